@@ -1,7 +1,6 @@
-import os, time
+import os, sys, time
 from azure.identity import DefaultAzureCredential
 from azure.ai.projects import AIProjectClient
-from azure.ai.agents.models import FunctionTool
 import json
 import datetime
 import random
@@ -10,6 +9,13 @@ from typing import Any, Callable, Set, Dict, List, Optional
 
 from dotenv import load_dotenv
 
+# Make the shared helpers in EX3-AgentWithTools/samples importable
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../samples"))
+from helpers.timezones import describe_time, describe_times
+from helpers.weather import weather_report, weather_reports
+from helpers.output_shaping import ToolOutputShaper
+from helpers.tool_cache import CachedFunctionTool
+
 load_dotenv()
 
 azure_foundry_project_endpoint = os.getenv("AI_FOUNDRY_ENDPOINT")
@@ -19,7 +25,11 @@ azure_foundry_deployment = os.getenv("AI_FOUNDRY_DEPLOYMENT_NAME")
 task_storage = []
 task_counter = 1
 
-# Enhanced weather function with multiple cities and detailed information
+# Large tool outputs (e.g. the task list) are paginated to a per-tool token budget
+output_shaper = ToolOutputShaper(budgets={"manage_tasks": 400})
+
+# Enhanced weather functions with multiple cities and detailed information
+# The weather and forecast tables are read-only module-level data in helpers.weather
 def fetch_weather(location: str, include_forecast: bool = False) -> str:
     """
     Fetches detailed weather information for the specified location.
@@ -28,110 +38,38 @@ def fetch_weather(location: str, include_forecast: bool = False) -> str:
     :param include_forecast: Whether to include a 3-day forecast
     :return: Weather information as a JSON string
     """
-    # Enhanced weather database with detailed information
-    weather_database = {
-        "New York": {"temp": "18°C", "condition": "Cloudy", "humidity": "65%", "wind": "12 km/h NW"},
-        "London": {"temp": "12°C", "condition": "Rainy", "humidity": "80%", "wind": "8 km/h SW"},
-        "Tokyo": {"temp": "22°C", "condition": "Sunny", "humidity": "55%", "wind": "6 km/h E"},
-        "Sydney": {"temp": "25°C", "condition": "Partly Cloudy", "humidity": "60%", "wind": "15 km/h SE"},
-        "Barcelona": {"temp": "25°C", "condition": "Sunny", "humidity": "45%", "wind": "10 km/h E"},
-        "Madrid": {"temp": "22°C", "condition": "Cloudy", "humidity": "50%", "wind": "7 km/h N"},
-        "Frankfurt": {"temp": "16°C", "condition": "Rainy", "humidity": "75%", "wind": "9 km/h W"},
-        "Paris": {"temp": "19°C", "condition": "Overcast", "humidity": "70%", "wind": "11 km/h NW"},
-        "Berlin": {"temp": "17°C", "condition": "Partly Cloudy", "humidity": "60%", "wind": "8 km/h NE"}
-    }
-    
-    # Simple 3-day forecast data
-    forecast_data = {
-        "New York": ["19°C Sunny", "21°C Partly Cloudy", "16°C Rainy"],
-        "London": ["14°C Overcast", "11°C Rainy", "15°C Cloudy"],
-        "Tokyo": ["24°C Sunny", "23°C Partly Cloudy", "25°C Sunny"],
-        "Sydney": ["27°C Sunny", "24°C Cloudy", "26°C Partly Cloudy"],
-        "Barcelona": ["27°C Sunny", "26°C Sunny", "24°C Partly Cloudy"]
-    }
-    
-    current_weather = weather_database.get(location, {
-        "temp": "N/A", "condition": "Data not available", 
-        "humidity": "N/A", "wind": "N/A"
-    })
-    
-    result = {
-        "location": location,
-        "current": current_weather
-    }
-    
-    if include_forecast and location in forecast_data:
-        result["forecast"] = {
-            "tomorrow": forecast_data[location][0],
-            "day_2": forecast_data[location][1],
-            "day_3": forecast_data[location][2]
-        }
+    return json.dumps(weather_report(location, include_forecast))
+
+def fetch_weather_batch(locations: List[str], include_forecast: bool = False) -> str:
+    """
+    Fetches weather information for several locations with a single call.
+    Prefer this over calling fetch_weather once per city when comparing locations.
     
-    return json.dumps(result)
+    :param locations: The locations to fetch weather for
+    :param include_forecast: Whether to include a 3-day forecast for each location
+    :return: Weather information for all locations as a compact JSON string
+    """
+    return json.dumps(weather_reports(locations, include_forecast), separators=(",", ":"), ensure_ascii=False)
 
-# Time function with timezone support
+# Time functions with timezone support
+# The alias index (abbreviations, IANA names, city names) is built once when helpers.timezones is imported
 def get_current_time(timezone: str = "UTC") -> str:
     """
     Gets the current time in the specified timezone.
     
-    :param timezone: Timezone (UTC, EST, EDT, PST, PDT, CET, etc.) or America/New_York format
+    :param timezone: Timezone abbreviation (UTC, EST, PST, CET, PKT, etc.), IANA name (America/New_York) or city name (Tokyo)
     :return: Current time as a JSON string
     """
-    # Enhanced timezone mappings with both standard and daylight saving time
-    # Also handle common timezone names
-    timezones = {
-        "UTC": 0, "GMT": 0,
-        # US Eastern Time
-        "EST": -5, "EDT": -4, "AMERICA/NEW_YORK": -4, "NEW_YORK": -4, "EASTERN": -4,
-        # US Pacific Time  
-        "PST": -8, "PDT": -7, "AMERICA/LOS_ANGELES": -7, "PACIFIC": -7,
-        # US Central Time
-        "CST": -6, "CDT": -5, "AMERICA/CHICAGO": -5, "CENTRAL": -5,
-        # US Mountain Time
-        "MST": -7, "MDT": -6, "AMERICA/DENVER": -6, "MOUNTAIN": -6,
-        # European Time
-        "CET": 1, "CEST": 2, "EUROPE/MADRID": 2, "EUROPE/PARIS": 2,
-        # Asian Time
-        "JST": 9, "ASIA/TOKYO": 9, "TOKYO": 9,
-        # Australian Time
-        "AEST": 10, "AEDT": 11, "AUSTRALIA/SYDNEY": 10, "SYDNEY": 10
-    }
-    
-    # Get current UTC time
-    utc_now = datetime.datetime.now(datetime.timezone.utc)
-    
-    # Normalize timezone input
-    tz_key = timezone.upper().replace("/", "/")
-    
-    # Apply timezone offset
-    offset = timezones.get(tz_key, 0)
-    if offset == 0 and tz_key != "UTC" and tz_key != "GMT":
-        # If timezone not found, try common variations
-        for tz_name, tz_offset in timezones.items():
-            if tz_key in tz_name or tz_name in tz_key:
-                offset = tz_offset
-                break
-    
-    local_time = utc_now + datetime.timedelta(hours=offset)
-    
-    # Determine the actual timezone name being used
-    actual_tz = timezone
-    if tz_key == "AMERICA/NEW_YORK" or tz_key == "NEW_YORK":
-        actual_tz = "EDT (Eastern Daylight Time)"
-    elif tz_key == "EST":
-        actual_tz = "EST (Eastern Standard Time)"
-    
-    result = {
-        "timezone": actual_tz,
-        "timezone_offset": f"UTC{offset:+d}",
-        "current_time": local_time.strftime("%Y-%m-%d %H:%M:%S"),
-        "day_of_week": local_time.strftime("%A"),
-        "formatted_time": local_time.strftime("%I:%M %p"),
-        "date": local_time.strftime("%B %d, %Y"),
-        "note": "September uses Daylight Saving Time (EDT = UTC-4)" if "YORK" in tz_key.upper() else ""
-    }
+    return json.dumps(describe_time(timezone))
+
+def get_current_times(timezones: List[str]) -> str:
+    """
+    Gets the current time in several timezones with a single call.
     
-    return json.dumps(result)
+    :param timezones: List of timezone abbreviations, IANA names or city names
+    :return: Current time for every requested timezone as a JSON string
+    """
+    return json.dumps({"times": describe_times(timezones)})
 
 # Password generator function
 def generate_password(length: int = 12, include_symbols: bool = True) -> str:
@@ -188,14 +126,15 @@ def generate_password(length: int = 12, include_symbols: bool = True) -> str:
     return json.dumps(result)
 
 # Task management function (Advanced level)
-def manage_tasks(action: str, task: str = "", task_id: int = 0) -> str:
+def manage_tasks(action: str, task: str = "", task_id: int = 0, cursor: str = "") -> str:
     """
     Manages a simple task list.
     
     :param action: Action to perform (add, list, complete, delete)
     :param task: Task description (for add action)
     :param task_id: Task ID (for complete/delete actions)
-    :return: Task management result as JSON
+    :param cursor: For list: the next_cursor value of the previous page to get the following tasks
+    :return: Task management result as JSON (list returns columns/rows pages with a next_cursor)
     """
     global task_storage, task_counter
     
@@ -219,12 +158,15 @@ def manage_tasks(action: str, task: str = "", task_id: int = 0) -> str:
         })
     
     elif action.lower() == "list":
-        return json.dumps({
-            "action": "list",
-            "tasks": task_storage,
-            "total_tasks": len(task_storage),
-            "pending_tasks": len([t for t in task_storage if t["status"] == "pending"])
-        })
+        return output_shaper.paginate(
+            "manage_tasks",
+            task_storage,
+            cursor=cursor,
+            extra={
+                "action": "list",
+                "pending_tasks": len([t for t in task_storage if t["status"] == "pending"])
+            }
+        )
     
     elif action.lower() == "complete":
         for task_item in task_storage:
@@ -304,7 +246,7 @@ def get_random_content(content_type: str) -> str:
         })
 
 # Define user functions - including all basic and advanced functions
-user_functions = {fetch_weather, get_current_time, generate_password, manage_tasks, get_random_content}
+user_functions = {fetch_weather, fetch_weather_batch, get_current_time, get_current_times, generate_password, manage_tasks, get_random_content}
 
 # Initialize the AIProjectClient
 project_client = AIProjectClient(
@@ -312,8 +254,8 @@ project_client = AIProjectClient(
     credential=DefaultAzureCredential(),
 )
 
-# Initialize the FunctionTool with user-defined functions
-functions = FunctionTool(functions=user_functions)
+# Initialize the FunctionTool with user-defined functions (definitions are cached until this file changes)
+functions = CachedFunctionTool(functions=user_functions)
 
 with project_client:
     # Create an agent with custom functions
@@ -322,8 +264,8 @@ with project_client:
         name="Multi-Function Personal Assistant",
         instructions="""You are a helpful personal assistant with multiple capabilities. You can:
         
-        🌤️ Provide detailed weather information for cities worldwide
-        ⏰ Tell the current time in different timezones  
+        🌤️ Provide detailed weather information for one or several cities at once
+        ⏰ Tell the current time in one or several timezones at once
         🔐 Generate secure passwords with customizable options
         📝 Manage tasks (add, list, complete, delete)
         🎲 Generate random jokes, facts, and lucky numbers
@@ -344,7 +286,7 @@ with project_client:
         role="user",
         content="""Hello! I need help with several things:
         1. What's the weather like in Tokyo with forecast?
-        2. What time is it in New York right now?
+        2. What time is it in New York and Islamabad right now?
         3. Generate a secure password with 4 characters including symbols
         4. Add a task 'Prepare for tomorrow's meeting'
         5. Tell me a random fact
@@ -375,8 +317,12 @@ with project_client:
                 # Handle each function call
                 if function_name == "fetch_weather":
                     output = fetch_weather(**function_args)
+                elif function_name == "fetch_weather_batch":
+                    output = fetch_weather_batch(**function_args)
                 elif function_name == "get_current_time":
                     output = get_current_time(**function_args)
+                elif function_name == "get_current_times":
+                    output = get_current_times(**function_args)
                 elif function_name == "generate_password":
                     output = generate_password(**function_args)
                 elif function_name == "manage_tasks":
@@ -428,9 +374,11 @@ with project_client:
     # Test individual functions to show they work
     print("\n🌤️ Weather Test:")
     print(fetch_weather("Barcelona", True))
+    print(fetch_weather_batch(["Barcelona", "Madrid", "Paris", "London", "Berlin"], True))
     
     print("\n⏰ Time Test:")
     print(get_current_time("CET"))
+    print(get_current_times(["America/New_York", "islamabad", "PST"]))
     
     print("\n🔐 Password Test:")
     print(generate_password(20, False))
@@ -442,6 +390,9 @@ with project_client:
     print("\n🎲 Random Content Test:")
     print(get_random_content("joke"))
 
+    print("\n✂️ Tool Output Token Savings:")
+    print(json.dumps(output_shaper.report(), indent=2))
+
     # Delete the agent after use
     project_client.agents.delete_agent(agent.id)
     print(f"\n✅ Deleted agent: {agent.id}")
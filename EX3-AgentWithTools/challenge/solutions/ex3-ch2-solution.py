@@ -1,13 +1,27 @@
 # 0. Import necessary libraries and set up environment variables
 # ---------------------------------------------------------------------
 import os
-import jsonref
+import sys
+import json
 import time
+import urllib.parse
+import urllib.request
+from typing import List, Optional
 from azure.ai.projects import AIProjectClient
 from azure.identity import DefaultAzureCredential
 from azure.ai.agents.models import ListSortOrder, OpenApiTool, OpenApiAnonymousAuthDetails
 from dotenv import load_dotenv
 
+# Make the shared helpers in EX3-AgentWithTools/samples importable
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../samples"))
+from helpers.eval_runner import EvalRunner
+from helpers.openapi_executor import OpenApiExecutor, OpenApiFunctionTool
+from helpers.output_shaping import ToolOutputShaper
+from helpers.rate_governor import RateGovernor
+from helpers.spec_compiler import load_compiled_spec
+from helpers.standin import spec_paths
+from helpers.tool_cache import CachedFunctionTool
+
 # Load environment variables from a .env file
 load_dotenv()
 
@@ -17,14 +31,67 @@ azure_foundry_project_endpoint = os.getenv("AI_FOUNDRY_ENDPOINT")
 azure_foundry_key = os.getenv("AI_FOUNDRY_API_KEY")
 azure_foundry_deployment = os.getenv("AI_FOUNDRY_DEPLOYMENT_NAME")
 
+# "server" (default): the agent service calls the API through the OpenApiTool.
+# "local": the operations become function tools executed here, through a pooled
+# HTTP client that caches GETs and revalidates them with ETags (helpers/openapi_executor.py).
+openapi_execution = os.getenv("OPENAPI_EXECUTION", "server").lower()
+
+# Test suite: questions evaluated at the same time, and model requests allowed per minute
+eval_concurrency = int(os.getenv("EVAL_CONCURRENCY", "4"))
+eval_requests_per_minute = float(os.getenv("EVAL_REQUESTS_PER_MINUTE", "30"))
+
+# 1.5. Paginated Inventory Listing Tool
+# ---------------------------------------------------------------------
+# Through the OpenApiTool, GET /inventory returns the whole collection and every
+# item is billed as prompt tokens on the next model step. Listings therefore go
+# through a local function tool that returns token-budgeted pages with only the
+# most useful fields; the model passes next_cursor to read further pages.
+# ---------------------------------------------------------------------
+# Set INVENTORY_API_URL to a local stand-in (python -m helpers.standin inventory) to work offline
+inventory_api_url = os.getenv("INVENTORY_API_URL", "https://ibm-aiclass-apim.azure-api.net/inventory")
+# A local URL is the stand-in, which also serves the operations of its overlay spec (bulk reservations)
+inventory_standin = urllib.parse.urlsplit(inventory_api_url).hostname in ("127.0.0.1", "localhost")
+# Set MAINTENANCE_API_URL to a maintenance stand-in (python -m helpers.standin maintenance) to also give the
+# agent its scheduling tools: the earliest slot across all technicians, and planning many jobs in one call
+maintenance_api_url = os.getenv("MAINTENANCE_API_URL", "")
+
+output_shaper = ToolOutputShaper(
+    budgets={"list_inventory": 1200},
+    default_fields={"list_inventory": ["item_id", "name", "category", "stock_quantity", "min_stock_level", "location"]}
+)
+
+# Listings fetched during this session, so following pages do not hit the API again
+inventory_listing_cache = {}
+
+def list_inventory(category: str = "", cursor: str = "", fields: Optional[List[str]] = None) -> str:
+    """
+    Lists inventory items one page at a time. Prefer this over the OpenAPI tool for listings.
+    
+    :param category: Optional category filter (Mechanical, Electrical, Hydraulic, ...); empty for all items
+    :param cursor: The next_cursor value of the previous page; empty for the first page
+    :param fields: Optional item fields to return (item_id, name, category, stock_quantity, location, min_stock_level, unit_price, supplier, last_updated)
+    :return: JSON page with columns, rows, total and next_cursor (null on the last page)
+    """
+    if category not in inventory_listing_cache:
+        path = f"/inventory/category/{urllib.parse.quote(category)}" if category else "/inventory"
+        try:
+            with urllib.request.urlopen(inventory_api_url + path, timeout=30) as response:
+                inventory_listing_cache[category] = json.loads(response.read())
+        except Exception as e:
+            return json.dumps({"error": f"Inventory API request failed: {e}"})
+
+    return output_shaper.paginate("list_inventory", inventory_listing_cache[category], cursor=cursor, fields=fields)
+
 # 2. Authentication Setup using DefaultAzureCredential
 # ---------------------------------------------------------------------
 # 3. AI Project Client Setup with context manager
 # ---------------------------------------------------------------------
 
-def test_inventory_questions(project, agent_id, thread_id):
+def test_inventory_questions(project, agent_id):
     """
-    Test the inventory agent with multiple questions covering all challenge requirements
+    Test the inventory agent with multiple questions covering all challenge requirements.
+    Every question runs on its own thread, several at a time, and a JSON report with the
+    latency, tokens and tool calls of each question is written to eval_reports/.
     """
     # Challenge questions covering all requirements
     test_questions = [
@@ -49,46 +116,34 @@ def test_inventory_questions(project, agent_id, thread_id):
     print("\n" + "="*80)
     print("🧪 TESTING INVENTORY MANAGEMENT AGENT")
     print("="*80)
-    print("Testing various inventory queries to demonstrate full functionality...")
-    
-    for i, question in enumerate(test_questions, 1):
-        print(f"\n🔍 Test {i}/11: {question}")
+    print(f"Running {len(test_questions)} questions, {eval_concurrency} at a time...")
+
+    runner = EvalRunner(
+        project.agents,
+        agent_id,
+        max_concurrency=eval_concurrency,
+        governor=RateGovernor(eval_requests_per_minute, burst=eval_concurrency),
+    )
+    report = runner.run(test_questions)
+
+    for result in report["results"]:
+        print(f"\n🔍 Test {result['index']}/{len(test_questions)}: {result['question']}")
         print("-" * 60)
-        
-        # Create message for this test
-        message = project.agents.messages.create(
-            thread_id=thread_id,
-            role="user", 
-            content=question
-        )
-        
-        # Create and process run
-        run = project.agents.runs.create_and_process(
-            thread_id=thread_id, 
-            agent_id=agent_id
-        )
-        
-        # Handle errors
-        if run.status == "failed":
-            print(f"❌ Run failed: {run.last_error}")
+        if result["status"] != "completed":
+            print(f"❌ Run {result['status']}: {result['error']}")
             continue
-            
-        # Get the latest message (response)
-        messages = project.agents.messages.list(
-            thread_id=thread_id,
-            order=ListSortOrder.DESCENDING,
-            limit=1
-        )
-        
-        for message in messages:
-            if message.run_id == run.id and message.text_messages:
-                response = message.text_messages[-1].text.value
-                print(f"🤖 Response: {response[:300]}...")
-                if len(response) > 300:
-                    print("    [Response truncated - full response available in logs]")
-        
-        # Add small delay between requests to avoid rate limiting
-        time.sleep(1)
+        response = result["answer"] or ""
+        print(f"🤖 Response: {response[:300]}...")
+        if len(response) > 300:
+            print("    [Response truncated - full response available in the eval report]")
+
+    report_path = EvalRunner.write_report(report, os.path.join(
+        os.path.dirname(__file__), "eval_reports", f"inventory-eval-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    ))
+    summary = report["summary"]
+    print(f"\n⏱️ {summary['completed']}/{summary['questions']} questions answered in {summary['wall_time_s']}s "
+          f"(sequential would take ~{summary['sum_of_latencies_s']}s, slowest question {summary['slowest_question_s']}s)")
+    print(f"📄 Evaluation report: {report_path}")
 
 def run_interactive_session(project, agent_id, thread_id):
     """
@@ -156,34 +211,88 @@ with AIProjectClient(
     print("📡 Loading OpenAPI specification for real inventory API...")
     
     # Load the OpenAPI specification for the inventory service from a local JSON file
-    openapi_file_path = os.path.join(os.path.dirname(__file__), "../samples/openApiDef/InventoryAPI.json")
-    with open(openapi_file_path, "r") as f:
-        openapi_inventory = jsonref.loads(f.read())
+    openapi_file_path = os.path.join(os.path.dirname(__file__), "../../samples/openApiDef/InventoryAPI.json")
+    # Only the read operations the agent needs are kept, without examples and
+    # validation-error schemas, so the tool definition costs fewer tokens per step
+    inventory_operations = [
+        "get_all_inventory_inventory_get",
+        "check_stock_inventory__item_id__get",
+        "get_items_by_category_inventory_category__category__get",
+        "get_low_stock_items_inventory_low_stock_get",
+    ]
+    inventory_overlay = None
+    if openapi_execution == "local" and inventory_standin:
+        # Reserve all the parts of a maintenance plan in one call (stand-in only, see openApiDef/standin)
+        inventory_overlay = spec_paths("inventory")[1]
+        inventory_operations.append("reserve_items_bulk_inventory_reserve_bulk_post")
+    openapi_inventory = load_compiled_spec(openapi_file_path, operations=inventory_operations,
+                                           overlay=inventory_overlay)
 
     print(f"✅ Loaded OpenAPI spec from: {openapi_file_path}")
     print(f"🌐 Target API: {openapi_inventory['servers'][0]['url']}")
 
-    # Create Auth object for the OpenApiTool (using anonymous auth for this demo)
-    auth = OpenApiAnonymousAuthDetails()
+    openapi_executor = maintenance_executor = None
+    if openapi_execution == "local":
+        # Stock levels barely move during a conversation: serve repeated listings from
+        # the cache for a minute, then revalidate them with a conditional request
+        openapi_executor = OpenApiExecutor(
+            openapi_inventory,
+            base_url=inventory_api_url,
+            ttl={
+                "get_low_stock_items_inventory_low_stock_get": 60,
+                "get_items_by_category_inventory_category__category__get": 60,
+                "get_all_inventory_inventory_get": 60,
+            },
+            default_ttl=15,
+        )
+        executors = [openapi_executor]
+        if maintenance_api_url:
+            # The scheduling operations are served by the stand-in only (openApiDef/standin/MaintenanceAPI.ext.json)
+            maintenance_path, maintenance_overlay = spec_paths("maintenance")
+            maintenance_executor = OpenApiExecutor(
+                load_compiled_spec(maintenance_path, operations=[
+                    "get_earliest_slot_schedule_earliest_get",
+                    "plan_maintenance_jobs_jobs_plan_post",
+                ], overlay=maintenance_overlay),
+                base_url=maintenance_api_url,
+            )
+            executors.append(maintenance_executor)
+        functions = OpenApiFunctionTool(executors, functions={list_inventory})
+        agent_tools = functions.definitions
+    else:
+        # Create Auth object for the OpenApiTool (using anonymous auth for this demo)
+        auth = OpenApiAnonymousAuthDetails()
 
-    # Initialize the main OpenAPI tool definition for inventory
-    openapi_tool = OpenApiTool(
-        name="inventory_management", 
-        spec=openapi_inventory, 
-        description="Access real industrial inventory data including spare parts, components, stock levels, and categories. Use this to retrieve inventory information, check stock levels, find items by category, and generate inventory insights.", 
-        auth=auth
-    )
+        # Initialize the main OpenAPI tool definition for inventory
+        openapi_tool = OpenApiTool(
+            name="inventory_management", 
+            spec=openapi_inventory, 
+            description="Access real industrial inventory data including spare parts, components, stock levels, and categories. Use this to retrieve inventory information, check stock levels, find items by category, and generate inventory insights.", 
+            auth=auth
+        )
 
-    print("🔧 OpenAPI tool configured successfully")
+        # Local function tool for token-budgeted, paginated listings
+        functions = CachedFunctionTool(functions={list_inventory})
+        agent_tools = openapi_tool.definitions + functions.definitions
+
+    project.agents.enable_auto_function_calls(functions)
+
+    print(f"🔧 OpenAPI tool configured successfully ({openapi_execution} execution)")
 
     # 5. Agent Creation
     # ---------------------------------------------------------------------
     print("🤖 Creating Inventory Management Agent...")
+    extra_instructions = ""
+    if inventory_overlay:
+        extra_instructions += "\n- To reserve the parts of a maintenance plan, reserve all of them in one bulk reservation call"
+    if maintenance_executor is not None:
+        extra_instructions += ("\n- To schedule maintenance, find the earliest slot across all technicians in one call, "
+                               "and plan several jobs in one call (dry_run to propose a plan without booking it)")
     
     agent = project.agents.create_agent(
         model=azure_foundry_deployment,
         name="Real-World Inventory Management Assistant",
-        instructions="""You are an expert inventory management assistant connected to a REAL industrial inventory API containing actual spare parts and components data.
+        instructions=f"""You are an expert inventory management assistant connected to a REAL industrial inventory API containing actual spare parts and components data.
 
 Your capabilities include:
 🔍 SEARCH & RETRIEVE: Find inventory items by category, name, or characteristics
@@ -197,9 +306,10 @@ Key responsibilities:
 - For maintenance planning, focus on critical components and reorder priorities
 - Present data in clear, organized formats (lists, tables, summaries)
 - Flag urgent situations (very low stock, critical components)
+- Use list_inventory to list items; it returns pages, so pass next_cursor only when you need more items{extra_instructions}
 
 Remember: This is REAL data from an industrial facility, so be precise and professional in your responses.""",
-        tools=openapi_tool.definitions,
+        tools=agent_tools,
     )
 
     print(f"✅ Agent created successfully: {agent.id}")
@@ -252,7 +362,7 @@ Remember: This is REAL data from an industrial facility, so be precise and profe
     # ---------------------------------------------------------------------
     if run.status != "failed":
         # Run all challenge tests
-        test_inventory_questions(project, agent.id, thread.id)
+        test_inventory_questions(project, agent.id)
         
         # Run advanced interactive session
         run_interactive_session(project, agent.id, thread.id)
@@ -279,7 +389,7 @@ Remember: This is REAL data from an industrial facility, so be precise and profe
     
     print(f"\n🤖 Agent ID: {agent.id}")
     print(f"💬 Thread ID: {thread.id}")
-    print(f"🌐 API Endpoint: https://ibm-aiclass-apim.azure-api.net/inventory")
+    print(f"🌐 API Endpoint: {inventory_api_url}")
     
     print("\n💡 Next Steps:")
     print("  - Try asking specific questions about inventory categories")
@@ -290,6 +400,18 @@ Remember: This is REAL data from an industrial facility, so be precise and profe
     print("\n🏆 You have successfully completed Challenge 2: Real-World Inventory Management!")
     print("   This demonstrates practical OpenAPI integration with live business systems.")
 
+    print("\n✂️ Tool Output Token Savings:")
+    print(json.dumps(output_shaper.report(), indent=2))
+
     # Clean up
     project.agents.delete_agent(agent.id)
-    print(f"\n🧹 Cleaned up agent: {agent.id}")
\ No newline at end of file
+    print(f"\n🧹 Cleaned up agent: {agent.id}")
+
+    if openapi_executor is not None:
+        print("\n⏱️ Inventory API Calls (local execution):")
+        print(json.dumps(openapi_executor.report(), indent=2))
+        openapi_executor.close()
+    if maintenance_executor is not None:
+        print("\n⏱️ Maintenance API Calls (local execution):")
+        print(json.dumps(maintenance_executor.report(), indent=2))
+        maintenance_executor.close()
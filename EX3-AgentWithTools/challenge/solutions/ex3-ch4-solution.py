@@ -1,19 +1,15 @@
 # Import necessary libraries
 
 from concurrent.futures import thread
-import os, time
-import jsonref
+import os, sys, time
 import json
+from typing import Any, Dict, List
 from azure.ai.projects import AIProjectClient
 from azure.identity import DefaultAzureCredential
 from azure.ai.agents.models import (
     ListSortOrder,
     McpTool,
-    RequiredMcpToolCall,
     RunStepActivityDetails,
-    SubmitToolApprovalAction,
-    ToolApproval,
-    FunctionTool,
     OpenApiTool, 
     OpenApiAnonymousAuthDetails,
     ResponseFormatJsonSchema,
@@ -22,6 +18,15 @@ from azure.ai.agents.models import (
 from dotenv import load_dotenv
 from pydantic import BaseModel
 
+# Make the shared helpers in EX3-AgentWithTools/samples importable
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../samples"))
+from helpers.tool_cache import CachedFunctionTool, cached_model_json_schema
+from helpers.run_multiplexer import RunMultiplexer
+from helpers.mcp_approval import McpApprovalPolicy
+from helpers.mcp_catalog import McpToolCatalog
+from helpers.repo_metrics import analyze_repositories
+from helpers.spec_compiler import load_compiled_spec
+
 load_dotenv()
 
 azure_foundry_project_endpoint = os.getenv("AI_FOUNDRY_ENDPOINT")
@@ -104,18 +109,29 @@ def analyze_code_metrics(repo_data):
         "complexity_summary": f"{project_size} {language} project with {popularity.lower()} popularity"
     }
 
+# Batch variant: classifies a whole list of repositories (e.g. GitHubReposResponse.repositories)
+# in one vectorized NumPy pass, adding percentile ranks relative to the batch
+def analyze_code_metrics_batch(repositories: List[Dict[str, Any]]) -> str:
+    """
+    Analyzes many repositories at once. Prefer this over calling analyze_code_metrics once per repository.
+    
+    :param repositories: Repository objects with GitHub API fields (name, language, size, stargazers_count, forks_count, open_issues_count)
+    :return: JSON table with one row per repository (classes, metrics and percentile ranks within the batch) and a summary
+    """
+    return json.dumps(analyze_repositories(repositories), separators=(",", ":"))
+
 # Creating objects user_function and function_tool
 # Define user functions
-user_functions = {analyze_code_metrics}
+user_functions = {analyze_code_metrics, analyze_code_metrics_batch}
 
 # Initialize the FunctionTool with user-defined functions
-functions_tool = FunctionTool(functions=user_functions)
+functions_tool = CachedFunctionTool(functions=user_functions)
 
 ########### SECOND AGENT TOOL DEFINITION - OPENAPI TOOL ###########
 # Load the OpenAPI specification for GitHub repositories API
 openapi_file_path = os.path.join(os.path.dirname(__file__), "../gitHubOpenApidef.json")
-with open(openapi_file_path, "r") as f:
-    openapi_inventory = jsonref.loads(f.read())
+# Only the parts of the spec the model needs are sent (see helpers/spec_compiler.py)
+openapi_inventory = load_compiled_spec(openapi_file_path)
 
 print(f"✅ Loaded OpenAPI spec from: {openapi_file_path}")
 print(f"🌐 Target API: {openapi_inventory['servers'][0]['url']}")
@@ -130,16 +146,81 @@ openapi_tool = OpenApiTool(
 
 ########### THIRD AGENT TOOL DEFINITION - MCP TOOL ###########
 # Get MCP server configuration from environment variables or Fixed values
-mcp_server_url = "https://learn.microsoft.com/api/mcp"
+# MCP_PROXY_URL can point at a helpers.mcp_proxy in front of this server (reachable from Azure,
+# e.g. through a dev tunnel) so repeated documentation reads are served from its cache
+mcp_server_url = os.getenv("MCP_PROXY_URL", "https://learn.microsoft.com/api/mcp")
 mcp_server_label = "MicrosoftLean"
 
 # Initialize agent MCP tool
 mcp_tool = McpTool(
     server_label=mcp_server_label,
     server_url=mcp_server_url,
-    allowed_tools=[],  # Optional: specify allowed tools
+    allowed_tools=[],  # Pinned below from the tool catalog
 )
 
+# Approval policy: searches are read-only and run without approval,
+# fetching pages is limited to Microsoft Learn
+approval_policy = McpApprovalPolicy(default="deny")
+approval_policy.rule(mcp_server_label, "microsoft_docs_search", "always")
+approval_policy.rule(mcp_server_label, "microsoft_code_sample_search", "always")
+approval_policy.rule(
+    mcp_server_label, "microsoft_docs_fetch", "approve",
+    when=lambda args: args.get("url", "").startswith("https://learn.microsoft.com/"),
+    max_per_minute=10,
+)
+approval_policy.apply(mcp_tool)
+
+# Expose only the tools the approval policy allows instead of the server's whole catalog;
+# the catalog is cached with a hash and changes to it are reported (if it cannot be
+# checked, e.g. behind a proxy, the policy's tools are allowed as configured)
+tool_catalog = McpToolCatalog()
+tool_catalog.pin_or_allow(mcp_tool, approval_policy.tools(mcp_server_label))
+print(f"📌 Pinned MCP tools: {tool_catalog.report()[mcp_server_label]}")
+
+########### REQUIRES_ACTION HANDLERS FOR THE RUN MULTIPLEXER ###########
+# Agent 1: execute analyze_code_metrics calls and return their outputs
+def handle_function_calls(run):
+    print("Agent 1 requires action - processing function call")
+    tool_outputs = []
+    for tool_call in run.required_action.submit_tool_outputs.tool_calls:
+        if tool_call.function.name == "analyze_code_metrics":
+            # Parse the function arguments (simple approach like Challenge 1)
+            args = json.loads(tool_call.function.arguments)
+            
+            # Get repo_data and ensure it's a dictionary  
+            repo_data = args.get("repo_data", {})
+            if isinstance(repo_data, str):
+                try:
+                    repo_data = json.loads(repo_data)
+                except json.JSONDecodeError:
+                    repo_data = {"error": "Invalid repo data format"}
+            
+            # Call our function with the corrected repo_data
+            result = analyze_code_metrics(repo_data)
+            tool_outputs.append({
+                "tool_call_id": tool_call.id,
+                "output": json.dumps(result)
+            })
+        elif tool_call.function.name == "analyze_code_metrics_batch":
+            args = json.loads(tool_call.function.arguments)
+            repositories = args.get("repositories", [])
+            if isinstance(repositories, str):
+                try:
+                    repositories = json.loads(repositories)
+                except json.JSONDecodeError:
+                    repositories = []
+            # Accept a whole GitHubReposResponse as well as the bare repositories list
+            if isinstance(repositories, dict):
+                repositories = repositories.get("repositories", [])
+            tool_outputs.append({
+                "tool_call_id": tool_call.id,
+                "output": analyze_code_metrics_batch(repositories)
+            })
+    return {"tool_outputs": tool_outputs} if tool_outputs else None
+
+# Agent 3: MCP approvals are decided by the approval policy (see helpers/mcp_approval.py)
+handle_mcp_approvals = approval_policy.requires_action_handler()
+
 ############ COMMON CLIENT CREATION ###########
 project_client = AIProjectClient(
     endpoint=azure_foundry_project_endpoint,
@@ -154,7 +235,7 @@ with project_client:
     agentTool = agents_client.create_agent(
         model=azure_foundry_deployment,
         name="Code Analyst Agent",
-        instructions="You are a code analysis specialist. Your job is to analyze GitHub repositories and provide insights about their complexity, size, and characteristics. When given repository data from GitHub API, use the analyze_code_metrics function to provide detailed analysis including project size assessment, programming language identification, popularity and activity metrics, and development recommendations.",
+        instructions="You are a code analysis specialist. Your job is to analyze GitHub repositories and provide insights about their complexity, size, and characteristics. When given repository data from GitHub API, use the analyze_code_metrics function (or analyze_code_metrics_batch for several repositories in a single call) to provide detailed analysis including project size assessment, programming language identification, popularity and activity metrics, and development recommendations.",
         tools=functions_tool.definitions,
     )
     print(f"Created Agent 1, ID: {agentTool.id}")
@@ -173,7 +254,7 @@ with project_client:
         response_format=ResponseFormatJsonSchemaType(
             json_schema=ResponseFormatJsonSchema(
                 name="GitHubReposResponse",
-                schema=GitHubReposResponse.model_json_schema()
+                schema=cached_model_json_schema(GitHubReposResponse)
             )
         )
     )
@@ -229,146 +310,46 @@ with project_client:
     )
     print(f"Created message for Agent 3, ID: {message3.id}")
     
-    # Create and process agent run in thread with Function Tool
-    run1 = agents_client.runs.create(thread_id=thread1.id, agent_id=agentTool.id)
-    
-    print(f"Created run for Agent 1, ID: {run1.id}")
-    
-    while run1.status in ["queued", "in_progress", "requires_action"]:
-        time.sleep(1)
-        run1 = agents_client.runs.get(thread_id=thread1.id, run_id=run1.id)
-        
-        # Handle function call approval for Agent 1
-        if run1.status == "requires_action":
-            print("Agent 1 requires action - processing function call")
-            
-            # Get the required action details
-            required_action = run1.required_action
-            tool_calls = required_action.submit_tool_outputs.tool_calls
-            
-            tool_outputs = []
-            for tool_call in tool_calls:
-                if tool_call.function.name == "analyze_code_metrics":
-                    # Parse the function arguments (simple approach like Challenge 1)
-                    args = json.loads(tool_call.function.arguments)
-                    
-                    # Get repo_data and ensure it's a dictionary  
-                    repo_data = args.get("repo_data", {})
-                    if isinstance(repo_data, str):
-                        try:
-                            repo_data = json.loads(repo_data)
-                        except json.JSONDecodeError:
-                            repo_data = {"error": "Invalid repo data format"}
-                    
-                    # Call our function with the corrected repo_data
-                    result = analyze_code_metrics(repo_data)
-                    
-                    # Add the result to tool outputs
-                    tool_outputs.append({
-                        "tool_call_id": tool_call.id,
-                        "output": json.dumps(result)
-                    })
-            
-            # Submit the tool outputs
-            if tool_outputs:
-                run1 = agents_client.runs.submit_tool_outputs(
-                    thread_id=thread1.id, 
-                    run_id=run1.id, 
-                    tool_outputs=tool_outputs
-                )
-        
-        print(f"Current run status for Agent 1: {run1.status}")
-    print(f"Final run status for Agent 1: {run1.status}")
-    
-    if run1.status == "completed":
-        # Get the messages from the thread to see the response
-        messages = agents_client.messages.list(thread_id=thread1.id)
-        for message in messages:
-            if message.role == "assistant":
-                if message.content and len(message.content) > 0:
-                    content = message.content[0].text.value
-                    print(f"\n{'='*20} Agent 1 - Code Analyst {'='*20}")
-                    print(content)
-                    print(f"{'='*60}\n")
-                break
-    else:
-        print("Run for Agent 1 did not complete successfully.")
-        
-    # Create and process agent run in thread with OpenAPI Tool
-    run2 = agents_client.runs.create(thread_id=thread2.id, agent_id=agentOpenAPI.id)
-    print(f"Created run for Agent 2, ID: {run2.id}")
-    while run2.status in ["queued", "in_progress"]:
-        time.sleep(1)
-        run2 = agents_client.runs.get(thread_id=thread2.id, run_id=run2.id)
-        print(f"Current run status for Agent 2: {run2.status}")
-    print(f"Final run status for Agent 2: {run2.status}")
-    
-    if run2.status == "completed":
-        # Get the messages from the thread to see the response
-        messages = agents_client.messages.list(thread_id=thread2.id)
-        for message in messages:
-            if message.role == "assistant":
-                if message.content and len(message.content) > 0:
-                    content = message.content[0].text.value
-                    print(f"\n{'='*20} Agent 2 - GitHub Explorer {'='*19}")
-                    print(content)
-                    print(f"{'='*60}\n")
-                break
-    else:
-        print("Run for Agent 2 did not complete successfully.")
-    
-    # Create and process agent run in thread with MCP tools
-    run3 = agents_client.runs.create(thread_id=thread3.id, agent_id=agentMCP.id)
-    print(f"Created run for Agent 3, ID: {run3.id}")
-    
-    while run3.status in ["queued", "in_progress", "requires_action"]:
-        time.sleep(1)
-        run3 = agents_client.runs.get(thread_id=thread3.id, run_id=run3.id)
-
-        if run3.status == "requires_action" and isinstance(run3.required_action, SubmitToolApprovalAction):
-            tool_calls = run3.required_action.submit_tool_approval.tool_calls
-            if not tool_calls:
-                print("No tool calls provided - cancelling run")
-                agents_client.runs.cancel(thread_id=thread3.id, run_id=run3.id)
-                break
-
-            tool_approvals = []
-            for tool_call in tool_calls:
-                if isinstance(tool_call, RequiredMcpToolCall):
-                    try:
-                        print(f"Approving tool call: {tool_call}")
-                        tool_approvals.append(
-                            ToolApproval(
-                                tool_call_id=tool_call.id,
-                                approve=True,
-                                headers=mcp_tool.headers,
-                            )
-                        )
-                    except Exception as e:
-                        print(f"Error approving tool_call {tool_call.id}: {e}")
-
-            print(f"tool_approvals: {tool_approvals}")
-            if tool_approvals:
-                agents_client.runs.submit_tool_outputs(
-                    thread_id=thread3.id, run_id=run3.id, tool_approvals=tool_approvals
-                )
-
-        print(f"Current run status for Agent 3: {run3.status}")
-    print(f"Final run status for Agent 3: {run3.status}")
-    
-    if run3.status == "completed":
-        # Get the messages from the thread to see the response
-        messages = agents_client.messages.list(thread_id=thread3.id)
-        for message in messages:
-            if message.role == "assistant":
-                if message.content and len(message.content) > 0:
-                    content = message.content[0].text.value
-                    print(f"\n{'='*18} Agent 3 - Documentation Expert {'='*17}")
-                    print(content)
-                    print(f"{'='*60}\n")
-                break
-    else:
-        print("Run for Agent 3 did not complete successfully.")
+    # Start the three runs up front and watch them together with one batched poller.
+    # Each requires_action handler is dispatched as soon as it fires, so the total
+    # wall time is the one of the slowest run instead of the sum of all three.
+    run_multiplexer = RunMultiplexer(agents_client)
+
+    run_multiplexer.start("Agent 1 - Code Analyst", thread_id=thread1.id, agent_id=agentTool.id,
+                          on_requires_action=handle_function_calls)
+    run_multiplexer.start("Agent 2 - GitHub Explorer", thread_id=thread2.id, agent_id=agentOpenAPI.id)
+    run_multiplexer.start("Agent 3 - Documentation Expert", thread_id=thread3.id, agent_id=agentMCP.id,
+                          on_requires_action=handle_mcp_approvals, tool_resources=mcp_tool.resources)
+    print("Started runs for Agents 1, 2 and 3")
+
+    threads_by_agent = {
+        "Agent 1 - Code Analyst": thread1.id,
+        "Agent 2 - GitHub Explorer": thread2.id,
+        "Agent 3 - Documentation Expert": thread3.id,
+    }
+
+    started_at = time.perf_counter()
+    for agent_label, run in run_multiplexer.as_completed():
+        print(f"Final run status for {agent_label}: {run.status}")
+
+        if run.status == "completed":
+            # Get the messages from the thread to see the response
+            messages = agents_client.messages.list(thread_id=threads_by_agent[agent_label])
+            for message in messages:
+                if message.role == "assistant":
+                    if message.content and len(message.content) > 0:
+                        content = message.content[0].text.value
+                        print(f"\n{'='*20} {agent_label} {'='*20}")
+                        print(content)
+                        print(f"{'='*60}\n")
+                    break
+        else:
+            print(f"Run for {agent_label} did not complete successfully."
+                  + (f" {run_multiplexer.errors[agent_label]}" if agent_label in run_multiplexer.errors else ""))
+
+    wall_time = time.perf_counter() - started_at
+    print(f"⏱️ Wall time: {wall_time:.1f}s (sum of individual runs: {sum(run_multiplexer.durations.values()):.1f}s)")
+    print(f"🔐 MCP approval decisions: {approval_policy.report()}")
 
 print("✅ All agents have completed their runs!")
 
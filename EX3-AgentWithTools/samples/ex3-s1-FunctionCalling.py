@@ -1,12 +1,14 @@
 import os, time
 from azure.identity import DefaultAzureCredential
 from azure.ai.projects import AIProjectClient
-from azure.ai.agents.models import FunctionTool
 import json
 import datetime
+from types import MappingProxyType
 from typing import Any, Callable, Set, Dict, List, Optional
 
 from dotenv import load_dotenv
+from helpers.nifty_query import default_engine
+from helpers.tool_cache import CachedFunctionTool
 
 load_dotenv()
 
@@ -19,6 +21,11 @@ azure_foundry_deployment = os.getenv("AI_FOUNDRY_DEPLOYMENT_NAME")
 # with any required parameters in a docstring.
 
 
+# Mock weather data for demonstration purposes.
+# It is defined once at module level (read-only) instead of being rebuilt on every call.
+MOCK_WEATHER_DATA = MappingProxyType({"Barcelona": "Sunny, 25°C", "Madrid": "Cloudy, 22°C", "Frankfurt": "Rainy, 16°C"})
+
+
 def fetch_weather(location: str) -> str:
     """
     Fetches the weather information for the specified location.
@@ -26,13 +33,44 @@ def fetch_weather(location: str) -> str:
     :param location: The location to fetch weather for.
     :return: Weather information as a JSON string.
     """
-    # Mock weather data for demonstration purposes
-    mock_weather_data = {"Barcelona": "Sunny, 25°C", "Madrid": "Cloudy, 22°C", "Frankfurt": "Rainy, 16°C"}
-    weather = mock_weather_data.get(location, "Weather data not available for this location.")
+    weather = MOCK_WEATHER_DATA.get(location, "Weather data not available for this location.")
+    return json.dumps({"weather": weather})
+
+
+def fetch_weather_batch(locations: List[str]) -> str:
+    """
+    Fetches the weather information for several locations in a single call.
+    Use it instead of calling fetch_weather once per location.
+
+    :param locations: The locations to fetch weather for.
+    :return: Weather information per location as a JSON string.
+    """
+    weather = {location: MOCK_WEATHER_DATA.get(location, "Weather data not available for this location.")
+               for location in locations}
     return json.dumps({"weather": weather})
 
+def query_quarterly_results(where: str = "", metric: str = "revenue", k: int = 10, group_by: str = "",
+                            aggregates: Optional[List[str]] = None, ascending: bool = False) -> str:
+    """
+    Screens, ranks and aggregates the NIFTY 500 quarterly results (amounts in INR crore) in one call.
+    Use it instead of reading company rows: e.g. the top 10 by EPS_TTM in each sector is metric="EPS_TTM", group_by="sector".
+
+    :param where: Optional condition in Python syntax, e.g. "operating_profit_margin > 20 and sector == 'CEMENT AND CONSTRUCTION'". Columns: revenue, operating_expenses, operating_profit, operating_profit_margin (percent), depreciation, interest, profit_before_tax, tax, net_profit, EPS, profit_TTM, EPS_TTM, sector, industry, name, NSE_code, BSE_code
+    :param metric: Metric to rank by or aggregate
+    :param k: Companies to return (per group when group_by is set), or groups when aggregating
+    :param group_by: Empty, "sector" or "industry"
+    :param aggregates: Optional aggregates per group instead of companies: count, sum, mean, median, min, max
+    :param ascending: Return the lowest values first
+    :return: JSON table with columns, rows, the number of matching companies (total) and whether rows were left out (truncated)
+    """
+    try:
+        return json.dumps(default_engine().run(where, metric, k, group_by, aggregates, ascending),
+                          separators=(",", ":"), ensure_ascii=False)
+    except ValueError as e:
+        return json.dumps({"error": str(e)})
+
 # Define user functions
-user_functions = {fetch_weather}
+user_functions = {fetch_weather, fetch_weather_batch, query_quarterly_results}
 
 # Initialize the AIProjectClient
 
@@ -41,8 +79,8 @@ project_client = AIProjectClient(
     credential=DefaultAzureCredential(),
 )
 
-# Initialize the FunctionTool with user-defined functions
-functions = FunctionTool(functions=user_functions)
+# Initialize the FunctionTool with user-defined functions (definitions are cached until this file changes)
+functions = CachedFunctionTool(functions=user_functions)
 
 with project_client:
     # Create an agent with custom functions
@@ -62,7 +100,8 @@ with project_client:
     message = project_client.agents.messages.create(
         thread_id=thread.id,
         role="user",
-        content="Hello, send an email with the datetime and weather information in Barcelona?",
+        content="Hello, send an email with the datetime and weather information in Barcelona, Madrid and Frankfurt? "
+                "Also, which cement and construction companies with an operating margin above 20% made the most net profit?",
     )
     print(f"Created message, ID: {message['id']}")
 
@@ -75,6 +114,16 @@ with project_client:
         time.sleep(1)
         run = project_client.agents.runs.get(thread_id=thread.id, run_id=run.id)
 
+        # Execute the requested functions and send their results back to the agent
+        if run.status == "requires_action":
+            tool_outputs = [
+                {"tool_call_id": tool_call.id, "output": functions.execute(tool_call)}
+                for tool_call in run.required_action.submit_tool_outputs.tool_calls
+            ]
+            project_client.agents.runs.submit_tool_outputs(
+                thread_id=thread.id, run_id=run.id, tool_outputs=tool_outputs
+            )
+
     print(f"Run completed with status: {run.status}")
 
     # Fetch and log all messages from the thread
@@ -1,11 +1,11 @@
 # 0. Import necessary libraries and set up environment variables
 # ---------------------------------------------------------------------
 import os
-import jsonref
 from azure.ai.projects import AIProjectClient
 from azure.identity import DefaultAzureCredential
 from azure.ai.agents.models import ListSortOrder, OpenApiTool, OpenApiAnonymousAuthDetails
 from dotenv import load_dotenv
+from helpers.tool_cache import load_openapi_spec
 
 # Load environment variables from a .env file
 load_dotenv()
@@ -29,8 +29,8 @@ with AIProjectClient(
     # 4. Create the OpenAPI Tool loading the specification from a local file
     # ---------------------------------------------------------------------
     # Load the OpenAPI specification for the inventory service from a local JSON file
-    with open(os.path.join(os.path.dirname(__file__), "./openApiDef/InventoryAPI.json"), "r") as f:
-        openapi_inventory = jsonref.loads(f.read())
+    # Resolved specs are cached by content hash (see helpers/tool_cache.py)
+    openapi_inventory = load_openapi_spec(os.path.join(os.path.dirname(__file__), "./openApiDef/InventoryAPI.json"))
 
     # Create Auth object for the OpenApiTool (note: using anonymous auth here; connection or managed identity requires additional setup)
     auth = OpenApiAnonymousAuthDetails()
@@ -1,17 +1,17 @@
 # Import necessary libraries
 
-import os, time
+import os
+from urllib.parse import urlparse
 from azure.ai.projects import AIProjectClient
 from azure.identity import DefaultAzureCredential
 from azure.ai.agents.models import (
     ListSortOrder,
     McpTool,
-    RequiredMcpToolCall,
     RunStepActivityDetails,
-    SubmitToolApprovalAction,
-    ToolApproval,
 )
 from dotenv import load_dotenv
+from helpers.mcp_approval import McpApprovalPolicy, run_with_approvals
+from helpers.mcp_catalog import McpToolCatalog
 
 load_dotenv()
 
@@ -19,7 +19,9 @@ azure_foundry_project_endpoint = os.getenv("AI_FOUNDRY_ENDPOINT")
 azure_foundry_deployment = os.getenv("AI_FOUNDRY_DEPLOYMENT_NAME")
 
 # Get MCP server configuration from environment variables or Fixed values
-mcp_server_url = "https://gitmcp.io/Azure/azure-rest-api-specs"
+# MCP_PROXY_URL can point at a helpers.mcp_proxy in front of this server (reachable from Azure,
+# e.g. through a dev tunnel) so repeated documentation reads are served from its cache
+mcp_server_url = os.getenv("MCP_PROXY_URL", "https://gitmcp.io/Azure/azure-rest-api-specs")
 mcp_server_label = "github"
 
 project_client = AIProjectClient(
@@ -30,9 +32,29 @@ project_client = AIProjectClient(
 mcp_tool = McpTool(
     server_label=mcp_server_label,
     server_url=mcp_server_url,
-    allowed_tools=[],  # Optional: specify allowed tools
+    allowed_tools=[],  # Pinned below from the tool catalog
 )
 
+# Approval policy: the documentation tools only read the Azure REST API specs repository,
+# fetching arbitrary URLs is limited to GitHub hosts and a few calls per minute
+approval_policy = McpApprovalPolicy(default="deny")
+for tool_name in ("fetch_azure_rest_api_specs_documentation",
+                  "search_azure_rest_api_specs_documentation",
+                  "search_azure_rest_api_specs_code"):
+    approval_policy.rule(mcp_server_label, tool_name, "always")
+approval_policy.rule(
+    mcp_server_label, "fetch_generic_url_content", "approve",
+    when=lambda args: urlparse(args.get("url", "")).hostname in ("github.com", "raw.githubusercontent.com"),
+    max_per_minute=5,
+)
+
+# Expose only the tools the approval policy allows instead of the server's whole catalog;
+# the catalog is cached with a hash and changes to it are reported (if it cannot be
+# checked, e.g. behind a proxy, the policy's tools are allowed as configured)
+tool_catalog = McpToolCatalog()
+tool_catalog.pin_or_allow(mcp_tool, approval_policy.tools(mcp_server_label))
+print(f"📌 Pinned MCP tools: {tool_catalog.report()[mcp_server_label]}")
+
 # You can also add or remove allowed tools dynamically
 with project_client:
     agents_client = project_client.agents
@@ -62,43 +84,10 @@ with project_client:
     print(f"Created message, ID: {message.id}")
     # Create and process agent run in thread with MCP tools
     mcp_tool.update_headers("SuperSecret", "123456")
-    # mcp_tool.set_approval_mode("never")  # Uncomment to disable approval requirement
-    run = agents_client.runs.create(thread_id=thread.id, agent_id=agent.id, tool_resources=mcp_tool.resources)
-    print(f"Created run, ID: {run.id}")
-
-    while run.status in ["queued", "in_progress", "requires_action"]:
-        time.sleep(1)
-        run = agents_client.runs.get(thread_id=thread.id, run_id=run.id)
-
-        if run.status == "requires_action" and isinstance(run.required_action, SubmitToolApprovalAction):
-            tool_calls = run.required_action.submit_tool_approval.tool_calls
-            if not tool_calls:
-                print("No tool calls provided - cancelling run")
-                agents_client.runs.cancel(thread_id=thread.id, run_id=run.id)
-                break
-
-            tool_approvals = []
-            for tool_call in tool_calls:
-                if isinstance(tool_call, RequiredMcpToolCall):
-                    try:
-                        print(f"Approving tool call: {tool_call}")
-                        tool_approvals.append(
-                            ToolApproval(
-                                tool_call_id=tool_call.id,
-                                approve=True,
-                                headers=mcp_tool.headers,
-                            )
-                        )
-                    except Exception as e:
-                        print(f"Error approving tool_call {tool_call.id}: {e}")
-
-            print(f"tool_approvals: {tool_approvals}")
-            if tool_approvals:
-                agents_client.runs.submit_tool_outputs(
-                    thread_id=thread.id, run_id=run.id, tool_approvals=tool_approvals
-                )
-
-        print(f"Current run status: {run.status}")
+    # Read-only tools run without approval; the other calls are answered from the run event stream
+    approval_policy.apply(mcp_tool)
+    run = run_with_approvals(agents_client, thread.id, agent.id, approval_policy, tool_resources=mcp_tool.resources)
+    print(f"Approval decisions: {approval_policy.report()}")
 
     print(f"Run completed with status: {run.status}")
     if run.status == "failed":
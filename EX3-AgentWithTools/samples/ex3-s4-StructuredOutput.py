@@ -7,22 +7,23 @@
 # Key concepts covered:
 # - Pydantic BaseModel for data validation and schema generation
 # - ResponseFormatJsonSchema for enforcing output structure
-# - OpenAPI tool integration with structured responses
+# - Tool integration with structured responses (a local search tool returning only the fields the model needs)
 # - Working with complex data structures and arrays
+# - Parsing the streamed response incrementally, one repository at a time
 
 import os
-import jsonref
 from azure.ai.projects import AIProjectClient
 from azure.identity import DefaultAzureCredential
 from azure.ai.agents.models import (
-    ListSortOrder, 
-    OpenApiTool, 
-    OpenApiAnonymousAuthDetails, 
     ResponseFormatJsonSchema, 
     ResponseFormatJsonSchemaType
 )
 from dotenv import load_dotenv
 from pydantic import BaseModel
+from helpers.github_index import GitHubRepoIndex
+from helpers.github_search import GitHubSearchTool
+from helpers.structured_stream import StructuredStream
+from helpers.tool_cache import CachedFunctionTool, cached_model_json_schema
 
 # Load environment variables from a .env file
 load_dotenv()
@@ -69,24 +70,20 @@ with AIProjectClient(
     credential=DefaultAzureCredential()
 ) as project:
 
-    # OpenAPI Tool Setup for GitHub Integration
+    # GitHub Search Tool Setup
     # ---------------------------------------------------------------------
-    # Load the GitHub OpenAPI specification from a local JSON file
-    # This allows our agent to search GitHub repositories using the GitHub API
-    with open(os.path.join(os.path.dirname(__file__), "openApiDef/gitHubOpenApidef.json"), "r") as f:
-        github_openapi_spec = jsonref.loads(f.read())
-
-    # Create authentication object for the OpenAPI tool
-    # Using anonymous auth for GitHub public API (no token required for basic searches)
-    auth = OpenApiAnonymousAuthDetails()
-
-    # Initialize the OpenAPI tool definition for GitHub
-    github_tool = OpenApiTool(
-        name="github_search", 
-        spec=github_openapi_spec, 
-        description="Search and retrieve GitHub repository information", 
-        auth=auth
-    )
+    # The GitHub search API returns ~100 fields per repository; through an OpenApiTool
+    # all of them would be sent to the model. GitHubSearchTool calls the same API from
+    # here and keeps only the GitHubRepo fields, already named as in the model
+    # (see helpers/github_search.py). Set GITHUB_TOKEN for higher rate limits.
+    # Searches go through a local repository index persisted in samples/.cache: a query
+    # repeated within 15 minutes (or a narrower version of it) is answered without
+    # calling GitHub, and older ones are revalidated with a conditional request.
+    github_search = GitHubSearchTool(GitHubRepo, index=GitHubRepoIndex(freshness=900))
+    functions = CachedFunctionTool(functions={github_search.search_repositories})
+
+    # Run the search function automatically whenever the agent calls it
+    project.agents.enable_auto_function_calls(functions)
 
     # Agent Creation with Structured Output Configuration
     # ---------------------------------------------------------------------
@@ -100,7 +97,7 @@ with AIProjectClient(
         You are a GitHub repository specialist that provides structured data about repositories.
 
         When searching for repositories:
-        1. Use the GitHub search API to find MULTIPLE repositories (at least 3-5) related to the user's query
+        1. Use the search_repositories function to find MULTIPLE repositories (at least 3-5) related to the user's query
         2. For each repository found, extract the following information:
            - Repository name (repo_name)
            - Description
@@ -110,15 +107,15 @@ with AIProjectClient(
            - Repository URL
         """,
         
-        # Attach the GitHub search tool to the agent
-        tools=github_tool.definitions,
+        # Attach the GitHub search function to the agent
+        tools=functions.definitions,
         
         # Configure structured output using ResponseFormatJsonSchema
         # This is the key component that enforces the Pydantic model structure
         response_format=ResponseFormatJsonSchemaType(
             json_schema=ResponseFormatJsonSchema(
                 name="GitHubReposResponse",  # Name of the schema
-                schema=GitHubReposResponse.model_json_schema()  # Auto-generated from Pydantic model
+                schema=cached_model_json_schema(GitHubReposResponse)  # Auto-generated from Pydantic model
             )
         )
     )
@@ -135,11 +132,16 @@ with AIProjectClient(
         content="Find repositories related to AI Agent frameworks and services"
     )
 
-    # Run Creation and Processing
+    # Run Creation and Streaming
     # ---------------------------------------------------------------------
-    # This will execute the agent with the structured output requirements
+    # The run is streamed and the JSON is parsed as its deltas arrive: each repository
+    # is validated against GitHubRepo and shown as soon as its object closes, instead of
+    # after the whole response is written (see helpers/structured_stream.py).
     print("🔍 Searching for AI Agent repositories with structured output...")
-    run = project.agents.runs.create_and_process(thread_id=thread.id, agent_id=agent.id)
+    structured = StructuredStream(GitHubReposResponse, "repositories")
+    for repo in structured.run(project.agents, thread.id, agent.id):
+        print(f"📦 {repo.repo_name}: ⭐ {repo.stars} | 🍴 {repo.forks} | 🐛 {repo.issues} | {repo.url}")
+    run = structured.thread_run
 
     # Error Handling
     # ---------------------------------------------------------------------
@@ -148,32 +150,27 @@ with AIProjectClient(
     else:
         print("✅ Search completed successfully!")
 
-    # Retrieving and Displaying Structured Results
+    # Displaying and Validating the Structured Output
     # ---------------------------------------------------------------------
-    messages = project.agents.messages.list(
-        thread_id=thread.id, 
-        order=ListSortOrder.ASCENDING
-    )
-
-    # Process the agent's response
-    for message in messages:
-        if message.run_id == run.id and message.text_messages:
-            response_content = message.text_messages[-1].text.value
-            print(f"\n📊 Structured Output from Agent:")
-            print("=" * 50)
-            print(f"{response_content}")
-            
-            # Optional: Parse the JSON response to validate it matches our Pydantic model
-            try:
-                import json
-                parsed_response = json.loads(response_content)
-                validated_response = GitHubReposResponse(**parsed_response)
-                print(f"\n✅ Response validation successful!")
-                print(f"📈 Found {validated_response.total_found} repositories")
-                print(f"🔍 Query used: {validated_response.query_used}")
-                print(f"📦 First repository: {validated_response.repositories[0].repo_name}")
-            except Exception as e:
-                print(f"⚠️  Response validation failed: {e}")
+    print(f"\n📊 Structured Output from Agent:")
+    print("=" * 50)
+    print(f"{structured.text}")
+
+    # Validate the whole response against our Pydantic model
+    try:
+        validated_response = structured.result()
+        print(f"\n✅ Response validation successful!")
+        print(f"📈 Found {validated_response.total_found} repositories")
+        print(f"🔍 Query used: {validated_response.query_used}")
+        print(f"⏱️  First repository shown after {structured.report()['first_item_ms']} ms")
+    except Exception as e:
+        print(f"⚠️  Response validation failed: {e}")
+
+    search_report = github_search.report()
+    print(f"\n✂️  {search_report['calls']} searches: {search_report['tokens_returned']} tokens sent to the model, "
+          f"{search_report['tokens_saved']} saved by the projection")
+    print(f"🗂️  GitHub index: {github_search.index.report()}")
+    github_search.close()
 
 # Key Takeaways for Structured Output:
 # ====================================
@@ -181,4 +178,5 @@ with AIProjectClient(
 # 2. Use ResponseFormatJsonSchema to enforce the structure at the agent level
 # 3. Provide detailed instructions to guide the agent on how to populate the structure
 # 4. Always validate the response to ensure it matches your expected format
+#    (streamed, each array element can be validated as soon as it is complete)
 # 5. Consider the complexity of your schema - simpler structures are more reliable
\ No newline at end of file
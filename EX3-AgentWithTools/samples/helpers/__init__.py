@@ -0,0 +1,6 @@
+"""
+Shared helper modules for the EX3/EX4 samples and challenge solutions.
+
+Samples in this folder import them directly (``from helpers.timezones import ...``).
+Scripts living elsewhere add ``EX3-AgentWithTools/samples`` to ``sys.path`` first.
+"""
@@ -0,0 +1,343 @@
+"""
+Batched, deduplicated embeddings with an on-disk vector cache.
+
+Every feature that compares texts by meaning (retrieval, semantic caching,
+routing) needs the same embeddings, and embedding a text costs a request
+and tokens. EmbeddingPipeline makes each distinct text cost that once:
+
+- inputs are keyed by the SHA-256 of the model name and the text, so
+  repeated texts in a call are embedded once and texts embedded in an
+  earlier run are not embedded again;
+- the missing texts are packed into the largest batches the deployment
+  accepts (max_batch_inputs inputs and max_batch_tokens tokens per
+  request) and sent with bounded concurrency;
+- vectors are appended to a float32 matrix file per model and read back
+  memory-mapped, with an append-only key index (one SHA-256 per row). A
+  row whose vector or key was not completely written, or whose key file is
+  missing, is dropped from both files on the next load.
+
+The pipeline is a plain function from texts to an (n, dimensions) float32
+array, so it can be passed as embed= to helpers.local_search.LocalSearchClient.
+The cache lives in samples/.cache/embeddings; one process writes it at a time.
+
+Usage:
+    pipeline = EmbeddingPipeline(azure_openai_embedder(), model="text-embedding-3-small")
+    vectors = pipeline(["first text", "second text", "first text"])
+
+Run from EX3-AgentWithTools/samples (set AZURE_OPENAI_EMBEDDING_DEPLOYMENT, or --benchmark to use a
+stand-in embedder with latency):
+    python -m helpers.embeddings --benchmark --latency-ms 200
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from helpers.tokens import count_tokens
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "embeddings")
+
+# Azure OpenAI embedding limits: inputs per request, tokens per input, and a request size that stays under them
+MAX_BATCH_INPUTS = 2048
+MAX_INPUT_TOKENS = 8191
+MAX_BATCH_TOKENS = 300_000
+
+BatchEmbedder = Callable[[List[str]], List[List[float]]]
+
+
+def azure_openai_embedder(deployment: Optional[str] = None, client: Optional[object] = None,
+                          dimensions: Optional[int] = None) -> BatchEmbedder:
+    """
+    Batch embedding function calling an Azure OpenAI embedding deployment.
+
+    :param deployment: Embedding deployment (defaults to AZURE_OPENAI_EMBEDDING_DEPLOYMENT)
+    :param client: AzureOpenAI client (defaults to one built from the AZURE_OPENAI_* variables)
+    :param dimensions: Shortened vector size (text-embedding-3 models only)
+    :return: Function from a batch of texts to their vectors
+    """
+    deployment = deployment or os.getenv("AZURE_OPENAI_EMBEDDING_DEPLOYMENT")
+    if not deployment:
+        raise ValueError("Set AZURE_OPENAI_EMBEDDING_DEPLOYMENT (see .env.example) or pass deployment=")
+    if client is None:
+        from openai import AzureOpenAI
+
+        client = AzureOpenAI(azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
+                             api_key=os.getenv("AZURE_OPENAI_API_KEY"),
+                             api_version=os.getenv("AZURE_OPENAI_API_VERSION"))
+    extra = {"dimensions": dimensions} if dimensions else {}
+
+    def embed(batch: List[str]) -> List[List[float]]:
+        response = client.embeddings.create(model=deployment, input=batch, **extra)
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+
+    return embed
+
+
+class EmbeddingCache:
+    """
+    Append-only float32 matrix of vectors with a key index, memory-mapped for reads.
+
+    :param directory: Cache directory
+    :param model: Model name (one matrix per model)
+    """
+
+    def __init__(self, directory: str, model: str):
+        slug = "".join(char if char.isalnum() or char in "-_." else "_" for char in model)
+        self.matrix_path = os.path.join(directory, f"{slug}.f32")
+        self.keys_path = os.path.join(directory, f"{slug}.keys")
+        self.meta_path = os.path.join(directory, f"{slug}.json")
+        os.makedirs(directory, exist_ok=True)
+        self.dimensions: Optional[int] = None
+        self.rows: Dict[str, int] = {}
+        self.count = 0
+        self._matrix: Optional[np.ndarray] = None
+        self._lock = threading.Lock()
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def lookup(self, keys: Sequence[str]) -> np.ndarray:
+        """Row of every key, -1 when it is not cached."""
+        return np.array([self.rows.get(key, -1) for key in keys], dtype=np.int64)
+
+    def vectors(self, rows: np.ndarray) -> np.ndarray:
+        """Cached vectors of the given rows (a copy, so later appends do not affect it)."""
+        with self._lock:
+            if self._matrix is None or len(self._matrix) < self.count:
+                self._matrix = np.memmap(self.matrix_path, dtype=np.float32, mode="r",
+                                         shape=(self.count, self.dimensions))
+            return np.array(self._matrix[rows])
+
+    def append(self, keys: Sequence[str], vectors: np.ndarray) -> None:
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        with self._lock:
+            if self.dimensions is None:
+                self.dimensions = vectors.shape[1]
+                with open(self.meta_path, "w", encoding="utf-8") as f:
+                    json.dump({"dimensions": self.dimensions}, f)
+            elif vectors.shape[1] != self.dimensions:
+                raise ValueError(f"Vectors have {vectors.shape[1]} dimensions, the cache holds {self.dimensions}")
+            # Vectors first: a key is only written once its row is complete on disk
+            with open(self.matrix_path, "ab") as f:
+                f.write(vectors.tobytes())
+            with open(self.keys_path, "a", encoding="ascii") as f:
+                f.write("".join(f"{key}\n" for key in keys))
+            for row, key in enumerate(keys, start=self.count):
+                self.rows.setdefault(key, row)
+            self.count += len(keys)
+
+    def _load(self) -> None:
+        # Each file may be missing or cut short after a crash; whatever is missing counts as empty
+        try:
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                self.dimensions = json.load(f)["dimensions"]
+        except (OSError, ValueError, KeyError):
+            self.dimensions = None
+        try:
+            with open(self.keys_path, "r", encoding="ascii") as f:
+                # The text after the last newline is a key line cut short
+                keys = f.read().split("\n")[:-1]
+        except (OSError, ValueError):
+            keys = []
+        try:
+            vector_bytes = os.path.getsize(self.matrix_path)
+        except OSError:
+            vector_bytes = 0
+        # Keep the rows complete in both files (a crash can leave a partial vector or key line, or
+        # vectors whose keys were never written), so appends number their rows from the right place
+        row_bytes = 4 * self.dimensions if self.dimensions else 0
+        self.count = min(len(keys), vector_bytes // row_bytes) if row_bytes else 0
+        self.rows = {key: row for row, key in enumerate(keys[:self.count])}
+        if self.count != len(keys) or vector_bytes != self.count * row_bytes:
+            with open(self.matrix_path, "ab") as f:
+                f.truncate(self.count * row_bytes)
+            with open(self.keys_path, "w", encoding="ascii") as f:
+                f.write("".join(f"{key}\n" for key in keys[:self.count]))
+
+
+class EmbeddingPipeline:
+    """
+    Embeds texts through a batch embedding function, once per distinct text and model.
+
+    :param embed_batch: Function from a batch of texts to their vectors (e.g. azure_openai_embedder())
+    :param model: Model or deployment name (part of the cache key)
+    :param cache_dir: Directory of the vector cache (None keeps nothing on disk between runs)
+    :param max_batch_inputs: Texts per request
+    :param max_batch_tokens: Tokens per request
+    :param max_input_tokens: Tokens of one text (longer texts raise ValueError)
+    :param concurrency: Requests in flight
+    :param verbose: Print a line per call that had to embed texts
+    """
+
+    def __init__(self, embed_batch: BatchEmbedder, model: str, cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+                 max_batch_inputs: int = MAX_BATCH_INPUTS, max_batch_tokens: int = MAX_BATCH_TOKENS,
+                 max_input_tokens: int = MAX_INPUT_TOKENS, concurrency: int = 4, verbose: bool = False):
+        self.embed_batch = embed_batch
+        self.model = model
+        self.max_batch_inputs = max_batch_inputs
+        self.max_batch_tokens = max_batch_tokens
+        self.max_input_tokens = max_input_tokens
+        self.concurrency = concurrency
+        self.verbose = verbose
+        self.stats: Counter = Counter()
+        self._memory: Dict[str, np.ndarray] = {}
+        self.cache = EmbeddingCache(cache_dir, model) if cache_dir else None
+
+    def __call__(self, texts: Sequence[str]) -> np.ndarray:
+        return self.embed(texts)
+
+    def key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model}\x00{text}".encode("utf-8")).hexdigest()
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Vectors of the texts, embedding only the ones never embedded before.
+
+        :param texts: Texts (duplicates allowed)
+        :return: float32 array of shape (len(texts), dimensions), in the order given
+        """
+        keys = [self.key(text) for text in texts]
+        self.stats["requested"] += len(keys)
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in missing and key not in self._memory and (self.cache is None or key not in self.cache.rows):
+                missing[key] = text
+        self.stats["unique_missing"] += len(missing)
+        if missing:
+            start = time.perf_counter()
+            batches = self._batches(list(missing.items()))
+            with ThreadPoolExecutor(self.concurrency) as pool:
+                for batch_keys, vectors in pool.map(self._embed_one, batches):
+                    self._store(batch_keys, vectors)
+            if self.verbose:
+                print(f"🧮 Embedded {len(missing)} of {len(texts)} texts in {len(batches)} request(s) "
+                      f"({(time.perf_counter() - start) * 1000:.0f} ms)")
+        return self._gather(keys)
+
+    def report(self) -> Dict[str, int]:
+        """Texts requested, distinct texts that had to be embedded, requests, tokens sent and vectors cached."""
+        return dict(self.stats, cached_vectors=len(self.cache) if self.cache else len(self._memory))
+
+    def _batches(self, items: List[Tuple[str, str]]) -> List[List[Tuple[str, str]]]:
+        """Greedy packing into batches under the input and token limits."""
+        batches: List[List[Tuple[str, str]]] = []
+        batch: List[Tuple[str, str]] = []
+        batch_tokens = 0
+        for key, text in items:
+            tokens = count_tokens(text)
+            self.stats["tokens"] += tokens
+            if tokens > self.max_input_tokens:
+                raise ValueError(f"A text has {tokens} tokens, more than the {self.max_input_tokens} the model accepts; "
+                                 "split it before embedding")
+            if batch and (len(batch) >= self.max_batch_inputs or batch_tokens + tokens > self.max_batch_tokens):
+                batches.append(batch)
+                batch, batch_tokens = [], 0
+            batch.append((key, text))
+            batch_tokens += tokens
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def _embed_one(self, batch: List[Tuple[str, str]]) -> Tuple[List[str], np.ndarray]:
+        vectors = np.asarray(self.embed_batch([text for _, text in batch]), dtype=np.float32)
+        if len(vectors) != len(batch):
+            raise ValueError(f"The embedder returned {len(vectors)} vectors for {len(batch)} texts")
+        return [key for key, _ in batch], vectors
+
+    def _store(self, keys: List[str], vectors: np.ndarray) -> None:
+        self.stats["requests"] += 1
+        self.stats["embedded"] += len(keys)
+        if self.cache is not None:
+            self.cache.append(keys, vectors)
+        else:
+            self._memory.update(zip(keys, vectors))
+
+    def _gather(self, keys: List[str]) -> np.ndarray:
+        if not keys:
+            dimensions = (self.cache.dimensions if self.cache else None) or 0
+            return np.empty((0, dimensions), dtype=np.float32)
+        if self.cache is None:
+            return np.array([self._memory[key] for key in keys], dtype=np.float32)
+        return self.cache.vectors(self.cache.lookup(keys))
+
+
+def run_benchmark(latency_ms: float = 200.0, concurrency: int = 4, max_batch_inputs: int = 64) -> Dict[str, object]:
+    """
+    Embeds the search corpus twice through a stand-in embedder, one request per text vs the pipeline.
+
+    :param latency_ms: Latency of every stand-in request
+    :param concurrency: Requests in flight
+    :param max_batch_inputs: Texts per request
+    :return: Requests and wall time of each pass
+    """
+    import tempfile
+
+    from helpers.local_search import HashingEmbedder
+    from helpers.search_corpus import default_documents
+
+    hashing = HashingEmbedder(1536)
+    requests = Counter()
+
+    def standin(batch: List[str]) -> List[List[float]]:
+        requests["calls"] += 1
+        time.sleep(latency_ms / 1000)
+        return hashing(batch).tolist()
+
+    documents = default_documents()
+    # Agents re-embed the same texts: the corpus, then queries that repeat
+    texts = [f"{document['title']}\n{document['content']}" for document in documents]
+    texts += texts[:100]
+
+    # One request per text, timed on the first 50 texts and scaled to all of them
+    start = time.perf_counter()
+    for text in texts[:50]:
+        standin([text])
+    naive_ms = (time.perf_counter() - start) * 1000 * len(texts) / 50
+
+    result: Dict[str, object] = {"texts": len(texts), "distinct": len(set(texts)),
+                                 "one_request_per_text": {"requests": len(texts), "estimated_wall_ms": round(naive_ms)}}
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for run in ("cold", "warm"):
+            requests.clear()
+            pipeline = EmbeddingPipeline(standin, "standin-1536", cache_dir=cache_dir, concurrency=concurrency,
+                                         max_batch_inputs=max_batch_inputs)
+            start = time.perf_counter()
+            vectors = pipeline(texts)
+            result[run] = {"requests": requests["calls"], "wall_ms": round((time.perf_counter() - start) * 1000, 1),
+                           "matrix": list(vectors.shape)}
+        assert np.allclose(vectors, hashing(texts), atol=1e-6)
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Embed texts through the cached pipeline")
+    parser.add_argument("texts", nargs="*", help="Texts to embed")
+    parser.add_argument("--benchmark", action="store_true", help="Compare against one request per text, offline")
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="Stand-in request latency (benchmark)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Requests in flight")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        outcome = run_benchmark(args.latency_ms, args.concurrency)
+        print(json.dumps(outcome, indent=2))
+        print(f"🧮 {outcome['texts']} texts: {outcome['one_request_per_text']['estimated_wall_ms']} ms one request per text, "
+              f"{outcome['cold']['wall_ms']} ms batched and deduplicated, {outcome['warm']['wall_ms']} ms from the cache")
+    else:
+        from dotenv import load_dotenv
+
+        load_dotenv()
+        deployment_name = os.getenv("AZURE_OPENAI_EMBEDDING_DEPLOYMENT", "")
+        embedding_pipeline = EmbeddingPipeline(azure_openai_embedder(deployment_name), model=deployment_name,
+                                               concurrency=args.concurrency, verbose=True)
+        matrix = embedding_pipeline(args.texts)
+        print(f"📐 {matrix.shape[0]} vectors of {matrix.shape[1] if matrix.ndim == 2 else 0} dimensions; "
+              f"{embedding_pipeline.report()}")
@@ -0,0 +1,183 @@
+"""
+Concurrent evaluation of an agent over a list of questions.
+
+Asking every question on one shared thread serializes the suite and makes
+each answer pay for the context of all previous ones. EvalRunner gives every
+question its own thread and runs up to max_concurrency of them at once,
+with the model requests paced by a shared RateGovernor. For each question it
+records the latency of its run(s), the time spent waiting for the governor
+or a rate-limit pause, the token usage and the tool calls made, and the
+whole result can be written as a JSON report. A question whose requests
+raise is recorded with status "error" and does not stop the suite.
+
+Usage:
+    runner = EvalRunner(project.agents, agent.id, max_concurrency=4, governor=RateGovernor(30, burst=4))
+    report = runner.run(questions)
+    runner.write_report(report, "eval_reports/inventory.json")
+"""
+
+import json
+import os
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence
+
+from azure.ai.agents.models import ListSortOrder
+
+from helpers.rate_governor import RateGovernor
+
+# Seconds to hold every worker when a run fails with rate_limit_exceeded, before retrying it
+RATE_LIMIT_PAUSE = 20.0
+
+
+class EvalRunner:
+    """
+    Runs each question on its own thread with bounded concurrency.
+
+    :param agents_client: The agents client (project_client.agents); tool calls are executed
+                          automatically, so enable_auto_function_calls must have been called if needed
+    :param agent_id: Agent to evaluate
+    :param max_concurrency: Questions in flight at the same time
+    :param governor: Optional limiter acquired before each run is started
+    :param max_retries: Retries of a question whose run was rate limited
+    :param delete_threads: Delete every question's thread once its result is captured
+    """
+
+    def __init__(self, agents_client: Any, agent_id: str, max_concurrency: int = 4,
+                 governor: Optional[RateGovernor] = None, max_retries: int = 2, delete_threads: bool = True):
+        self.agents_client = agents_client
+        self.agent_id = agent_id
+        self.max_concurrency = max_concurrency
+        self.governor = governor
+        self.max_retries = max_retries
+        self.delete_threads = delete_threads
+
+    def run(self, questions: Sequence[str], verbose: bool = True) -> Dict[str, Any]:
+        """
+        Evaluates all questions.
+
+        :param questions: The question suite
+        :param verbose: Print a line per question as it completes
+        :return: Report with one result per question (in suite order) and the suite totals
+        """
+        started_at = datetime.now(timezone.utc)
+        start = time.perf_counter()
+        results: List[Dict[str, Any]] = []
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            futures = [executor.submit(self._ask, index, question) for index, question in enumerate(questions, 1)]
+            for future in futures:
+                result = future.result()
+                results.append(result)
+                if verbose:
+                    print(f"🧪 Q{result['index']:>2} {result['status']:<9} {result['latency_s']:>6.1f}s "
+                          f"(+{result['wait_s']:.1f}s wait) "
+                          f"{result['total_tokens']:>6} tokens {sum(result['tool_calls'].values()):>2} tool calls  "
+                          f"{result['question'][:60]}")
+        wall = time.perf_counter() - start
+
+        completed = [result for result in results if result["status"] == "completed"]
+        return {
+            "agent_id": self.agent_id,
+            "started_at": started_at.isoformat(timespec="seconds"),
+            "max_concurrency": self.max_concurrency,
+            "summary": {
+                "questions": len(results),
+                "completed": len(completed),
+                "wall_time_s": round(wall, 2),
+                "sum_of_latencies_s": round(sum(result["latency_s"] for result in results), 2),
+                "slowest_question_s": max((result["latency_s"] for result in results), default=0.0),
+                "sum_of_waits_s": round(sum(result["wait_s"] for result in results), 2),
+                "errors": sum(1 for result in results if result["status"] == "error"),
+                "prompt_tokens": sum(result["prompt_tokens"] for result in results),
+                "completion_tokens": sum(result["completion_tokens"] for result in results),
+                "tool_calls": dict(sum((Counter(result["tool_calls"]) for result in results), Counter())),
+            },
+            "results": results,
+        }
+
+    @staticmethod
+    def write_report(report: Dict[str, Any], path: str) -> str:
+        """Writes the report as JSON (creating the folder) and returns its path."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        return path
+
+    def _ask(self, index: int, question: str) -> Dict[str, Any]:
+        result: Dict[str, Any] = {
+            "index": index,
+            "question": question,
+            "status": "error",
+            "error": None,
+            "latency_s": 0.0,
+            "wait_s": 0.0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "total_tokens": 0,
+            "tool_calls": {},
+            "answer": None,
+            "thread_id": None,
+            "run_id": None,
+        }
+        latency = wait = 0.0
+        try:
+            thread = self.agents_client.threads.create()
+            result["thread_id"] = thread.id
+            self.agents_client.messages.create(thread_id=thread.id, role="user", content=question)
+
+            for attempt in range(self.max_retries + 1):
+                if self.governor:
+                    waited = time.perf_counter()
+                    self.governor.acquire()
+                    wait += time.perf_counter() - waited
+                started = time.perf_counter()
+                run = self.agents_client.runs.create_and_process(thread_id=thread.id, agent_id=self.agent_id)
+                latency += time.perf_counter() - started
+                error_code = (run.last_error or {}).get("code") if run.status == "failed" else None
+                if error_code != "rate_limit_exceeded" or attempt == self.max_retries:
+                    break
+                waited = time.perf_counter()
+                if self.governor:
+                    self.governor.pause(RATE_LIMIT_PAUSE)
+                else:
+                    time.sleep(RATE_LIMIT_PAUSE)
+                wait += time.perf_counter() - waited
+
+            result.update({
+                "status": run.status,
+                "error": str(run.last_error) if run.last_error else None,
+                "prompt_tokens": run.usage.prompt_tokens if run.usage else 0,
+                "completion_tokens": run.usage.completion_tokens if run.usage else 0,
+                "total_tokens": run.usage.total_tokens if run.usage else 0,
+                "run_id": run.id,
+            })
+            result["tool_calls"] = self._tool_calls(thread.id, run.id)
+            result["answer"] = self._answer(thread.id, run.id)
+        except Exception as e:  # Recorded with this question; the rest of the suite carries on
+            result["status"], result["error"] = "error", f"{type(e).__name__}: {e}"
+        result["latency_s"], result["wait_s"] = round(latency, 2), round(wait, 2)
+
+        if self.delete_threads and result["thread_id"]:
+            try:
+                self.agents_client.threads.delete(result["thread_id"])
+            except Exception as e:
+                result["error"] = result["error"] or f"thread not deleted: {e}"
+        return result
+
+    def _tool_calls(self, thread_id: str, run_id: str) -> Dict[str, int]:
+        counts: Counter = Counter()
+        for step in self.agents_client.run_steps.list(thread_id=thread_id, run_id=run_id):
+            if step.step_details.type != "tool_calls":
+                continue
+            for call in step.step_details.tool_calls:
+                details = call.get(call.type) or {}
+                counts[details.get("name") or call.type] += 1
+        return dict(counts)
+
+    def _answer(self, thread_id: str, run_id: str) -> Optional[str]:
+        for message in self.agents_client.messages.list(thread_id=thread_id, order=ListSortOrder.DESCENDING):
+            if message.run_id == run_id and message.text_messages:
+                return message.text_messages[-1].text.value
+        return None
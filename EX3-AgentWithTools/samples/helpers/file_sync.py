@@ -0,0 +1,253 @@
+"""
+Content-addressed file uploads and incremental vector-store sync.
+
+An agent that attaches the NIFTY CSV or the OpenAPI specs as files uploads
+them again on every run, and a file_search vector store is re-indexed from
+scratch each time. FileSync keeps a local ledger instead:
+
+- files are keyed by the SHA-256 of their content (and the project endpoint
+  and purpose), so a file whose content was uploaded before is never
+  uploaded again: its file_id comes from the ledger. Hashes are remembered
+  per (size, mtime), so unchanged files are not even read;
+- uploads of new content run in parallel;
+- a vector store is remembered by name with the file_id of every path in
+  it. A sync attaches only the files whose hash changed or that are new (in
+  batches of up to MAX_BATCH_FILES), detaches the replaced and removed ones,
+  and leaves the unchanged ones indexed. When nothing changed, a startup
+  costs one GET to check that the store still exists.
+
+Entries whose remote object is gone (deleted, or an expired vector store)
+are dropped and rebuilt. The ledger lives in samples/.cache/file_sync.
+
+Usage:
+    sync = FileSync(agents_client)
+    vector_store_id = sync.vector_store("nifty-and-specs", ["files/nifty_500_quarterly_results new.csv",
+                                                            "openApiDef/InventoryAPI.json"])
+    file_search = FileSearchTool(vector_store_ids=[vector_store_id])
+
+Run from EX3-AgentWithTools/samples:
+    python -m helpers.file_sync --vector-store nifty-and-specs files/*.csv openApiDef/*.json
+    python -m helpers.standin.file_sync_benchmark --files 20 --upload-ms 300
+"""
+
+import argparse
+import datetime
+import json
+import os
+import tempfile
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence
+
+from azure.ai.agents.models import FilePurpose, VectorStoreFileBatchStatus, VectorStoreStatus
+from azure.core.exceptions import ResourceNotFoundError
+
+from helpers.tool_cache import file_sha256
+
+DEFAULT_LEDGER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "file_sync",
+                              "ledger.json")
+# Files attached to a vector store per batch request
+MAX_BATCH_FILES = 500
+
+
+def _now() -> str:
+    return datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds")
+
+
+class FileSync:
+    """
+    Uploads files once per content hash and keeps named vector stores in sync with local files.
+
+    :param agents_client: AgentsClient (project_client.agents)
+    :param endpoint: Project endpoint the file ids belong to (defaults to AI_FOUNDRY_ENDPOINT)
+    :param ledger_path: JSON ledger of uploaded files and vector stores
+    :param max_workers: Parallel uploads
+    :param verbose: Print what is uploaded, reused and re-indexed
+    """
+
+    def __init__(self, agents_client: Any, endpoint: Optional[str] = None, ledger_path: str = DEFAULT_LEDGER,
+                 max_workers: int = 4, verbose: bool = True):
+        self.client = agents_client
+        self.endpoint = endpoint or os.getenv("AI_FOUNDRY_ENDPOINT", "")
+        self.ledger_path = ledger_path
+        self.max_workers = max_workers
+        self.verbose = verbose
+        self.stats: Counter = Counter()
+        self._lock = threading.Lock()
+        self._ledger = self._load()
+
+    def digest(self, path: str) -> str:
+        """SHA-256 of a file, re-read only when its size or modification time changed."""
+        path = os.path.abspath(path)
+        hashes = self._ledger["hashes"]
+        known = hashes.get(path)
+        digest = file_sha256(path, hashes)
+        if hashes[path] is not known:
+            with self._lock:
+                self.stats["hashed"] += 1
+        return digest
+
+    def upload(self, paths: Sequence[str], purpose: FilePurpose = FilePurpose.AGENTS,
+               verify: bool = False) -> Dict[str, str]:
+        """
+        Uploads the files whose content was not uploaded before, in parallel.
+
+        :param paths: Local files
+        :param purpose: Upload purpose
+        :param verify: Check that every reused file still exists remotely (one GET each)
+        :return: Path -> file_id, in the order given
+        """
+        paths = [os.path.abspath(path) for path in paths]
+        with ThreadPoolExecutor(self.max_workers) as pool:
+            file_ids = list(pool.map(lambda path: self._upload_one(path, purpose, verify), paths))
+        self._save()
+        return dict(zip(paths, file_ids))
+
+    def vector_store(self, name: str, paths: Sequence[str], **create_kwargs: Any) -> str:
+        """
+        Returns the id of a vector store holding exactly these files, re-indexing only what changed.
+
+        :param name: Vector store name (the ledger key, with the endpoint)
+        :param paths: Local files the store must hold
+        :param create_kwargs: Extra arguments of vector_stores.create_and_poll (e.g. expires_after, chunking_strategy)
+        :return: Vector store id
+        """
+        wanted = self.upload(paths)
+        key = f"{self.endpoint}|{name}"
+        try:
+            entry = self._sync_store(name, key, wanted, create_kwargs)
+        except ResourceNotFoundError:
+            # A file of the ledger was deleted remotely: check every file and upload the missing ones again
+            self._log(f"♻️  A file of vector store '{name}' is gone; checking the uploaded files")
+            wanted = self.upload(paths, verify=True)
+            entry = self._sync_store(name, key, wanted, create_kwargs)
+        entry.update(files=wanted, synced_at=_now())
+        self._ledger["vector_stores"][key] = entry
+        self._save()
+        return entry["id"]
+
+    def report(self) -> Dict[str, int]:
+        """Files hashed, uploaded and reused; files indexed, detached and left unchanged in vector stores."""
+        return dict(self.stats)
+
+    def _upload_one(self, path: str, purpose: FilePurpose, verify: bool) -> str:
+        key = f"{self.endpoint}|{getattr(purpose, 'value', purpose)}|{self.digest(path)}"
+        known = self._ledger["files"].get(key)
+        if known is not None:
+            if not verify or self._file_alive(known["file_id"]):
+                with self._lock:
+                    self.stats["reused"] += 1
+                return known["file_id"]
+            self._log(f"♻️  {os.path.basename(path)} ({known['file_id']}) is gone; uploading it again")
+
+        uploaded = self.client.files.upload_and_poll(file_path=path, purpose=purpose)
+        with self._lock:
+            self._ledger["files"][key] = {"file_id": uploaded.id, "filename": os.path.basename(path),
+                                          "bytes": os.path.getsize(path), "uploaded_at": _now()}
+            self.stats["uploaded"] += 1
+        self._log(f"⬆️  Uploaded {os.path.basename(path)} ({uploaded.id})")
+        return uploaded.id
+
+    def _sync_store(self, name: str, key: str, wanted: Dict[str, str],
+                    create_kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        entry = self._ledger["vector_stores"].get(key)
+        if entry is not None and not self._store_alive(entry["id"]):
+            self._log(f"♻️  Vector store '{name}' ({entry['id']}) is gone; rebuilding it")
+            entry = None
+
+        if entry is None:
+            file_ids = list(dict.fromkeys(wanted.values()))
+            store = self.client.vector_stores.create_and_poll(file_ids=file_ids[:MAX_BATCH_FILES], name=name,
+                                                              **create_kwargs)
+            self._attach(store.id, file_ids[MAX_BATCH_FILES:])
+            self.stats["indexed"] += len(file_ids)
+            self._log(f"🗂️  Created vector store '{name}' ({store.id}) with {len(file_ids)} file(s)")
+            entry = {"id": store.id}
+        else:
+            indexed = entry["files"]
+            added = [file_id for path, file_id in wanted.items() if indexed.get(path) != file_id]
+            kept = set(wanted.values())
+            removed = [file_id for path, file_id in indexed.items()
+                       if (path not in wanted or wanted[path] != file_id) and file_id not in kept]
+            self._attach(entry["id"], list(dict.fromkeys(added)))
+            for file_id in dict.fromkeys(removed):
+                try:
+                    self.client.vector_store_files.delete(vector_store_id=entry["id"], file_id=file_id)
+                except ResourceNotFoundError:
+                    pass
+            self.stats["indexed"] += len(set(added))
+            self.stats["detached"] += len(set(removed))
+            self.stats["unchanged"] += len(wanted) - len(added)
+            self._log(f"🗂️  Vector store '{name}' ({entry['id']}): {len(set(added))} file(s) indexed, "
+                      f"{len(set(removed))} detached, {len(wanted) - len(added)} unchanged")
+        return entry
+
+    def _attach(self, vector_store_id: str, file_ids: List[str]) -> None:
+        for start in range(0, len(file_ids), MAX_BATCH_FILES):
+            batch = self.client.vector_store_file_batches.create_and_poll(
+                vector_store_id=vector_store_id, file_ids=file_ids[start:start + MAX_BATCH_FILES])
+            if batch.status != VectorStoreFileBatchStatus.COMPLETED:
+                raise RuntimeError(f"Indexing into vector store {vector_store_id} ended with status {batch.status}")
+
+    def _store_alive(self, vector_store_id: str) -> bool:
+        try:
+            return self.client.vector_stores.get(vector_store_id).status != VectorStoreStatus.EXPIRED
+        except ResourceNotFoundError:
+            return False
+
+    def _file_alive(self, file_id: str) -> bool:
+        try:
+            self.client.files.get(file_id)
+            return True
+        except ResourceNotFoundError:
+            return False
+
+    def _load(self) -> Dict[str, Any]:
+        ledger: Dict[str, Any] = {}
+        try:
+            with open(self.ledger_path, "r", encoding="utf-8") as f:
+                ledger = json.load(f)
+        except (OSError, ValueError):
+            pass
+        for section in ("hashes", "files", "vector_stores"):
+            ledger.setdefault(section, {})
+        return ledger
+
+    def _save(self) -> None:
+        directory = os.path.dirname(self.ledger_path)
+        os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            # Write to a temporary file first so concurrent runs never read a half-written ledger
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self._ledger, f, indent=1)
+            os.replace(tmp_path, self.ledger_path)
+
+    def _log(self, message: str) -> None:
+        if self.verbose:
+            print(message)
+
+
+if __name__ == "__main__":
+    from azure.ai.projects import AIProjectClient
+    from azure.identity import DefaultAzureCredential
+    from dotenv import load_dotenv
+
+    parser = argparse.ArgumentParser(description="Upload files once per content hash and sync a vector store")
+    parser.add_argument("paths", nargs="+", help="Local files")
+    parser.add_argument("--vector-store", help="Vector store holding exactly these files")
+    parser.add_argument("--verify", action="store_true", help="Check that reused files still exist remotely")
+    parser.add_argument("--workers", type=int, default=4, help="Parallel uploads")
+    args = parser.parse_args()
+
+    load_dotenv()
+    project_client = AIProjectClient(endpoint=os.getenv("AI_FOUNDRY_ENDPOINT"), credential=DefaultAzureCredential())
+    with project_client:
+        sync = FileSync(project_client.agents, max_workers=args.workers)
+        if args.vector_store:
+            print(f"🗂️  {args.vector_store}: {sync.vector_store(args.vector_store, args.paths)}")
+        else:
+            for path, file_id in sync.upload(args.paths, verify=args.verify).items():
+                print(f"📄 {path}: {file_id}")
+        print(f"📊 {sync.report()}")
@@ -0,0 +1,346 @@
+"""
+Local index of GitHub repositories with a query cache in front of the search API.
+
+Anonymous GitHub search allows about 10 requests per minute, and the samples
+ask the same "AI agent" questions over and over. GitHubRepoIndex stores every
+repository a search returns (the fields the samples use) together with an
+inverted index over name, description, topics and language, and remembers
+each query's result for a freshness window:
+
+- a repeated query (same terms and qualifiers in any order, same or smaller
+  per_page) is answered from the query cache;
+- a narrower query (more terms or more qualifiers) is answered locally when a
+  fresh query it refines returned its complete result set, by filtering that
+  set through the inverted index (GitHub also matches README text, so this is
+  a close approximation, not an exact replay);
+- everything else goes to the API, with If-None-Match when the query was seen
+  before; a 304 refreshes the entry without using the rate limit.
+
+While GitHub reports the rate limit as exhausted, stale entries (or, failing
+that, the whole local index) are served instead of an error.
+
+Usage:
+    index = GitHubRepoIndex()
+    result = index.search("ai agent language:python", sort="stars")
+"""
+
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+import httpx
+
+from helpers.rate_governor import RateGovernor
+from helpers.tokens import count_json_tokens
+
+GITHUB_API_URL = "https://api.github.com"
+
+DEFAULT_INDEX_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                  ".cache", "github_index.json")
+
+# Repository fields kept in the index (everything the samples' repository models read)
+STORED_FIELDS = ("name", "full_name", "description", "topics", "language", "stargazers_count", "forks_count",
+                 "open_issues_count", "watchers_count", "size", "html_url", "archived", "created_at",
+                 "updated_at", "pushed_at")
+
+# Sort orders that can be applied locally to a complete result set
+_SORT_KEYS: Dict[str, Callable[[Mapping[str, Any]], Any]] = {
+    "stars": lambda repo: repo.get("stargazers_count") or 0,
+    "forks": lambda repo: repo.get("forks_count") or 0,
+    "updated": lambda repo: repo.get("updated_at") or "",
+}
+
+_RANGE = re.compile(r"^(>=|<=|>|<)?(\d+)(?:\.\.(\d+|\*))?$")
+
+
+def github_headers(token: Optional[str] = None) -> Dict[str, str]:
+    """Headers for the GitHub REST API, authenticated when a token is given (or GITHUB_TOKEN is set)."""
+    headers = {"Accept": "application/vnd.github+json", "X-GitHub-Api-Version": "2022-11-28"}
+    token = token or os.getenv("GITHUB_TOKEN")
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    return headers
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased alphanumeric words ("ai-agents_SDK" -> ["ai", "agents", "sdk"])."""
+    return re.findall(r"[a-z0-9]+", text.lower())
+
+
+def parse_query(q: str) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """
+    Splits a search query into its free-text terms and its qualifiers.
+
+    :param q: GitHub search query (e.g. 'AI agent language:Python stars:>100')
+    :return: (sorted unique terms, sorted unique "key:value" qualifiers, lower-cased)
+    """
+    terms: Set[str] = set()
+    qualifiers: Set[str] = set()
+    for word in q.split():
+        key, sep, value = word.partition(":")
+        if sep and key and value:
+            qualifiers.add(f"{key.lower()}:{value.lower()}")
+        else:
+            terms.update(tokenize(word))
+    return tuple(sorted(terms)), tuple(sorted(qualifiers))
+
+
+def _in_range(value: Any, expression: str) -> Optional[bool]:
+    match = _RANGE.match(expression)
+    if match is None:
+        return None
+    operator, low, high = match.group(1), int(match.group(2)), match.group(3)
+    value = value or 0
+    if high is not None:
+        return low <= value and (high == "*" or value <= int(high))
+    return {">": value > low, ">=": value >= low, "<": value < low, "<=": value <= low, None: value == low}[operator]
+
+
+def _qualifier_matches(repo: Mapping[str, Any], qualifier: str) -> Optional[bool]:
+    """Whether a repository satisfies a qualifier; None when the qualifier cannot be evaluated locally."""
+    key, _, value = qualifier.partition(":")
+    if key == "language":
+        return (repo.get("language") or "").lower() == value
+    if key == "topic":
+        return value in (topic.lower() for topic in repo.get("topics") or [])
+    if key == "archived":
+        return str(bool(repo.get("archived"))).lower() == value
+    if key in ("stars", "forks"):
+        return _in_range(repo.get("stargazers_count" if key == "stars" else "forks_count"), value)
+    return None
+
+
+def _evaluable(qualifier: str) -> bool:
+    return _qualifier_matches({}, qualifier) is not None
+
+
+class GitHubRepoIndex:
+    """
+    Repository store, inverted index and query cache in front of GitHub's /search/repositories.
+
+    :param path: JSON file the index is persisted to (None keeps it in memory only)
+    :param freshness: Seconds a query result is served without asking GitHub again
+    :param token: GitHub token (defaults to GITHUB_TOKEN)
+    :param governor: Pacing of the API requests (defaults to GitHub's search limit: 10/min anonymous, 30/min with a token)
+    :param base_url: GitHub API root
+    :param timeout: Request timeout in seconds
+    """
+
+    def __init__(self, path: Optional[str] = DEFAULT_INDEX_PATH, freshness: float = 900.0,
+                 token: Optional[str] = None, governor: Optional[RateGovernor] = None,
+                 base_url: str = GITHUB_API_URL, timeout: float = 30.0):
+        self.path = path
+        self.freshness = freshness
+        headers = github_headers(token)
+        self.governor = governor or RateGovernor(30 if "Authorization" in headers else 10, burst=3)
+        self._client = httpx.Client(base_url=base_url, headers=headers, timeout=timeout)
+        self._lock = threading.Lock()
+        self.repos: Dict[str, Dict[str, Any]] = {}
+        self.queries: Dict[str, Dict[str, Any]] = {}
+        self._postings: Dict[str, Set[str]] = {}
+        self._rate_limited_until = 0.0
+        self.stats = {"queries": 0, "cache_hits": 0, "subsumed": 0, "revalidated": 0, "api_calls": 0, "stale": 0}
+        if path and os.path.exists(path):
+            self._load(path)
+
+    def search(self, q: str, sort: str = "", order: str = "desc", per_page: int = 10) -> Dict[str, Any]:
+        """
+        Searches repositories, locally when possible.
+
+        :param q: GitHub search query
+        :param sort: stars, forks or updated; empty for best match
+        :param order: asc or desc
+        :param per_page: Number of results (1-100)
+        :return: {"total_count", "items" (stored repositories), "source" (cache, subsumed, revalidated,
+                 api or stale), "raw_tokens" (size of GitHub's response for these items)}
+        :raises httpx.HTTPError: If the request fails and no stored answer exists
+        """
+        per_page = max(1, min(per_page, 100))
+        terms, qualifiers = parse_query(q)
+        key = self._query_key(terms, qualifiers, sort, order)
+        now = time.time()
+        with self._lock:
+            self.stats["queries"] += 1
+            entry = self.queries.get(key)
+            if entry and now - entry["fetched_at"] < self.freshness and self._covers(entry, per_page):
+                self.stats["cache_hits"] += 1
+                return self._answer(entry, entry["ids"], per_page, "cache")
+            local = self._refine(terms, qualifiers, sort, order, per_page, now)
+            if local is not None:
+                self.stats["subsumed"] += 1
+                return local
+            if now < self._rate_limited_until and (entry or self.repos):
+                return self._stale(entry, terms, qualifiers, sort, order, per_page)
+
+        try:
+            response = self._request(q, sort, order, per_page, entry)
+        except httpx.HTTPError:
+            with self._lock:
+                if entry or self.repos:
+                    return self._stale(entry, terms, qualifiers, sort, order, per_page)
+            raise
+
+        with self._lock:
+            if response.status_code == 304 and entry:
+                self.stats["revalidated"] += 1
+                entry["fetched_at"] = time.time()
+                self._save()
+                return self._answer(entry, entry["ids"], per_page, "revalidated")
+            if response.status_code in (403, 429) and (entry or self.repos):
+                return self._stale(entry, terms, qualifiers, sort, order, per_page)
+            response.raise_for_status()
+
+            self.stats["api_calls"] += 1
+            payload = response.json()
+            ids = [self._store(item) for item in payload.get("items", [])]
+            entry = {
+                "query": q,
+                "terms": list(terms),
+                "qualifiers": list(qualifiers),
+                "sort": sort,
+                "order": order,
+                "per_page": per_page,
+                "ids": ids,
+                "total_count": payload.get("total_count", len(ids)),
+                "etag": response.headers.get("ETag"),
+                "fetched_at": time.time(),
+                "raw_tokens": count_json_tokens(payload),
+            }
+            self.queries[key] = entry
+            self._save()
+            return self._answer(entry, ids, per_page, "api")
+
+    def report(self) -> Dict[str, int]:
+        """Counters of how the queries were answered, plus the number of repositories and queries stored."""
+        with self._lock:
+            return dict(self.stats, repositories=len(self.repos), stored_queries=len(self.queries))
+
+    def close(self) -> None:
+        self._client.close()
+
+    @staticmethod
+    def _query_key(terms: Iterable[str], qualifiers: Iterable[str], sort: str, order: str) -> str:
+        return json.dumps([list(terms), list(qualifiers), sort, order if sort else "desc"])
+
+    @staticmethod
+    def _covers(entry: Mapping[str, Any], per_page: int) -> bool:
+        return per_page <= entry["per_page"] or len(entry["ids"]) >= entry["total_count"]
+
+    @staticmethod
+    def _complete(entry: Mapping[str, Any]) -> bool:
+        return len(entry["ids"]) >= entry["total_count"]
+
+    def _answer(self, entry: Mapping[str, Any], ids: List[str], per_page: int, source: str,
+                total_count: Optional[int] = None) -> Dict[str, Any]:
+        items = [self.repos[repo_id] for repo_id in ids[:per_page]]
+        raw_per_item = entry["raw_tokens"] / max(len(entry["ids"]), 1)
+        return {
+            "total_count": entry["total_count"] if total_count is None else total_count,
+            "items": items,
+            "source": source,
+            "raw_tokens": round(raw_per_item * len(items)),
+        }
+
+    def _matches(self, repo_id: str, terms: Iterable[str], qualifiers: Iterable[str]) -> bool:
+        repo = self.repos[repo_id]
+        return (all(repo_id in self._postings.get(term, ()) for term in terms)
+                and all(_qualifier_matches(repo, qualifier) for qualifier in qualifiers))
+
+    def _ordered(self, ids: List[str], sort: str, order: str) -> List[str]:
+        if sort not in _SORT_KEYS:
+            return ids
+        return sorted(ids, key=lambda repo_id: _SORT_KEYS[sort](self.repos[repo_id]), reverse=order != "asc")
+
+    def _refine(self, terms: Tuple[str, ...], qualifiers: Tuple[str, ...], sort: str, order: str,
+                per_page: int, now: float) -> Optional[Dict[str, Any]]:
+        """Answers from a fresh, complete result of a broader query, or returns None."""
+        for entry in self.queries.values():
+            if now - entry["fetched_at"] >= self.freshness or not self._complete(entry):
+                continue
+            extra = set(qualifiers) - set(entry["qualifiers"])
+            if not (set(entry["terms"]) <= set(terms) and set(entry["qualifiers"]) <= set(qualifiers)):
+                continue
+            if not all(_evaluable(qualifier) for qualifier in extra):
+                continue
+            if sort and sort != entry["sort"] and sort not in _SORT_KEYS:
+                continue
+            ids = [repo_id for repo_id in entry["ids"] if self._matches(repo_id, terms, extra)]
+            if sort != entry["sort"] or order != entry["order"]:
+                ids = self._ordered(ids, sort, order)
+            return self._answer(entry, ids, per_page, "subsumed", total_count=len(ids))
+        return None
+
+    def _stale(self, entry: Optional[Mapping[str, Any]], terms: Tuple[str, ...], qualifiers: Tuple[str, ...],
+               sort: str, order: str, per_page: int) -> Dict[str, Any]:
+        """Best stored answer while GitHub cannot be asked: the expired entry, or a search of the whole index."""
+        self.stats["stale"] += 1
+        if entry:
+            return self._answer(entry, entry["ids"], per_page, "stale")
+        candidates = set.intersection(*(self._postings.get(term, set()) for term in terms)) if terms else set(self.repos)
+        ids = [repo_id for repo_id in candidates
+               if all(_qualifier_matches(self.repos[repo_id], qualifier) is not False for qualifier in qualifiers)]
+        ids = self._ordered(sorted(ids), sort or "stars", order)
+        return {"total_count": len(ids), "items": [self.repos[repo_id] for repo_id in ids[:per_page]],
+                "source": "stale", "raw_tokens": 0}
+
+    def _request(self, q: str, sort: str, order: str, per_page: int,
+                 entry: Optional[Mapping[str, Any]]) -> httpx.Response:
+        params: Dict[str, Any] = {"q": q, "order": order, "per_page": per_page}
+        if sort:
+            params["sort"] = sort
+        headers = {}
+        if entry and entry.get("etag") and self._covers(entry, per_page):
+            headers["If-None-Match"] = entry["etag"]
+        self.governor.acquire()
+        response = self._client.get("/search/repositories", params=params, headers=headers)
+        if response.headers.get("X-RateLimit-Remaining") == "0":
+            with self._lock:
+                self._rate_limited_until = float(response.headers.get("X-RateLimit-Reset") or time.time() + 60)
+        return response
+
+    def _store(self, item: Mapping[str, Any]) -> str:
+        repo_id = item.get("full_name") or item["name"]
+        repo = {field: item.get(field) for field in STORED_FIELDS}
+        if repo_id in self.repos:
+            self._unindex(repo_id)
+        self.repos[repo_id] = repo
+        for token in self._tokens(repo):
+            self._postings.setdefault(token, set()).add(repo_id)
+        return repo_id
+
+    def _unindex(self, repo_id: str) -> None:
+        for token in self._tokens(self.repos[repo_id]):
+            self._postings.get(token, set()).discard(repo_id)
+
+    @staticmethod
+    def _tokens(repo: Mapping[str, Any]) -> Set[str]:
+        text = " ".join([repo.get("name") or "", repo.get("description") or "", repo.get("language") or "",
+                         " ".join(repo.get("topics") or [])])
+        return set(tokenize(text))
+
+    def _load(self, path: str) -> None:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.queries = data.get("queries", {})
+        for repo_id, repo in data.get("repos", {}).items():
+            self.repos[repo_id] = repo
+            for token in self._tokens(repo):
+                self._postings.setdefault(token, set()).add(repo_id)
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        # Write to a temporary file first so a concurrent run never reads a half-written index
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"repos": self.repos, "queries": self.queries}, f, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,143 @@
+"""
+GitHub repository search as a local function tool with projected results.
+
+GitHub's /search/repositories returns ~100 fields per repository (owner
+object, dozens of *_url templates, license, permissions, ...), and through
+the OpenApiTool all of it becomes prompt tokens. GitHubSearchTool calls the
+same endpoint from the client and keeps, for each repository, only the
+fields of the Pydantic model the agent must fill. Fields are renamed to the
+model's names (stars <- stargazers_count, url <- html_url, ...) and nulls
+are replaced by the model type's empty value, so the model can copy values
+straight into the structured output.
+
+Searches go through a GitHubRepoIndex (helpers/github_index.py); pass a
+persistent one to answer repeated queries locally within its freshness window.
+
+Usage:
+    github_search = GitHubSearchTool(GitHubRepo, index=GitHubRepoIndex())
+    functions = CachedFunctionTool(functions={github_search.search_repositories})
+"""
+
+import json
+import typing
+from typing import Any, Dict, List, Mapping, Optional, Type
+
+import httpx
+from pydantic import BaseModel
+
+from helpers.github_index import GITHUB_API_URL, GitHubRepoIndex
+from helpers.tokens import count_tokens
+
+# Model field names used in the samples -> GitHub API field
+FIELD_ALIASES = {
+    "repo_name": "name",
+    "stars": "stargazers_count",
+    "forks": "forks_count",
+    "issues": "open_issues_count",
+    "open_issues": "open_issues_count",
+    "url": "html_url",
+    "size_kb": "size",
+}
+
+_EMPTY_VALUES = {str: "", int: 0, float: 0.0, bool: False, list: []}
+
+
+def repository_projection(model: Type[BaseModel]) -> Dict[str, str]:
+    """
+    Maps every field of a repository model to the GitHub API field it is read from
+    (one of helpers.github_index.STORED_FIELDS).
+
+    :param model: Pydantic model describing one repository (e.g. GitHubRepo)
+    :return: {model field: GitHub field}
+    """
+    return {name: FIELD_ALIASES.get(name, name) for name in model.model_fields}
+
+
+def _empty_value(annotation: Any) -> Any:
+    origin = typing.get_origin(annotation) or annotation
+    return _EMPTY_VALUES.get(origin)
+
+
+def project_repository(item: Mapping[str, Any], projection: Mapping[str, str],
+                       empty_values: Mapping[str, Any]) -> Dict[str, Any]:
+    """Keeps the projected fields of one search result, with nulls replaced by the field's empty value."""
+    projected = {}
+    for field, source in projection.items():
+        value = item.get(source)
+        projected[field] = empty_values.get(field) if value is None else value
+    return projected
+
+
+class GitHubSearchTool:
+    """
+    Client-side GitHub repository search returning only the fields of a repository model.
+
+    :param repository_model: Pydantic model of one repository in the agent's structured output
+    :param index: Repository index and query cache to search through (default: in memory, no freshness window)
+    :param token: GitHub token for the default index (defaults to GITHUB_TOKEN)
+    :param base_url: GitHub API root for the default index
+    :param timeout: Request timeout in seconds for the default index
+    :param verbose: Print a line per call with the tokens returned and saved
+    """
+
+    def __init__(self, repository_model: Type[BaseModel], index: Optional[GitHubRepoIndex] = None,
+                 token: Optional[str] = None, base_url: str = GITHUB_API_URL, timeout: float = 30.0,
+                 verbose: bool = True):
+        self.projection = repository_projection(repository_model)
+        self.empty_values = {name: _empty_value(field.annotation)
+                             for name, field in repository_model.model_fields.items()}
+        self.verbose = verbose
+        self.calls: List[Dict[str, Any]] = []
+        self.index = index or GitHubRepoIndex(path=None, freshness=0, token=token, base_url=base_url, timeout=timeout)
+
+    def search_repositories(self, q: str, sort: str = "", order: str = "desc", per_page: int = 10) -> str:
+        """
+        Searches GitHub repositories and returns the fields needed for each repository.
+
+        :param q: Search query (e.g., 'chainlit azure openai' or 'ai agent language:python')
+        :param sort: Sort by stars, forks or updated; empty for best match
+        :param order: Sort order, asc or desc
+        :param per_page: Number of results (1-100)
+        :return: JSON with total_count, query and the projected repositories
+        """
+        try:
+            found = self.index.search(q, sort=sort, order=order, per_page=per_page)
+        except httpx.HTTPStatusError as e:
+            return json.dumps({"error": f"GitHub search failed with HTTP {e.response.status_code}"})
+        except httpx.HTTPError as e:
+            return json.dumps({"error": f"GitHub search failed: {e}"})
+
+        result = {
+            "total_count": found["total_count"],
+            "query": q,
+            "repositories": [project_repository(item, self.projection, self.empty_values) for item in found["items"]],
+        }
+        output = json.dumps(result, separators=(",", ":"), ensure_ascii=False)
+        self._record(q, found["source"], found["raw_tokens"], output)
+        return output
+
+    def report(self) -> Dict[str, int]:
+        """
+        Totals over all calls.
+
+        :return: {"calls", "api_calls", "tokens_returned", "tokens_raw", "tokens_saved"}
+        """
+        return {
+            "calls": len(self.calls),
+            "api_calls": sum(1 for call in self.calls if call["source"] == "api"),
+            "tokens_returned": sum(call["tokens_returned"] for call in self.calls),
+            "tokens_raw": sum(call["tokens_raw"] for call in self.calls),
+            "tokens_saved": sum(max(call["tokens_raw"] - call["tokens_returned"], 0) for call in self.calls),
+        }
+
+    def close(self) -> None:
+        self.index.close()
+
+    def _record(self, query: str, source: str, tokens_raw: int, output: str) -> None:
+        # Baseline: GitHub's response for these repositories, as the OpenApiTool would hand it to the model
+        tokens_returned = count_tokens(output)
+        self.calls.append({"query": query, "source": source, "tokens_returned": tokens_returned,
+                           "tokens_raw": tokens_raw})
+        if self.verbose:
+            print(f"✂️  search_repositories ({query}) [{source}]: {tokens_returned} tokens returned, "
+                  f"{max(tokens_raw - tokens_returned, 0)} saved vs raw response")
@@ -0,0 +1,182 @@
+"""
+Client for the maintenance API's job status change feed.
+
+Instead of polling GET /jobs/status/{status} or /jobs/{job_id}, a
+JobStatusFeed keeps one request open and receives job creations and status
+transitions as they happen, either as server-sent events (/jobs/events/stream)
+or by long-polling (/jobs/events). The feed remembers the cursor of the last
+event delivered and resumes from it after a dropped connection, a server
+timeout or an injected fault, so no transition is missed or repeated.
+
+The feed is served by the maintenance stand-in only (its operations are in
+openApiDef/standin/MaintenanceAPI.ext.json, not in the hosted spec), and is
+consumed here rather than through a tool: an agent cannot hold a stream open.
+
+Usage:
+    feed = JobStatusFeed("http://127.0.0.1:8002", status="completed")
+    subscription = feed.subscribe(lambda event: print(event["job_id"], event["status"]))
+    ...
+    subscription.stop()
+"""
+
+import json
+import socket
+import threading
+from typing import Any, Callable, Dict, Iterator, Mapping, Optional
+
+import httpx
+
+# Reconnect delays after a failure: doubles from the first value up to the second
+RETRY_DELAYS = (0.5, 10.0)
+
+
+class CursorExpired(Exception):
+    """The cursor is older than the events the server keeps; re-read the jobs and subscribe again from now."""
+
+
+class Subscription:
+    """Background delivery of a feed's events to a callback; stop() ends it."""
+
+    def __init__(self, feed: "JobStatusFeed", callback: Callable[[Dict[str, Any]], None]):
+        self.feed = feed
+        self.error: Optional[BaseException] = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(callback,), name="job-feed", daemon=True)
+        self._thread.start()
+
+    def _run(self, callback: Callable[[Dict[str, Any]], None]) -> None:
+        try:
+            for event in self.feed.events(self._stop):
+                callback(event)
+        except BaseException as e:  # Surfaced to the owner through .error
+            self.error = e
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Ends the delivery and waits for the background thread.
+
+        :param timeout: Seconds to wait for the thread
+        :raises RuntimeError: If the thread is still running after timeout
+        """
+        self._stop.set()
+        self.feed.interrupt()
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            raise RuntimeError(f"The job feed thread did not stop within {timeout} s")
+
+
+class JobStatusFeed:
+    """
+    Resumable subscription to job status transitions.
+
+    :param base_url: Maintenance API root (e.g. the stand-in's URL)
+    :param cursor: Resume after this event cursor (None: only events from now on)
+    :param status: Only transitions to this status
+    :param job_id: Only events of this job
+    :param transport: "sse" for server-sent events, "poll" for long-polling
+    :param poll_timeout: Seconds each long-poll (or keep-alive gap of the stream) may wait
+    :param headers: Extra request headers (e.g. an API key)
+    """
+
+    def __init__(self, base_url: str, cursor: Optional[int] = None, status: Optional[str] = None,
+                 job_id: Optional[str] = None, transport: str = "sse", poll_timeout: float = 25.0,
+                 headers: Optional[Mapping[str, str]] = None):
+        if transport not in ("sse", "poll"):
+            raise ValueError("transport must be 'sse' or 'poll'")
+        self.cursor = cursor
+        self.filters = {key: value for key, value in (("status", status), ("job_id", job_id)) if value}
+        self.transport = transport
+        self.poll_timeout = poll_timeout
+        # Reads may wait for a whole long-poll or keep-alive interval. Every request opens its own connection,
+        # so interrupt() can shut down the one a request is blocked on (a long-poll has no response until it ends)
+        self._client = httpx.Client(base_url=base_url.rstrip("/"), headers=dict(headers or {}),
+                                    timeout=httpx.Timeout(10.0, read=poll_timeout + 20.0),
+                                    limits=httpx.Limits(max_keepalive_connections=0))
+        self._network_stream: Any = None
+        self._stop = threading.Event()
+
+    def events(self, stop: Optional[threading.Event] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Yields events until `stop` is set, reconnecting with backoff after failures.
+
+        :param stop: Event that ends the iteration (checked between requests and events)
+        :raises CursorExpired: If the server no longer has the events after the cursor
+        """
+        stop = self._stop = stop or threading.Event()
+        if self.cursor is None:
+            self.cursor = self._current_cursor()
+        delay = RETRY_DELAYS[0]
+        while not stop.is_set():
+            try:
+                batches = self._stream() if self.transport == "sse" else self._poll()
+                for event in batches:
+                    delay = RETRY_DELAYS[0]
+                    self.cursor = event["cursor"]
+                    yield event
+                    if stop.is_set():
+                        return
+            except (httpx.TransportError, httpx.HTTPStatusError) as e:
+                if isinstance(e, httpx.HTTPStatusError) and e.response.status_code == 410:
+                    raise CursorExpired(e.response.json().get("detail")) from e
+                if stop.is_set():
+                    return
+                stop.wait(delay)
+                delay = min(delay * 2, RETRY_DELAYS[1])
+
+    def subscribe(self, callback: Callable[[Dict[str, Any]], None]) -> Subscription:
+        """Delivers the events to callback from a background thread until the subscription is stopped."""
+        return Subscription(self, callback)
+
+    def interrupt(self) -> None:
+        """Shuts the open connection's socket down so a blocked request returns (used by Subscription.stop)."""
+        network_stream = self._network_stream
+        sock = network_stream.get_extra_info("socket") if network_stream is not None else None
+        if sock is not None:
+            # Closing the response or the client does not wake a thread blocked in recv(); shutdown() does
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass  # Already closed
+
+    def close(self) -> None:
+        self.interrupt()
+        self._client.close()
+
+    def _current_cursor(self) -> int:
+        response = self._client.get("/jobs/events", params={"timeout": 0, "limit": 1})
+        response.raise_for_status()
+        return response.json()["cursor"]
+
+    def _trace(self, name: str, info: Dict[str, Any]) -> None:
+        """httpx trace hook: remembers the connection of the current request for interrupt()."""
+        if name in ("connection.connect_tcp.complete", "connection.start_tls.complete"):
+            self._network_stream = info["return_value"]
+            if self._stop.is_set():  # Stopped while connecting
+                self.interrupt()
+
+    def _poll(self) -> Iterator[Dict[str, Any]]:
+        params = dict(self.filters, cursor=self.cursor, timeout=self.poll_timeout)
+        response = self._client.get("/jobs/events", params=params, extensions={"trace": self._trace})
+        response.raise_for_status()
+        page = response.json()
+        yield from page["events"]
+        # Events filtered out still move the cursor forward
+        self.cursor = page["cursor"]
+
+    def _stream(self) -> Iterator[Dict[str, Any]]:
+        params = dict(self.filters, cursor=self.cursor)
+        with self._client.stream("GET", "/jobs/events/stream", params=params,
+                                 headers={"Accept": "text/event-stream"}, extensions={"trace": self._trace}) as response:
+            if response.status_code != 200:
+                response.read()
+                response.raise_for_status()
+            try:
+                data = []
+                for line in response.iter_lines():
+                    if line.startswith("data:"):
+                        data.append(line[5:].strip())
+                    elif not line and data:
+                        yield json.loads("\n".join(data))
+                        data = []
+            except httpx.StreamClosed:
+                return
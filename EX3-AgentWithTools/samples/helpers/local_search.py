@@ -0,0 +1,501 @@
+"""
+Local hybrid retrieval index with the query surface of Azure AI Search.
+
+Retrieval tools are developed and benchmarked against this instead of an AI
+Search service. LocalSearchClient.search takes the arguments agents pass to
+SearchClient.search (search_text, vector_queries, filter, select, top,
+skip) and returns the same result dicts with "@search.score", so code
+written against it switches to a real index by swapping the client:
+
+- full-text: BM25 (k1=1.2, b=0.75, the AI Search defaults) over an
+  inverted index stored as NumPy posting arrays; a query gathers the
+  postings of its terms and scores them without a loop over documents;
+- vectors: cosine similarity of L2-normalized float32 vectors. Up to
+  ann_threshold documents (or with exhaustive=True, or under a filter) it is
+  exact, one matrix-vector product. Larger corpora get an approximate
+  nearest-neighbour graph: documents are clustered with k-means, every
+  document is linked to its nearest neighbours among its own and the
+  nearest clusters, and a query runs a best-first beam search from the
+  closest members of the closest clusters;
+- hybrid: the rankings are fused with Reciprocal Rank Fusion (score
+  sum of weight / (60 + rank)), as AI Search does; vector-only scores are
+  1 / (1 + cosine distance);
+- filter: the OData subset the samples need, "field eq 'value'", ne,
+  search.in(field, 'a,b'), combined with and / or. Filters are applied
+  before ranking.
+
+The default embedder hashes words and word pairs into a fixed number of
+dimensions. It only captures lexical overlap but is deterministic and free,
+so results are reproducible offline; pass embed= a real embedding function
+(e.g. a helpers.embeddings.EmbeddingPipeline) for semantic recall.
+
+Usage:
+    client = LocalSearchClient(documents)
+    client.search("reserve parts for a work order", top=5, filter="source eq 'openapi'",
+                  vector_queries=[VectorizableTextQuery(text="reserve parts", k_nearest_neighbors=50)])
+
+Run from EX3-AgentWithTools/samples:
+    python -m helpers.local_search "which API reserves inventory items" --top 5
+    python -m helpers.local_search --benchmark --vectors 100000
+"""
+
+import argparse
+import heapq
+import json
+import math
+import re
+import time
+import zlib
+from collections import Counter
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Reciprocal Rank Fusion constant, and full-text results fused into hybrid rankings (as in AI Search)
+RRF_K = 60
+HYBRID_TEXT_RESULTS = 50
+DEFAULT_ANN_THRESHOLD = 20_000
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_FILTER_TOKEN = re.compile(r"\s*(?:(\()|(\))|(and|or)\b|search\.in\(\s*(\w+)\s*,\s*'((?:[^']|'')*)'\s*\)"
+                           r"|(\w+)\s+(eq|ne)\s+'((?:[^']|'')*)')", re.IGNORECASE)
+
+Embedder = Callable[[Sequence[str]], np.ndarray]
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased alphanumeric terms (snake_case and paths split into words)."""
+    return _TOKEN.findall(text.lower())
+
+
+class HashingEmbedder:
+    """
+    Deterministic lexical embedding: words and word pairs hashed into `dimensions` signed buckets, L2-normalized.
+
+    :param dimensions: Vector size
+    """
+
+    def __init__(self, dimensions: int = 256):
+        self.dimensions = dimensions
+
+    def __call__(self, texts: Sequence[str]) -> np.ndarray:
+        rows, buckets, signs = [], [], []
+        for row, text in enumerate(texts):
+            words = tokenize(text)
+            for feature in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+                hashed = zlib.crc32(feature.encode("utf-8"))
+                rows.append(row)
+                buckets.append(hashed % self.dimensions)
+                signs.append(1.0 if hashed & 0x80000000 else -1.0)
+        vectors = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        np.add.at(vectors, (np.array(rows, dtype=np.int64), np.array(buckets, dtype=np.int64)),
+                  np.array(signs, dtype=np.float32))
+        # Dampen repeated words like BM25 does
+        vectors = np.sign(vectors) * np.log1p(np.abs(vectors))
+        return _normalize(vectors)
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+def _top(scores: np.ndarray, candidates: np.ndarray, k: int) -> np.ndarray:
+    """The k candidates with the highest scores, best first (argpartition, then a sort of only those)."""
+    if k < len(candidates):
+        selected = np.argpartition(-scores[candidates], k - 1)[:k]
+        candidates = candidates[selected]
+    return candidates[np.lexsort((candidates, -scores[candidates]))]
+
+
+class Bm25Index:
+    """
+    BM25 over an inverted index of NumPy posting arrays.
+
+    :param texts: One text per document
+    :param k1: Term frequency saturation
+    :param b: Length normalization
+    """
+
+    def __init__(self, texts: Sequence[str], k1: float = 1.2, b: float = 0.75):
+        self.k1, self.b = k1, b
+        self.vocabulary: Dict[str, int] = {}
+        doc_ids, term_ids = [], []
+        for doc, text in enumerate(texts):
+            terms = [self.vocabulary.setdefault(term, len(self.vocabulary)) for term in tokenize(text)]
+            doc_ids.extend([doc] * len(terms))
+            term_ids.extend(terms)
+        self.documents = len(texts)
+        doc_ids = np.array(doc_ids, dtype=np.int64)
+        term_ids = np.array(term_ids, dtype=np.int64)
+        self.lengths = np.bincount(doc_ids, minlength=self.documents).astype(np.float32)
+        self.average_length = float(self.lengths.mean()) if self.documents else 0.0
+
+        # Postings sorted by term: (term, doc) pairs counted once each give the term frequencies
+        pairs, frequencies = np.unique(term_ids * max(self.documents, 1) + doc_ids, return_counts=True)
+        self.posting_docs = (pairs % max(self.documents, 1)).astype(np.int32)
+        self.posting_tf = frequencies.astype(np.float32)
+        document_frequency = np.bincount(pairs // max(self.documents, 1), minlength=len(self.vocabulary))
+        self.offsets = np.concatenate(([0], np.cumsum(document_frequency)))
+        self.idf = np.log1p((self.documents - document_frequency + 0.5) / (document_frequency + 0.5)).astype(np.float32)
+
+    def scores(self, query: str) -> np.ndarray:
+        """BM25 score of every document (0 for documents without any query term)."""
+        terms = sorted({self.vocabulary[term] for term in tokenize(query) if term in self.vocabulary})
+        if not terms:
+            return np.zeros(self.documents, dtype=np.float32)
+        slices = [np.arange(self.offsets[term], self.offsets[term + 1]) for term in terms]
+        postings = np.concatenate(slices)
+        docs, tf = self.posting_docs[postings], self.posting_tf[postings]
+        idf = np.repeat(self.idf[terms], [len(part) for part in slices])
+        norm = self.k1 * (1 - self.b + self.b * self.lengths[docs] / self.average_length)
+        return np.bincount(docs, weights=idf * tf * (self.k1 + 1) / (tf + norm),
+                           minlength=self.documents).astype(np.float32)
+
+
+class KnnGraph:
+    """
+    Approximate nearest neighbours of normalized vectors: a k-means-partitioned neighbour graph and beam search.
+
+    :param vectors: L2-normalized float32 vectors
+    :param degree: Neighbours kept per vector
+    :param probes: Clusters whose members are linked to (and searched from) each cluster
+    :param seed: k-means seed
+    """
+
+    def __init__(self, vectors: np.ndarray, degree: int = 16, probes: int = 3, seed: int = 0):
+        self.vectors = vectors
+        self.probes = probes
+        count = len(vectors)
+        clusters = max(1, int(math.sqrt(count)))
+        rng = np.random.default_rng(seed)
+        self.centroids = vectors[rng.choice(count, clusters, replace=False)].copy()
+        for _ in range(8):
+            assignment = self._assign(vectors)
+            sums = np.zeros_like(self.centroids)
+            np.add.at(sums, assignment, vectors)
+            empty = np.bincount(assignment, minlength=clusters) == 0
+            sums[empty] = self.centroids[empty]
+            self.centroids = _normalize(sums)
+        assignment = self._assign(vectors)
+        order = np.argsort(assignment, kind="stable")
+        bounds = np.searchsorted(assignment[order], np.arange(clusters + 1))
+        self.members = [order[bounds[c]:bounds[c + 1]] for c in range(clusters)]
+        self.near = np.argsort(-(self.centroids @ self.centroids.T), axis=1)[:, :probes]
+
+        self.graph = np.empty((count, degree), dtype=np.int32)
+        for cluster, members in enumerate(self.members):
+            if not len(members):
+                continue
+            candidates = np.concatenate([self.members[c] for c in self.near[cluster]])
+            similarities = vectors[members] @ vectors[candidates].T
+            similarities[members[:, None] == candidates[None, :]] = -np.inf
+            kept = min(degree, len(candidates))
+            nearest = np.argpartition(-similarities, kept - 1, axis=1)[:, :kept]
+            links = candidates[nearest]
+            if kept < degree:
+                links = np.pad(links, ((0, 0), (0, degree - kept)), mode="edge")
+            self.graph[members] = links
+
+    def _assign(self, vectors: np.ndarray, block: int = 65_536) -> np.ndarray:
+        return np.concatenate([np.argmax(vectors[start:start + block] @ self.centroids.T, axis=1)
+                               for start in range(0, len(vectors), block)])
+
+    def search(self, query: np.ndarray, k: int, ef: int = 64) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Best-first search of the graph.
+
+        :param query: Normalized query vector
+        :param k: Neighbours returned
+        :param ef: Candidates kept during the search (higher is slower and more accurate)
+        :return: Vector indexes and cosine similarities, best first
+        """
+        ef = max(ef, k)
+        entry = np.concatenate([self.members[c] for c in np.argsort(-(self.centroids @ query))[:self.probes]])
+        entry_similarities = self.vectors[entry] @ query
+        best = np.argsort(-entry_similarities)[:ef]
+        visited = np.zeros(len(self.vectors), dtype=bool)
+        visited[entry] = True
+        # candidates: max-heap of similarity (negated); results: min-heap holding the ef best
+        candidates = [(-float(s), int(i)) for s, i in zip(entry_similarities[best], entry[best])]
+        heapq.heapify(candidates)
+        results = [(-negated, index) for negated, index in candidates]
+        heapq.heapify(results)
+        while candidates:
+            negated, index = heapq.heappop(candidates)
+            if len(results) >= ef and -negated < results[0][0]:
+                break
+            neighbours = self.graph[index]
+            neighbours = neighbours[~visited[neighbours]]
+            if not len(neighbours):
+                continue
+            visited[neighbours] = True
+            for similarity, neighbour in zip((self.vectors[neighbours] @ query).tolist(), neighbours.tolist()):
+                if len(results) < ef or similarity > results[0][0]:
+                    heapq.heappush(candidates, (-similarity, neighbour))
+                    heapq.heappush(results, (similarity, neighbour))
+                    if len(results) > ef:
+                        heapq.heappop(results)
+        ranked = sorted(results, reverse=True)[:k]
+        return (np.array([index for _, index in ranked], dtype=np.int64),
+                np.array([similarity for similarity, _ in ranked], dtype=np.float32))
+
+
+class LocalSearchClient:
+    """
+    In-memory search index answering SearchClient.search calls.
+
+    :param documents: Documents with a key field and text fields (other fields are returned and filterable)
+    :param key: Key field
+    :param text_fields: Fields indexed for full-text and embedded for vector search
+    :param embed: Function from texts to vectors (defaults to a HashingEmbedder)
+    :param vectors: Precomputed document vectors (skips embedding the documents)
+    :param ann_threshold: Documents above which vector queries use the approximate graph
+    """
+
+    def __init__(self, documents: Sequence[Mapping[str, Any]], key: str = "id",
+                 text_fields: Sequence[str] = ("title", "content"), embed: Optional[Embedder] = None,
+                 vectors: Optional[np.ndarray] = None, ann_threshold: int = DEFAULT_ANN_THRESHOLD):
+        self.documents = [dict(document) for document in documents]
+        self.key = key
+        keys = Counter(str(document.get(key)) for document in self.documents)
+        duplicates = sorted(value for value, count in keys.items() if count > 1)
+        if duplicates:
+            raise ValueError(f"Duplicate {key} values: {', '.join(duplicates)}")
+        self.embed = embed or HashingEmbedder()
+        texts = ["\n".join(str(document.get(field) or "") for field in text_fields) for document in self.documents]
+        self.bm25 = Bm25Index(texts)
+        self.vectors = _normalize(vectors if vectors is not None else self.embed(texts))
+        self.graph = KnnGraph(self.vectors) if len(self.documents) > ann_threshold else None
+        self._columns: Dict[str, np.ndarray] = {}
+        self._filters: Dict[str, np.ndarray] = {}
+
+    def get_document_count(self) -> int:
+        return len(self.documents)
+
+    def get_document(self, key: str, selected_fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        for document in self.documents:
+            if str(document.get(self.key)) == key:
+                return self._select(document, selected_fields)
+        raise KeyError(f"No document with {self.key} '{key}'")
+
+    def search(self, search_text: Optional[str] = None, *, vector_queries: Optional[Sequence[Any]] = None,
+               filter: Optional[str] = None, select: Optional[List[str]] = None, top: Optional[int] = None,
+               skip: Optional[int] = None, **_: Any) -> List[Dict[str, Any]]:
+        """
+        Full-text, vector or hybrid search.
+
+        :param search_text: Full-text query ("*" or None for no full-text ranking)
+        :param vector_queries: VectorizedQuery (vector=) or VectorizableTextQuery (text=) objects,
+            with optional k_nearest_neighbors, weight and exhaustive
+        :param filter: OData filter (eq, ne, search.in, and, or)
+        :param select: Fields returned (all by default)
+        :param top: Results returned (default 50)
+        :param skip: Results skipped
+        :return: Documents with "@search.score", best first
+        """
+        top, skip = 50 if top is None else top, skip or 0
+        mask = self._filter(filter) if filter else None
+        rankings: List[Tuple[np.ndarray, np.ndarray, float]] = []
+
+        if search_text and search_text.strip() != "*":
+            scores = self.bm25.scores(search_text)
+            if mask is not None:
+                scores = np.where(mask, scores, 0)
+            candidates = np.flatnonzero(scores > 0)
+            ranked = _top(scores, candidates, max(top + skip, HYBRID_TEXT_RESULTS if vector_queries else 0))
+            rankings.append((ranked, scores[ranked], 1.0))
+
+        for query in vector_queries or ():
+            vector = getattr(query, "vector", None)
+            if vector is None:
+                vector = self.embed([query.text])[0]
+            k = getattr(query, "k_nearest_neighbors", None) or top + skip
+            ranked, similarities = self._nearest(_normalize(np.asarray(vector, dtype=np.float32)), k, mask,
+                                                 bool(getattr(query, "exhaustive", False)))
+            rankings.append((ranked, similarities, getattr(query, "weight", None) or 1.0))
+
+        if not rankings:
+            # No ranking: matching documents in index order, all with score 1 (like search="*")
+            ranked = np.flatnonzero(mask) if mask is not None else np.arange(len(self.documents))
+            results = [(int(index), 1.0) for index in ranked]
+        elif len(rankings) == 1:
+            ranked, scores, _ = rankings[0]
+            # Vector-only scores are similarities mapped like AI Search's cosine metric
+            scores = scores if search_text and search_text.strip() != "*" else 1 / (2 - scores)
+            results = list(zip(ranked.tolist(), scores.tolist()))
+        else:
+            fused: Dict[int, float] = {}
+            for ranked, _, weight in rankings:
+                for rank, index in enumerate(ranked.tolist(), start=1):
+                    fused[index] = fused.get(index, 0.0) + weight / (RRF_K + rank)
+            results = sorted(fused.items(), key=lambda item: (-item[1], item[0]))
+        return [dict(self._select(self.documents[index], select), **{"@search.score": round(score, 6)})
+                for index, score in results[skip:skip + top]]
+
+    def _nearest(self, vector: np.ndarray, k: int, mask: Optional[np.ndarray],
+                 exhaustive: bool) -> Tuple[np.ndarray, np.ndarray]:
+        if self.graph is not None and mask is None and not exhaustive:
+            return self.graph.search(vector, k, ef=max(64, 2 * k))
+        candidates = np.flatnonzero(mask) if mask is not None else np.arange(len(self.documents))
+        similarities = np.full(len(self.documents), -np.inf, dtype=np.float32)
+        similarities[candidates] = self.vectors[candidates] @ vector
+        ranked = _top(similarities, candidates, k)
+        return ranked, similarities[ranked]
+
+    def _column(self, field: str) -> np.ndarray:
+        if field not in self._columns:
+            if not any(field in document for document in self.documents):
+                raise ValueError(f"Unknown filter field '{field}'")
+            self._columns[field] = np.array([str(document.get(field, "")) for document in self.documents])
+        return self._columns[field]
+
+    def _filter(self, expression: str) -> np.ndarray:
+        if expression not in self._filters:
+            self._filters[expression] = self._parse_filter(expression)
+        return self._filters[expression]
+
+    def _parse_filter(self, expression: str) -> np.ndarray:
+        tokens: List[Any] = []
+        position = 0
+        while position < len(expression.rstrip()):
+            match = _FILTER_TOKEN.match(expression, position)
+            if match is None:
+                raise ValueError(f"Unsupported filter near: {expression[position:]!r} "
+                                 "(supported: field eq 'value', ne, search.in(field, 'a,b'), and, or)")
+            position = match.end()
+            opening, closing, connective, in_field, in_values, field, operator, value = match.groups()
+            if opening or closing:
+                tokens.append(opening or closing)
+            elif connective:
+                tokens.append(connective.lower())
+            elif in_field:
+                values = [item.strip() for item in in_values.replace("''", "'").split(",")]
+                tokens.append(np.isin(self._column(in_field), values))
+            else:
+                equal = self._column(field) == value.replace("''", "'")
+                tokens.append(equal if operator.lower() == "eq" else ~equal)
+
+        def expression_at(index: int) -> Tuple[np.ndarray, int]:
+            # or of ands of terms
+            result, index = term_at(index)
+            while index < len(tokens) and isinstance(tokens[index], str) and tokens[index] in ("and", "or"):
+                connective = tokens[index]
+                right, index = term_at(index + 1)
+                if connective == "and":
+                    result = result & right
+                else:
+                    # and binds tighter: fold the rest of this conjunction before or-ing it
+                    while index < len(tokens) and isinstance(tokens[index], str) and tokens[index] == "and":
+                        more, index = term_at(index + 1)
+                        right = right & more
+                    result = result | right
+            return result, index
+
+        def term_at(index: int) -> Tuple[np.ndarray, int]:
+            if index >= len(tokens):
+                raise ValueError(f"Incomplete filter: {expression!r}")
+            token = tokens[index]
+            if isinstance(token, str) and token == "(":
+                result, index = expression_at(index + 1)
+                if index >= len(tokens) or not (isinstance(tokens[index], str) and tokens[index] == ")"):
+                    raise ValueError(f"Unbalanced parentheses in filter: {expression!r}")
+                return result, index + 1
+            if isinstance(token, str):
+                raise ValueError(f"Unexpected '{token}' in filter: {expression!r}")
+            return token, index + 1
+
+        mask, end = expression_at(0)
+        if end != len(tokens):
+            raise ValueError(f"Unexpected '{tokens[end]}' in filter: {expression!r}")
+        return mask
+
+    @staticmethod
+    def _select(document: Mapping[str, Any], select: Optional[Iterable[str]]) -> Dict[str, Any]:
+        return {field: document.get(field) for field in select} if select else dict(document)
+
+
+def run_benchmark(client: LocalSearchClient, queries: Sequence[str], vectors: int = 100_000, dimensions: int = 256,
+                  k: int = 10, repeat: int = 20) -> Dict[str, Any]:
+    """
+    Query latency of each mode on a corpus, and recall and latency of the ANN graph against exact search.
+
+    :param client: Index over the corpus
+    :param queries: Queries timed
+    :param vectors: Size of the random clustered vector set the graph is measured on
+    :param dimensions: Dimensions of those vectors
+    :param k: Neighbours compared for recall@k
+    :param repeat: Repetitions of every query
+    :return: Milliseconds per query by mode, graph build time, recall@k and milliseconds per query
+    """
+    def per_query(run: Callable[[str], Any]) -> float:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for query in queries:
+                run(query)
+        return round((time.perf_counter() - start) / (repeat * len(queries)) * 1000, 3)
+
+    modes = {
+        "text_ms": per_query(lambda query: client.search(query, top=k)),
+        "vector_ms": per_query(lambda query: client.search(vector_queries=[SimpleNamespace(text=query)], top=k)),
+        "hybrid_ms": per_query(lambda query: client.search(query, vector_queries=[SimpleNamespace(text=query)],
+                                                           top=k)),
+    }
+
+    # Clustered random vectors, like embeddings of a corpus about a few topics
+    rng = np.random.default_rng(0)
+    centers = rng.standard_normal((200, dimensions)).astype(np.float32)
+    data = _normalize(centers[rng.integers(0, len(centers), vectors)]
+                      + 0.6 * rng.standard_normal((vectors, dimensions)).astype(np.float32))
+    # Queries near documents: a perturbation of norm about 0.3 around 100 of them
+    probe = _normalize(data[rng.choice(vectors, 100, replace=False)]
+                       + 0.3 / math.sqrt(dimensions) * rng.standard_normal((100, dimensions)).astype(np.float32))
+    start = time.perf_counter()
+    graph = KnnGraph(data)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    exact = [set(_top(data @ query, np.arange(vectors), k).tolist()) for query in probe]
+    exact_ms = (time.perf_counter() - start) / len(probe) * 1000
+    start = time.perf_counter()
+    found = [set(graph.search(query, k)[0].tolist()) for query in probe]
+    graph_ms = (time.perf_counter() - start) / len(probe) * 1000
+    recall = sum(len(a & b) for a, b in zip(exact, found)) / (k * len(probe))
+    return {"documents": client.get_document_count(), **modes,
+            "ann": {"vectors": vectors, "dimensions": dimensions, "build_s": round(build, 1),
+                    f"recall_at_{k}": round(recall, 3), "graph_ms": round(graph_ms, 3),
+                    "exact_ms": round(exact_ms, 3)}}
+
+
+if __name__ == "__main__":
+    from helpers.search_corpus import default_documents
+
+    parser = argparse.ArgumentParser(description="Query the local hybrid index over the samples' documents")
+    parser.add_argument("query", nargs="?", default="reserve inventory items for a work order", help="Query")
+    parser.add_argument("--top", type=int, default=5, help="Results returned")
+    parser.add_argument("--mode", choices=("hybrid", "text", "vector"), default="hybrid", help="Ranking")
+    parser.add_argument("--filter", help="OData filter, e.g. \"source eq 'openapi'\"")
+    parser.add_argument("--benchmark", action="store_true", help="Time every mode and measure the ANN graph")
+    parser.add_argument("--vectors", type=int, default=100_000, help="Vectors the ANN graph is measured on")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    search_client = LocalSearchClient(default_documents())
+    built = time.perf_counter() - start
+    if args.benchmark:
+        print(json.dumps(run_benchmark(search_client, ["reserve inventory items", "cement companies profit",
+                                                       "approve MCP tool calls", "maintenance schedule"],
+                                       vectors=args.vectors), indent=2))
+    else:
+        start = time.perf_counter()
+        hits = search_client.search(
+            None if args.mode == "vector" else args.query, filter=args.filter, top=args.top,
+            select=["id", "source", "title"],
+            vector_queries=None if args.mode == "text" else [SimpleNamespace(text=args.query)])
+        elapsed = time.perf_counter() - start
+        for hit in hits:
+            print(f"{hit['@search.score']:.4f}  [{hit['source']}] {hit['title']}")
+        print(f"🔎 {len(hits)} results of {search_client.get_document_count()} documents in {elapsed * 1000:.2f} ms "
+              f"(indexed in {built * 1000:.0f} ms)")
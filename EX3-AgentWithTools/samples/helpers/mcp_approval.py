@@ -0,0 +1,244 @@
+"""
+Policy-driven approval of MCP tool calls.
+
+With the default require_approval="always", every MCP call stops the run in
+requires_action until the script submits a ToolApproval, and a script that
+polls every second adds up to a second per call on top of the service's own
+round trip. McpApprovalPolicy decides approvals from rules per server label
+and tool name:
+
+- "always": the call is safe whatever its arguments; apply() sets the tool's
+  approval mode to "never" for it, so the run does not stop at all;
+- "approve": approved when the optional argument predicate accepts it and
+  the optional per-minute cap is not exceeded;
+- "deny": refused (also the default for tools without a rule).
+
+Decisions are cached per (server, tool, arguments). run_with_approvals()
+streams the run and answers each approval request as soon as its event
+arrives; requires_action_handler() plugs the same policy into RunMultiplexer.
+
+Usage:
+    policy = McpApprovalPolicy()
+    policy.rule("MicrosoftLearn", "microsoft_docs_search", "always")
+    policy.rule("MicrosoftLearn", "microsoft_docs_fetch", "approve",
+                when=lambda args: args.get("url", "").startswith("https://learn.microsoft.com/"))
+    policy.apply(mcp_tool)
+    run = run_with_approvals(agents_client, thread.id, agent.id, policy, tool_resources=mcp_tool.resources)
+"""
+
+import json
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from azure.ai.agents.models import (
+    MCPApprovalPerTool,
+    MCPToolList,
+    McpTool,
+    RequiredMcpToolCall,
+    SubmitToolApprovalAction,
+    ThreadRun,
+    ToolApproval,
+)
+
+DECISIONS = ("always", "approve", "deny")
+ANY_TOOL = "*"
+
+# Cached decisions kept per policy (oldest dropped first)
+MAX_CACHED_DECISIONS = 1024
+
+
+@dataclass
+class ApprovalRule:
+    server_label: str
+    tool: str
+    decision: str
+    when: Optional[Callable[[Dict[str, Any]], bool]] = None
+    max_per_minute: Optional[int] = None
+    calls: Deque[float] = field(default_factory=deque)
+
+    @property
+    def unconditional(self) -> bool:
+        return self.decision == "always"
+
+
+class McpApprovalPolicy:
+    """
+    Approval rules per MCP server label and tool name.
+
+    :param default: Decision for calls no rule matches ("deny" or "approve")
+    :param verbose: Print one line per decision
+    """
+
+    def __init__(self, default: str = "deny", verbose: bool = True):
+        if default not in ("approve", "deny"):
+            raise ValueError("default must be 'approve' or 'deny'")
+        self.default = default
+        self.verbose = verbose
+        self.rules: Dict[Tuple[str, str], ApprovalRule] = {}
+        self.headers: Dict[str, Dict[str, str]] = {}
+        self.stats: Counter = Counter()
+        self._cache: Dict[Tuple[str, str, str], Tuple[bool, str]] = {}
+        self._lock = threading.Lock()
+
+    def rule(self, server_label: str, tool: str = ANY_TOOL, decision: str = "approve",
+             when: Optional[Callable[[Dict[str, Any]], bool]] = None,
+             max_per_minute: Optional[int] = None) -> "McpApprovalPolicy":
+        """
+        Adds (or replaces) the rule for a tool of a server.
+
+        :param server_label: MCP server label (McpTool.server_label)
+        :param tool: Tool name, or "*" for every tool of the server without its own rule
+        :param decision: "always", "approve" or "deny"
+        :param when: Predicate on the parsed call arguments; the call is denied when it returns False
+        :param max_per_minute: Calls approved per minute under this rule; further calls are denied
+        :return: The policy (rules can be chained)
+        """
+        if decision not in DECISIONS:
+            raise ValueError(f"decision must be one of {', '.join(DECISIONS)}")
+        if decision == "always" and (when is not None or max_per_minute is not None):
+            raise ValueError("'always' rules cannot have conditions; use 'approve'")
+        with self._lock:
+            self.rules[(server_label, tool)] = ApprovalRule(server_label, tool, decision, when, max_per_minute)
+            self._cache.clear()
+        return self
+
+    def apply(self, mcp_tool: McpTool) -> None:
+        """
+        Sets the tool's approval mode from the rules and remembers its headers for the approvals.
+
+        Tools with an "always" rule are sent with require_approval "never", so their calls run without
+        stopping the run; "always" on "*" turns approvals off for the whole server.
+        """
+        label = mcp_tool.server_label
+        self.headers[label] = mcp_tool.headers
+        server_rule = self.rules.get((label, ANY_TOOL))
+        if server_rule is not None and server_rule.unconditional and all(
+                rule.unconditional for (rule_label, _), rule in self.rules.items() if rule_label == label):
+            mcp_tool.set_approval_mode("never")
+            return
+        never = sorted(tool for (rule_label, tool), rule in self.rules.items()
+                       if rule_label == label and tool != ANY_TOOL and rule.unconditional)
+        if never:
+            mcp_tool.set_approval_mode(MCPApprovalPerTool(never=MCPToolList(tool_names=never)))
+
+    def decide(self, server_label: str, tool: str, arguments: str) -> Tuple[bool, str]:
+        """
+        Decides one call.
+
+        :param server_label: Server the call goes to
+        :param tool: Tool name
+        :param arguments: Call arguments as provided by the model (JSON string)
+        :return: (approved, reason)
+        """
+        with self._lock:
+            rule = self.rules.get((server_label, tool)) or self.rules.get((server_label, ANY_TOOL))
+            key = (server_label, tool, arguments or "")
+            cached = self._cache.get(key)
+            if cached is None:
+                cached = self._evaluate(rule, arguments)
+                if len(self._cache) >= MAX_CACHED_DECISIONS:
+                    del self._cache[next(iter(self._cache))]
+                self._cache[key] = cached
+            else:
+                self.stats["cached"] += 1
+
+            approved, reason = cached
+            if approved and rule is not None and rule.max_per_minute is not None:
+                # Rate caps are counted on every call, cached or not
+                now = time.monotonic()
+                while rule.calls and now - rule.calls[0] >= 60:
+                    rule.calls.popleft()
+                if len(rule.calls) >= rule.max_per_minute:
+                    approved, reason = False, f"rate cap of {rule.max_per_minute}/min reached"
+                else:
+                    rule.calls.append(now)
+            self.stats["approved" if approved else "denied"] += 1
+
+        if self.verbose:
+            print(f"{'✅' if approved else '⛔'} {server_label}.{tool}: {reason}")
+        return approved, reason
+
+    def approvals(self, tool_calls: Sequence[Any]) -> List[ToolApproval]:
+        """Builds the ToolApproval of every MCP call of a requires_action."""
+        approvals = []
+        for tool_call in tool_calls:
+            if not isinstance(tool_call, RequiredMcpToolCall):
+                continue
+            try:
+                approved, _ = self.decide(tool_call.server_label, tool_call.name, tool_call.arguments)
+            except Exception as e:  # A failing decision refuses this call instead of aborting the run
+                print(f"⚠️  Error deciding {tool_call.server_label}.{tool_call.name}: {e}")
+                approved = False
+            approvals.append(ToolApproval(tool_call_id=tool_call.id, approve=approved,
+                                          headers=self.headers.get(tool_call.server_label, {})))
+        return approvals
+
+    def requires_action_handler(self) -> Callable[[ThreadRun], Optional[Dict[str, Any]]]:
+        """Handler for RunMultiplexer.start(on_requires_action=...)."""
+        def handle(run: ThreadRun) -> Optional[Dict[str, Any]]:
+            if not isinstance(run.required_action, SubmitToolApprovalAction):
+                return None
+            approvals = self.approvals(run.required_action.submit_tool_approval.tool_calls)
+            return {"tool_approvals": approvals} if approvals else None
+        return handle
+
+    def tools(self, server_label: str) -> List[str]:
+        """Tools of a server with a rule that can approve them (the ones worth exposing to the agent)."""
+        return [tool for (label, tool), rule in self.rules.items()
+                if label == server_label and tool != ANY_TOOL and rule.decision != "deny"]
+
+    def report(self) -> Dict[str, int]:
+        """Counts of approved, denied and cached decisions."""
+        with self._lock:
+            return dict(self.stats)
+
+    def _evaluate(self, rule: Optional[ApprovalRule], arguments: str) -> Tuple[bool, str]:
+        if rule is None:
+            return self.default == "approve", f"no rule, default {self.default}"
+        if rule.decision == "deny":
+            return False, f"denied by rule {rule.tool}"
+        if rule.when is None:
+            return True, f"{rule.decision} by rule {rule.tool}"
+        try:
+            parsed = json.loads(arguments) if arguments else {}
+        except ValueError:
+            return False, "arguments are not valid JSON"
+        try:
+            accepted = bool(rule.when(parsed if isinstance(parsed, Mapping) else {"value": parsed}))
+        except Exception as e:  # A failing predicate refuses the call rather than crashing the run
+            return False, f"predicate failed: {e}"
+        return (True, f"approved by rule {rule.tool}") if accepted else (False, f"arguments rejected by rule {rule.tool}")
+
+
+def run_with_approvals(agents_client: Any, thread_id: str, agent_id: str, policy: McpApprovalPolicy,
+                       **run_kwargs: Any) -> ThreadRun:
+    """
+    Runs an agent with streaming and answers MCP approval requests as soon as they arrive.
+
+    :param agents_client: The agents client (project_client.agents)
+    :param thread_id: Thread to run
+    :param agent_id: Agent to run
+    :param policy: Approval policy (apply() it to the MCP tools first)
+    :param run_kwargs: Extra arguments for runs.stream (tool_resources, instructions, ...)
+    :return: The run in its final state
+    """
+    run_id = None
+    with agents_client.runs.stream(thread_id=thread_id, agent_id=agent_id, **run_kwargs) as stream:
+        for _, event_data, _ in stream:
+            if not isinstance(event_data, ThreadRun):
+                continue
+            run_id = event_data.id
+            if event_data.status == "requires_action" and isinstance(event_data.required_action, SubmitToolApprovalAction):
+                approvals = policy.approvals(event_data.required_action.submit_tool_approval.tool_calls)
+                if not approvals:
+                    agents_client.runs.cancel(thread_id=thread_id, run_id=run_id)
+                    break
+                # The continuation is appended to the same event stream
+                agents_client.runs.submit_tool_outputs_stream(thread_id=thread_id, run_id=run_id,
+                                                              tool_approvals=approvals, event_handler=stream)
+    if run_id is None:
+        raise RuntimeError("The run stream ended before the run was created")
+    return agents_client.runs.get(thread_id=thread_id, run_id=run_id)
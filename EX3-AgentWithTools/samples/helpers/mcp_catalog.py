@@ -0,0 +1,220 @@
+"""
+Cached MCP tool catalogs and allowed_tools pinning.
+
+An McpTool created with allowed_tools=[] exposes every tool the server
+advertises, and the service adds all of their names, descriptions and input
+schemas to every model step. McpToolCatalog fetches a server's catalog once
+(tools/list), keeps it in the tool definition cache with a hash of what the
+model sees (name, description, input schema) and pins an McpTool to the tools
+the agent actually uses:
+
+- within max_age the cached catalog is used without contacting the server;
+- after that the catalog is fetched again and, when its hash changed, the
+  added, removed and changed tools are reported, pinned ones first, since a
+  changed description or schema changes what the agent does with the tool;
+- when the server cannot be reached the cached catalog is used as it is.
+
+The catalog is only a check made from the developer's machine; the service
+reaches the MCP server itself. pin_or_allow() therefore falls back to
+allowing the requested tools unchecked, with a warning, when there is no
+catalog to check against or a tool was renamed, instead of failing.
+
+Usage:
+    catalog = McpToolCatalog()
+    catalog.pin(mcp_tool, ["microsoft_docs_search", "microsoft_docs_fetch"])
+    catalog.pin_or_allow(mcp_tool, approval_policy.tools("MicrosoftLearn"))  # never raises
+
+Run from EX3-AgentWithTools/samples to list a server's tools:
+    python -m helpers.mcp_catalog https://learn.microsoft.com/api/mcp --pin microsoft_docs_search
+"""
+
+import argparse
+import hashlib
+import json
+import time
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import httpx
+from azure.ai.agents.models import McpTool
+
+from helpers.mcp_client import McpError, McpSession
+from helpers.tokens import count_json_tokens
+from helpers.tool_cache import cache_key, read_cached, write_cached
+
+# Catalogs are fetched again after a day
+DEFAULT_MAX_AGE = 24 * 3600
+
+# The parts of a tool definition the model sees
+_MODEL_FIELDS = ("name", "description", "inputSchema")
+
+
+def _model_view(tool: Mapping[str, Any]) -> Dict[str, Any]:
+    return {key: tool[key] for key in _MODEL_FIELDS if key in tool}
+
+
+def tool_hash(tool: Mapping[str, Any]) -> str:
+    """SHA-256 of the tool's name, description and input schema."""
+    canonical = json.dumps(_model_view(tool), sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def catalog_hash(tool_hashes: Mapping[str, str]) -> str:
+    """SHA-256 over the tool hashes of a catalog (or of a pinned subset), independent of their order."""
+    lines = "\n".join(f"{name}:{digest}" for name, digest in sorted(tool_hashes.items()))
+    return hashlib.sha256(lines.encode("utf-8")).hexdigest()
+
+
+def diff_catalogs(old: Mapping[str, str], new: Mapping[str, str]) -> Dict[str, List[str]]:
+    """Tools added, removed and changed between two {name: tool_hash} maps."""
+    return {
+        "added": sorted(set(new) - set(old)),
+        "removed": sorted(set(old) - set(new)),
+        "changed": sorted(name for name in set(old) & set(new) if old[name] != new[name]),
+    }
+
+
+def _allow_only(mcp_tool: McpTool, tools: Sequence[str]) -> None:
+    for name in list(mcp_tool.allowed_tools):
+        if name not in tools:
+            mcp_tool.disallow_tool(name)
+    for name in tools:
+        mcp_tool.allow_tool(name)
+
+
+class McpToolCatalog:
+    """
+    Tool catalogs of MCP servers, cached per server URL.
+
+    :param max_age: Seconds a cached catalog is used before it is fetched again
+    :param timeout: Request timeout in seconds
+    :param verbose: Print where catalogs come from and what changed
+    """
+
+    def __init__(self, max_age: float = DEFAULT_MAX_AGE, timeout: float = 30.0, verbose: bool = True):
+        self.max_age = max_age
+        self.timeout = timeout
+        self.verbose = verbose
+        self.pins: Dict[str, Dict[str, Any]] = {}
+
+    def get(self, server_url: str, headers: Optional[Mapping[str, str]] = None, refresh: bool = False) -> Dict[str, Any]:
+        """
+        The catalog of a server: {server_url, hash, fetched_at, tools, tool_hashes}.
+
+        :param server_url: MCP server endpoint
+        :param headers: Headers needed to reach the server
+        :param refresh: Fetch even when the cached catalog is recent
+        :raises httpx.HTTPError: If the server cannot be reached and nothing is cached
+        """
+        key = cache_key("mcp-catalog", server_url)
+        cached = read_cached(key)
+        if cached is not None and not refresh and time.time() - cached["fetched_at"] < self.max_age:
+            self._log(f"📇 {server_url}: {len(cached['tools'])} tools (cached, hash {cached['hash'][:12]})")
+            return cached
+
+        try:
+            with McpSession(server_url, headers=headers, timeout=self.timeout) as session:
+                tools = [_model_view(tool) for tool in session.list_tools()]
+        except (httpx.HTTPError, McpError) as e:
+            if cached is None:
+                raise
+            self._log(f"⚠️  {server_url}: catalog fetch failed ({e}); using the catalog cached "
+                      f"{(time.time() - cached['fetched_at']) / 3600:.1f} h ago")
+            return cached
+
+        tool_hashes = {tool["name"]: tool_hash(tool) for tool in tools}
+        entry = {
+            "server_url": server_url,
+            "hash": catalog_hash(tool_hashes),
+            "fetched_at": time.time(),
+            "tools": sorted(tools, key=lambda tool: tool["name"]),
+            "tool_hashes": tool_hashes,
+        }
+        if cached is not None and cached["hash"] != entry["hash"]:
+            entry["changes"] = diff_catalogs(cached["tool_hashes"], tool_hashes)
+            entry["previous_hash"] = cached["hash"]
+            self._log(f"⚠️  {server_url}: tool catalog changed ({cached['hash'][:12]} -> {entry['hash'][:12]}): "
+                      + ", ".join(f"{kind} {', '.join(names)}" for kind, names in entry["changes"].items() if names))
+        else:
+            self._log(f"📇 {server_url}: {len(tools)} tools (fetched, hash {entry['hash'][:12]})")
+        write_cached(key, entry)
+        return entry
+
+    def pin(self, mcp_tool: McpTool, tools: Sequence[str], refresh: bool = False) -> str:
+        """
+        Restricts an McpTool to the given tools after checking the server still advertises them.
+
+        :param mcp_tool: Tool to pin (its allowed_tools are replaced)
+        :param tools: Names of the tools the agent uses
+        :param refresh: Fetch the catalog even when the cached one is recent
+        :return: Hash of the pinned tools' definitions
+        :raises ValueError: If the server does not advertise one of the tools
+        """
+        entry = self.get(mcp_tool.server_url, headers=mcp_tool.headers, refresh=refresh)
+        unknown = [name for name in tools if name not in entry["tool_hashes"]]
+        if unknown:
+            raise ValueError(f"{mcp_tool.server_url} does not advertise {', '.join(unknown)}; "
+                             f"available tools: {', '.join(sorted(entry['tool_hashes']))}")
+
+        pinned = {name: entry["tool_hashes"][name] for name in tools}
+        changes = entry.get("changes", {})
+        affected = [name for name in changes.get("changed", []) if name in pinned]
+        if affected:
+            self._log(f"⚠️  {mcp_tool.server_label}: pinned tools changed since the last fetch: {', '.join(affected)}; "
+                      "review the agent instructions and approval rules that rely on them")
+
+        _allow_only(mcp_tool, tools)
+        pinned_tools = [tool for tool in entry["tools"] if tool["name"] in pinned]
+        self.pins[mcp_tool.server_label] = {
+            "catalog_hash": entry["hash"],
+            "pinned_hash": catalog_hash(pinned),
+            "tools": f"{len(pinned)}/{len(entry['tools'])}",
+            "catalog_tokens": count_json_tokens(entry["tools"]),
+            "pinned_tokens": count_json_tokens(pinned_tools),
+        }
+        return self.pins[mcp_tool.server_label]["pinned_hash"]
+
+    def pin_or_allow(self, mcp_tool: McpTool, tools: Sequence[str], refresh: bool = False) -> Optional[str]:
+        """
+        pin(), falling back to allowing the tools unchecked when the catalog cannot be checked.
+
+        Used by the samples at startup: a proxy, an MCP server outage or a renamed tool prints a
+        warning instead of stopping a script that only needs the service to reach the server.
+
+        :param mcp_tool: Tool to pin (its allowed_tools are replaced)
+        :param tools: Names of the tools the agent uses
+        :param refresh: Fetch the catalog even when the cached one is recent
+        :return: Hash of the pinned tools' definitions, or None when they were allowed unchecked
+        """
+        try:
+            return self.pin(mcp_tool, tools, refresh=refresh)
+        except (httpx.HTTPError, McpError, ValueError) as e:
+            self._log(f"⚠️  {mcp_tool.server_label}: tool catalog not checked ({e}); "
+                      f"allowing {', '.join(tools)} as configured")
+        _allow_only(mcp_tool, tools)
+        self.pins[mcp_tool.server_label] = {"catalog_hash": None, "pinned_hash": None,
+                                            "tools": f"{len(tools)}/?", "unchecked": True}
+        return None
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        """Per server label: catalog and pinned hashes, pinned tool count and definition tokens."""
+        return {label: dict(pin) for label, pin in self.pins.items()}
+
+    def _log(self, message: str) -> None:
+        if self.verbose:
+            print(message)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="List an MCP server's tools and the tokens saved by pinning")
+    parser.add_argument("server_url", help="MCP server endpoint")
+    parser.add_argument("--pin", nargs="+", default=[], help="Tools to pin")
+    parser.add_argument("--refresh", action="store_true", help="Fetch the catalog even when the cached one is recent")
+    args = parser.parse_args()
+
+    catalog = McpToolCatalog()
+    entry = catalog.get(args.server_url, refresh=args.refresh)
+    for tool in entry["tools"]:
+        print(f"  {tool['name']} ({count_json_tokens(tool)} tokens) {entry['tool_hashes'][tool['name']][:12]}")
+    if args.pin:
+        catalog.pin(McpTool(server_label="cli", server_url=args.server_url), args.pin)
+        print(json.dumps(catalog.report()["cli"], indent=2))
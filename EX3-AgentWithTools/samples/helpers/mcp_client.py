@@ -0,0 +1,157 @@
+"""
+Minimal MCP client over the streamable HTTP transport.
+
+The agents service talks to the MCP servers itself; the samples only need to
+reach a server directly for housekeeping such as listing its tools. McpSession
+speaks the JSON-RPC subset for that with httpx (already a dependency):
+initialize, tools/list (following the pagination cursor) and tools/call. A
+response may come back as plain JSON or as a server-sent event stream; both
+are handled.
+
+Usage:
+    with McpSession("https://learn.microsoft.com/api/mcp") as session:
+        tools = session.list_tools()
+"""
+
+import itertools
+import json
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+import httpx
+
+PROTOCOL_VERSION = "2025-06-18"
+CLIENT_INFO = {"name": "ex3-samples", "version": "1.0"}
+
+
+class McpError(Exception):
+    """JSON-RPC error returned by an MCP server."""
+
+    def __init__(self, code: int, message: str, data: Any = None):
+        super().__init__(f"MCP error {code}: {message}")
+        self.code = code
+        self.message = message
+        self.data = data
+
+
+def _sse_messages(lines: Iterable[str]) -> Iterable[Dict[str, Any]]:
+    data: List[str] = []
+    for line in itertools.chain(lines, [""]):
+        if line.startswith("data:"):
+            data.append(line[5:].strip())
+        elif not line and data:
+            yield json.loads("\n".join(data))
+            data = []
+
+
+class McpSession:
+    """
+    One session with an MCP server.
+
+    :param server_url: Streamable HTTP endpoint of the server
+    :param headers: Extra request headers (e.g. an API key)
+    :param timeout: Request timeout in seconds
+    :param client: httpx client to send the requests with (shared clients keep connections pooled)
+    """
+
+    def __init__(self, server_url: str, headers: Optional[Mapping[str, str]] = None, timeout: float = 30.0,
+                 client: Optional[httpx.Client] = None):
+        self.server_url = server_url
+        self.headers = dict(headers or {})
+        self.server_info: Dict[str, Any] = {}
+        self.protocol_version = PROTOCOL_VERSION
+        self._owns_client = client is None
+        self._client = client or httpx.Client(timeout=timeout, follow_redirects=True)
+        self._session_id: Optional[str] = None
+        self._ids = itertools.count(1)
+        self._initialized = False
+
+    def __enter__(self) -> "McpSession":
+        self.initialize()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def initialize(self) -> Dict[str, Any]:
+        """Opens the session (done on first use when not called explicitly)."""
+        if self._initialized:
+            return self.server_info
+        result = self._send("initialize", {
+            "protocolVersion": PROTOCOL_VERSION,
+            "capabilities": {},
+            "clientInfo": CLIENT_INFO,
+        })
+        self.server_info = result.get("serverInfo", {})
+        self.protocol_version = result.get("protocolVersion", PROTOCOL_VERSION)
+        self._initialized = True
+        self._send("notifications/initialized", notification=True)
+        return self.server_info
+
+    def list_tools(self) -> List[Dict[str, Any]]:
+        """All the tools the server advertises, across pages."""
+        self.initialize()
+        tools: List[Dict[str, Any]] = []
+        cursor = None
+        while True:
+            result = self._send("tools/list", {"cursor": cursor} if cursor else {})
+            tools.extend(result.get("tools", []))
+            cursor = result.get("nextCursor")
+            if not cursor:
+                return tools
+
+    def call_tool(self, name: str, arguments: Optional[Mapping[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Calls a tool.
+
+        :return: The tools/call result (content, structuredContent, isError)
+        """
+        self.initialize()
+        return self._send("tools/call", {"name": name, "arguments": dict(arguments or {})})
+
+    def close(self) -> None:
+        if self._session_id is not None:
+            try:
+                self._client.delete(self.server_url, headers=self._headers())
+            except httpx.HTTPError:
+                pass  # The server drops idle sessions on its own
+            self._session_id = None
+        self._initialized = False
+        if self._owns_client:
+            self._client.close()
+
+    def _headers(self) -> Dict[str, str]:
+        headers = dict(self.headers, **{"Accept": "application/json, text/event-stream",
+                                        "MCP-Protocol-Version": self.protocol_version})
+        if self._session_id is not None:
+            headers["Mcp-Session-Id"] = self._session_id
+        return headers
+
+    def _send(self, method: str, params: Optional[Dict[str, Any]] = None, notification: bool = False) -> Dict[str, Any]:
+        message: Dict[str, Any] = {"jsonrpc": "2.0", "method": method}
+        if params is not None:
+            message["params"] = params
+        if not notification:
+            message["id"] = next(self._ids)
+
+        with self._client.stream("POST", self.server_url, json=message, headers=self._headers()) as response:
+            if response.status_code >= 400:
+                response.read()
+                response.raise_for_status()
+            self._session_id = response.headers.get("mcp-session-id", self._session_id)
+            if notification:
+                return {}
+            if response.headers.get("content-type", "").startswith("text/event-stream"):
+                replies: Iterable[Dict[str, Any]] = _sse_messages(response.iter_lines())
+            else:
+                response.read()
+                body = response.json()
+                replies = body if isinstance(body, list) else [body]
+            for reply in replies:
+                # Server requests and notifications can be interleaved with the response
+                if reply.get("id") != message["id"]:
+                    continue
+                if "error" in reply:
+                    error = reply["error"]
+                    raise McpError(error.get("code", 0), error.get("message", ""), error.get("data"))
+                return reply.get("result", {})
+        raise McpError(-32603, f"No response to {method}")
@@ -0,0 +1,300 @@
+"""
+Caching MCP proxy in front of one upstream MCP server.
+
+The MCP samples read the same documentation (the Azure REST API specs
+README, the Azure Functions docs) in every run, and each read is a round trip
+to the remote server. McpProxy serves the upstream's tools on a local
+endpoint and:
+
+- caches the results of idempotent tools for a TTL. A tool counts as
+  idempotent when the upstream annotates it with readOnlyHint or
+  idempotentHint, or when a TTL is configured for it. The cache key hashes
+  the tool name, the tool's definition and the canonical arguments, so a
+  changed tool definition invalidates its entries. Results are stored once
+  per content hash, so identical results of different calls share storage
+  and a refresh that returns the same content is counted as unchanged;
+- coalesces concurrent identical calls into one upstream call;
+- keeps a pool of initialized upstream sessions on one pooled HTTP client
+  instead of opening a session per call.
+
+Error results (isError) are never cached. Headers sent by the agent are not
+forwarded; upstream headers are configured on the proxy.
+
+The agents service calls server_url from Azure, so the proxy has to be
+reachable from there (for instance through a dev tunnel) before it can
+replace a remote server in an McpTool.
+
+Run from EX3-AgentWithTools/samples:
+    python -m helpers.mcp_proxy https://learn.microsoft.com/api/mcp --port 8010 \
+        --tool-ttl microsoft_docs_search=900 microsoft_docs_fetch=3600
+    python -m helpers.standin.mcp_proxy_benchmark --latency-ms 150
+"""
+
+import argparse
+import hashlib
+import json
+import queue
+import threading
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+import httpx
+
+from helpers.mcp_catalog import tool_hash
+from helpers.mcp_client import McpError, McpSession
+from helpers.mcp_server import INTERNAL_ERROR, INVALID_PARAMS, McpHttpServer
+
+# Cached results kept (least recently used dropped first)
+MAX_CACHE_ENTRIES = 10_000
+
+
+def _digest(value: Any) -> str:
+    canonical = json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class UpstreamPool:
+    """
+    Initialized sessions with one upstream server, sharing a pooled HTTP client.
+
+    :param server_url: Upstream MCP endpoint
+    :param headers: Headers sent upstream
+    :param size: Maximum concurrent upstream calls (and sessions kept)
+    :param timeout: Request timeout in seconds
+    """
+
+    def __init__(self, server_url: str, headers: Optional[Mapping[str, str]] = None, size: int = 8,
+                 timeout: float = 30.0):
+        self.server_url = server_url
+        self.headers = dict(headers or {})
+        self.sessions_opened = 0
+        self._client = httpx.Client(timeout=timeout, follow_redirects=True,
+                                    limits=httpx.Limits(max_connections=size, max_keepalive_connections=size))
+        self._idle: "queue.LifoQueue[McpSession]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def session(self) -> Iterator[McpSession]:
+        """Borrows an initialized session; a session whose connection failed is closed instead of returned."""
+        with self._slots:
+            try:
+                session = self._idle.get_nowait()
+            except queue.Empty:
+                session = McpSession(self.server_url, headers=self.headers, client=self._client)
+                with self._lock:
+                    self.sessions_opened += 1
+            try:
+                yield session
+            except httpx.HTTPError:
+                session.close()
+                raise
+            except BaseException:
+                self._idle.put(session)
+                raise
+            else:
+                self._idle.put(session)
+
+    def request(self, call: str, *args: Any) -> Any:
+        """
+        Runs a session method, retrying once on a fresh session (the upstream may have dropped an idle one).
+
+        :param call: McpSession method name (list_tools, call_tool, initialize)
+        """
+        for attempt in range(2):
+            try:
+                with self.session() as session:
+                    return getattr(session, call)(*args)
+            except (httpx.TransportError, httpx.HTTPStatusError):
+                if attempt:
+                    raise
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+        self._client.close()
+
+
+class McpProxy(McpHttpServer):
+    """
+    MCP server forwarding to an upstream server, with a result cache.
+
+    :param upstream_url: Upstream MCP endpoint
+    :param upstream_headers: Headers sent upstream (e.g. an API key)
+    :param ttl: Seconds results of tools annotated read-only or idempotent are cached (0 disables that)
+    :param tool_ttls: Per-tool TTLs overriding the annotations (0 never caches the tool)
+    :param pool_size: Maximum concurrent upstream calls
+    :param max_entries: Cached results kept
+    :param host: Interface to bind
+    :param port: Port to bind (0 picks a free port)
+    :param verbose: Log every request to stderr
+    """
+
+    def __init__(self, upstream_url: str, upstream_headers: Optional[Mapping[str, str]] = None, ttl: float = 900.0,
+                 tool_ttls: Optional[Mapping[str, float]] = None, pool_size: int = 8,
+                 max_entries: int = MAX_CACHE_ENTRIES, host: str = "127.0.0.1", port: int = 0, verbose: bool = False):
+        super().__init__("mcp-proxy", host=host, port=port, verbose=verbose)
+        self.upstream = UpstreamPool(upstream_url, upstream_headers, size=pool_size)
+        self.ttl = ttl
+        self.tool_ttls = dict(tool_ttls or {})
+        self.max_entries = max_entries
+        self.stats: Counter = Counter()
+        self._catalog: Optional[Tuple[float, List[Dict[str, Any]], Dict[str, Dict[str, Any]]]] = None
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._blobs: Dict[str, Tuple[Dict[str, Any], int]] = {}
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def initialize_result(self) -> Dict[str, Any]:
+        result = super().initialize_result()
+        upstream_info = self.upstream.request("initialize")
+        result["serverInfo"] = dict(upstream_info, name=f"{upstream_info.get('name', 'upstream')} (cached)")
+        return result
+
+    def list_tools(self) -> List[Dict[str, Any]]:
+        return self._tools_catalog()[0]
+
+    def call_tool(self, name: str, arguments: Mapping[str, Any]) -> Dict[str, Any]:
+        tool = self._tools_catalog()[1].get(name)
+        if tool is None:
+            raise McpError(INVALID_PARAMS, f"Unknown tool: {name}")
+        ttl = self._ttl(tool)
+        if not ttl:
+            self.stats["uncached"] += 1
+            return self._forward(name, arguments)
+
+        key = _digest([name, tool_hash(tool), arguments])
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return self._blobs[entry[0]][0]
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+                self.stats["misses"] += 1
+            else:
+                self.stats["coalesced"] += 1
+        if not leader:
+            return future.result()
+
+        try:
+            result = self._forward(name, arguments)
+        except BaseException as e:
+            with self._lock:
+                del self._inflight[key]
+            future.set_exception(e)
+            raise
+        with self._lock:
+            if not result.get("isError"):
+                self._store(key, result, ttl)
+            del self._inflight[key]
+        future.set_result(result)
+        return result
+
+    def report(self) -> Dict[str, Any]:
+        """Cache hits, misses, coalesced and uncached calls, upstream calls and sessions, stored results."""
+        with self._lock:
+            return dict(self.stats, entries=len(self._entries), stored_results=len(self._blobs),
+                        upstream_sessions=self.upstream.sessions_opened)
+
+    def stop(self) -> None:
+        super().stop()
+        self.upstream.close()
+
+    def _forward(self, name: str, arguments: Mapping[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            self.stats["upstream_calls"] += 1
+        try:
+            return self.upstream.request("call_tool", name, arguments)
+        except httpx.HTTPError as e:
+            raise McpError(INTERNAL_ERROR, f"Upstream unavailable: {e}") from e
+
+    def _tools_catalog(self) -> Tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+        catalog = self._catalog
+        if catalog is None or catalog[0] <= time.monotonic():
+            try:
+                tools = self.upstream.request("list_tools")
+            except httpx.HTTPError as e:
+                if catalog is None:
+                    raise McpError(INTERNAL_ERROR, f"Upstream unavailable: {e}") from e
+                return catalog[1], catalog[2]  # Keep serving the last catalog
+            # The catalog is refreshed as often as the shortest-lived results
+            catalog = self._catalog = (time.monotonic() + (self.ttl or 300), tools,
+                                       {tool["name"]: tool for tool in tools})
+        return catalog[1], catalog[2]
+
+    def _ttl(self, tool: Mapping[str, Any]) -> float:
+        if tool["name"] in self.tool_ttls:
+            return self.tool_ttls[tool["name"]]
+        annotations = tool.get("annotations") or {}
+        return self.ttl if annotations.get("readOnlyHint") or annotations.get("idempotentHint") else 0.0
+
+    def _store(self, key: str, result: Dict[str, Any], ttl: float) -> None:
+        digest = _digest(result)
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.stats["unchanged" if previous[0] == digest else "changed"] += 1
+            self._release(previous[0])
+        if digest in self._blobs:
+            blob, references = self._blobs[digest]
+            self._blobs[digest] = (blob, references + 1)
+            if previous is None or previous[0] != digest:
+                self.stats["deduplicated"] += 1
+        else:
+            self._blobs[digest] = (result, 1)
+        self._entries[key] = (digest, time.monotonic() + ttl)
+        while len(self._entries) > self.max_entries:
+            _, (evicted, _) = self._entries.popitem(last=False)
+            self._release(evicted)
+
+    def _release(self, digest: str) -> None:
+        blob, references = self._blobs[digest]
+        if references > 1:
+            self._blobs[digest] = (blob, references - 1)
+        else:
+            del self._blobs[digest]
+
+
+def _parse_pairs(pairs: List[str], separator: str) -> Dict[str, str]:
+    parsed = {}
+    for pair in pairs:
+        name, found, value = pair.partition(separator)
+        if not found:
+            raise SystemExit(f"Expected NAME{separator}VALUE, got '{pair}'")
+        parsed[name.strip()] = value.strip()
+    return parsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve a caching proxy in front of an MCP server")
+    parser.add_argument("upstream_url", help="Upstream MCP endpoint")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    parser.add_argument("--port", type=int, default=8010, help="Port to bind")
+    parser.add_argument("--ttl", type=float, default=900.0, help="TTL of read-only/idempotent tool results (s)")
+    parser.add_argument("--tool-ttl", nargs="+", default=[], metavar="TOOL=SECONDS",
+                        help="Per-tool TTLs (0 never caches the tool)")
+    parser.add_argument("--header", nargs="+", default=[], metavar="NAME:VALUE", help="Headers sent upstream")
+    parser.add_argument("--pool-size", type=int, default=8, help="Maximum concurrent upstream calls")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args()
+
+    proxy = McpProxy(args.upstream_url, upstream_headers=_parse_pairs(args.header, ":"), ttl=args.ttl,
+                     tool_ttls={name: float(ttl) for name, ttl in _parse_pairs(args.tool_ttl, "=").items()},
+                     pool_size=args.pool_size, host=args.host, port=args.port, verbose=args.verbose)
+    print(f"🗄️  Caching proxy for {args.upstream_url} serving on {proxy.url}")
+    try:
+        proxy.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n👋 Stopped: {proxy.report()}")
+    finally:
+        proxy.server_close()
+        proxy.upstream.close()
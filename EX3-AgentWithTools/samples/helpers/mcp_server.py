@@ -0,0 +1,249 @@
+"""
+Minimal MCP server over the streamable HTTP transport.
+
+Serves the JSON-RPC subset the agents service and McpSession use
+(initialize, ping, tools/list, tools/call) on the standard library's
+ThreadingHTTPServer, answering every POST with a plain JSON response, or
+over stdio (one message per line) for local MCP clients. Tools
+are registered with add_tool(); subclasses such as the caching proxy
+override list_tools() and call_tool() instead.
+
+Usage:
+    server = McpHttpServer("docs", port=8003)
+    server.add_tool("echo", "Echoes the text", {"type": "object", "properties": {"text": {"type": "string"}}},
+                    lambda text: text, read_only=True)
+    url = server.start()  # http://127.0.0.1:8003/mcp
+"""
+
+import json
+import sys
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Mapping, Optional, TextIO
+
+from helpers.mcp_client import PROTOCOL_VERSION, McpError
+
+# JSON-RPC error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+
+def tool_result(value: Any, is_error: bool = False) -> Dict[str, Any]:
+    """
+    tools/call result for a value: text content, plus structured content for objects.
+
+    :param value: String, or any JSON-serializable value
+    :param is_error: Mark the result as a tool error (the model sees it and can correct the call)
+    """
+    text = value if isinstance(value, str) else json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+    result: Dict[str, Any] = {"content": [{"type": "text", "text": text}], "isError": is_error}
+    if isinstance(value, Mapping):
+        result["structuredContent"] = value
+    return result
+
+
+class McpHttpServer(ThreadingHTTPServer):
+    """
+    Streamable HTTP MCP endpoint.
+
+    :param name: Server name reported by initialize
+    :param version: Server version reported by initialize
+    :param host: Interface to bind
+    :param port: Port to bind (0 picks a free port)
+    :param instructions: Instructions reported by initialize
+    :param verbose: Log every request to stderr
+    :param listen: Bind the HTTP port (False for servers only used over stdio)
+    """
+
+    daemon_threads = True
+
+    def __init__(self, name: str, version: str = "1.0", host: str = "127.0.0.1", port: int = 0,
+                 instructions: Optional[str] = None, verbose: bool = False, listen: bool = True):
+        self.server_info = {"name": name, "version": version}
+        self.instructions = instructions
+        self.verbose = verbose
+        self._tools: Dict[str, Dict[str, Any]] = {}
+        self._handlers: Dict[str, Callable[..., Any]] = {}
+        self._thread: Optional[threading.Thread] = None
+        super().__init__((host, port), _McpRequestHandler, bind_and_activate=listen)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/mcp"
+
+    def add_tool(self, name: str, description: str, input_schema: Mapping[str, Any], handler: Callable[..., Any],
+                 read_only: bool = False) -> None:
+        """
+        Registers a tool.
+
+        :param name: Tool name
+        :param description: Description shown to the model
+        :param input_schema: JSON schema of the arguments (an object schema)
+        :param handler: Called with the arguments as keyword arguments; its return value becomes the result
+        :param read_only: Advertise the tool as read-only and idempotent (callers may cache its results)
+        """
+        tool: Dict[str, Any] = {"name": name, "description": description, "inputSchema": dict(input_schema)}
+        if read_only:
+            tool["annotations"] = {"readOnlyHint": True, "idempotentHint": True}
+        self._tools[name] = tool
+        self._handlers[name] = handler
+
+    def initialize_result(self) -> Dict[str, Any]:
+        result = {"protocolVersion": PROTOCOL_VERSION, "capabilities": {"tools": {"listChanged": False}},
+                  "serverInfo": self.server_info}
+        if self.instructions:
+            result["instructions"] = self.instructions
+        return result
+
+    def list_tools(self) -> List[Dict[str, Any]]:
+        return list(self._tools.values())
+
+    def call_tool(self, name: str, arguments: Mapping[str, Any]) -> Dict[str, Any]:
+        """
+        Runs a registered tool; exceptions from the handler become error results.
+
+        :raises McpError: If the tool does not exist
+        """
+        if name not in self._handlers:
+            raise McpError(INVALID_PARAMS, f"Unknown tool: {name}")
+        try:
+            return tool_result(self._handlers[name](**arguments))
+        except Exception as e:  # Reported to the model as a tool error rather than a protocol error
+            return tool_result(f"{type(e).__name__}: {e}", is_error=True)
+
+    def handle_request(self, method: str, params: Mapping[str, Any]) -> Dict[str, Any]:
+        """
+        Answers one JSON-RPC request.
+
+        :raises McpError: For unknown methods and invalid parameters
+        """
+        if method == "initialize":
+            return self.initialize_result()
+        if method == "ping":
+            return {}
+        if method == "tools/list":
+            return {"tools": self.list_tools()}
+        if method == "tools/call":
+            if not isinstance(params.get("name"), str) or not isinstance(params.get("arguments", {}), Mapping):
+                raise McpError(INVALID_PARAMS, "tools/call needs a tool name and an arguments object")
+            return self.call_tool(params["name"], params.get("arguments") or {})
+        raise McpError(METHOD_NOT_FOUND, f"Method not found: {method}")
+
+    def handle_message(self, message: Any) -> Optional[Dict[str, Any]]:
+        """
+        Answers one JSON-RPC message.
+
+        :return: The response, or None for notifications
+        """
+        if not isinstance(message, Mapping) or not isinstance(message.get("method"), str):
+            return _error(message.get("id") if isinstance(message, Mapping) else None, INVALID_REQUEST, "Invalid request")
+        if "id" not in message:
+            return None  # Notification
+        try:
+            result = self.handle_request(message["method"], message.get("params") or {})
+        except McpError as e:
+            return _error(message["id"], e.code, e.message, e.data)
+        except Exception as e:  # Keep serving; the caller gets a JSON-RPC error
+            return _error(message["id"], INTERNAL_ERROR, f"{type(e).__name__}: {e}")
+        return {"jsonrpc": "2.0", "id": message["id"], "result": result}
+
+    def serve_stdio(self, stdin: Optional[TextIO] = None, stdout: Optional[TextIO] = None) -> None:
+        """
+        Serves the stdio transport (one JSON-RPC message per line) until stdin closes.
+
+        Construct the server with listen=False when it should not open a port.
+        """
+        stdin = stdin or sys.stdin
+        stdout = stdout or sys.stdout
+        for line in stdin:
+            if not line.strip():
+                continue
+            try:
+                message = json.loads(line)
+            except ValueError:
+                reply: Any = _error(None, PARSE_ERROR, "Parse error")
+            else:
+                replies = [reply for reply in map(self.handle_message, message if isinstance(message, list) else [message])
+                           if reply is not None]
+                reply = replies if isinstance(message, list) else (replies[0] if replies else None)
+            if reply:
+                stdout.write(json.dumps(reply, separators=(",", ":")) + "\n")
+                stdout.flush()
+
+    def start(self) -> str:
+        """
+        Serves in a background thread (for benchmarks and tests in the same process).
+
+        :return: URL of the MCP endpoint
+        """
+        self._thread = threading.Thread(target=self.serve_forever, name="mcp-server", daemon=True)
+        self._thread.start()
+        return self.url
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+        if self._thread:
+            self._thread.join()
+
+
+class _McpRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Keep-alive responses need TCP_NODELAY, as in helpers/standin/server.py (_RequestHandler)
+    disable_nagle_algorithm = True
+    server: McpHttpServer
+
+    def do_POST(self) -> None:
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        try:
+            messages = json.loads(body)
+        except ValueError:
+            self._send(400, _error(None, PARSE_ERROR, "Parse error"))
+            return
+
+        batch = isinstance(messages, list)
+        replies = [reply for reply in map(self.server.handle_message, messages if batch else [messages]) if reply is not None]
+        session_id = None
+        if any(isinstance(message, Mapping) and message.get("method") == "initialize"
+               for message in (messages if batch else [messages])):
+            session_id = uuid.uuid4().hex
+        if not replies:
+            self._send(202, None, session_id)
+        else:
+            self._send(200, replies if batch else replies[0], session_id)
+
+    def do_GET(self) -> None:
+        # No server-initiated messages: the optional GET stream is not offered
+        self._send(405, None, allow="POST, DELETE")
+
+    def do_DELETE(self) -> None:
+        self._send(200, None)
+
+    def _send(self, status: int, payload: Any, session_id: Optional[str] = None, allow: Optional[str] = None) -> None:
+        data = b"" if payload is None else json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        self.send_response(status)
+        if payload is not None:
+            self.send_header("Content-Type", "application/json")
+        if session_id:
+            self.send_header("Mcp-Session-Id", session_id)
+        if allow:
+            self.send_header("Allow", allow)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def _error(message_id: Any, code: int, message: str, data: Any = None) -> Dict[str, Any]:
+    error: Dict[str, Any] = {"code": code, "message": message}
+    if data is not None:
+        error["data"] = data
+    return {"jsonrpc": "2.0", "id": message_id, "error": error}
@@ -0,0 +1,354 @@
+"""
+Typed columns for the NIFTY 500 quarterly results (samples/files).
+
+The CSV stores amounts as quoted, thousands-separated strings ("1,057",
+"1,202.7"), margins as percentages ("18.48%") and a few amounts with their
+trailing zeros dropped by the export ("15,33" for 15,330). load_quarterly_results
+parses it once into NumPy columns: float64 for the amounts (NaN when
+missing), the margin in percent, sector and industry as integer codes into
+sorted category arrays, and the identifiers as strings.
+
+The parsed columns are saved as .npy files under samples/.cache/nifty, in a
+directory named after the CSV's SHA-256, and later loads memory-map them
+instead of parsing: only the pages a query touches are read, and processes
+loading the same file share them. Larger files with the same schema are
+parsed in chunks, so the text held at once is bounded by chunk_rows.
+
+Usage:
+    table = load_quarterly_results()
+    table.column("EPS_TTM"), table.labels("sector"), table.row(0)
+    table.summary_table(rows, ["revenue"], total=len(rows))  # the compact shape of the tools
+
+Run from EX3-AgentWithTools/samples to time parsing against the cache:
+    python -m helpers.nifty --synthetic-rows 1000000
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import math
+import os
+import shutil
+import tempfile
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional
+
+import numpy as np
+
+from helpers.tool_cache import file_sha256
+
+DEFAULT_CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "files",
+                           "nifty_500_quarterly_results new.csv")
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "nifty")
+# Bumped when the cached layout changes, so older caches are ignored
+CACHE_FORMAT = 1
+
+TEXT_COLUMNS = ("name", "NSE_code", "BSE_code")
+CATEGORICAL_COLUMNS = ("sector", "industry")
+METRIC_COLUMNS = ("revenue", "operating_expenses", "operating_profit", "operating_profit_margin", "depreciation",
+                  "interest", "profit_before_tax", "tax", "net_profit", "EPS", "profit_TTM", "EPS_TTM")
+ALL_COLUMNS = (*TEXT_COLUMNS, *CATEGORICAL_COLUMNS, *METRIC_COLUMNS)
+# Identifying columns leading every row of a summary table
+SUMMARY_FIELDS = ("name", "NSE_code", "sector", "industry")
+# Aggregates of a metric over a group of companies
+AGGREGATES = ("count", "sum", "mean", "median", "min", "max")
+
+
+def parse_number(text: str) -> float:
+    """
+    Parses an amount or percentage of the results CSV.
+
+    :param text: "1,057", "-228.6", "18.48%", "15,33" (read as 15,330) or "" (NaN)
+    :return: The value (percentages in percent)
+    """
+    text = text.strip().rstrip("%")
+    if not text:
+        return math.nan
+    if "," in text:
+        integer, dot, fraction = text.partition(".")
+        groups = integer.split(",")
+        # Thousands groups always have three digits; shorter last groups lost their trailing zeros
+        groups[-1] = groups[-1].ljust(3, "0")
+        text = "".join(groups) + dot + fraction
+    return float(text)
+
+
+def round_value(value: float) -> Optional[float]:
+    """An amount as returned by the tools: rounded to 2 decimals, NaN as None."""
+    return None if value != value else round(float(value), 2)
+
+
+class QuarterlyResults:
+    """
+    Column store of the quarterly results.
+
+    :param columns: Column name -> array (metrics float64, categorical columns as int16 codes, text as str)
+    :param categories: Categorical column name -> sorted labels indexed by code
+    :param source: Where the columns come from ("csv" or "cache")
+    """
+
+    def __init__(self, columns: Mapping[str, np.ndarray], categories: Mapping[str, np.ndarray], source: str = "csv"):
+        self.columns = dict(columns)
+        self.categories = dict(categories)
+        self.source = source
+        self._summary_columns: Optional[List[list]] = None
+
+    def __len__(self) -> int:
+        return len(self.columns[TEXT_COLUMNS[0]])
+
+    def column(self, name: str) -> np.ndarray:
+        if name not in self.columns:
+            raise KeyError(f"Unknown column '{name}'")
+        return self.columns[name]
+
+    def labels(self, name: str) -> np.ndarray:
+        """Decoded values of a categorical column."""
+        return self.categories[name][self.columns[name]]
+
+    def code(self, name: str, label: str) -> Optional[int]:
+        """Code of a categorical label (case-insensitive), or None when it does not occur."""
+        categories = self.categories[name]
+        position = int(np.searchsorted(categories, label.strip().upper()))
+        return position if position < len(categories) and categories[position] == label.strip().upper() else None
+
+    def summary_table(self, rows: np.ndarray, metrics: Iterable[str], total: int) -> Dict[str, Any]:
+        """
+        Compact tabular output: column names once, then one list per company.
+
+        :param rows: Row indices, in output order
+        :param metrics: Metric columns appended after SUMMARY_FIELDS
+        :param total: Number of matching rows (rows may be a page of them)
+        :return: {"columns", "rows", "total"}
+        """
+        if self._summary_columns is None:
+            # Python lists, so building a result does not box NumPy scalars
+            self._summary_columns = [self.column("name").tolist(), self.column("NSE_code").tolist(),
+                                     self.labels("sector").tolist(), self.labels("industry").tolist()]
+        metrics = list(metrics)
+        rows = rows.tolist()
+        data = [[column[row] for column in self._summary_columns] for row in rows]
+        for metric in metrics:
+            values = self.column(metric)
+            for record, row in zip(data, rows):
+                record.append(round_value(values[row]))
+        return {"columns": [*SUMMARY_FIELDS, *metrics], "rows": data, "total": total}
+
+    def row(self, index: int, fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """One record as a dict (NaN as None, amounts rounded to 2 decimals)."""
+        record: Dict[str, Any] = {}
+        for name in fields or ALL_COLUMNS:
+            if name in self.categories:
+                record[name] = str(self.categories[name][self.columns[name][index]])
+            elif name in TEXT_COLUMNS:
+                record[name] = str(self.columns[name][index])
+            else:
+                value = float(self.columns[name][index])
+                record[name] = None if math.isnan(value) else round(value, 2)
+        return record
+
+
+def _file_digest(path: str, cache_dir: str) -> str:
+    """SHA-256 of a file, remembered per (path, size, mtime) so unchanged files are not hashed again."""
+    path = os.path.abspath(path)
+    memo_path = os.path.join(cache_dir, "hashes.json")
+    try:
+        with open(memo_path, "r", encoding="utf-8") as f:
+            memo = json.load(f)
+    except (OSError, ValueError):
+        memo = {}
+    known = memo.get(path)
+    digest = file_sha256(path, memo)
+    if memo[path] is not known:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(memo, f)
+        os.replace(tmp_path, memo_path)
+    return digest
+
+
+def _read_chunks(path: str, chunk_rows: int) -> Iterator[Dict[str, np.ndarray]]:
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        header = [name.strip() for name in next(reader, [])]
+        missing = [name for name in ALL_COLUMNS if name not in header]
+        if missing:
+            raise ValueError(f"{path} has no column(s) {', '.join(missing)}")
+        positions = {name: header.index(name) for name in ALL_COLUMNS}
+        while True:
+            rows = [row for row in itertools.islice(reader, chunk_rows) if row]
+            if not rows:
+                return
+            # Transpose in C; short rows are padded with empty values
+            by_column = list(itertools.zip_longest(*rows, fillvalue=""))
+            yield {name: np.strings.strip(np.array(by_column[position], dtype=str))
+                   for name, position in positions.items()}
+
+
+def _parse_numbers(values: np.ndarray) -> np.ndarray:
+    """parse_number over a whole column with NumPy string ufuncs (no per-value Python calls)."""
+    text = np.strings.rstrip(values, "%")
+    numbers = np.full(len(text), np.nan)
+    empty = np.strings.str_len(text) == 0
+    grouped = np.strings.find(text, ",") >= 0
+    plain = ~(empty | grouped)
+    try:
+        numbers[plain] = text[plain].astype(np.float64)
+        if grouped.any():
+            integer, dot, fraction = np.strings.partition(text[grouped], ".")
+            # Pad the last thousands group back to three digits ("15,33" -> "15330")
+            last_group = np.strings.str_len(integer) - np.strings.rfind(integer, ",") - 1
+            padding = np.strings.multiply("0", np.maximum(3 - last_group, 0))
+            digits = np.strings.add(np.strings.replace(integer, ",", ""), padding)
+            numbers[grouped] = np.strings.add(np.strings.add(digits, dot), fraction).astype(np.float64)
+    except ValueError:
+        # Report the offending value the way the scalar parser does
+        return np.fromiter(map(parse_number, values.tolist()), dtype=np.float64, count=len(values))
+    return numbers
+
+
+def parse_quarterly_results(path: str, chunk_rows: int = 100_000) -> QuarterlyResults:
+    """
+    Parses a results CSV into typed columns, chunk_rows rows at a time.
+
+    Only one chunk of text is held at once; categorical labels are coded as they first occur and renumbered in
+    sorted order at the end.
+
+    :param path: CSV with the NIFTY 500 quarterly results columns
+    :param chunk_rows: Rows parsed per chunk
+    :return: The column store
+    """
+    parts: Dict[str, List[np.ndarray]] = {name: [] for name in ALL_COLUMNS}
+    first_seen: Dict[str, Dict[str, int]] = {name: {} for name in CATEGORICAL_COLUMNS}
+    for chunk in _read_chunks(path, chunk_rows):
+        for name in TEXT_COLUMNS:
+            parts[name].append(chunk[name])
+        for name in CATEGORICAL_COLUMNS:
+            seen = first_seen[name]
+            labels, local_codes = np.unique(np.strings.upper(chunk[name]), return_inverse=True)
+            to_global = np.array([seen.setdefault(label, len(seen)) for label in labels.tolist()], dtype=np.int32)
+            parts[name].append(to_global[local_codes])
+        for name in METRIC_COLUMNS:
+            parts[name].append(_parse_numbers(chunk[name]))
+
+    columns: Dict[str, np.ndarray] = {}
+    categories: Dict[str, np.ndarray] = {}
+    for name in ALL_COLUMNS:
+        if not parts[name]:
+            raise ValueError(f"{path} has no rows")
+        columns[name] = np.concatenate(parts[name])
+    for name in CATEGORICAL_COLUMNS:
+        labels = np.array(list(first_seen[name]), dtype=str)
+        order = np.argsort(labels, kind="stable")
+        renumber = np.empty(len(labels), dtype=np.int32)
+        renumber[order] = np.arange(len(labels), dtype=np.int32)
+        categories[name] = labels[order]
+        columns[name] = renumber[columns[name]].astype(np.int16 if len(labels) <= np.iinfo(np.int16).max else np.int32)
+    return QuarterlyResults(columns, categories)
+
+
+def _save_cache(table: QuarterlyResults, directory: str) -> None:
+    parent = os.path.dirname(directory)
+    os.makedirs(parent, exist_ok=True)
+    # Written to a temporary directory first so concurrent loads never see a partial cache
+    tmp_dir = tempfile.mkdtemp(dir=parent, suffix=".tmp")
+    for name, values in table.columns.items():
+        np.save(os.path.join(tmp_dir, f"{name}.npy"), values)
+    for name, labels in table.categories.items():
+        np.save(os.path.join(tmp_dir, f"categories-{name}.npy"), labels)
+    with open(os.path.join(tmp_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump({"rows": len(table), "columns": list(table.columns), "categories": list(table.categories)}, f)
+    try:
+        os.replace(tmp_dir, directory)
+    except OSError:
+        shutil.rmtree(tmp_dir, ignore_errors=True)  # Another process cached the same file first
+
+
+def _load_cache(directory: str) -> Optional[QuarterlyResults]:
+    try:
+        with open(os.path.join(directory, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        # Columns are memory-mapped: pages are read on first access and shared between processes
+        columns = {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r") for name in meta["columns"]}
+        categories = {name: np.load(os.path.join(directory, f"categories-{name}.npy")) for name in meta["categories"]}
+    except (OSError, ValueError, KeyError):
+        return None
+    return QuarterlyResults(columns, categories, source="cache")
+
+
+def load_quarterly_results(path: str = DEFAULT_CSV, cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+                           chunk_rows: int = 100_000) -> QuarterlyResults:
+    """
+    Loads the results CSV as typed columns, from the binary cache when the file was parsed before.
+
+    :param path: CSV with the NIFTY 500 quarterly results columns
+    :param cache_dir: Directory of the binary cache (None parses the CSV every time)
+    :param chunk_rows: Rows parsed per chunk when the CSV has to be parsed
+    :return: The column store (memory-mapped when it comes from the cache)
+    """
+    if cache_dir is None:
+        return parse_quarterly_results(path, chunk_rows)
+    directory = os.path.join(cache_dir, f"{_file_digest(path, cache_dir)}-v{CACHE_FORMAT}")
+    table = _load_cache(directory)
+    if table is None:
+        table = parse_quarterly_results(path, chunk_rows)
+        _save_cache(table, directory)
+    return table
+
+
+def write_synthetic_results(path: str, rows: int, source: str = DEFAULT_CSV) -> None:
+    """
+    Writes a larger results file with the same schema and formatting, by repeating the source rows under new codes.
+
+    :param path: Output CSV
+    :param rows: Number of rows
+    :param source: Results CSV the rows are copied from
+    """
+    with open(source, "r", encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        base = list(reader)
+    name_at, code_at = header.index("name"), header.index("NSE_code")
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        for index in range(rows):
+            row = list(base[index % len(base)])
+            copy = index // len(base)
+            if copy:
+                row[name_at] = f"{row[name_at]} #{copy}"
+                row[code_at] = f"{row[code_at]}{copy}"
+            writer.writerow(row)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time parsing the quarterly results CSV vs loading the binary cache")
+    parser.add_argument("csv", nargs="?", default=DEFAULT_CSV, help="Quarterly results CSV")
+    parser.add_argument("--synthetic-rows", type=int, help="Benchmark a synthetic file of this many rows instead")
+    parser.add_argument("--chunk-rows", type=int, default=100_000, help="Rows parsed per chunk")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        csv_path = args.csv
+        if args.synthetic_rows:
+            csv_path = os.path.join(work_dir, "results.csv")
+            write_synthetic_results(csv_path, args.synthetic_rows, args.csv)
+        cache_dir = os.path.join(work_dir, "cache")
+
+        start = time.perf_counter()
+        table = load_quarterly_results(csv_path, cache_dir=cache_dir, chunk_rows=args.chunk_rows)
+        cold = time.perf_counter() - start
+        start = time.perf_counter()
+        cached = load_quarterly_results(csv_path, cache_dir=cache_dir)
+        warm = time.perf_counter() - start
+        start = time.perf_counter()
+        total = float(np.nansum(cached.column("net_profit")))
+        first_scan = time.perf_counter() - start
+
+        assert all(np.array_equal(table.columns[name], cached.columns[name], equal_nan=name in METRIC_COLUMNS)
+                   for name in table.columns)
+        print(f"📊 {len(table):,} rows ({os.path.getsize(csv_path) / 1e6:.1f} MB CSV): parsed and cached in "
+              f"{cold * 1000:.0f} ms, loaded from the cache in {warm * 1000:.1f} ms "
+              f"(first scan of a column {first_scan * 1000:.1f} ms, net profit total {total:,.0f})")
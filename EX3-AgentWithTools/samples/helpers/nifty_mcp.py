@@ -0,0 +1,310 @@
+"""
+MCP server over the NIFTY 500 quarterly results, answered from precomputed indexes.
+
+The CSV is parsed once into typed columns (helpers.nifty). At startup
+NiftyIndex precomputes, for every metric, the descending order of all
+companies and of the companies of every sector and industry, and every
+group's count, sum, mean, median, min and max. The tools then only slice
+those arrays:
+
+- top_companies: the first k entries of a precomputed order;
+- screen_companies: a vectorized mask over the filters, applied to the
+  precomputed order of the sort metric;
+- group_summary: a lookup of the precomputed aggregates;
+- list_sectors and get_company: dictionary lookups.
+
+A call takes tens of microseconds including the JSON encoding, so the server is a
+realistic data backend for the MCP agent pattern that can be benchmarked
+offline. It speaks HTTP (the agents service needs it reachable from Azure,
+e.g. through a dev tunnel) and stdio (local MCP clients).
+
+Run from EX3-AgentWithTools/samples:
+    python -m helpers.nifty_mcp --transport http --port 8004
+    python -m helpers.nifty_mcp --transport stdio
+    python -m helpers.nifty_mcp --benchmark
+"""
+
+import argparse
+import json
+import math
+import time
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from helpers.mcp_server import McpHttpServer
+from helpers.nifty import (
+    AGGREGATES,
+    CATEGORICAL_COLUMNS,
+    DEFAULT_CSV,
+    METRIC_COLUMNS,
+    QuarterlyResults,
+    load_quarterly_results,
+    round_value,
+)
+
+OPERATORS = {">": np.greater, ">=": np.greater_equal, "<": np.less, "<=": np.less_equal,
+             "==": np.equal, "!=": np.not_equal}
+MAX_LIMIT = 100
+
+
+def _descending(values: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    """Rows ordered by descending value (stable, so ties keep CSV order), rows with NaN left out."""
+    rows = rows[~np.isnan(values[rows])]
+    return rows[np.argsort(-values[rows], kind="stable")]
+
+
+class NiftyIndex:
+    """
+    Precomputed orders and aggregates over the quarterly results.
+
+    :param table: Column store from load_quarterly_results
+    """
+
+    def __init__(self, table: QuarterlyResults):
+        self.table = table
+        all_rows = np.arange(len(table), dtype=np.int32)
+        self.symbols = {str(symbol).upper(): index for index, symbol in enumerate(table.column("NSE_code"))}
+        self.symbols.update({str(code): index for index, code in enumerate(table.column("BSE_code"))
+                             if str(code).isdigit()})
+
+        # Rows of every sector and industry, and for each metric their descending order
+        self.group_rows: Dict[str, List[np.ndarray]] = {}
+        self.order: Dict[Tuple[Optional[str], int, str], np.ndarray] = {}
+        self.aggregates: Dict[Tuple[str, str], Dict[str, np.ndarray]] = {}
+        for metric in METRIC_COLUMNS:
+            self.order[(None, 0, metric)] = _descending(table.column(metric), all_rows)
+        for field in CATEGORICAL_COLUMNS:
+            codes = table.column(field)
+            groups = [np.flatnonzero(codes == code).astype(np.int32) for code in range(len(table.categories[field]))]
+            self.group_rows[field] = groups
+            for metric in METRIC_COLUMNS:
+                values = table.column(metric)
+                stats: Dict[str, List[float]] = {name: [] for name in AGGREGATES}
+                for code, rows in enumerate(groups):
+                    ordered = self.order[(field, code, metric)] = _descending(values, rows)
+                    present = values[ordered]
+                    stats["count"].append(len(present))
+                    stats["sum"].append(present.sum() if len(present) else math.nan)
+                    stats["mean"].append(present.mean() if len(present) else math.nan)
+                    stats["median"].append(np.median(present) if len(present) else math.nan)
+                    stats["max"].append(present[0] if len(present) else math.nan)
+                    stats["min"].append(present[-1] if len(present) else math.nan)
+                self.aggregates[(field, metric)] = {name: np.array(column, dtype=np.float64)
+                                                    for name, column in stats.items()}
+        # Output columns as Python lists, so building a result does not box NumPy scalars
+        self.category_labels = {field: table.categories[field].tolist() for field in CATEGORICAL_COLUMNS}
+        # Industries of each sector, for list_sectors
+        sector_codes, industry_codes = table.column("sector"), table.column("industry")
+        self.industries_of = [np.unique(industry_codes[rows]) for rows in self.group_rows["sector"]]
+        self._sector_of_industry = {int(industry): int(sector) for sector, industry in zip(sector_codes, industry_codes)}
+
+    def list_sectors(self, include_industries: bool = False) -> Dict[str, Any]:
+        labels = self.category_labels
+        sectors = []
+        for code, rows in enumerate(self.group_rows["sector"]):
+            sector: Dict[str, Any] = {"sector": labels["sector"][code], "companies": len(rows)}
+            if include_industries:
+                sector["industries"] = [labels["industry"][industry] for industry in self.industries_of[code].tolist()]
+            sectors.append(sector)
+        return {"sectors": sectors}
+
+    def get_company(self, symbol: str) -> Dict[str, Any]:
+        index = self.symbols.get(symbol.strip().upper())
+        if index is None:
+            # Fall back to a name prefix ("Tata Consultancy")
+            names = np.char.lower(self.table.column("name"))
+            matches = np.flatnonzero(np.char.startswith(names, symbol.strip().lower()))
+            if len(matches) != 1:
+                hint = f"; matches: {', '.join(self.table.column('NSE_code')[matches[:10]])}" if len(matches) else ""
+                raise ValueError(f"No single company for '{symbol}'{hint}")
+            index = int(matches[0])
+        return self.table.row(index)
+
+    def top_companies(self, metric: str, k: int = 10, sector: Optional[str] = None, industry: Optional[str] = None,
+                      ascending: bool = False) -> Dict[str, Any]:
+        self._check_metric(metric)
+        ordered = self._order(metric, sector, industry)
+        rows = ordered[::-1][:self._limit(k)] if ascending else ordered[:self._limit(k)]
+        return self.table.summary_table(rows, [metric], total=len(ordered))
+
+    def screen_companies(self, filters: Sequence[Mapping[str, Any]] = (), sector: Optional[str] = None,
+                         industry: Optional[str] = None, sort_by: str = "revenue", ascending: bool = False,
+                         limit: int = 20) -> Dict[str, Any]:
+        self._check_metric(sort_by)
+        table = self.table
+        mask = np.ones(len(table), dtype=bool)
+        metrics = [sort_by]
+        for condition in filters:
+            metric, operator, value = condition.get("metric"), condition.get("op"), condition.get("value")
+            self._check_metric(metric)
+            if operator not in OPERATORS:
+                raise ValueError(f"Unknown operator '{operator}', expected one of: {', '.join(OPERATORS)}")
+            if not isinstance(value, (int, float)) or isinstance(value, bool):
+                raise ValueError(f"Filter value for {metric} must be a number")
+            # NaN compares False, so companies without the metric never pass a filter on it
+            mask &= OPERATORS[operator](table.column(metric), value)
+            if metric not in metrics:
+                metrics.append(metric)
+        ordered = self._order(sort_by, sector, industry)
+        if ascending:
+            ordered = ordered[::-1]
+        matches = ordered[mask[ordered]]
+        return self.table.summary_table(matches[:self._limit(limit)], metrics, total=len(matches))
+
+    def group_summary(self, metric: str, by: str = "sector", aggregate: str = "sum", sector: Optional[str] = None,
+                      limit: Optional[int] = None) -> Dict[str, Any]:
+        self._check_metric(metric)
+        if by not in CATEGORICAL_COLUMNS:
+            raise ValueError(f"by must be one of: {', '.join(CATEGORICAL_COLUMNS)}")
+        if aggregate not in AGGREGATES:
+            raise ValueError(f"aggregate must be one of: {', '.join(AGGREGATES)}")
+        values = self.aggregates[(by, metric)][aggregate]
+        codes = np.arange(len(values))
+        if sector is not None:
+            if by != "industry":
+                raise ValueError("sector can only narrow an industry summary")
+            codes = self.industries_of[self._code("sector", sector)]
+        codes = codes[np.argsort(-np.nan_to_num(values[codes], nan=-math.inf), kind="stable")]
+        if limit is not None:
+            codes = codes[:self._limit(limit)]
+        labels = self.category_labels[by]
+        return {"metric": metric, "aggregate": aggregate, "by": by,
+                "groups": [[labels[code], round_value(value)] for code, value in zip(codes.tolist(), values[codes].tolist())]}
+
+    def _order(self, metric: str, sector: Optional[str], industry: Optional[str]) -> np.ndarray:
+        if industry is not None:
+            code = self._code("industry", industry)
+            if sector is not None and self._sector_of_industry[code] != self._code("sector", sector):
+                return np.empty(0, dtype=np.int32)
+            return self.order[("industry", code, metric)]
+        if sector is not None:
+            return self.order[("sector", self._code("sector", sector), metric)]
+        return self.order[(None, 0, metric)]
+
+    def _code(self, field: str, label: str) -> int:
+        code = self.table.code(field, label)
+        if code is None:
+            raise ValueError(f"Unknown {field} '{label}'; call list_sectors for the valid names")
+        return code
+
+    @staticmethod
+    def _check_metric(metric: Any) -> None:
+        if metric not in METRIC_COLUMNS:
+            raise ValueError(f"Unknown metric '{metric}', expected one of: {', '.join(METRIC_COLUMNS)}")
+
+    @staticmethod
+    def _limit(limit: Any) -> int:
+        if not isinstance(limit, int) or isinstance(limit, bool) or limit < 1:
+            raise ValueError("limit must be a positive integer")
+        return min(limit, MAX_LIMIT)
+
+
+def _metric_schema() -> Dict[str, Any]:
+    return {"type": "string", "enum": list(METRIC_COLUMNS)}
+
+
+class NiftyMcpServer(McpHttpServer):
+    """
+    MCP server exposing the NIFTY 500 quarterly results.
+
+    :param path: Results CSV
+    :param host: Interface to bind
+    :param port: Port to bind (0 picks a free port)
+    :param listen: Bind the HTTP port (False for stdio)
+    :param verbose: Log every request to stderr
+    """
+
+    def __init__(self, path: str = DEFAULT_CSV, host: str = "127.0.0.1", port: int = 0, listen: bool = True,
+                 verbose: bool = False):
+        super().__init__("nifty500", host=host, port=port, listen=listen, verbose=verbose,
+                         instructions="Quarterly results of the NIFTY 500 companies, amounts in INR crore. "
+                                      "Call list_sectors for the sector and industry names.")
+        self.index = NiftyIndex(load_quarterly_results(path))
+        index = self.index
+        group_filters = {"sector": {"type": "string"}, "industry": {"type": "string"}}
+
+        self.add_tool("list_sectors", "List the sectors with their number of companies (and optionally industries).",
+                      {"type": "object", "properties": {"include_industries": {"type": "boolean", "default": False}}},
+                      index.list_sectors, read_only=True)
+        self.add_tool("get_company", "Get the quarterly results of one company by NSE code, BSE code or name prefix.",
+                      {"type": "object", "properties": {"symbol": {"type": "string"}}, "required": ["symbol"]},
+                      index.get_company, read_only=True)
+        self.add_tool("top_companies", "Top (or bottom, with ascending) k companies by a metric, "
+                                       "optionally within a sector or industry.",
+                      {"type": "object", "properties": {"metric": _metric_schema(),
+                                                        "k": {"type": "integer", "default": 10},
+                                                        "ascending": {"type": "boolean", "default": False},
+                                                        **group_filters},
+                       "required": ["metric"]},
+                      index.top_companies, read_only=True)
+        self.add_tool("screen_companies", "Companies matching all the metric filters, sorted by a metric.",
+                      {"type": "object", "properties": {
+                          "filters": {"type": "array", "items": {
+                              "type": "object",
+                              "properties": {"metric": _metric_schema(), "op": {"type": "string", "enum": list(OPERATORS)},
+                                             "value": {"type": "number"}},
+                              "required": ["metric", "op", "value"]}},
+                          "sort_by": dict(_metric_schema(), default="revenue"),
+                          "ascending": {"type": "boolean", "default": False},
+                          "limit": {"type": "integer", "default": 20},
+                          **group_filters}},
+                      index.screen_companies, read_only=True)
+        self.add_tool("group_summary", "Aggregate a metric per sector or industry "
+                                       "(industries can be narrowed to one sector).",
+                      {"type": "object", "properties": {
+                          "metric": _metric_schema(),
+                          "by": {"type": "string", "enum": list(CATEGORICAL_COLUMNS), "default": "sector"},
+                          "aggregate": {"type": "string", "enum": list(AGGREGATES), "default": "sum"},
+                          "sector": {"type": "string"},
+                          "limit": {"type": "integer"}},
+                       "required": ["metric"]},
+                      index.group_summary, read_only=True)
+
+
+def run_benchmark(server: NiftyMcpServer, repeat: int = 2000) -> Dict[str, float]:
+    """Microseconds per tools/call of each tool, in-process (no transport)."""
+    calls = {
+        "list_sectors": {},
+        "get_company": {"symbol": "TCS"},
+        "top_companies": {"metric": "EPS_TTM", "k": 10, "sector": "SOFTWARE & SERVICES"},
+        "screen_companies": {"filters": [{"metric": "operating_profit_margin", "op": ">", "value": 20}],
+                             "sector": "CEMENT AND CONSTRUCTION", "sort_by": "net_profit"},
+        "group_summary": {"metric": "net_profit", "by": "industry", "aggregate": "median"},
+    }
+    timings = {}
+    for name, arguments in calls.items():
+        start = time.perf_counter()
+        for _ in range(repeat):
+            server.call_tool(name, arguments)
+        timings[name] = round((time.perf_counter() - start) / repeat * 1e6, 1)
+    return timings
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the NIFTY 500 quarterly results over MCP")
+    parser.add_argument("--transport", choices=("http", "stdio"), default="http", help="MCP transport")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind (http)")
+    parser.add_argument("--port", type=int, default=8004, help="Port to bind (http)")
+    parser.add_argument("--csv", default=DEFAULT_CSV, help="Quarterly results CSV")
+    parser.add_argument("--benchmark", action="store_true", help="Time every tool in-process and exit")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args()
+
+    listen = args.transport == "http" and not args.benchmark
+    start = time.perf_counter()
+    server = NiftyMcpServer(args.csv, host=args.host, port=args.port, listen=listen, verbose=args.verbose)
+    startup = time.perf_counter() - start
+    if args.benchmark:
+        print(json.dumps({"startup_ms": round(startup * 1000, 1), "us_per_call": run_benchmark(server)}, indent=2))
+    elif args.transport == "stdio":
+        server.serve_stdio()
+    else:
+        print(f"📈 NIFTY 500 MCP server ({len(server.index.table)} companies, indexed in {startup * 1000:.0f} ms) "
+              f"serving on {server.url}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("\n👋 Stopped")
+        finally:
+            server.server_close()
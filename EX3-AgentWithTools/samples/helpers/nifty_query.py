@@ -0,0 +1,411 @@
+"""
+Vectorized screening and aggregation queries over the NIFTY 500 quarterly results.
+
+Asked "top 10 by EPS_TTM in each sector", a model that can only read rows
+pages through the whole file and ranks the companies itself, which is slow,
+expensive and error-prone. NiftyQueryEngine answers the question in one call:
+
+- where: a predicate in Python syntax over the columns, e.g.
+  "operating_profit_margin > 20 and sector == 'CEMENT AND CONSTRUCTION'".
+  It is parsed with ast (names must be columns, values literals; no
+  function calls or attribute access) and compiled once into NumPy boolean
+  masks: comparisons (also chained, "10 < EPS < 50"), in / not in lists,
+  and, or, not and + - * / between metrics. Sector and industry
+  comparisons match the labels case-insensitively on their integer codes.
+  Missing (NaN) metrics never pass a comparison;
+- top-k by any metric: np.argpartition selects the k rows before only
+  those are sorted, and the top k per sector or industry comes from one
+  lexsort of the matching rows by (group, value);
+- group-by aggregates: count, sum, mean, median, min and max of a metric
+  per sector or industry, from np.bincount and one sort, without a loop
+  over groups or rows.
+
+Results are compact tables: the column names once, then one list per row,
+at most MAX_ROWS of them. truncated says whether rows were left out; a
+ranking per group then keeps fewer companies (k) of every group rather than
+dropping groups.
+
+Usage:
+    engine = default_engine()
+    engine.run(where="operating_profit_margin > 20 and sector == 'CEMENT AND CONSTRUCTION'", metric="net_profit")
+    engine.run(metric="EPS_TTM", k=10, group_by="sector")
+    engine.run(metric="net_profit", group_by="industry", aggregates=["sum", "median"])
+
+Run from EX3-AgentWithTools/samples:
+    python -m helpers.nifty_query "EPS_TTM > 100" --metric EPS_TTM --group-by sector --k 3
+"""
+
+import argparse
+import ast
+import functools
+import json
+import operator
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from helpers.nifty import (
+    AGGREGATES,
+    CATEGORICAL_COLUMNS,
+    DEFAULT_CSV,
+    METRIC_COLUMNS,
+    TEXT_COLUMNS,
+    QuarterlyResults,
+    load_quarterly_results,
+    round_value,
+)
+
+# Rows in a result: the top 10 of every sector (28 of them) fit
+MAX_ROWS = 300
+
+_COMPARISONS = {ast.Gt: np.greater, ast.GtE: np.greater_equal, ast.Lt: np.less, ast.LtE: np.less_equal,
+                ast.Eq: np.equal, ast.NotEq: np.not_equal}
+_ARITHMETIC = {ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul, ast.Div: operator.truediv}
+
+# A compiled expression: table -> mask, metric values or a literal
+Compiled = Callable[[QuarterlyResults], Any]
+
+
+class _Column(str):
+    """A column name in a compiled predicate (distinguishes names from string literals)."""
+
+
+class _PredicateCompiler:
+    """Turns a where string into a function of the table, rejecting anything but columns, literals and operators."""
+
+    def __init__(self, columns: Dict[str, str]):
+        self.columns = columns
+
+    def compile(self, text: str) -> Compiled:
+        try:
+            tree = ast.parse(text.strip(), mode="eval")
+        except SyntaxError as e:
+            raise ValueError(f"Invalid where expression: {e.msg}") from None
+        return self._condition(tree.body)
+
+    def _node(self, node: ast.AST) -> Any:
+        """Returns a _Column, a literal (str, float, tuple) or a compiled function returning a mask or values."""
+        if isinstance(node, ast.BoolOp):
+            parts = [self._condition(value) for value in node.values]
+            combine = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+            return lambda table: functools.reduce(combine, (part(table) for part in parts))
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+            part = self._condition(node.operand)
+            return lambda table: ~part(table)
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+            operand = self._node(node.operand)
+            if isinstance(operand, float):
+                return -operand
+            values = self._metric(operand)
+            return lambda table: -values(table)
+        if isinstance(node, ast.Compare):
+            return self._compare(node)
+        if isinstance(node, ast.BinOp) and type(node.op) in _ARITHMETIC:
+            left, right = self._operand(self._node(node.left)), self._operand(self._node(node.right))
+            apply = _ARITHMETIC[type(node.op)]
+
+            def arithmetic(table: QuarterlyResults) -> np.ndarray:
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    return apply(left(table), right(table))
+            return arithmetic
+        if isinstance(node, ast.Name):
+            if node.id not in self.columns:
+                raise ValueError(f"Unknown column '{node.id}', expected one of: "
+                                 f"{', '.join((*METRIC_COLUMNS, *CATEGORICAL_COLUMNS, *TEXT_COLUMNS))}")
+            return _Column(self.columns[node.id])
+        if isinstance(node, ast.Constant) and isinstance(node.value, str):
+            return node.value
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+            return float(node.value)
+        if isinstance(node, (ast.List, ast.Tuple, ast.Set)):
+            items = tuple(self._node(element) for element in node.elts)
+            if not all(isinstance(item, (str, float)) and not isinstance(item, _Column) for item in items):
+                raise ValueError("Lists in where may only hold numbers or strings")
+            return items
+        raise ValueError(f"Unsupported syntax in where: {ast.unparse(node)}")
+
+    def _condition(self, node: ast.AST) -> Compiled:
+        if not (isinstance(node, (ast.BoolOp, ast.Compare))
+                or isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not)):
+            raise ValueError(f"'{ast.unparse(node)}' is not a condition, "
+                             "e.g. \"net_profit > 100 and sector == 'BANKING AND FINANCE'\"")
+        return self._node(node)
+
+    def _metric(self, value: Any) -> Compiled:
+        if isinstance(value, _Column):
+            if value not in METRIC_COLUMNS:
+                raise ValueError(f"Arithmetic needs metric columns, got '{value}'")
+            return lambda table: table.column(value)
+        if callable(value):
+            return value
+        raise ValueError(f"Expected a metric, got {value!r}")
+
+    def _operand(self, value: Any) -> Compiled:
+        if isinstance(value, float):
+            return lambda table: value
+        return self._metric(value)
+
+    def _compare(self, node: ast.Compare) -> Compiled:
+        operands = [self._node(node.left), *(self._node(comparator) for comparator in node.comparators)]
+        parts = [self._comparison(left, op, right)
+                 for left, op, right in zip(operands, node.ops, operands[1:])]
+        if len(parts) == 1:
+            return parts[0]
+        return lambda table: functools.reduce(np.logical_and, (part(table) for part in parts))
+
+    def _comparison(self, left: Any, op: ast.cmpop, right: Any) -> Compiled:
+        if isinstance(op, (ast.In, ast.NotIn)):
+            if not isinstance(right, tuple):
+                raise ValueError("in needs a list, e.g. sector in ['BANKING AND FINANCE', 'SOFTWARE & SERVICES']")
+            member = self._membership(left, right)
+            return member if isinstance(op, ast.In) else (lambda table: ~member(table))
+        if type(op) not in _COMPARISONS:
+            raise ValueError(f"Unsupported comparison: {type(op).__name__}")
+        compare = _COMPARISONS[type(op)]
+        # Keep the column on the left ("20 < margin" is "margin > 20")
+        if not isinstance(left, _Column) and isinstance(right, _Column):
+            left, right = right, left
+            compare = {np.greater: np.less, np.less: np.greater, np.greater_equal: np.less_equal,
+                       np.less_equal: np.greater_equal}.get(compare, compare)
+        if isinstance(left, _Column) and left not in METRIC_COLUMNS:
+            if not isinstance(right, str) or isinstance(right, _Column) or compare not in (np.equal, np.not_equal):
+                raise ValueError(f"{left} can only be compared with == or != to a string")
+            return self._label_comparison(left, compare, right)
+        if isinstance(right, str):
+            raise ValueError(f"Cannot compare a metric with the string '{right}'")
+        left_values, right_values = self._operand(left), self._operand(right)
+        return lambda table: compare(left_values(table), right_values(table))
+
+    @staticmethod
+    def _label_comparison(column: str, compare: Callable, label: str) -> Compiled:
+        if column in CATEGORICAL_COLUMNS:
+            def categorical(table: QuarterlyResults) -> np.ndarray:
+                code = table.code(column, label)
+                if code is None:
+                    raise ValueError(f"Unknown {column} '{label}', expected one of: "
+                                     f"{', '.join(table.categories[column].tolist())}")
+                return compare(table.column(column), code)
+            return categorical
+        return lambda table: compare(np.char.upper(table.column(column)), label.strip().upper())
+
+    def _membership(self, left: Any, values: tuple) -> Compiled:
+        if not isinstance(left, _Column):
+            raise ValueError("The left side of in must be a column")
+        if left in METRIC_COLUMNS:
+            if not all(isinstance(value, float) for value in values):
+                raise ValueError(f"{left} in [...] needs numbers")
+            return lambda table: np.isin(table.column(left), np.array(values, dtype=np.float64))
+        if not all(isinstance(value, str) for value in values):
+            raise ValueError(f"{left} in [...] needs strings")
+        labels = [value.strip().upper() for value in values]
+        if left in CATEGORICAL_COLUMNS:
+            def categorical(table: QuarterlyResults) -> np.ndarray:
+                codes = [table.code(left, label) for label in labels]
+                unknown = [label for label, code in zip(labels, codes) if code is None]
+                if unknown:
+                    raise ValueError(f"Unknown {left} {', '.join(map(repr, unknown))}")
+                return np.isin(table.column(left), codes)
+            return categorical
+        return lambda table: np.isin(np.char.upper(table.column(left)), labels)
+
+
+class NiftyQueryEngine:
+    """
+    Predicates, top-k and group-by aggregates over the quarterly results columns.
+
+    :param table: Column store from load_quarterly_results
+    """
+
+    def __init__(self, table: QuarterlyResults):
+        self.table = table
+        # Column names are matched case-insensitively ("eps_ttm" is EPS_TTM)
+        columns = {name.lower(): name for name in (*METRIC_COLUMNS, *CATEGORICAL_COLUMNS, *TEXT_COLUMNS)}
+        self._compiler = _PredicateCompiler({**columns, **{name: name for name in columns.values()}})
+        self._compiled: Dict[str, Compiled] = {}
+
+    def mask(self, where: str = "") -> np.ndarray:
+        """
+        Rows matching a predicate.
+
+        :param where: Condition over the columns (empty for every row)
+        :return: Boolean mask over the rows
+        """
+        if not where or not where.strip():
+            return np.ones(len(self.table), dtype=bool)
+        compiled = self._compiled.get(where)
+        if compiled is None:
+            compiled = self._compiled[where] = self._compiler.compile(where)
+        mask = compiled(self.table)
+        return np.broadcast_to(np.asarray(mask, dtype=bool), (len(self.table),))
+
+    def top(self, metric: str, k: int = 10, where: str = "", group_by: Optional[str] = None,
+            ascending: bool = False) -> Dict[str, Any]:
+        """
+        The k companies with the highest (or lowest) metric, overall or in each sector or industry.
+
+        :param metric: Metric to rank by
+        :param k: Companies returned (per group with group_by)
+        :param where: Condition the companies must match
+        :param group_by: "sector" or "industry" for the top k of each group
+        :param ascending: Lowest values first
+        :return: Compact table with the ranked companies, the metrics in where and the number of matches
+        """
+        metric = self._metric(metric)
+        k = self._positive(k, "k")
+        values = self.table.column(metric)
+        # Companies without the metric are not ranked
+        rows = np.flatnonzero(self.mask(where) & ~np.isnan(values))
+        total = len(rows)
+        keys = values[rows] if ascending else -values[rows]
+        metrics = [metric, *(name for name in self._metrics_in(where) if name != metric)]
+
+        if group_by is None:
+            if k < len(rows):
+                # Select the k best rows in linear time, then sort only those
+                selected = np.argpartition(keys, k - 1)[:k]
+                rows, keys = rows[selected], keys[selected]
+            ranked = rows[np.lexsort((rows, keys))]
+            result = self.table.summary_table(ranked[:MAX_ROWS], metrics, total=total)
+            result["truncated"] = len(ranked) > MAX_ROWS
+            return result
+
+        group_by = self._group_field(group_by)
+        codes = self.table.column(group_by)[rows]
+        ordered = np.lexsort((rows, keys, codes))
+        rows, codes = rows[ordered], codes[ordered]
+        # Rank within the group: position minus the position where the group starts
+        starts = np.flatnonzero(np.r_[len(codes) > 0, codes[1:] != codes[:-1]])
+        ranks = np.arange(len(rows)) - np.repeat(starts, np.diff(np.r_[starts, len(rows)]))
+        kept = ranks < k
+        truncated = int(kept.sum()) > MAX_ROWS
+        if truncated:
+            # Fewer companies from every group rather than whole groups left out
+            k = max(MAX_ROWS // len(starts), 1)
+            kept = ranks < k
+        rows, ranks, codes = rows[kept][:MAX_ROWS], ranks[kept][:MAX_ROWS], codes[kept][:MAX_ROWS]
+        result = self.table.summary_table(rows, metrics, total=total)
+        result["columns"].insert(0, "rank")
+        for row, rank in zip(result["rows"], (ranks + 1).tolist()):
+            row.insert(0, rank)
+        result.update(groups=len(starts), groups_returned=len(np.unique(codes)), k=k, truncated=truncated)
+        return result
+
+    def aggregate(self, metric: str, group_by: Optional[str] = "sector", aggregates: Sequence[str] = ("sum",),
+                  where: str = "", limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Aggregates of a metric per sector or industry (or over all matching companies).
+
+        :param metric: Metric to aggregate
+        :param group_by: "sector", "industry" or None for one overall row
+        :param aggregates: Any of count, sum, mean, median, min, max (count is of companies with the metric)
+        :param where: Condition the companies must match
+        :param limit: Groups returned, largest first aggregate first
+        :return: Compact table with one row per group
+        """
+        metric = self._metric(metric)
+        aggregates = list(aggregates) or ["sum"]
+        unknown = [name for name in aggregates if name not in AGGREGATES]
+        if unknown:
+            raise ValueError(f"Unknown aggregate(s) {', '.join(unknown)}, expected any of: {', '.join(AGGREGATES)}")
+        values = self.table.column(metric)
+        rows = np.flatnonzero(self.mask(where) & ~np.isnan(values))
+        if group_by is None:
+            labels, codes, groups = ["ALL"], np.zeros(len(rows), dtype=np.int64), 1
+        else:
+            group_by = self._group_field(group_by)
+            labels = self.table.categories[group_by].tolist()
+            codes, groups = self.table.column(group_by)[rows].astype(np.int64), len(labels)
+
+        # One sort by (group, value): min, max and median are then positions in each group's run
+        ordered = np.lexsort((values[rows], codes))
+        sorted_values, sorted_codes = values[rows][ordered], codes[ordered]
+        counts = np.bincount(sorted_codes, minlength=groups)
+        present = np.flatnonzero(counts)
+        starts = (np.cumsum(counts) - counts)[present]
+        ends = starts + counts[present] - 1
+        sums = np.bincount(sorted_codes, weights=sorted_values, minlength=groups)[present]
+        columns = {
+            "count": counts[present].astype(np.float64),
+            "sum": sums,
+            "mean": sums / counts[present],
+            "median": (sorted_values[starts + (counts[present] - 1) // 2] + sorted_values[starts + counts[present] // 2]) / 2,
+            "min": sorted_values[starts],
+            "max": sorted_values[ends],
+        }
+
+        order = np.argsort(-columns[aggregates[0]], kind="stable")
+        if limit is not None:
+            order = order[:self._positive(limit, "limit")]
+        data = [[labels[code]] for code in present[order].tolist()]
+        for name in aggregates:
+            for record, value in zip(data, columns[name][order].tolist()):
+                record.append(int(value) if name == "count" else round_value(value))
+        return {"metric": metric, "columns": [group_by or "group", *aggregates], "rows": data[:MAX_ROWS],
+                "total": int(len(rows)), "truncated": len(data) > MAX_ROWS}
+
+    def run(self, where: str = "", metric: str = "revenue", k: int = 10, group_by: str = "",
+            aggregates: Optional[Sequence[str]] = None, ascending: bool = False) -> Dict[str, Any]:
+        """
+        One query: group-by aggregates when aggregates are given, otherwise the top k (per group with group_by).
+
+        :param where: Condition over the columns
+        :param metric: Metric to rank by or aggregate
+        :param k: Companies returned (per group with group_by)
+        :param group_by: "sector", "industry" or empty
+        :param aggregates: Any of count, sum, mean, median, min, max
+        :param ascending: Lowest values first (top k only)
+        :return: Compact table
+        """
+        if aggregates:
+            return self.aggregate(metric, group_by or None, aggregates, where=where, limit=k if group_by else None)
+        return self.top(metric, k, where=where, group_by=group_by or None, ascending=ascending)
+
+    def _metrics_in(self, where: str) -> List[str]:
+        if not where:
+            return []
+        names = {node.id for node in ast.walk(ast.parse(where.strip(), mode="eval")) if isinstance(node, ast.Name)}
+        return [name for name in METRIC_COLUMNS if name in names or name.lower() in names]
+
+    def _metric(self, metric: str) -> str:
+        for name in METRIC_COLUMNS:
+            if metric == name or metric.lower() == name.lower():
+                return name
+        raise ValueError(f"Unknown metric '{metric}', expected one of: {', '.join(METRIC_COLUMNS)}")
+
+    @staticmethod
+    def _group_field(field: str) -> str:
+        if field.lower() not in CATEGORICAL_COLUMNS:
+            raise ValueError(f"group_by must be one of: {', '.join(CATEGORICAL_COLUMNS)}")
+        return field.lower()
+
+    @staticmethod
+    def _positive(value: Any, name: str) -> int:
+        if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+            raise ValueError(f"{name} must be a positive integer")
+        return value
+
+
+@functools.lru_cache(maxsize=None)
+def default_engine(path: str = DEFAULT_CSV) -> NiftyQueryEngine:
+    """Engine over the results CSV, loaded (from the binary cache when possible) on first use."""
+    return NiftyQueryEngine(load_quarterly_results(path))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query the NIFTY 500 quarterly results")
+    parser.add_argument("where", nargs="?", default="", help="Condition over the columns")
+    parser.add_argument("--metric", default="revenue", help="Metric to rank by or aggregate")
+    parser.add_argument("--k", type=int, default=10, help="Companies (or groups) returned")
+    parser.add_argument("--group-by", default="", choices=("", *CATEGORICAL_COLUMNS), help="Group by")
+    parser.add_argument("--aggregates", nargs="+", choices=AGGREGATES, help="Aggregate instead of ranking")
+    parser.add_argument("--ascending", action="store_true", help="Lowest values first")
+    parser.add_argument("--csv", default=DEFAULT_CSV, help="Quarterly results CSV")
+    args = parser.parse_args()
+
+    engine = default_engine(args.csv)
+    start = time.perf_counter()
+    result = engine.run(args.where, args.metric, args.k, args.group_by, args.aggregates, args.ascending)
+    elapsed = time.perf_counter() - start
+    print(json.dumps(result, indent=1, ensure_ascii=False))
+    print(f"🔎 {len(result['rows'])} rows of {result['total']} matching companies in {elapsed * 1000:.2f} ms")
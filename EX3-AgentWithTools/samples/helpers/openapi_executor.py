@@ -0,0 +1,376 @@
+"""
+Client-side execution of OpenAPI operations as local function tools.
+
+With OpenApiTool the service calls the API itself, so connections, caching
+and retries are out of our hands. OpenApiExecutor compiles every operation of
+a spec into a function tool definition and executes the calls locally:
+- through one pooled httpx.AsyncClient (keep-alive, bounded connections)
+  running on a background event loop, so the tool calls of runs in other
+  threads (e.g. the concurrent questions of helpers/eval_runner.py) share
+  the connections and overlap,
+- GET responses are cached per operation for a TTL; once the TTL has passed
+  they are revalidated with If-None-Match / If-Modified-Since, so a repeated
+  call costs nothing or a 304,
+- any successful write (POST/PUT/PATCH/DELETE) drops the cached GETs,
+- idempotent calls are retried with backoff on connection errors and 502/503/504,
+- every call is timed and reported per operation.
+
+Usage:
+    executor = OpenApiExecutor(load_openapi_spec(path), ttl={"get_low_stock_items_inventory_low_stock_get": 60})
+    functions = OpenApiFunctionTool(executor, functions={list_inventory})  # or [executor, other_api_executor]
+    agent = project.agents.create_agent(..., tools=functions.definitions)
+    project.agents.enable_auto_function_calls(functions)
+"""
+
+import asyncio
+import json
+import re
+import statistics
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Set, Tuple, Union
+from urllib.parse import quote, urlencode
+
+import httpx
+from azure.ai.agents.models import FunctionToolDefinition
+
+from helpers.spec_compiler import streams_events
+from helpers.tool_cache import CachedFunctionTool
+
+IDEMPOTENT_METHODS = ("GET", "HEAD", "PUT", "DELETE")
+RETRY_STATUSES = (502, 503, 504)
+
+# Keys of parameter schemas worth sending to the model; titles, examples, etc. are dropped
+_SCHEMA_KEYS = ("type", "enum", "items", "properties", "required", "anyOf", "minimum", "maximum", "default", "format")
+
+
+@dataclass
+class Operation:
+    name: str
+    method: str
+    path: str
+    description: str
+    parameters: List[Dict[str, Any]]
+    body_schema: Optional[Dict[str, Any]]
+
+
+@dataclass
+class _CacheEntry:
+    text: str
+    status: int
+    etag: Optional[str]
+    last_modified: Optional[str]
+    stored_at: float
+
+
+def _function_name(operation_id: str) -> str:
+    return re.sub(r"[^a-zA-Z0-9_-]", "_", operation_id)[:64]
+
+
+def _slim_schema(schema: Mapping[str, Any]) -> Dict[str, Any]:
+    slim: Dict[str, Any] = {}
+    for key in _SCHEMA_KEYS:
+        if key not in schema:
+            continue
+        value = schema[key]
+        if key == "items":
+            value = _slim_schema(value)
+        elif key == "properties":
+            value = {name: _slim_schema(prop) for name, prop in value.items()}
+        elif key == "anyOf":
+            value = [_slim_schema(option) for option in value]
+        slim[key] = value
+    if "description" in schema:
+        slim["description"] = schema["description"]
+    return slim
+
+
+def compile_operations(spec: Mapping[str, Any]) -> Dict[str, Operation]:
+    """
+    Extracts the operations of a resolved OpenAPI spec.
+
+    :param spec: OpenAPI spec with every $ref resolved (helpers.tool_cache.load_openapi_spec)
+    :return: Operations keyed by function name (the operationId, made safe for function tools),
+             without the operations that stream server-sent events
+    """
+    operations = {}
+    for path, path_item in spec["paths"].items():
+        shared_parameters = path_item.get("parameters", [])
+        for method, operation in path_item.items():
+            # Server-sent event streams are for subscription clients (helpers/job_feed.py), not tool calls
+            if method == "parameters" or streams_events(operation):
+                continue
+            name = _function_name(operation.get("operationId") or f"{method}_{path}")
+            text = [operation.get("summary"), operation.get("description")]
+            body = operation.get("requestBody", {}).get("content", {}).get("application/json", {})
+            operations[name] = Operation(
+                name=name,
+                method=method.upper(),
+                path=path,
+                description=". ".join(part.rstrip(".") for part in text if part) or f"{method.upper()} {path}",
+                parameters=shared_parameters + operation.get("parameters", []),
+                body_schema=body.get("schema"),
+            )
+    return operations
+
+
+def operation_definition(operation: Operation) -> FunctionToolDefinition:
+    """Builds the function tool definition of an operation: its parameters, plus "body" when it takes one."""
+    properties: Dict[str, Any] = {}
+    required: List[str] = []
+    for parameter in operation.parameters:
+        schema = _slim_schema(parameter.get("schema", {}))
+        if parameter.get("description"):
+            schema["description"] = parameter["description"]
+        properties[parameter["name"]] = schema
+        if parameter.get("required"):
+            required.append(parameter["name"])
+    if operation.body_schema is not None:
+        properties["body"] = _slim_schema(operation.body_schema)
+        required.append("body")
+    return FunctionToolDefinition({
+        "type": "function",
+        "function": {
+            "name": operation.name,
+            "description": operation.description,
+            "parameters": {"type": "object", "properties": properties, "required": required},
+        },
+    })
+
+
+class OpenApiExecutor:
+    """
+    Executes the operations of an OpenAPI spec through a pooled async HTTP client with GET caching.
+
+    :param spec: OpenAPI spec with every $ref resolved
+    :param base_url: API root (defaults to the first entry of the spec's servers)
+    :param ttl: Seconds a GET response of an operation is served without contacting the API, per function name
+    :param default_ttl: TTL for operations not listed in ttl (0: always revalidate)
+    :param headers: Headers sent with every request (e.g. Authorization)
+    :param timeout: Request timeout in seconds
+    :param max_connections: Size of the connection pool
+    :param max_retries: Retries of idempotent calls on connection errors and 502/503/504
+    :param verbose: Print a line per call with its status, cache outcome and duration
+    """
+
+    def __init__(self, spec: Mapping[str, Any], base_url: Optional[str] = None, ttl: Optional[Mapping[str, float]] = None,
+                 default_ttl: float = 0.0, headers: Optional[Mapping[str, str]] = None, timeout: float = 30.0,
+                 max_connections: int = 10, max_retries: int = 2, verbose: bool = True):
+        self.operations = compile_operations(spec)
+        self.base_url = (base_url or spec["servers"][0]["url"]).rstrip("/")
+        self.ttl = dict(ttl or {})
+        self.default_ttl = default_ttl
+        self.max_retries = max_retries
+        self.verbose = verbose
+        self.calls: List[Dict[str, Any]] = []
+        self._cache: Dict[str, _CacheEntry] = {}
+        self._client_options = {
+            "headers": {"Accept": "application/json", **(headers or {})},
+            "timeout": timeout,
+            "limits": httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        }
+        self._client: Optional[httpx.AsyncClient] = None
+
+        # The tools are called synchronously (FunctionTool.execute); the client lives on its own loop
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="openapi-executor", daemon=True)
+        self._thread.start()
+
+    def definitions(self) -> List[FunctionToolDefinition]:
+        return [operation_definition(operation) for operation in self.operations.values()]
+
+    def functions(self) -> List[Callable[..., str]]:
+        """
+        One callable per operation, named after it (for FunctionTool / enable_auto_function_calls).
+        Listed in the order of the spec, so the tool definitions sent to the agent are the same on every run.
+        """
+        return [self._make_function(name) for name in self.operations]
+
+    def call(self, name: str, arguments: Optional[Mapping[str, Any]] = None) -> str:
+        """
+        Executes one operation and waits for the result.
+
+        :param name: Function name of the operation
+        :param arguments: Path/query parameters, plus "body" for operations with a request body
+        :return: The response body, or a JSON error
+        """
+        return asyncio.run_coroutine_threadsafe(self.acall(name, arguments or {}), self._loop).result()
+
+    async def acall(self, name: str, arguments: Mapping[str, Any]) -> str:
+        start = time.perf_counter()
+        operation = self.operations.get(name)
+        if operation is None:
+            self._record(name, "", "", "error", "invalid", start)
+            return json.dumps({"error": f"Unknown operation: {name}"})
+        try:
+            path, query, body = self._request_parts(operation, arguments)
+        except ValueError as e:
+            self._record(name, operation.method, operation.path, "error", "invalid", start)
+            return json.dumps({"error": str(e)})
+
+        key = f"{path}?{urlencode(sorted(query.items()), doseq=True)}"
+        entry = self._cache.get(key) if operation.method == "GET" else None
+        ttl = self.ttl.get(name, self.default_ttl)
+
+        if entry and time.monotonic() - entry.stored_at < ttl:
+            status, text, outcome = entry.status, entry.text, "hit"
+        else:
+            headers = {}
+            if entry and entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry and entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+            try:
+                response = await self._send(operation.method, path, query, body, headers)
+            except httpx.HTTPError as e:
+                self._record(name, operation.method, path, "error", "network", start)
+                return json.dumps({"error": f"{operation.method} {path} failed: {e}"})
+
+            if response.status_code == 304 and entry:
+                entry.stored_at = time.monotonic()
+                status, text, outcome = entry.status, entry.text, "revalidated"
+            else:
+                status, text, outcome = response.status_code, response.text, "network"
+                self._store(operation, key, response)
+
+        self._record(name, operation.method, path, status, outcome, start)
+        if status >= 400:
+            try:
+                detail = json.loads(text)
+            except ValueError:
+                detail = text
+            return json.dumps({"error": f"HTTP {status}", "detail": detail})
+        return text
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Summarizes the recorded calls per operation.
+
+        :return: {name: {"calls", "cache_hits", "revalidated", "network", "errors", "avg_ms", "max_ms"}}
+        """
+        summary: Dict[str, Dict[str, Any]] = {}
+        for name in dict.fromkeys(call["operation"] for call in self.calls):
+            calls = [call for call in self.calls if call["operation"] == name]
+            durations = [call["ms"] for call in calls]
+            summary[name] = {
+                "calls": len(calls),
+                "cache_hits": sum(call["cache"] == "hit" for call in calls),
+                "revalidated": sum(call["cache"] == "revalidated" for call in calls),
+                "network": sum(call["cache"] == "network" for call in calls),
+                "errors": sum(call["status"] == "error" or call["status"] >= 400 for call in calls),
+                "avg_ms": round(statistics.mean(durations), 2),
+                "max_ms": round(max(durations), 2),
+            }
+        return summary
+
+    def close(self) -> None:
+        if self._client is not None:
+            asyncio.run_coroutine_threadsafe(self._client.aclose(), self._loop).result()
+            self._client = None
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+    def _make_function(self, name: str) -> Callable[..., str]:
+        def call_operation(**arguments: Any) -> str:
+            return self.call(name, arguments)
+
+        call_operation.__name__ = name
+        call_operation.__qualname__ = f"{type(self).__name__}.{name}"
+        call_operation.__doc__ = self.operations[name].description
+        return call_operation
+
+    def _request_parts(self, operation: Operation, arguments: Mapping[str, Any]) -> Tuple[str, Dict[str, Any], Any]:
+        path, query = operation.path, {}
+        for parameter in operation.parameters:
+            name = parameter["name"]
+            if name not in arguments or arguments[name] is None:
+                if parameter.get("required"):
+                    raise ValueError(f"Missing required parameter: {name}")
+                continue
+            value = arguments[name]
+            if isinstance(value, bool):
+                value = str(value).lower()
+            if parameter["in"] == "path":
+                path = path.replace("{" + name + "}", quote(str(value), safe=""))
+            elif parameter["in"] == "query":
+                query[name] = value
+
+        body = arguments.get("body")
+        if operation.body_schema is not None and body is None:
+            raise ValueError("Missing required parameter: body")
+        return path, query, body
+
+    async def _send(self, method: str, path: str, query: Mapping[str, Any], body: Any,
+                    headers: Mapping[str, str]) -> httpx.Response:
+        if self._client is None:
+            self._client = httpx.AsyncClient(**self._client_options)
+        retries = self.max_retries if method in IDEMPOTENT_METHODS else 0
+        attempt = 0
+        while True:
+            try:
+                response = await self._client.request(
+                    method, self.base_url + path, params=query, json=body, headers=headers
+                )
+                if response.status_code not in RETRY_STATUSES or attempt >= retries:
+                    return response
+            except httpx.TransportError:
+                if attempt >= retries:
+                    raise
+            await asyncio.sleep(0.2 * 2 ** attempt)
+            attempt += 1
+
+    def _store(self, operation: Operation, key: str, response: httpx.Response) -> None:
+        if operation.method != "GET":
+            if response.is_success:
+                self._cache.clear()  # A write may change any listing; revalidation would be cheap but not free
+            return
+        if response.status_code != 200:
+            return
+        etag, last_modified = response.headers.get("ETag"), response.headers.get("Last-Modified")
+        if etag or last_modified or self.ttl.get(operation.name, self.default_ttl) > 0:
+            self._cache[key] = _CacheEntry(response.text, 200, etag, last_modified, time.monotonic())
+
+    def _record(self, name: str, method: str, path: str, status: Any, outcome: str, start: float) -> None:
+        call = {
+            "operation": name,
+            "method": method,
+            "path": path,
+            "status": status,
+            "cache": outcome,
+            "ms": (time.perf_counter() - start) * 1000,
+        }
+        self.calls.append(call)
+        if self.verbose:
+            print(f"🌐 {name} {method} {path} → {status} ({outcome}, {call['ms']:.1f} ms)")
+
+
+class OpenApiFunctionTool(CachedFunctionTool):
+    """
+    FunctionTool exposing the operations of one or more OpenApiExecutors, optionally next to ordinary functions.
+
+    :param executor: Executor whose operations become tools, or a sequence of them (one per API)
+    :param functions: Additional Python functions to expose
+    """
+
+    def __init__(self, executor: Union[OpenApiExecutor, Sequence[OpenApiExecutor]],
+                 functions: Optional[Set[Callable[..., Any]]] = None):
+        self.executors = [executor] if isinstance(executor, OpenApiExecutor) else list(executor)
+        self.operations: Dict[str, Operation] = {}
+        for api in self.executors:
+            clashes = sorted(set(api.operations) & set(self.operations))
+            if clashes:
+                raise ValueError(f"Operations exposed by more than one executor: {', '.join(clashes)}")
+            self.operations.update(api.operations)
+        # An ordered collection keeps the definitions in a fixed order: the operations as in the specs,
+        # then the other functions by name (a set would order them differently on every run)
+        super().__init__([*(function for api in self.executors for function in api.functions()),
+                          *sorted(functions or (), key=lambda function: function.__name__)])
+
+    def _build_function_definitions(self, functions: Dict[str, Any]) -> List[FunctionToolDefinition]:
+        plain = {name: function for name, function in functions.items() if name not in self.operations}
+        built = super()._build_function_definitions(plain) if plain else []
+        definitions = {definition.function.name: definition for definition in built}
+        definitions.update((name, operation_definition(operation))
+                           for name, operation in self.operations.items() if name in functions)
+        return [definitions[name] for name in functions]
@@ -0,0 +1,146 @@
+"""
+Token-budgeted, paginated tool outputs.
+
+Returning a whole collection as JSON bills every element as prompt
+tokens on the next model step. ToolOutputShaper instead:
+- projects each item onto the requested fields,
+- encodes the page as columns + rows so field names are sent only once,
+- cuts the page when the tool's token budget is reached and hands back a
+  "next_cursor" the model can pass to get the following page,
+- records how many output tokens each call saved compared to the whole collection as JSON.
+"""
+
+import json
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+from helpers.tokens import count_json_tokens, count_tokens
+
+DEFAULT_TOKEN_BUDGET = 800
+
+# Tokens reserved for the envelope around the rows (columns, totals, cursor)
+_ENVELOPE_TOKENS = 60
+
+
+def encode_cursor(offset: int) -> str:
+    return f"offset:{offset}"
+
+
+def decode_cursor(cursor: str) -> int:
+    """
+    Turns a cursor returned by a previous page back into an offset.
+
+    :param cursor: Cursor string ("" for the first page)
+    :return: Offset of the first item of the page
+    :raises ValueError: If the cursor was not produced by encode_cursor
+    """
+    if not cursor:
+        return 0
+    prefix, _, value = cursor.partition(":")
+    if prefix != "offset" or not value.isdigit():
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return int(value)
+
+
+class ToolOutputShaper:
+    """
+    Shapes list-returning tool outputs to a per-tool token budget.
+
+    :param budgets: Token budget per tool name; tools not listed use default_budget
+    :param default_budget: Token budget for tools without an explicit entry
+    :param default_fields: Fields returned per tool when the caller does not ask for specific ones
+    :param verbose: Print a line per call with the tokens returned and saved
+    """
+
+    def __init__(self, budgets: Optional[Mapping[str, int]] = None, default_budget: int = DEFAULT_TOKEN_BUDGET,
+                 default_fields: Optional[Mapping[str, Sequence[str]]] = None, verbose: bool = True):
+        self.budgets = dict(budgets or {})
+        self.default_budget = default_budget
+        self.default_fields = dict(default_fields or {})
+        self.verbose = verbose
+        self.calls: List[Dict[str, Any]] = []
+
+    def paginate(self, tool_name: str, items: Sequence[Mapping[str, Any]], cursor: str = "",
+                 fields: Optional[Sequence[str]] = None, extra: Optional[Mapping[str, Any]] = None) -> str:
+        """
+        Returns one page of items as a compact JSON string.
+
+        :param tool_name: Name of the tool producing the output (selects the budget and default fields)
+        :param items: The full collection
+        :param cursor: Cursor from the previous page, "" for the first one
+        :param fields: Fields to keep for every item (defaults to the tool's default fields, then to all fields)
+        :param extra: Additional top-level values to include (e.g. totals)
+        :return: JSON string with "columns", "rows", "total", "returned" and "next_cursor" (null on the last page)
+        """
+        try:
+            offset = decode_cursor(cursor)
+        except ValueError as e:
+            return json.dumps({"error": str(e)})
+
+        columns = self._columns(tool_name, items, fields)
+        budget = self.budgets.get(tool_name, self.default_budget)
+
+        rows = []
+        used = _ENVELOPE_TOKENS + (count_json_tokens(extra) if extra else 0) + count_json_tokens(columns)
+        for item in items[offset:]:
+            row = [item.get(column) for column in columns]
+            row_tokens = count_json_tokens(row) + 1  # +1 for the separating comma
+            if rows and used + row_tokens > budget:
+                break
+            rows.append(row)
+            used += row_tokens
+
+        end = offset + len(rows)
+        page = {
+            **(extra or {}),
+            "columns": columns,
+            "rows": rows,
+            "total": len(items),
+            "returned": len(rows),
+            "next_cursor": encode_cursor(end) if end < len(items) else None,
+        }
+        output = json.dumps(page, separators=(",", ":"), ensure_ascii=False)
+
+        self._record(tool_name, items, extra, output, offset)
+        return output
+
+    def report(self) -> Dict[str, Dict[str, int]]:
+        """
+        Summarizes the recorded calls per tool.
+
+        :return: {tool_name: {"calls", "tokens_returned", "tokens_full", "tokens_saved"}}
+        """
+        summary: Dict[str, Dict[str, int]] = {}
+        for call in self.calls:
+            entry = summary.setdefault(call["tool"], {"calls": 0, "tokens_returned": 0, "tokens_full": 0, "tokens_saved": 0})
+            entry["calls"] += 1
+            entry["tokens_returned"] += call["tokens_returned"]
+            entry["tokens_full"] += call["tokens_full"]
+            entry["tokens_saved"] += call["tokens_saved"]
+        return summary
+
+    def _columns(self, tool_name: str, items: Sequence[Mapping[str, Any]],
+                 fields: Optional[Sequence[str]]) -> List[str]:
+        available = list(dict.fromkeys(key for item in items for key in item))
+        requested = fields or self.default_fields.get(tool_name)
+        if not requested:
+            return available
+        selected = [field for field in requested if field in available]
+        return selected or available
+
+    def _record(self, tool_name: str, items: Sequence[Mapping[str, Any]], extra: Optional[Mapping[str, Any]],
+                output: str, offset: int) -> None:
+        # Baseline: what the tool used to return, the whole collection as compact JSON in a single call.
+        # Later pages have no baseline, so summing tokens_saved over all calls gives the net saving.
+        tokens_full = count_json_tokens({**(extra or {}), "items": list(items)}) if offset == 0 else 0
+        tokens_returned = count_tokens(output)
+        call = {
+            "tool": tool_name,
+            "offset": offset,
+            "tokens_returned": tokens_returned,
+            "tokens_full": tokens_full,
+            "tokens_saved": tokens_full - tokens_returned,
+        }
+        self.calls.append(call)
+        if self.verbose:
+            print(f"✂️  {tool_name} (offset {offset}): {tokens_returned} tokens returned, "
+                  f"{call['tokens_saved']} saved vs full output")
@@ -0,0 +1,55 @@
+"""
+Shared request-rate limiter for scripts that call rate-limited services from several threads.
+
+RateGovernor is a token bucket: requests are spread at the configured rate,
+with up to `burst` of them allowed back to back. When the service answers
+"rate limited" anyway, pause() holds every caller until the retry-after
+delay has passed, instead of each thread hammering the service on its own.
+"""
+
+import threading
+import time
+
+
+class RateGovernor:
+    """
+    Token-bucket limiter shared by all threads of a script.
+
+    :param requests_per_minute: Sustained request rate
+    :param burst: Requests allowed back to back before the rate applies
+    """
+
+    def __init__(self, requests_per_minute: float, burst: int = 1):
+        if requests_per_minute <= 0 or burst < 1:
+            raise ValueError("requests_per_minute must be positive and burst at least 1")
+        self.interval = 60.0 / requests_per_minute
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Blocks until a request may be sent.
+
+        :return: Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) / self.interval)
+                self._updated = now
+                if now >= self._paused_until and self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = max(self._paused_until - now, (1 - self._tokens) * self.interval)
+            time.sleep(delay)
+            waited += delay
+
+    def pause(self, seconds: float) -> None:
+        """Holds every caller for `seconds` (e.g. the Retry-After of a 429) and empties the bucket."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0.0
@@ -0,0 +1,96 @@
+"""
+Vectorized repository analysis for batches of GitHub repositories.
+
+analyze_code_metrics classifies one repository per tool call. Here the whole
+batch (e.g. GitHubReposResponse.repositories) is turned into NumPy columns
+once, the size/popularity/activity classes are computed with searchsorted
+over the same thresholds, and every metric also gets a percentile rank
+relative to the batch. The result is one compact columns + rows table.
+"""
+
+from typing import Any, Dict, List, Mapping, Sequence
+
+import numpy as np
+
+# Same thresholds as analyze_code_metrics in ex3-ch4-solution.py
+SIZE_THRESHOLDS_KB = np.array([1000, 10000])        # < 1000 Small, < 10000 Medium, else Large
+SIZE_CLASSES = np.array(["Small", "Medium", "Large"])
+STAR_THRESHOLDS = np.array([100, 1000])             # < 100 Low, < 1000 Medium, else High
+POPULARITY_CLASSES = np.array(["Low", "Medium", "High"])
+ISSUE_THRESHOLDS = np.array([0, 10])                # 0 Low, 1-10 Moderate, > 10 Active
+ACTIVITY_CLASSES = np.array(["Low", "Moderate", "Active"])
+
+COLUMNS = [
+    "name", "language", "project_size", "popularity_level", "activity_level",
+    "size_kb", "stars", "forks", "open_issues",
+    "size_pct", "stars_pct", "forks_pct", "issues_pct",
+]
+
+
+def _column(repositories: Sequence[Mapping[str, Any]], key: str) -> np.ndarray:
+    return np.fromiter((repo.get(key) or 0 for repo in repositories), dtype=np.float64, count=len(repositories))
+
+
+def percentile_ranks(values: np.ndarray) -> np.ndarray:
+    """
+    Percentile rank of every value within its own batch (0-100, ties share the average rank).
+
+    :param values: 1-D array of metric values
+    :return: Array of the same length with the percentile ranks
+    """
+    if values.size == 0:
+        return values
+    ordered = np.sort(values)
+    below = np.searchsorted(ordered, values, side="left")
+    at_or_below = np.searchsorted(ordered, values, side="right")
+    return (below + at_or_below) / (2 * values.size) * 100
+
+
+def analyze_repositories(repositories: Sequence[Mapping[str, Any]]) -> Dict[str, Any]:
+    """
+    Classifies and ranks a batch of repositories in one pass.
+
+    :param repositories: Repository dictionaries using GitHub API field names
+                         (name, language, size, stargazers_count, forks_count, open_issues_count)
+    :return: Compact table ({"columns", "rows"}) plus a batch "summary"
+    """
+    if not repositories:
+        return {"error": "No repository data provided"}
+
+    size_kb = _column(repositories, "size")
+    stars = _column(repositories, "stargazers_count")
+    forks = _column(repositories, "forks_count")
+    issues = _column(repositories, "open_issues_count")
+
+    project_size = SIZE_CLASSES[np.searchsorted(SIZE_THRESHOLDS_KB, size_kb, side="right")]
+    popularity = POPULARITY_CLASSES[np.searchsorted(STAR_THRESHOLDS, stars, side="right")]
+    activity = ACTIVITY_CLASSES[np.searchsorted(ISSUE_THRESHOLDS, issues, side="left")]
+
+    ranks = np.round(np.column_stack([
+        percentile_ranks(size_kb), percentile_ranks(stars), percentile_ranks(forks), percentile_ranks(issues)
+    ]), 1)
+    metrics = np.column_stack([size_kb, stars, forks, issues]).astype(np.int64)
+
+    names = [repo.get("name") or repo.get("repo_name") or "" for repo in repositories]
+    languages = [repo.get("language") or "Unknown" for repo in repositories]
+    rows: List[List[Any]] = [
+        [name, language, *labels, *counts, *pct]
+        for name, language, labels, counts, pct in zip(
+            names, languages,
+            np.column_stack([project_size, popularity, activity]).tolist(),
+            metrics.tolist(),
+            ranks.tolist(),
+        )
+    ]
+
+    unique_languages, language_counts = np.unique(np.array(languages), return_counts=True)
+    summary = {
+        "repositories": len(repositories),
+        "languages": dict(zip(unique_languages.tolist(), language_counts.tolist())),
+        "median_stars": float(np.median(stars)),
+        "median_size_kb": float(np.median(size_kb)),
+        "total_open_issues": int(issues.sum()),
+        "popularity_levels": dict(zip(*(a.tolist() for a in np.unique(popularity, return_counts=True)))),
+    }
+
+    return {"columns": COLUMNS, "rows": rows, "summary": summary}
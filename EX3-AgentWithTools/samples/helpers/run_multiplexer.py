@@ -0,0 +1,158 @@
+"""
+Multiplexer for scripts that drive several agent runs at once.
+
+Polling runs one after another (one sleep loop per run) makes the total time
+the sum of all runs. RunMultiplexer starts every run up front and watches
+them with a single batched poller: each tick fetches the status of all
+pending runs concurrently, dispatches a run's requires_action handler as
+soon as it fires and hands back runs as they complete, so the wall time is
+the one of the slowest run.
+
+Failures stay with the run they belong to: a status request that fails is
+retried on the next ticks (the run is given up after max_poll_errors in a
+row), and a handler that raises, or a requires_action without a handler,
+cancels that run only. The reason is printed and kept in errors[name].
+
+Usage:
+    mux = RunMultiplexer(agents_client)
+    mux.start("analyst", thread_id=t1.id, agent_id=a1.id, on_requires_action=handle_function_calls)
+    mux.start("docs", thread_id=t2.id, agent_id=a2.id, on_requires_action=handle_mcp_approvals)
+    for name, run in mux.as_completed():
+        ...
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from azure.ai.agents.models import ThreadRun
+
+ACTIVE_STATUSES = ("queued", "in_progress", "requires_action", "cancelling")
+
+# Returns the keyword arguments for runs.submit_tool_outputs (tool_outputs=... or tool_approvals=...),
+# or None to cancel the run
+RequiresActionHandler = Callable[[ThreadRun], Optional[Dict[str, Any]]]
+
+
+@dataclass
+class _TrackedRun:
+    name: str
+    thread_id: str
+    run: ThreadRun
+    on_requires_action: Optional[RequiresActionHandler]
+    started_at: float = field(default_factory=time.perf_counter)
+    handled_calls: set = field(default_factory=set)
+    poll_errors: int = 0
+
+
+class RunMultiplexer:
+    """
+    Starts several runs and watches them concurrently with one batched poller.
+
+    :param agents_client: The agents client (project_client.agents or an AgentsClient)
+    :param poll_interval: Seconds between two polling ticks
+    :param max_workers: Maximum number of status requests sent in parallel per tick
+    :param max_poll_errors: Consecutive failed status requests after which a run is given up
+    :param verbose: Print why a run is cancelled or given up
+    """
+
+    def __init__(self, agents_client: Any, poll_interval: float = 1.0, max_workers: int = 8,
+                 max_poll_errors: int = 3, verbose: bool = True):
+        self.agents_client = agents_client
+        self.poll_interval = poll_interval
+        self.max_workers = max_workers
+        self.max_poll_errors = max_poll_errors
+        self.verbose = verbose
+        self.durations: Dict[str, float] = {}
+        self.errors: Dict[str, str] = {}
+        self._pending: Dict[str, _TrackedRun] = {}
+
+    def start(self, name: str, thread_id: str, agent_id: str,
+              on_requires_action: Optional[RequiresActionHandler] = None, **run_kwargs: Any) -> ThreadRun:
+        """
+        Creates a run and registers it with the multiplexer.
+
+        :param name: Label used to report the run (must be unique)
+        :param thread_id: Thread to run
+        :param agent_id: Agent to run the thread with
+        :param on_requires_action: Handler called whenever the run stops in requires_action
+        :param run_kwargs: Extra arguments for runs.create (tool_resources, instructions, ...)
+        :return: The created run
+        """
+        if name in self._pending or name in self.durations:
+            raise ValueError(f"A run named '{name}' is already registered")
+        run = self.agents_client.runs.create(thread_id=thread_id, agent_id=agent_id, **run_kwargs)
+        self._pending[name] = _TrackedRun(name, thread_id, run, on_requires_action)
+        return run
+
+    def as_completed(self) -> Iterator[Tuple[str, ThreadRun]]:
+        """
+        Yields (name, run) pairs as runs reach a final status (completed, failed, cancelled, expired).
+        A run given up after repeated polling errors is yielded with its last known status; errors[name]
+        says why.
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while self._pending:
+                time.sleep(self.poll_interval)
+                tracked_runs = list(self._pending.values())
+                for tracked, polled in zip(tracked_runs, executor.map(self._poll, tracked_runs)):
+                    if isinstance(polled, Exception):
+                        tracked.poll_errors += 1
+                        if tracked.poll_errors < self.max_poll_errors:
+                            continue
+                        self._fail(tracked, f"status request failed {tracked.poll_errors} times: {polled}")
+                        yield self._finish(tracked)
+                        continue
+                    tracked.poll_errors = 0
+                    tracked.run = polled
+                    if polled.status == "requires_action":
+                        self._dispatch(tracked)
+                    if tracked.run.status not in ACTIVE_STATUSES:
+                        yield self._finish(tracked)
+
+    def _poll(self, tracked: _TrackedRun) -> Any:
+        try:
+            return self.agents_client.runs.get(thread_id=tracked.thread_id, run_id=tracked.run.id)
+        except Exception as e:  # Kept with this run; the others are unaffected
+            return e
+
+    def _finish(self, tracked: _TrackedRun) -> Tuple[str, ThreadRun]:
+        del self._pending[tracked.name]
+        self.durations[tracked.name] = time.perf_counter() - tracked.started_at
+        return tracked.name, tracked.run
+
+    def _fail(self, tracked: _TrackedRun, reason: str) -> None:
+        self.errors[tracked.name] = reason
+        if self.verbose:
+            print(f"⚠️  {tracked.name}: {reason}")
+
+    def _dispatch(self, tracked: _TrackedRun) -> None:
+        required_action = tracked.run.required_action
+        details = getattr(required_action, "submit_tool_outputs", None) or getattr(required_action, "submit_tool_approval", None)
+        call_ids = frozenset(call.id for call in details.tool_calls) if details else frozenset()
+        if call_ids in tracked.handled_calls:
+            return  # Already answered; the service has not picked up the submission yet
+
+        tracked.handled_calls.add(call_ids)
+        if tracked.on_requires_action is None:
+            self._cancel(tracked, "requires_action but no on_requires_action handler was given")
+            return
+        try:
+            submission = tracked.on_requires_action(tracked.run)
+            if submission:
+                tracked.run = self.agents_client.runs.submit_tool_outputs(
+                    thread_id=tracked.thread_id, run_id=tracked.run.id, **submission
+                )
+                return
+            reason = "the requires_action handler returned nothing to submit"
+        except Exception as e:
+            reason = f"the requires_action handler failed: {e}"
+        self._cancel(tracked, reason)
+
+    def _cancel(self, tracked: _TrackedRun, reason: str) -> None:
+        try:
+            tracked.run = self.agents_client.runs.cancel(thread_id=tracked.thread_id, run_id=tracked.run.id)
+        except Exception as e:  # The next ticks see the run fail or expire on its own
+            reason = f"{reason} (cancel request failed: {e})"
+        self._fail(tracked, f"cancelled, {reason}")
@@ -0,0 +1,148 @@
+"""
+Documents of the samples for the local search index.
+
+Builds one flat document shape (id, source, title, content, path) from the
+three kinds of data the agents retrieve over:
+
+- openapi: one document per operation of the specs in openApiDef and the
+  challenge folder (a spec copied into both is indexed once), with the
+  method, path, summary, description and parameter names, keyed by the spec
+  file name and the operationId;
+- nifty: one document per company of the NIFTY 500 quarterly results, as
+  a sentence with its sector, industry and main figures;
+- challenge: the challenge markdown files, split at their headings into
+  sections of at most max_chars characters.
+
+Usage:
+    client = LocalSearchClient(default_documents())
+    search_documents("reserve inventory items", top=5, source="openapi")
+"""
+
+import functools
+import glob
+import os
+import re
+from types import SimpleNamespace
+from typing import Any, Dict, Iterable, List, Optional
+
+from helpers.local_search import LocalSearchClient
+from helpers.nifty import DEFAULT_CSV, load_quarterly_results
+from helpers.spec_compiler import HTTP_METHODS
+from helpers.tool_cache import file_sha256, load_openapi_spec
+
+SAMPLES_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SPEC_PATHS = sorted(glob.glob(os.path.join(SAMPLES_DIR, "openApiDef", "*.json")))
+CHALLENGE_DIR = os.path.join(os.path.dirname(SAMPLES_DIR), "challenge")
+
+_HEADING = re.compile(r"^#{1,3}\s+(.*)$", re.MULTILINE)
+
+
+def openapi_documents(paths: Iterable[str] = SPEC_PATHS) -> List[Dict[str, Any]]:
+    """One document per operation of each OpenAPI spec."""
+    documents = []
+    for path in paths:
+        spec = load_openapi_spec(path)
+        stem = os.path.splitext(os.path.basename(path))[0]
+        api = spec.get("info", {}).get("title") or stem
+        for route, item in spec.get("paths", {}).items():
+            for method in HTTP_METHODS:
+                operation = item.get(method)
+                if not isinstance(operation, dict):
+                    continue
+                parameters = [parameter.get("name", "") for parameter in operation.get("parameters", [])]
+                body = (operation.get("requestBody", {}).get("content", {}).get("application/json", {})
+                        .get("schema", {}).get("properties", {}))
+                summary = operation.get("summary") or operation.get("operationId", "")
+                content = [summary, operation.get("description") or ""]
+                if parameters:
+                    content.append(f"Parameters: {', '.join(parameters)}")
+                if body:
+                    content.append(f"Body fields: {', '.join(body)}")
+                documents.append({
+                    "id": f"openapi-{stem}-{operation.get('operationId') or f'{method}-{route}'}",
+                    "source": "openapi",
+                    "title": f"{api}: {method.upper()} {route} ({summary})",
+                    "content": "\n".join(part for part in content if part),
+                    "path": os.path.relpath(path, SAMPLES_DIR),
+                })
+    return documents
+
+
+def nifty_documents(path: str = DEFAULT_CSV) -> List[Dict[str, Any]]:
+    """One document per company of the quarterly results."""
+    table = load_quarterly_results(path)
+    documents = []
+    for index in range(len(table)):
+        row = table.row(index)
+        figures = ", ".join(f"{name.replace('_', ' ')} {value}" for name, value in row.items()
+                            if isinstance(value, float))
+        documents.append({
+            "id": f"nifty-{row['NSE_code'] or index}",
+            "source": "nifty",
+            "title": f"{row['name']} ({row['NSE_code']})",
+            "content": f"{row['name']} is a {row['industry'].lower()} company in the {row['sector'].lower()} sector. "
+                       f"Quarterly results in INR crore: {figures}.",
+            "path": os.path.relpath(path, SAMPLES_DIR),
+        })
+    return documents
+
+
+def markdown_documents(paths: Optional[Iterable[str]] = None, max_chars: int = 1500) -> List[Dict[str, Any]]:
+    """The challenge markdown files, one document per heading section (long sections split at paragraphs)."""
+    documents = []
+    for path in paths if paths is not None else sorted(glob.glob(os.path.join(CHALLENGE_DIR, "*.md"))):
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+        name = os.path.splitext(os.path.basename(path))[0]
+        starts = [match.start() for match in _HEADING.finditer(text)]
+        for number, (start, end) in enumerate(zip([0, *starts], [*starts, len(text)])):
+            section = text[start:end].strip()
+            heading = _HEADING.match(section)
+            title = heading.group(1).strip() if heading else name
+            chunk = ""
+            for paragraph in section.split("\n\n"):
+                if chunk and len(chunk) + len(paragraph) > max_chars:
+                    documents.append(_markdown_document(name, number, len(documents), title, chunk, path))
+                    chunk = ""
+                chunk = f"{chunk}\n\n{paragraph}" if chunk else paragraph
+            # Sections that only hold markup (dividers, badges) carry no words to retrieve
+            if re.search(r"[A-Za-z]{3}", chunk):
+                documents.append(_markdown_document(name, number, len(documents), title, chunk, path))
+    return documents
+
+
+def _markdown_document(name: str, section: int, position: int, title: str, content: str,
+                       path: str) -> Dict[str, Any]:
+    return {"id": f"challenge-{name}-{section}-{position}", "source": "challenge", "title": f"{name}: {title}",
+            "content": content, "path": os.path.relpath(path, SAMPLES_DIR)}
+
+
+def default_documents() -> List[Dict[str, Any]]:
+    """The OpenAPI operations, NIFTY companies and challenge sections."""
+    # The challenge folder repeats some of the sample specs: index each content once
+    specs: Dict[str, str] = {}
+    for path in [*SPEC_PATHS, *sorted(glob.glob(os.path.join(CHALLENGE_DIR, "*.json")))]:
+        specs.setdefault(file_sha256(path), path)
+    return [*openapi_documents(specs.values()), *nifty_documents(), *markdown_documents()]
+
+
+@functools.lru_cache(maxsize=None)
+def default_search_client() -> LocalSearchClient:
+    """Index over default_documents(), built on first use."""
+    return LocalSearchClient(default_documents())
+
+
+def search_documents(query: str, top: int = 5, source: str = "") -> Dict[str, Any]:
+    """
+    Hybrid search over the samples' documents, in the compact shape of the other tools.
+
+    :param query: What to look for
+    :param top: Results returned
+    :param source: Optional source filter: openapi, nifty or challenge
+    :return: Columns and rows (score, id, source, title, content)
+    """
+    source_filter = "source eq '{}'".format(source.replace("'", "''")) if source else None
+    hits = default_search_client().search(query, vector_queries=[SimpleNamespace(text=query)], top=top,
+                                          filter=source_filter, select=["id", "source", "title", "content"])
+    return {"columns": ["score", "id", "source", "title", "content"],
+            "rows": [[hit["@search.score"], hit["id"], hit["source"], hit["title"], hit["content"]] for hit in hits]}
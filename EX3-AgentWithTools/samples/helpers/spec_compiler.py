@@ -0,0 +1,287 @@
+"""
+Compiles OpenAPI specs down to what an agent needs to call them.
+
+The tool definitions built from a spec are sent with every model step, and
+the specs in openApiDef carry much more than the model uses: operations the
+agent should not call, examples, titles, long descriptions next to a
+summary, and 422 validation-error schemas on every operation. compile_spec
+keeps only the allowed operations and, for each of them, the parameters,
+request body and (optionally) success response schema. Schemas are inlined;
+a schema that still occurs more than once is stored once under
+components/schemas and referenced. Operations answering with server-sent
+events are never kept: a tool call cannot consume a stream.
+
+Run from EX3-AgentWithTools/samples to see the savings:
+    python -m helpers.spec_compiler openApiDef/InventoryAPI.json \
+        --operations get_low_stock_items_inventory_low_stock_get check_stock_inventory__item_id__get
+"""
+
+import argparse
+import json
+import os
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import jsonref
+
+from helpers.tokens import count_json_tokens
+from helpers.tool_cache import cache_key, file_sha256, load_openapi_spec, read_cached, read_openapi_json, write_cached
+
+HTTP_METHODS = ("get", "put", "post", "delete", "patch", "head", "options")
+
+# Schema keywords the model needs to build a valid call
+_SCHEMA_KEYS = ("type", "enum", "format", "items", "properties", "required", "minimum", "maximum",
+                "minLength", "maxLength", "pattern", "default", "description")
+
+# Hoisting a schema into components only pays off when it is longer than the $ref replacing it
+_MIN_HOISTED_CHARS = 80
+
+
+def streams_events(operation: Mapping[str, Any]) -> bool:
+    """True when every success response of an operation is a text/event-stream (not usable as an agent tool)."""
+    successes = [response for status, response in operation.get("responses", {}).items() if str(status).startswith("2")]
+    return bool(successes) and all("text/event-stream" in response.get("content", {}) for response in successes)
+
+
+def _minify_schema(schema: Any, openapi_30: bool = True) -> Any:
+    if not isinstance(schema, Mapping):
+        return schema
+
+    options = schema.get("anyOf") or schema.get("oneOf")
+    if options:
+        # Optional[X] is written as anyOf [X, null]; "nullable" (3.0) or a type list (3.1) says the same in fewer tokens
+        non_null = [option for option in options if option.get("type") != "null"]
+        if len(non_null) == 1 and len(non_null) < len(options) and isinstance(non_null[0].get("type"), str):
+            minified = _minify_schema(non_null[0], openapi_30)
+            if openapi_30:
+                minified["nullable"] = True
+            else:
+                minified["type"] = [minified["type"], "null"]
+            return minified
+        return {"anyOf": [_minify_schema(option, openapi_30) for option in options]}
+
+    minified = {}
+    for key in _SCHEMA_KEYS:
+        if key not in schema:
+            continue
+        value = schema[key]
+        if key == "items":
+            value = _minify_schema(value, openapi_30)
+        elif key == "properties":
+            value = {name: _minify_schema(prop, openapi_30) for name, prop in value.items()}
+        elif key == "description" and value == schema.get("title"):
+            continue
+        minified[key] = value
+    return minified
+
+
+def _minify_operation(operation: Mapping[str, Any], keep_response_schemas: bool, openapi_30: bool,
+                      path_parameters: Sequence[Mapping[str, Any]] = ()) -> Dict[str, Any]:
+    minified: Dict[str, Any] = {"operationId": operation["operationId"]}
+    # Summary and description usually say the same thing; keep the shorter one
+    texts = [text for text in (operation.get("summary"), operation.get("description")) if text]
+    if texts:
+        minified["summary"] = min(texts, key=len)
+
+    # Parameters of the path item apply to every operation, unless the operation redefines them
+    own = operation.get("parameters", [])
+    redefined = {(parameter["name"], parameter["in"]) for parameter in own}
+    shared = [parameter for parameter in path_parameters if (parameter["name"], parameter["in"]) not in redefined]
+    parameters = []
+    for parameter in [*shared, *own]:
+        compact = {"name": parameter["name"], "in": parameter["in"]}
+        if parameter.get("required"):
+            compact["required"] = True
+        if parameter.get("description"):
+            compact["description"] = parameter["description"]
+        compact["schema"] = _minify_schema(parameter.get("schema", {}), openapi_30)
+        parameters.append(compact)
+    if parameters:
+        minified["parameters"] = parameters
+
+    body = operation.get("requestBody", {}).get("content", {}).get("application/json")
+    if body is not None:
+        minified["requestBody"] = {
+            "required": True,
+            "content": {"application/json": {"schema": _minify_schema(body.get("schema", {}), openapi_30)}},
+        }
+
+    responses = {}
+    for status, response in operation.get("responses", {}).items():
+        if not str(status).startswith("2"):
+            continue  # Error payloads (e.g. FastAPI's 422 HTTPValidationError) reach the model as the tool output anyway
+        compact_response: Dict[str, Any] = {"description": "OK"}
+        schema = response.get("content", {}).get("application/json", {}).get("schema")
+        if keep_response_schemas and schema:
+            compact_response["content"] = {"application/json": {"schema": _minify_schema(schema, openapi_30)}}
+        responses[str(status)] = compact_response
+    minified["responses"] = responses or {"200": {"description": "OK"}}
+    return minified
+
+
+def _canonical(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"))
+
+
+def _object_schemas(value: Any, found: List[Dict[str, Any]]) -> None:
+    if isinstance(value, dict):
+        if "properties" in value:
+            found.append(value)
+        for item in value.values():
+            _object_schemas(item, found)
+    elif isinstance(value, list):
+        for item in value:
+            _object_schemas(item, found)
+
+
+def _replace(value: Any, canonical: str, ref: Dict[str, str]) -> Any:
+    if isinstance(value, dict):
+        if "properties" in value and _canonical(value) == canonical:
+            return dict(ref)
+        return {key: _replace(item, canonical, ref) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_replace(item, canonical, ref) for item in value]
+    return value
+
+
+def _dedupe(paths: Dict[str, Any], titles: Mapping[str, str]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Moves object schemas occurring more than once into components, largest first; returns (paths, schemas)."""
+    components: Dict[str, Any] = {}
+    while True:
+        found: List[Dict[str, Any]] = []
+        _object_schemas([paths, components], found)
+        counts: Dict[str, int] = {}
+        for schema in found:
+            counts[_canonical(schema)] = counts.get(_canonical(schema), 0) + 1
+        repeated = [key for key, count in counts.items() if count > 1 and len(key) >= _MIN_HOISTED_CHARS]
+        if not repeated:
+            return paths, components
+
+        canonical = max(repeated, key=len)
+        name = titles.get(canonical) or f"Schema{len(components) + 1}"
+        while name in components:
+            name += "_"
+        ref = {"$ref": f"#/components/schemas/{name}"}
+        components[name] = json.loads(canonical)
+        paths = _replace(paths, canonical, ref)
+        components = {key: _replace(schema, canonical, ref) if key != name else schema
+                      for key, schema in components.items()}
+
+
+def compile_spec(spec: Mapping[str, Any], operations: Optional[Sequence[str]] = None,
+                 keep_response_schemas: bool = False) -> Dict[str, Any]:
+    """
+    Builds a minimal spec exposing only the allowed operations.
+
+    :param spec: OpenAPI spec, with or without $refs
+    :param operations: operationIds to keep (all operations when None)
+    :param keep_response_schemas: Keep the success response schemas (the model rarely needs them)
+    :return: The compiled spec
+    :raises ValueError: If an operationId is not in the spec or streams events
+    """
+    resolved = jsonref.replace_refs(spec, proxies=False, lazy_load=False)
+    openapi_30 = str(spec.get("openapi", "3.0")).startswith("3.0")
+    titles = {}
+    for component in resolved.get("components", {}).get("schemas", {}).values():
+        titles[_canonical(_minify_schema(component, openapi_30))] = component.get("title")
+
+    allowed = set(operations) if operations is not None else None
+    paths: Dict[str, Any] = {}
+    kept = set()
+    for path, path_item in resolved["paths"].items():
+        for method in HTTP_METHODS:
+            operation = path_item.get(method)
+            if operation is None or (allowed is not None and operation.get("operationId") not in allowed):
+                continue
+            if streams_events(operation):
+                if allowed is not None:
+                    raise ValueError(f"{operation.get('operationId')} streams server-sent events and cannot be a tool")
+                continue
+            paths.setdefault(path, {})[method] = _minify_operation(operation, keep_response_schemas, openapi_30,
+                                                                   path_item.get("parameters", []))
+            kept.add(operation.get("operationId"))
+    if allowed is not None and allowed - kept:
+        raise ValueError(f"Operations not found in the spec: {', '.join(sorted(allowed - kept))}")
+
+    paths, schemas = _dedupe(paths, titles)
+
+    compiled: Dict[str, Any] = {
+        "openapi": spec.get("openapi", "3.0.0"),
+        "info": {"title": spec.get("info", {}).get("title", "API"), "version": spec.get("info", {}).get("version", "1.0")},
+        "servers": spec.get("servers", []),
+        "paths": paths,
+    }
+    components: Dict[str, Any] = {}
+    if schemas:
+        components["schemas"] = schemas
+    if "securitySchemes" in spec.get("components", {}):
+        components["securitySchemes"] = spec["components"]["securitySchemes"]
+    if components:
+        compiled["components"] = components
+    if "security" in spec:
+        compiled["security"] = spec["security"]
+    return compiled
+
+
+def token_report(original: Mapping[str, Any], compiled: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Compares the size of a spec before and after compilation.
+
+    :param original: The spec as the samples used to send it (fully resolved)
+    :param compiled: The output of compile_spec
+    :return: Operation and token counts before/after and the percentage saved
+    """
+    def count_operations(spec: Mapping[str, Any]) -> int:
+        return sum(1 for path_item in spec["paths"].values() for method in path_item if method in HTTP_METHODS)
+
+    before, after = count_json_tokens(original), count_json_tokens(compiled)
+    return {
+        "operations_before": count_operations(original),
+        "operations_after": count_operations(compiled),
+        "tokens_before": before,
+        "tokens_after": after,
+        "saved_pct": round((1 - after / before) * 100, 1) if before else 0.0,
+    }
+
+
+def load_compiled_spec(path: str, operations: Optional[Sequence[str]] = None, keep_response_schemas: bool = False,
+                       verbose: bool = True, overlay: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Loads and compiles a spec file, cached like helpers.tool_cache.load_openapi_spec.
+
+    :param path: Path to the OpenAPI JSON file
+    :param operations: operationIds to keep (all operations when None)
+    :param keep_response_schemas: Keep the success response schemas
+    :param verbose: Print the token counts before and after
+    :param overlay: Optional overlay spec merged in first (see helpers.tool_cache.read_openapi_json)
+    :return: The compiled spec
+    """
+    key = cache_key("compiled-openapi", file_sha256(path), file_sha256(__file__),
+                    ",".join(sorted(operations)) if operations is not None else "*", str(keep_response_schemas),
+                    *([file_sha256(overlay)] if overlay else []))
+    cached = read_cached(key)
+    if cached is None:
+        compiled = compile_spec(read_openapi_json(path, overlay), operations, keep_response_schemas)
+        cached = {"spec": compiled, "report": token_report(load_openapi_spec(path, overlay), compiled)}
+        write_cached(key, cached)
+
+    if verbose:
+        report = cached["report"]
+        print(f"🗜️  {os.path.basename(path)}: {report['operations_after']}/{report['operations_before']} operations, "
+              f"{report['tokens_before']} → {report['tokens_after']} tokens ({report['saved_pct']}% saved)")
+    return cached["spec"]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compile an OpenAPI spec down to the operations an agent may call")
+    parser.add_argument("spec", help="Path to the OpenAPI JSON file")
+    parser.add_argument("--operations", nargs="+", help="operationIds to keep (default: all)")
+    parser.add_argument("--keep-response-schemas", action="store_true", help="Keep the success response schemas")
+    parser.add_argument("--output", help="Write the compiled spec to this file")
+    args = parser.parse_args()
+
+    with open(args.spec, "r") as f:
+        result = compile_spec(json.load(f), args.operations, args.keep_response_schemas)
+    print(json.dumps(token_report(load_openapi_spec(args.spec), result), indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
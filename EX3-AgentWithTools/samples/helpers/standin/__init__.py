@@ -0,0 +1,86 @@
+"""
+Local stand-ins for the inventory and maintenance APIs used by the OpenAPI samples.
+
+The routes are generated from the specs in samples/openApiDef, so every
+operation the agents can call is served (startup fails if one is missing),
+over seeded datasets of 10 to 1,000,000 records with optional latency and
+fault injection. Operations only the stand-ins implement are described in
+overlay specs (openApiDef/standin/<API>.ext.json) merged over the hosted
+spec here, never in the hosted spec itself: agents built from openApiDef
+must not be offered tools the hosted APIs answer with 404. spec_paths()
+gives both files to the samples that target a stand-in (ex3-ch2 with
+OPENAPI_EXECUTION=local). Point the function tools at a stand-in to
+benchmark and load-test the tool path offline. docs_mcp is a documentation
+MCP server in the same spirit, for the MCP tools and the caching proxy, and
+agent_files holds the files and vector stores of an agents project in
+memory, for FileSync.
+
+Run from EX3-AgentWithTools/samples:
+    python -m helpers.standin inventory --port 8001 --items 10000 --latency-ms 40 --fault-rate 0.01
+    python -m helpers.standin maintenance --port 8002
+    python -m helpers.standin.loadtest http://127.0.0.1:8001 --requests 2000 --concurrency 16
+    python -m helpers.standin.reservation_benchmark --lines 15 --latency-ms 40
+    python -m helpers.standin.docs_mcp --port 8003 --latency-ms 150
+    python -m helpers.standin.mcp_proxy_benchmark --runs 5 --latency-ms 150
+    python -m helpers.standin.file_sync_benchmark --files 20 --upload-ms 300
+"""
+
+import datetime
+import os
+from typing import Any, Optional, Tuple
+
+from helpers.standin.inventory import InventoryApi
+from helpers.standin.maintenance import MaintenanceApi
+from helpers.standin.router import SpecRouter
+from helpers.standin.server import StandInServer
+from helpers.tool_cache import load_openapi_spec
+
+SPEC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "openApiDef")
+STANDIN_SPEC_DIR = os.path.join(SPEC_DIR, "standin")
+
+APIS = {
+    "inventory": (InventoryApi, "InventoryAPI.json"),
+    "maintenance": (MaintenanceApi, "MaintenanceAPI.json"),
+}
+
+MIN_ITEMS = 10
+MAX_ITEMS = 1_000_000
+
+
+def spec_paths(api: str) -> Tuple[str, Optional[str]]:
+    """
+    Spec of an API and its stand-in overlay, as (path, overlay or None) for load_openapi_spec / load_compiled_spec.
+
+    :param api: "inventory" or "maintenance"
+    """
+    if api not in APIS:
+        raise ValueError(f"Unknown API '{api}', expected one of: {', '.join(APIS)}")
+    spec_file = APIS[api][1]
+    overlay = os.path.join(STANDIN_SPEC_DIR, spec_file.replace(".json", ".ext.json"))
+    return os.path.join(SPEC_DIR, spec_file), overlay if os.path.isfile(overlay) else None
+
+
+def create_server(api: str, host: str = "127.0.0.1", port: int = 0, items: int = 100, seed: int = 42,
+                  today: Optional[datetime.date] = None, **server_options: Any) -> StandInServer:
+    """
+    Builds a stand-in server for one of the APIs.
+
+    :param api: "inventory" or "maintenance"
+    :param host: Interface to bind
+    :param port: Port to bind (0 picks a free port)
+    :param items: Dataset size (inventory items or maintenance jobs)
+    :param seed: Dataset seed
+    :param today: Reference date of the dataset (defaults to today)
+    :param server_options: latency_ms, jitter_ms, fault_rate, verbose (see StandInServer)
+    :return: The server; call start() or serve_forever()
+    """
+    if api not in APIS:
+        raise ValueError(f"Unknown API '{api}', expected one of: {', '.join(APIS)}")
+    if not MIN_ITEMS <= items <= MAX_ITEMS:
+        raise ValueError(f"items must be between {MIN_ITEMS} and {MAX_ITEMS}")
+
+    path, overlay = spec_paths(api)
+    handlers = APIS[api][0](size=items, seed=seed, today=today).handlers()
+    router = SpecRouter(load_openapi_spec(path, overlay=overlay), handlers)
+    return StandInServer(router, host=host, port=port, seed=seed, **server_options)
+
@@ -0,0 +1,34 @@
+"""
+Command line entry point: python -m helpers.standin {inventory,maintenance} [options]
+"""
+
+import argparse
+import time
+
+from helpers.standin import APIS, create_server
+
+parser = argparse.ArgumentParser(description="Serve a local stand-in of the inventory or maintenance API")
+parser.add_argument("api", choices=sorted(APIS), help="API to serve")
+parser.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+parser.add_argument("--port", type=int, default=8000, help="Port to bind")
+parser.add_argument("--items", type=int, default=100, help="Dataset size, 10 - 1,000,000 (inventory items or jobs)")
+parser.add_argument("--seed", type=int, default=42, help="Dataset and fault-injection seed")
+parser.add_argument("--latency-ms", type=float, default=0.0, help="Delay added to every response")
+parser.add_argument("--jitter-ms", type=float, default=0.0, help="Extra random delay, uniform in [0, jitter]")
+parser.add_argument("--fault-rate", type=float, default=0.0, help="Fraction of requests answered with a 503")
+parser.add_argument("--verbose", action="store_true", help="Log every request")
+args = parser.parse_args()
+
+start = time.perf_counter()
+server = create_server(
+    args.api, host=args.host, port=args.port, items=args.items, seed=args.seed,
+    latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, fault_rate=args.fault_rate, verbose=args.verbose,
+)
+print(f"🏭 {args.api} stand-in with {args.items} records (seed {args.seed}) "
+      f"built in {time.perf_counter() - start:.2f}s, serving on {server.url}")
+try:
+    server.serve_forever()
+except KeyboardInterrupt:
+    print("\n👋 Stopped")
+finally:
+    server.server_close()
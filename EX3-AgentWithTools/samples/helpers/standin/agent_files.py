@@ -0,0 +1,136 @@
+"""
+In-process stand-in for the files and vector-store operations of the agents client.
+
+Implements the subset of AgentsClient that helpers.file_sync uses (files,
+vector_stores, vector_store_file_batches, vector_store_files) over
+dictionaries. Every upload waits upload_ms and every file indexed into a
+vector store waits index_ms, and both are counted, so the time a file-backed
+agent spends at startup can be measured offline.
+
+Usage:
+    client = StandInAgentFiles(upload_ms=300, index_ms=200)
+    FileSync(client, endpoint="standin").vector_store("docs", paths)
+"""
+
+import itertools
+import os
+import threading
+import time
+from collections import Counter
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Set
+
+from azure.ai.agents.models import FilePurpose, VectorStoreFileBatchStatus, VectorStoreStatus
+from azure.core.exceptions import ResourceNotFoundError
+
+
+class _Files:
+    def __init__(self, owner: "StandInAgentFiles"):
+        self._owner = owner
+
+    def upload_and_poll(self, *, file_path: str, purpose: FilePurpose, **_: Any) -> SimpleNamespace:
+        owner = self._owner
+        with open(file_path, "rb") as f:
+            size = len(f.read())
+        time.sleep(owner.upload_ms / 1000)
+        file_id = owner.new_id("assistant-")
+        with owner.lock:
+            owner.file_objects[file_id] = SimpleNamespace(id=file_id, filename=os.path.basename(file_path),
+                                                          bytes=size, purpose=purpose, status="processed")
+            owner.calls["upload"] += 1
+        return owner.file_objects[file_id]
+
+    def get(self, file_id: str) -> SimpleNamespace:
+        self._owner.calls["get_file"] += 1
+        if file_id not in self._owner.file_objects:
+            raise ResourceNotFoundError(f"No file {file_id}")
+        return self._owner.file_objects[file_id]
+
+    def delete(self, file_id: str) -> None:
+        if self._owner.file_objects.pop(file_id, None) is None:
+            raise ResourceNotFoundError(f"No file {file_id}")
+
+
+class _VectorStores:
+    def __init__(self, owner: "StandInAgentFiles"):
+        self._owner = owner
+
+    def create_and_poll(self, *, file_ids: Optional[List[str]] = None, name: Optional[str] = None,
+                        **_: Any) -> SimpleNamespace:
+        owner = self._owner
+        store_id = owner.new_id("vs_")
+        owner.stores[store_id] = SimpleNamespace(id=store_id, name=name, status=VectorStoreStatus.COMPLETED)
+        owner.store_files[store_id] = set()
+        owner.calls["create_vector_store"] += 1
+        owner.index(store_id, file_ids or [])
+        return owner.stores[store_id]
+
+    def get(self, vector_store_id: str) -> SimpleNamespace:
+        self._owner.calls["get_vector_store"] += 1
+        if vector_store_id not in self._owner.stores:
+            raise ResourceNotFoundError(f"No vector store {vector_store_id}")
+        return self._owner.stores[vector_store_id]
+
+    def delete(self, vector_store_id: str) -> None:
+        if self._owner.stores.pop(vector_store_id, None) is None:
+            raise ResourceNotFoundError(f"No vector store {vector_store_id}")
+        del self._owner.store_files[vector_store_id]
+
+
+class _FileBatches:
+    def __init__(self, owner: "StandInAgentFiles"):
+        self._owner = owner
+
+    def create_and_poll(self, *, vector_store_id: str, file_ids: List[str], **_: Any) -> SimpleNamespace:
+        self._owner.calls["file_batch"] += 1
+        self._owner.index(vector_store_id, file_ids)
+        return SimpleNamespace(id=self._owner.new_id("vsfb_"), status=VectorStoreFileBatchStatus.COMPLETED)
+
+
+class _StoreFiles:
+    def __init__(self, owner: "StandInAgentFiles"):
+        self._owner = owner
+
+    def delete(self, *, vector_store_id: str, file_id: str) -> None:
+        self._owner.calls["detach"] += 1
+        files = self._owner.store_files.get(vector_store_id)
+        if files is None or file_id not in files:
+            raise ResourceNotFoundError(f"No file {file_id} in vector store {vector_store_id}")
+        files.discard(file_id)
+
+
+class StandInAgentFiles:
+    """
+    Files and vector stores of an agents project, in memory.
+
+    :param upload_ms: Delay of every upload
+    :param index_ms: Delay per file indexed into a vector store
+    """
+
+    def __init__(self, upload_ms: float = 0.0, index_ms: float = 0.0):
+        self.upload_ms = upload_ms
+        self.index_ms = index_ms
+        self.file_objects: Dict[str, SimpleNamespace] = {}
+        self.stores: Dict[str, SimpleNamespace] = {}
+        self.store_files: Dict[str, Set[str]] = {}
+        self.calls: Counter = Counter()
+        self.lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self.files = _Files(self)
+        self.vector_stores = _VectorStores(self)
+        self.vector_store_file_batches = _FileBatches(self)
+        self.vector_store_files = _StoreFiles(self)
+
+    def new_id(self, prefix: str) -> str:
+        with self.lock:
+            return f"{prefix}{next(self._ids):06d}"
+
+    def index(self, vector_store_id: str, file_ids: List[str]) -> None:
+        if vector_store_id not in self.store_files:
+            raise ResourceNotFoundError(f"No vector store {vector_store_id}")
+        missing = [file_id for file_id in file_ids if file_id not in self.file_objects]
+        if missing:
+            raise ResourceNotFoundError(f"No file(s) {', '.join(missing)}")
+        time.sleep(len(file_ids) * self.index_ms / 1000)
+        self.store_files[vector_store_id].update(file_ids)
+        self.calls["indexed_files"] += len(file_ids)
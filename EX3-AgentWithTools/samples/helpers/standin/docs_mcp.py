@@ -0,0 +1,152 @@
+"""
+Stand-in documentation MCP server, shaped like the Microsoft Learn MCP server.
+
+Serves a seeded corpus of documentation pages through three tools:
+docs_search and docs_fetch (annotated read-only, so a caching proxy may keep
+their results) and docs_feedback (a write, never cached). Every tool call
+waits latency_ms and is counted per tool, so the proxy's cache hits and
+coalesced calls can be checked against what actually reached the server.
+
+Run from EX3-AgentWithTools/samples:
+    python -m helpers.standin.docs_mcp --port 8003 --pages 500 --latency-ms 150
+"""
+
+import argparse
+import random
+import re
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List
+
+from helpers.mcp_server import McpHttpServer
+
+BASE_URL = "https://docs.example.com/en-us/azure"
+SERVICES = ["Azure Functions", "Azure App Service", "Azure Container Apps", "Azure Storage", "Azure Cosmos DB",
+            "Azure AI Foundry", "Azure Key Vault", "Azure Monitor", "Azure Service Bus", "Azure Event Grid"]
+TOPICS = ["overview", "quickstart", "triggers and bindings", "deployment", "scaling", "security", "monitoring",
+          "pricing", "best practices", "troubleshooting", "networking", "identity", "limits and quotas"]
+LANGUAGES = ["python", "csharp", "javascript", "java", "powershell"]
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+
+
+def generate_pages(count: int, seed: int = 42) -> List[Dict[str, str]]:
+    """
+    Generates a reproducible documentation corpus.
+
+    :param count: Number of pages
+    :param seed: Random seed
+    :return: Pages with url, title and content (markdown)
+    """
+    rng = random.Random(seed)
+    pages = []
+    for index in range(count):
+        service = SERVICES[index % len(SERVICES)]
+        topic = TOPICS[(index // len(SERVICES)) % len(TOPICS)]
+        language = LANGUAGES[rng.randrange(len(LANGUAGES))]
+        title = f"{service} {topic}" + (f" ({index // (len(SERVICES) * len(TOPICS))})" if index >= len(SERVICES) * len(TOPICS) else "")
+        paragraphs = [
+            f"# {title}",
+            f"This article covers {topic} for {service}. It applies to the {language} programming model.",
+            f"Use {service} {topic} guidance together with the {SERVICES[rng.randrange(len(SERVICES))]} documentation.",
+            f"```{language}\n# {service} sample {index}\nclient = create_client(\"{_slug(service)}\")\n```",
+        ]
+        pages.append({"url": f"{BASE_URL}/{_slug(service)}/{_slug(title)}", "title": title,
+                      "content": "\n\n".join(paragraphs)})
+    return pages
+
+
+class StandInDocsMcp(McpHttpServer):
+    """
+    Documentation MCP server over a generated corpus.
+
+    :param pages: Number of documentation pages
+    :param seed: Corpus seed
+    :param latency_ms: Delay added to every tool call
+    :param host: Interface to bind
+    :param port: Port to bind (0 picks a free port)
+    :param verbose: Log every request to stderr
+    """
+
+    def __init__(self, pages: int = 200, seed: int = 42, latency_ms: float = 0.0, host: str = "127.0.0.1",
+                 port: int = 0, verbose: bool = False):
+        super().__init__("standin-docs", host=host, port=port, verbose=verbose,
+                         instructions="Search and read the documentation before answering.")
+        self.latency_ms = latency_ms
+        self.pages = {page["url"]: page for page in generate_pages(pages, seed)}
+        self.calls: Counter = Counter()
+        self.feedback: Counter = Counter()
+        self._calls_lock = threading.Lock()
+
+        self.add_tool(
+            "docs_search", "Search the documentation and return the best matching pages with an excerpt.",
+            {"type": "object", "properties": {"query": {"type": "string"}, "top": {"type": "integer", "default": 5}},
+             "required": ["query"]},
+            self.docs_search, read_only=True,
+        )
+        self.add_tool(
+            "docs_fetch", "Fetch a documentation page as markdown.",
+            {"type": "object", "properties": {"url": {"type": "string"}}, "required": ["url"]},
+            self.docs_fetch, read_only=True,
+        )
+        self.add_tool(
+            "docs_feedback", "Record whether a documentation page was helpful.",
+            {"type": "object", "properties": {"url": {"type": "string"}, "helpful": {"type": "boolean"}},
+             "required": ["url", "helpful"]},
+            self.docs_feedback,
+        )
+
+    def call_tool(self, name: str, arguments: Any) -> Dict[str, Any]:
+        with self._calls_lock:
+            self.calls[name] += 1
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        return super().call_tool(name, arguments)
+
+    def docs_search(self, query: str, top: int = 5) -> Dict[str, Any]:
+        terms = set(re.findall(r"[a-z0-9]+", query.lower()))
+        scored = []
+        for page in self.pages.values():
+            words = re.findall(r"[a-z0-9]+", page["title"].lower())
+            score = sum(2 for word in words if word in terms) + sum(1 for term in terms if term in page["content"].lower())
+            if score:
+                scored.append((-score, page["url"]))
+        results = [{"url": url, "title": self.pages[url]["title"], "excerpt": self.pages[url]["content"].split("\n\n")[1]}
+                   for _, url in sorted(scored)[:max(1, min(top, 20))]]
+        return {"query": query, "results": results}
+
+    def docs_fetch(self, url: str) -> str:
+        if url not in self.pages:
+            raise ValueError(f"No documentation page at {url}")
+        return self.pages[url]["content"]
+
+    def docs_feedback(self, url: str, helpful: bool) -> Dict[str, Any]:
+        if url not in self.pages:
+            raise ValueError(f"No documentation page at {url}")
+        with self._calls_lock:
+            self.feedback[(url, helpful)] += 1
+        return {"url": url, "recorded": True}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve a stand-in documentation MCP server")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    parser.add_argument("--port", type=int, default=8003, help="Port to bind")
+    parser.add_argument("--pages", type=int, default=200, help="Documentation pages")
+    parser.add_argument("--seed", type=int, default=42, help="Corpus seed")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Delay added to every tool call")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args()
+
+    server = StandInDocsMcp(pages=args.pages, seed=args.seed, latency_ms=args.latency_ms, host=args.host,
+                            port=args.port, verbose=args.verbose)
+    print(f"📚 Documentation MCP stand-in with {args.pages} pages serving on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n👋 Stopped: {dict(server.calls)}")
+    finally:
+        server.server_close()
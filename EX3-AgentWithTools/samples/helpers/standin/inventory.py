@@ -0,0 +1,217 @@
+"""
+Stand-in for the Industrial Inventory Management API (openApiDef/InventoryAPI.json).
+
+The dataset is generated from a seed, so two servers started with the same
+--items and --seed serve identical data. Items are indexed by id and
+category and the low-stock set is maintained on every reservation, so
+lookups stay O(1) up to a million items. Bulk reservations check every line
+and reserve them under one lock, so they are atomic with respect to all
+other requests.
+"""
+
+import datetime
+import random
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from helpers.standin.router import ApiError
+
+CATALOG = {
+    "Mechanical": ["Ball Bearing", "Spur Gear", "Drive Belt", "Shaft Coupling", "Shaft Seal", "Sprocket", "Conveyor Roller"],
+    "Electrical": ["Control Relay", "Contactor", "Circuit Breaker", "Motor Starter", "Fuse", "Power Supply", "Terminal Block"],
+    "Hydraulic": ["Hydraulic Pump", "Hydraulic Cylinder", "Pressure Relief Valve", "Hydraulic Hose", "Filter Element"],
+    "Pneumatic": ["Air Cylinder", "Solenoid Valve", "Pressure Regulator", "Pneumatic Fitting", "Air Filter"],
+    "Sensors": ["Temperature Sensor", "Pressure Transmitter", "Proximity Sensor", "Flow Meter", "Vibration Sensor"],
+    "Safety": ["Emergency Stop Button", "Safety Light Curtain", "Safety Relay", "Guard Interlock Switch"],
+}
+SUPPLIERS = ["SKF", "Siemens", "ABB", "Parker Hannifin", "Festo", "Schneider Electric", "Bosch Rexroth", "Omron", "Eaton"]
+WAREHOUSES = ["Warehouse A", "Warehouse B", "Warehouse C"]
+RESERVATION_DAYS = 7
+MAX_BULK_LINES = 500
+
+
+def generate_inventory(size: int, seed: int = 42, today: Optional[datetime.date] = None) -> List[Dict[str, Any]]:
+    """
+    Generates a reproducible list of InventoryItem records.
+
+    :param size: Number of items (10 - 1,000,000)
+    :param seed: Random seed
+    :param today: Reference date for last_updated (defaults to today)
+    :return: Items with the InventoryItem fields
+    """
+    rng = random.Random(seed)
+    today = today or datetime.date.today()
+    categories = list(CATALOG)
+    items = []
+    for index in range(1, size + 1):
+        category = categories[rng.randrange(len(categories))]
+        part = CATALOG[category][rng.randrange(len(CATALOG[category]))]
+        items.append({
+            "item_id": f"ITM-{index:06d}",
+            "name": f"{part} {category[:2].upper()}-{rng.randint(100, 9999)}",
+            "category": category,
+            "stock_quantity": rng.randint(0, 200),
+            "location": f"{WAREHOUSES[rng.randrange(len(WAREHOUSES))]} - Aisle {rng.randint(1, 24)}",
+            "min_stock_level": rng.randint(5, 30),
+            "unit_price": round(rng.uniform(5, 2500), 2),
+            "supplier": SUPPLIERS[rng.randrange(len(SUPPLIERS))],
+            "last_updated": (today - datetime.timedelta(days=rng.randint(0, 90))).isoformat(),
+        })
+    return items
+
+
+class InventoryApi:
+    """
+    Handlers for every operation of InventoryAPI.json over a generated dataset.
+
+    :param size: Number of inventory items
+    :param seed: Random seed for the dataset
+    :param today: Reference date (defaults to today)
+    """
+
+    def __init__(self, size: int = 100, seed: int = 42, today: Optional[datetime.date] = None):
+        self.today = today or datetime.date.today()
+        self.items = generate_inventory(size, seed, self.today)
+        self.by_id = {item["item_id"]: item for item in self.items}
+        self.by_category: Dict[str, List[Dict[str, Any]]] = {}
+        for item in self.items:
+            self.by_category.setdefault(item["category"].lower(), []).append(item)
+        self.low_stock = {item["item_id"] for item in self.items if self._is_low(item)}
+        self.reservations: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _is_low(item: Dict[str, Any]) -> bool:
+        return item["stock_quantity"] <= item["min_stock_level"]
+
+    def _item(self, item_id: str) -> Dict[str, Any]:
+        item = self.by_id.get(item_id) or self.by_id.get(item_id.upper())
+        if item is None:
+            raise ApiError(404, f"Item {item_id} not found")
+        return item
+
+    def handlers(self) -> Dict[str, Callable[..., Any]]:
+        return {
+            "root__get": self.root,
+            "get_all_inventory_inventory_get": self.get_all_inventory,
+            "check_stock_inventory__item_id__get": self.check_stock,
+            "get_items_by_category_inventory_category__category__get": self.get_items_by_category,
+            "get_low_stock_items_inventory_low_stock_get": self.get_low_stock_items,
+            "reserve_items_inventory_reserve_post": self.reserve_items,
+            "reserve_items_bulk_inventory_reserve_bulk_post": self.reserve_items_bulk,
+            "get_reservations_reservations_get": self.get_reservations,
+            "get_reservation_reservations__reservation_id__get": self.get_reservation,
+        }
+
+    def root(self) -> Dict[str, Any]:
+        return {"message": "Industrial Inventory Management API", "status": "running", "items": len(self.items)}
+
+    def get_all_inventory(self) -> List[Dict[str, Any]]:
+        return self.items
+
+    def check_stock(self, item_id: str) -> Dict[str, Any]:
+        item = self._item(item_id)
+        available = item["stock_quantity"] > 0
+        return {
+            "item_id": item["item_id"],
+            "available": available,
+            "stock_quantity": item["stock_quantity"],
+            "location": item["location"],
+            "estimated_delivery_days": None if available else 3 + int(item["item_id"][4:]) % 12,
+        }
+
+    def get_items_by_category(self, category: str) -> List[Dict[str, Any]]:
+        return self.by_category.get(category.lower(), [])
+
+    def get_low_stock_items(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            ids = sorted(self.low_stock)
+        return [self.by_id[item_id] for item_id in ids]
+
+    def reserve_items(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        if body["quantity"] <= 0:
+            raise ApiError(400, "Quantity must be greater than zero")
+        with self._lock:
+            item = self._item(body["item_id"])
+            if item["stock_quantity"] < body["quantity"]:
+                raise ApiError(400, f"Insufficient stock for {item['item_id']}: "
+                                    f"{item['stock_quantity']} available, {body['quantity']} requested")
+            return self._reserve(item, body["quantity"], body["requested_by"], body["work_order"])
+
+    def reserve_items_bulk(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        lines = body["items"]
+        if not 1 <= len(lines) <= MAX_BULK_LINES:
+            raise ApiError(400, f"A bulk reservation takes 1 to {MAX_BULK_LINES} lines")
+        all_or_nothing = body.get("all_or_nothing", True)
+
+        with self._lock:
+            # One pass over the lines: stock left per item after the earlier lines of the same request
+            remaining: Dict[str, int] = {}
+            results = []
+            for line in lines:
+                result = {"item_id": line["item_id"], "quantity": line["quantity"]}
+                item = self.by_id.get(line["item_id"]) or self.by_id.get(line["item_id"].upper())
+                if item is None:
+                    result.update(status="failed", detail=f"Item {line['item_id']} not found")
+                elif line["quantity"] <= 0:
+                    result.update(status="failed", detail="Quantity must be greater than zero")
+                else:
+                    left = remaining.setdefault(item["item_id"], item["stock_quantity"])
+                    if left < line["quantity"]:
+                        result.update(status="failed", stock_quantity=left,
+                                      detail=f"Insufficient stock: {left} available, {line['quantity']} requested")
+                    else:
+                        remaining[item["item_id"]] = left - line["quantity"]
+                        result.update(status="ok", item=item)
+                results.append(result)
+
+            failed = sum(1 for result in results if result["status"] == "failed")
+            rejected = all_or_nothing and failed > 0
+            for result in results:
+                if result["status"] != "ok":
+                    continue
+                item = result.pop("item")
+                if rejected:
+                    result.update(status="not_reserved", detail="Not reserved: other lines failed (all_or_nothing)")
+                    continue
+                reservation = self._reserve(item, result["quantity"], body["requested_by"], body["work_order"])
+                result.update(item_id=item["item_id"], status="reserved", reservation_id=reservation["reservation_id"],
+                              stock_quantity=item["stock_quantity"])
+
+        return {
+            "work_order": body["work_order"],
+            "status": "rejected" if rejected else "partial" if failed else "confirmed",
+            "reserved_lines": sum(1 for result in results if result["status"] == "reserved"),
+            "failed_lines": failed,
+            "lines": results,
+        }
+
+    def _reserve(self, item: Dict[str, Any], quantity: int, requested_by: str, work_order: str) -> Dict[str, Any]:
+        """Takes the quantity out of stock and records the reservation; the caller holds the lock."""
+        item["stock_quantity"] -= quantity
+        item["last_updated"] = self.today.isoformat()
+        if self._is_low(item):
+            self.low_stock.add(item["item_id"])
+
+        reservation = {
+            "reservation_id": f"RES-{len(self.reservations) + 1:06d}",
+            "item_id": item["item_id"],
+            "quantity": quantity,
+            "status": "confirmed",
+            "reserved_until": (datetime.datetime.combine(self.today, datetime.time())
+                               + datetime.timedelta(days=RESERVATION_DAYS)).isoformat(timespec="seconds"),
+            "requested_by": requested_by,
+            "work_order": work_order,
+        }
+        self.reservations[reservation["reservation_id"]] = reservation
+        return reservation
+
+    def get_reservations(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self.reservations.values())
+
+    def get_reservation(self, reservation_id: str) -> Dict[str, Any]:
+        reservation = self.reservations.get(reservation_id)
+        if reservation is None:
+            raise ApiError(404, f"Reservation {reservation_id} not found")
+        return reservation
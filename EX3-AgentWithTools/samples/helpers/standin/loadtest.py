@@ -0,0 +1,119 @@
+"""
+Load generator for the stand-in servers (or any deployment of the two APIs).
+
+Each worker keeps one HTTP/1.1 connection open and cycles through the
+read-only operations the agents call most, so the numbers reflect the tool
+path rather than connection setup. Reports throughput, latency percentiles
+and status codes (injected faults show up as 503).
+
+Run from EX3-AgentWithTools/samples:
+    python -m helpers.standin.loadtest http://127.0.0.1:8001 --requests 2000 --concurrency 16
+"""
+
+import argparse
+import http.client
+import json
+import statistics
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence
+from urllib.parse import urlsplit
+
+DEFAULT_PATHS = {
+    "Industrial Inventory Management API": [
+        "/inventory/low-stock", "/inventory/ITM-000001", "/inventory/category/Electrical", "/reservations",
+    ],
+    "Industrial Maintenance Scheduling API": [
+        "/technicians/available", "/schedule/next-available", "/technicians/TECH-0001",
+        "/schedule/technician/TECH-0001?days=7", "/schedule/earliest?duration_hours=3&specialization=Hydraulic",
+    ],
+}
+
+
+def _connection(base_url: str) -> http.client.HTTPConnection:
+    parts = urlsplit(base_url)
+    connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+    return connection_class(parts.hostname, parts.port, timeout=30)
+
+
+def default_paths(base_url: str) -> List[str]:
+    """Picks the request mix from the API's root message."""
+    connection = _connection(base_url)
+    try:
+        connection.request("GET", urlsplit(base_url).path + "/")
+        message = json.loads(connection.getresponse().read()).get("message", "")
+    finally:
+        connection.close()
+    if message not in DEFAULT_PATHS:
+        raise ValueError(f"Unknown API at {base_url}; pass --paths explicitly")
+    return DEFAULT_PATHS[message]
+
+
+def run_load(base_url: str, paths: Sequence[str], requests: int = 1000, concurrency: int = 8) -> Dict[str, Any]:
+    """
+    Sends GET requests round-robin over paths from concurrent workers.
+
+    :param base_url: Server URL (e.g. http://127.0.0.1:8001)
+    :param paths: Paths to request
+    :param requests: Total number of requests
+    :param concurrency: Number of workers, one persistent connection each
+    :return: Throughput, latency percentiles (ms) and status code counts
+    """
+    prefix = urlsplit(base_url).path.rstrip("/")
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    lock = threading.Lock()
+    counter = iter(range(requests))
+
+    def worker() -> None:
+        connection: Optional[http.client.HTTPConnection] = None
+        for index in counter:  # Shared iterator: every request index is taken by exactly one worker
+            connection = connection or _connection(base_url)
+            start = time.perf_counter()
+            try:
+                connection.request("GET", prefix + paths[index % len(paths)])
+                response = connection.getresponse()
+                response.read()
+                status = response.status
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                connection, status = None, "connection_error"
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                latencies.append(elapsed)
+                statuses[status] += 1
+        if connection:
+            connection.close()
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+
+    cut_points = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    return {
+        "requests": len(latencies),
+        "concurrency": concurrency,
+        "seconds": round(wall, 3),
+        "requests_per_second": round(len(latencies) / wall, 1),
+        "p50_ms": round(cut_points[49], 2),
+        "p95_ms": round(cut_points[94], 2),
+        "p99_ms": round(cut_points[98], 2),
+        "statuses": dict(statuses),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure throughput and latency of an inventory/maintenance API")
+    parser.add_argument("url", help="Base URL of the API")
+    parser.add_argument("--requests", type=int, default=1000, help="Total number of requests")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent workers")
+    parser.add_argument("--paths", nargs="+", help="Paths to request (defaults to a mix for the detected API)")
+    args = parser.parse_args()
+
+    result = run_load(args.url, args.paths or default_paths(args.url), args.requests, args.concurrency)
+    print(json.dumps(result, indent=2))
@@ -0,0 +1,530 @@
+"""
+Stand-in for the Industrial Maintenance Scheduling API (openApiDef/MaintenanceAPI.json).
+
+Technicians work hourly slots from 08:00 to 17:00. Every scheduled or
+in-progress job occupies consecutive hours of its technician's day, so the
+schedule, next-available and booking endpoints answer from the same
+bookings. Earliest-slot questions are answered from a ScheduleIndex
+(helpers/standin/scheduling.py) kept in sync with every booking, so they
+cost O(log n) instead of a scan over all technicians and days. Every job
+creation and status change is appended to a change feed, served as long-poll
+(/jobs/events) and server-sent events (/jobs/events/stream) with resumable
+cursors. The dataset is generated from a seed: --items sets the number of
+jobs and the number of technicians grows with it.
+"""
+
+import bisect
+import datetime
+import math
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from helpers.standin.router import ApiError, EventStream
+from helpers.standin.scheduling import ANY_SPECIALIZATION, ScheduleIndex
+
+WORKDAY_START = 8
+WORKDAY_END = 17
+HORIZON_DAYS = 14  # Generated jobs are scheduled within the next two weeks
+INDEX_DAYS = 2 * HORIZON_DAYS  # Days covered by the schedule index; later searches scan the bookings
+MAX_PLAN_JOBS = 500
+MAX_EVENTS = 100_000  # Change-feed events kept; older cursors get 410 Gone
+MAX_POLL_SECONDS = 60
+MAX_STREAM_SECONDS = 3600
+KEEPALIVE_SECONDS = 15
+
+SPECIALIZATIONS = ["Mechanical", "Electrical", "Hydraulic", "Pneumatics", "PLC Programming", "Welding", "HVAC"]
+SKILL_LEVELS = ["junior", "intermediate", "senior", "expert"]
+LOCATIONS = ["Plant 1 - Line A", "Plant 1 - Line B", "Plant 2 - Assembly", "Plant 2 - Paint Shop", "Plant 3 - Packaging"]
+FIRST_NAMES = ["Ahmed", "Sara", "Bilal", "Ayesha", "Omar", "Fatima", "Hassan", "Zainab", "Usman", "Hira", "Kamran", "Maria"]
+LAST_NAMES = ["Khan", "Ali", "Qureshi", "Malik", "Sheikh", "Butt", "Chaudhry", "Raza", "Siddiqui", "Hussain"]
+
+# (specialization, error code, description) of the generated jobs
+ISSUES = [
+    ("Hydraulic", "HYD-201", "Hydraulic pressure drop on press line"),
+    ("Hydraulic", "HYD-305", "Hydraulic fluid leak at cylinder seal"),
+    ("Electrical", "ELC-110", "Motor overload trip on conveyor drive"),
+    ("Electrical", "ELC-402", "Intermittent power loss in control cabinet"),
+    ("Mechanical", "MEC-120", "Excessive vibration on gearbox"),
+    ("Mechanical", "MEC-233", "Bearing noise on spindle"),
+    ("PLC Programming", "PLC-501", "PLC communication fault with HMI"),
+    ("Pneumatics", "PNE-140", "Air pressure drop in pneumatic actuator"),
+    ("Welding", "WLD-210", "Weld seam crack on machine frame"),
+    ("HVAC", "HVC-330", "Cooling unit not reaching setpoint"),
+]
+ERROR_CODE_PREFIXES = {"HYD": "Hydraulic", "ELC": "Electrical", "MEC": "Mechanical", "PLC": "PLC Programming",
+                       "PNE": "Pneumatics", "WLD": "Welding", "HVC": "HVAC"}
+KEYWORDS = {
+    "Hydraulic": ("hydraulic", "oil leak", "fluid"),
+    "Electrical": ("electric", "motor", "power", "voltage", "breaker"),
+    "Mechanical": ("bearing", "gear", "vibration", "belt", "shaft"),
+    "Pneumatics": ("pneumatic", "air pressure", "compressor"),
+    "PLC Programming": ("plc", "controller", "hmi", "communication"),
+    "Welding": ("weld",),
+    "HVAC": ("cooling", "hvac", "chiller", "ventilation"),
+}
+
+JOB_STATUSES = ["scheduled", "in_progress", "completed", "cancelled"]
+ACTIVE_JOB_STATUSES = ("scheduled", "in_progress")
+PRIORITIES = ["low", "medium", "high", "critical"]
+
+
+def required_specialization(error_code: Optional[str], description: str) -> Optional[str]:
+    """Guesses the specialization a job needs from its error code prefix or description."""
+    if error_code and error_code[:3].upper() in ERROR_CODE_PREFIXES:
+        return ERROR_CODE_PREFIXES[error_code[:3].upper()]
+    text = description.lower()
+    for specialization, words in KEYWORDS.items():
+        if any(word in text for word in words):
+            return specialization
+    return None
+
+
+class MaintenanceApi:
+    """
+    Handlers for every operation of MaintenanceAPI.json over a generated dataset.
+
+    :param size: Number of maintenance jobs (technicians: size // 20, at least 5)
+    :param seed: Random seed for the dataset
+    :param today: First day of the schedule (defaults to today)
+    """
+
+    def __init__(self, size: int = 100, seed: int = 42, today: Optional[datetime.date] = None):
+        self.today = today or datetime.date.today()
+        self.technicians: Dict[str, Dict[str, Any]] = {}
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self.jobs_by_status: Dict[str, Dict[str, Dict[str, Any]]] = {status: {} for status in JOB_STATUSES}
+        # (technician_id, date) -> sorted [start_hour, end_hour, job_id] bookings
+        self.bookings: Dict[Tuple[str, str], List[List[Any]]] = {}
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self.events: List[Dict[str, Any]] = []
+        self._first_event = 1  # Cursor of events[0]
+        self.schedule: Optional[ScheduleIndex] = None
+        self._generate(size, random.Random(seed))
+        self.schedule = ScheduleIndex(self.technicians.values(), self.bookings, self.today, INDEX_DAYS,
+                                      WORKDAY_START, WORKDAY_END)
+
+    # Dataset
+
+    def _generate(self, size: int, rng: random.Random) -> None:
+        for index in range(1, max(5, size // 20) + 1):
+            technician = {
+                "technician_id": f"TECH-{index:04d}",
+                "name": f"{FIRST_NAMES[rng.randrange(len(FIRST_NAMES))]} {LAST_NAMES[rng.randrange(len(LAST_NAMES))]}",
+                "specialization": rng.sample(SPECIALIZATIONS, rng.randint(1, 3)),
+                "skill_level": SKILL_LEVELS[rng.randrange(len(SKILL_LEVELS))],
+                "status": rng.choices(["available", "busy", "off_duty"], weights=[6, 3, 1])[0],
+                "current_location": LOCATIONS[rng.randrange(len(LOCATIONS))],
+                "contact_phone": f"+92-300-{rng.randint(1000000, 9999999)}",
+            }
+            self.technicians[technician["technician_id"]] = technician
+
+        technician_ids = list(self.technicians)
+        machines = max(10, size // 10)
+        for index in range(1, size + 1):
+            _, error_code, description = ISSUES[rng.randrange(len(ISSUES))]
+            status = rng.choices(JOB_STATUSES, weights=[40, 15, 40, 5])[0]
+            hours = rng.choice([1, 1.5, 2, 3, 4, 6])
+            job = {
+                "job_id": f"JOB-{index:06d}",
+                "machine_id": f"MCH-{rng.randint(1, machines):04d}",
+                "error_code": error_code,
+                "description": description,
+                "priority": rng.choices(PRIORITIES, weights=[3, 4, 2, 1])[0],
+                "estimated_duration_hours": hours,
+                "assigned_technician_id": None,
+                "scheduled_date": None,
+                "scheduled_time": None,
+                "status": status,
+                "created_at": None,
+                "notes": None,
+            }
+
+            technician_id = technician_ids[rng.randrange(len(technician_ids))]
+            if status in ACTIVE_JOB_STATUSES:
+                first_day = 0 if status == "in_progress" else rng.randrange(HORIZON_DAYS)
+                slot = self._first_free_slot(technician_id, math.ceil(hours), first_day, HORIZON_DAYS)
+                if slot is None:  # Technician fully booked: leave the job unassigned
+                    job["notes"] = "Awaiting technician assignment"
+                else:
+                    self._book(job, technician_id, *slot)
+            elif status == "completed":
+                day = self.today - datetime.timedelta(days=rng.randint(1, 60))
+                job.update(assigned_technician_id=technician_id, scheduled_date=day.isoformat(),
+                           scheduled_time=f"{rng.randint(WORKDAY_START, WORKDAY_END - 1):02d}:00")
+            created = (datetime.datetime.combine(self.today, datetime.time())
+                       - datetime.timedelta(days=rng.randint(1, 90), minutes=rng.randint(0, 1439)))
+            job["created_at"] = created.isoformat(timespec="seconds")
+            self._add_job(job)
+
+    def _add_job(self, job: Dict[str, Any]) -> None:
+        self.jobs[job["job_id"]] = job
+        self.jobs_by_status[job["status"]][job["job_id"]] = job
+
+    # Change feed
+
+    def _emit(self, job: Dict[str, Any], previous_status: Optional[str]) -> None:
+        """Appends a status transition to the feed and wakes the subscribers; the caller holds the lock."""
+        self.events.append({
+            "cursor": self._first_event + len(self.events),
+            "job_id": job["job_id"],
+            "previous_status": previous_status,
+            "status": job["status"],
+            "priority": job["priority"],
+            "assigned_technician_id": job["assigned_technician_id"],
+            "changed_at": datetime.datetime.now().isoformat(timespec="milliseconds"),
+        })
+        if len(self.events) > MAX_EVENTS:
+            dropped = len(self.events) - MAX_EVENTS // 2
+            del self.events[:dropped]
+            self._first_event += dropped
+        self._changed.notify_all()
+
+    def _latest_cursor(self) -> int:
+        return self._first_event + len(self.events) - 1
+
+    def _events_after(self, cursor: int, status: Optional[str], job_id: Optional[str],
+                      limit: int) -> Tuple[List[Dict[str, Any]], int]:
+        """Events after the cursor matching the filters, and the cursor to resume from; the caller holds the lock."""
+        if cursor < self._first_event - 1:
+            raise ApiError(410, f"Cursor {cursor} has expired; the oldest event is {self._first_event}")
+        if cursor > self._latest_cursor():
+            raise ApiError(400, f"Cursor {cursor} is ahead of the latest event {self._latest_cursor()}")
+        matched = []
+        position = cursor
+        for event in self.events[max(cursor - self._first_event + 1, 0):]:
+            position = event["cursor"]
+            if (status is None or event["status"] == status) and (job_id is None or event["job_id"] == job_id):
+                matched.append(event)
+                if len(matched) == limit:
+                    break
+        return matched, position
+
+    # Schedule
+
+    def _day(self, offset: int) -> str:
+        return (self.today + datetime.timedelta(days=offset)).isoformat()
+
+    def _free_start(self, technician_id: str, day: str, hours: int) -> Optional[int]:
+        """Earliest start hour of `hours` free consecutive hours on a technician's day."""
+        start = WORKDAY_START
+        for booked_start, booked_end, _ in self.bookings.get((technician_id, day), []):
+            if booked_start - start >= hours:
+                break
+            start = max(start, booked_end)
+        return start if start + hours <= WORKDAY_END else None
+
+    def _first_free_slot(self, technician_id: str, hours: int, first_day: int, days: int) -> Optional[Tuple[str, int]]:
+        for offset in range(first_day, days):
+            start = self._free_start(technician_id, self._day(offset), hours)
+            if start is not None:
+                return self._day(offset), start
+        return None
+
+    def _book(self, job: Dict[str, Any], technician_id: str, day: str, start: int) -> None:
+        hours = math.ceil(job["estimated_duration_hours"])
+        day_bookings = self.bookings.setdefault((technician_id, day), [])
+        bisect.insort(day_bookings, [start, start + hours, job["job_id"]])
+        job.update(assigned_technician_id=technician_id, scheduled_date=day, scheduled_time=f"{start:02d}:00")
+        if self.schedule is not None:
+            self.schedule.update(technician_id, day, day_bookings)
+
+    def _release(self, job: Dict[str, Any]) -> None:
+        day_bookings = self.bookings.get((job["assigned_technician_id"], job["scheduled_date"]), [])
+        day_bookings[:] = [booking for booking in day_bookings if booking[2] != job["job_id"]]
+        if self.schedule is not None:
+            self.schedule.update(job["assigned_technician_id"], job["scheduled_date"], day_bookings)
+
+    def _earliest_slot(self, hours: int, statuses: Tuple[str, ...], specialization: Optional[str],
+                       first_day: int) -> Optional[Tuple[str, int, Dict[str, Any]]]:
+        """
+        Earliest (date, start hour, technician) with `hours` free hours within HORIZON_DAYS of first_day.
+
+        Specialists are preferred; without any eligible specialist every eligible technician is considered.
+        """
+        if not specialization or not any(self.schedule.has_group(status, specialization) for status in statuses):
+            specialization = ANY_SPECIALIZATION
+        last_day = first_day + HORIZON_DAYS
+        if last_day <= INDEX_DAYS:
+            slot = self.schedule.earliest(hours, statuses, specialization, first_day, last_day)
+            if slot is None:
+                return None
+            offset, start, technician_id = slot
+            return self._day(offset), start, self.technicians[technician_id]
+
+        # Beyond the indexed days: scan the bookings of every eligible technician
+        best = None
+        for technician in self.technicians.values():
+            if technician["status"] not in statuses:
+                continue
+            if specialization != ANY_SPECIALIZATION and specialization not in technician["specialization"]:
+                continue
+            slot = self._first_free_slot(technician["technician_id"], hours, first_day, last_day)
+            if slot and (best is None or slot < best[0]):
+                best = (slot, technician)
+        return None if best is None else (best[0][0], best[0][1], best[1])
+
+    def _available_technician_ids(self) -> List[str]:
+        return [technician_id for technician_id, technician in self.technicians.items() if technician["status"] == "available"]
+
+    def _technician(self, technician_id: str) -> Dict[str, Any]:
+        technician = self.technicians.get(technician_id) or self.technicians.get(technician_id.upper())
+        if technician is None:
+            raise ApiError(404, f"Technician {technician_id} not found")
+        return technician
+
+    def _job(self, job_id: str) -> Dict[str, Any]:
+        job = self.jobs.get(job_id) or self.jobs.get(job_id.upper())
+        if job is None:
+            raise ApiError(404, f"Job {job_id} not found")
+        return job
+
+    # Handlers
+
+    def handlers(self) -> Dict[str, Callable[..., Any]]:
+        return {
+            "root__get": self.root,
+            "get_technicians_technicians_get": self.get_technicians,
+            "get_available_technicians_technicians_available_get": self.get_available_technicians,
+            "get_technician_technicians__technician_id__get": self.get_technician,
+            "get_next_available_slot_schedule_next_available_get": self.get_next_available_slot,
+            "get_technician_schedule_schedule_technician__technician_id__get": self.get_technician_schedule,
+            "get_earliest_slot_schedule_earliest_get": self.get_earliest_slot,
+            "book_maintenance_job_jobs_book_post": self.book_maintenance_job,
+            "plan_maintenance_jobs_jobs_plan_post": self.plan_maintenance_jobs,
+            "get_all_jobs_jobs_get": self.get_all_jobs,
+            "get_job_jobs__job_id__get": self.get_job,
+            "get_jobs_by_status_jobs_status__status__get": self.get_jobs_by_status,
+            "update_job_status_jobs__job_id__status_put": self.update_job_status,
+            "get_job_events_jobs_events_get": self.get_job_events,
+            "stream_job_events_jobs_events_stream_get": self.stream_job_events,
+        }
+
+    def root(self) -> Dict[str, Any]:
+        return {"message": "Industrial Maintenance Scheduling API", "status": "running",
+                "technicians": len(self.technicians), "jobs": len(self.jobs)}
+
+    def get_technicians(self) -> List[Dict[str, Any]]:
+        return list(self.technicians.values())
+
+    def get_available_technicians(self) -> List[Dict[str, Any]]:
+        return [technician for technician in self.technicians.values() if technician["status"] == "available"]
+
+    def get_technician(self, technician_id: str) -> Dict[str, Any]:
+        return self._technician(technician_id)
+
+    def get_next_available_slot(self) -> Dict[str, Any]:
+        with self._lock:
+            slot = self._earliest_slot(1, ("available",), None, 0)
+        if slot is None:
+            raise ApiError(404, "No available slot in the next two weeks")
+        return self._slot(*slot, hours=1)
+
+    def get_earliest_slot(self, duration_hours: float = 1, priority: str = "medium",
+                          specialization: Optional[str] = None, not_before: Optional[str] = None) -> Dict[str, Any]:
+        hours = self._whole_hours(duration_hours)
+        first_day = self._first_day(not_before, priority)
+        if specialization and specialization not in SPECIALIZATIONS:
+            raise ApiError(400, f"Unknown specialization '{specialization}'")
+        with self._lock:
+            slot = self._earliest_slot(hours, self._statuses(priority), specialization, first_day)
+        if slot is None:
+            raise ApiError(404, "No technician has a free slot in the next two weeks")
+        return self._slot(*slot, hours=hours)
+
+    def _slot(self, day: str, start: int, technician: Dict[str, Any], hours: int) -> Dict[str, Any]:
+        return {
+            "technician_id": technician["technician_id"],
+            "technician_name": technician["name"],
+            "specialization": technician["specialization"],
+            "date": day,
+            "start_time": f"{start:02d}:00",
+            "end_time": f"{start + hours:02d}:00",
+            "location": technician["current_location"],
+        }
+
+    @staticmethod
+    def _whole_hours(duration_hours: float) -> int:
+        hours = math.ceil(duration_hours)
+        if not 0 < hours <= WORKDAY_END - WORKDAY_START:
+            raise ApiError(400, f"estimated_duration_hours must be between 0 and {WORKDAY_END - WORKDAY_START}")
+        return hours
+
+    def _first_day(self, preferred_date: Optional[str], priority: str) -> int:
+        # Critical jobs are scheduled as early as possible, whatever the preferred date
+        if not preferred_date or priority == "critical":
+            return 0
+        try:
+            preferred = datetime.date.fromisoformat(preferred_date)
+        except ValueError:
+            raise ApiError(400, "preferred_date must use the YYYY-MM-DD format")
+        return max(0, (preferred - self.today).days)
+
+    @staticmethod
+    def _statuses(priority: str) -> Tuple[str, ...]:
+        # Critical jobs may go to busy technicians; nobody is booked while off duty
+        return ("available", "busy") if priority == "critical" else ("available",)
+
+    def get_technician_schedule(self, technician_id: str, days: int = 7) -> List[Dict[str, Any]]:
+        technician = self._technician(technician_id)
+        if not 1 <= days <= 60:
+            raise ApiError(400, "days must be between 1 and 60")
+        slots = []
+        with self._lock:
+            for offset in range(days):
+                day = self._day(offset)
+                booked = set()
+                for start, end, _ in self.bookings.get((technician["technician_id"], day), []):
+                    booked.update(range(start, end))
+                for hour in range(WORKDAY_START, WORKDAY_END):
+                    slots.append({
+                        "slot_id": f"{technician['technician_id']}-{day}-{hour:02d}",
+                        "technician_id": technician["technician_id"],
+                        "date": day,
+                        "start_time": f"{hour:02d}:00",
+                        "end_time": f"{hour + 1:02d}:00",
+                        "available": hour not in booked and technician["status"] != "off_duty",
+                        "location": technician["current_location"],
+                    })
+        return slots
+
+    def book_maintenance_job(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        hours = self._whole_hours(body["estimated_duration_hours"])
+        first_day = self._first_day(body.get("preferred_date"), body["priority"])
+        with self._lock:
+            response, _ = self._schedule_job(body, hours, first_day)
+        return response
+
+    def plan_maintenance_jobs(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        requests = body["jobs"]
+        if not 1 <= len(requests) <= MAX_PLAN_JOBS:
+            raise ApiError(400, f"A plan takes 1 to {MAX_PLAN_JOBS} jobs")
+        dry_run = body.get("dry_run", False)
+
+        results: List[Dict[str, Any]] = [{} for _ in requests]
+        held: List[Dict[str, Any]] = []
+        # Most urgent first; within a priority, in request order
+        order = sorted(range(len(requests)), key=lambda index: -PRIORITIES.index(requests[index]["priority"]))
+        with self._lock:
+            for index in order:
+                request = requests[index]
+                try:
+                    hours = self._whole_hours(request["estimated_duration_hours"])
+                    first_day = self._first_day(request.get("preferred_date"), request["priority"])
+                    response, job = self._schedule_job(request, hours, first_day, dry_run)
+                    results[index] = {"index": index, **response}
+                    held.append(job)
+                except ApiError as e:
+                    results[index] = {"index": index, "status": "failed", "priority": request["priority"],
+                                      "detail": e.detail}
+            if dry_run:
+                # The slots were held so later jobs of the plan saw them; give them back
+                for job in held:
+                    self._release(job)
+
+        planned = sum(1 for result in results if result["status"] == "scheduled")
+        return {"planned": planned, "failed": len(results) - planned, "dry_run": dry_run, "results": results}
+
+    def _schedule_job(self, body: Dict[str, Any], hours: int, first_day: int,
+                      dry_run: bool = False) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Books the earliest slot for a job request and returns (booking response, job); the caller holds the lock."""
+        specialization = required_specialization(body.get("error_code"), body["description"])
+        slot = self._earliest_slot(hours, self._statuses(body["priority"]), specialization, first_day)
+        if slot is None:
+            raise ApiError(409, "No technician has a free slot in the next two weeks")
+
+        day, start, technician = slot
+        job = {
+            "job_id": None if dry_run else f"JOB-{len(self.jobs) + 1:06d}",
+            "machine_id": body["machine_id"],
+            "error_code": body.get("error_code"),
+            "description": body["description"],
+            "priority": body["priority"],
+            "estimated_duration_hours": body["estimated_duration_hours"],
+            "assigned_technician_id": None,
+            "scheduled_date": None,
+            "scheduled_time": None,
+            "status": "scheduled",
+            "created_at": datetime.datetime.now().isoformat(timespec="seconds"),
+            "notes": f"Requested by {body['requested_by']}",
+        }
+        self._book(job, technician["technician_id"], day, start)
+        if not dry_run:
+            self._add_job(job)
+            self._emit(job, None)
+
+        return {
+            "job_id": job["job_id"],
+            "assigned_technician": f"{technician['name']} ({technician['technician_id']})",
+            "scheduled_date": day,
+            "scheduled_time": job["scheduled_time"],
+            "estimated_completion": f"{day} {start + hours:02d}:00",
+            "status": job["status"],
+            "priority": job["priority"],
+        }, job
+
+    def get_all_jobs(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self.jobs.values())
+
+    def get_job(self, job_id: str) -> Dict[str, Any]:
+        return self._job(job_id)
+
+    def get_jobs_by_status(self, status: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self.jobs_by_status[status].values())
+
+    def update_job_status(self, job_id: str, new_status: str) -> Dict[str, Any]:
+        with self._lock:
+            job = self._job(job_id)
+            old_status = job["status"]
+            if old_status != new_status:
+                if old_status in ACTIVE_JOB_STATUSES and new_status not in ACTIVE_JOB_STATUSES and job["scheduled_date"]:
+                    self._release(job)
+                del self.jobs_by_status[old_status][job["job_id"]]
+                job["status"] = new_status
+                self.jobs_by_status[new_status][job["job_id"]] = job
+                self._emit(job, old_status)
+        return {**job, "previous_status": old_status}
+
+    def get_job_events(self, cursor: Optional[int] = None, status: Optional[str] = None, job_id: Optional[str] = None,
+                       timeout: float = 25, limit: int = 100) -> Dict[str, Any]:
+        if not 0 <= timeout <= MAX_POLL_SECONDS or not 1 <= limit <= 1000:
+            raise ApiError(400, f"timeout must be between 0 and {MAX_POLL_SECONDS} and limit between 1 and 1000")
+        deadline = time.monotonic() + timeout
+        with self._changed:
+            position = self._latest_cursor() if cursor is None else cursor
+            while True:
+                events, position = self._events_after(position, status, job_id, limit)
+                remaining = deadline - time.monotonic()
+                if events or remaining <= 0:
+                    return {"events": events, "cursor": position, "timed_out": not events}
+                self._changed.wait(remaining)
+
+    def stream_job_events(self, cursor: Optional[int] = None, status: Optional[str] = None,
+                          job_id: Optional[str] = None, timeout: float = 300) -> EventStream:
+        if not 0 < timeout <= MAX_STREAM_SECONDS:
+            raise ApiError(400, f"timeout must be between 0 and {MAX_STREAM_SECONDS}")
+        with self._lock:
+            position = self._latest_cursor() if cursor is None else cursor
+            self._events_after(position, status, job_id, 1)  # 410 now rather than inside the stream
+        return EventStream(self._stream(position, status, job_id, timeout))
+
+    def _stream(self, position: int, status: Optional[str], job_id: Optional[str],
+                timeout: float) -> Iterator[Optional[Tuple[int, str, Dict[str, Any]]]]:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self._changed:
+                try:
+                    events, position = self._events_after(position, status, job_id, 1000)
+                    if not events:
+                        self._changed.wait(min(KEEPALIVE_SECONDS, max(deadline - time.monotonic(), 0)))
+                        events, position = self._events_after(position, status, job_id, 1000)
+                except ApiError:
+                    return  # Fell behind the retained events; the subscriber resumes and gets the 410
+            if not events:
+                yield None
+            for event in events:
+                yield event["cursor"], "job_status", event
@@ -0,0 +1,96 @@
+"""
+Benchmark of the caching MCP proxy against the documentation MCP stand-in.
+
+Replays the documentation reads of a few agent runs (searches and page
+fetches, first from parallel runs issuing identical calls at the same moment,
+then from runs one after the other) once directly against the stand-in and once
+through an McpProxy in front of it, and reports wall time, the tool calls
+that reached the stand-in and the proxy's cache statistics.
+
+Run from EX3-AgentWithTools/samples:
+    python -m helpers.standin.mcp_proxy_benchmark --runs 5 --latency-ms 150
+"""
+
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Tuple
+
+from helpers.mcp_client import McpSession
+from helpers.mcp_proxy import McpProxy
+from helpers.standin.docs_mcp import StandInDocsMcp
+
+QUERIES = ["azure functions triggers and bindings", "azure functions python quickstart", "azure storage security"]
+
+
+def _workload(server: StandInDocsMcp, fetches: int) -> List[Tuple[str, Dict[str, Any]]]:
+    urls = sorted(server.pages)[:fetches]
+    return [("docs_search", {"query": query}) for query in QUERIES] + [("docs_fetch", {"url": url}) for url in urls]
+
+
+def _replay(url: str, workload: List[Tuple[str, Dict[str, Any]]], runs: int, parallel: int) -> float:
+    def one_run(_: int = 0) -> None:
+        with McpSession(url) as session:
+            for name, arguments in workload:
+                session.call_tool(name, arguments)
+
+    start = time.perf_counter()
+    # Parallel runs reading the same pages at the same moment, then runs one after the other
+    with ThreadPoolExecutor(parallel) as pool:
+        list(pool.map(one_run, range(parallel)))
+    for _ in range(runs):
+        one_run()
+    return (time.perf_counter() - start) * 1000
+
+
+def run_benchmark(runs: int = 5, fetches: int = 4, parallel: int = 4, latency_ms: float = 150.0) -> Dict[str, Any]:
+    """
+    Replays the same documentation reads directly and through the proxy.
+
+    :param runs: Sequential agent runs replayed (after the parallel ones)
+    :param fetches: Pages fetched per run
+    :param parallel: Concurrent runs replayed first
+    :param latency_ms: Latency of every stand-in tool call
+    :return: Wall time and stand-in tool calls of both, plus the proxy's statistics
+    """
+    server = StandInDocsMcp(latency_ms=latency_ms)
+    url = server.start()
+    proxy = McpProxy(url, ttl=600)
+    proxy_url = proxy.start()
+    try:
+        workload = _workload(server, fetches)
+
+        direct_ms = _replay(url, workload, runs, parallel)
+        direct_calls = sum(server.calls.values())
+        server.calls.clear()
+
+        proxied_ms = _replay(proxy_url, workload, runs, parallel)
+        proxied_calls = sum(server.calls.values())
+        stats = proxy.report()
+    finally:
+        proxy.stop()
+        server.stop()
+
+    return {
+        "tool_calls": (runs + parallel) * len(workload),
+        "latency_ms": latency_ms,
+        "direct": {"wall_ms": round(direct_ms, 1), "upstream_calls": direct_calls},
+        "proxied": {"wall_ms": round(proxied_ms, 1), "upstream_calls": proxied_calls},
+        "proxy": stats,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare direct and proxied MCP documentation reads")
+    parser.add_argument("--runs", type=int, default=5, help="Sequential agent runs replayed")
+    parser.add_argument("--fetches", type=int, default=4, help="Pages fetched per run")
+    parser.add_argument("--parallel", type=int, default=4, help="Concurrent runs replayed")
+    parser.add_argument("--latency-ms", type=float, default=150.0, help="Latency of every stand-in tool call")
+    args = parser.parse_args()
+
+    result = run_benchmark(args.runs, args.fetches, args.parallel, args.latency_ms)
+    print(json.dumps(result, indent=2))
+    print(f"🗄️  {result['tool_calls']} tool calls: {result['direct']['upstream_calls']} upstream calls in "
+          f"{result['direct']['wall_ms']} ms direct vs {result['proxied']['upstream_calls']} in "
+          f"{result['proxied']['wall_ms']} ms through the proxy")
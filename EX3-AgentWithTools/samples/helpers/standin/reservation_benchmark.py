@@ -0,0 +1,86 @@
+"""
+Benchmark of per-item vs bulk reservations against the inventory stand-in.
+
+A maintenance plan needing N parts costs N reserve_items calls, one model
+step each, when the agent only has POST /inventory/reserve. This starts an
+inventory stand-in in-process, reserves the same plan both ways through the
+OpenApiExecutor (the path the function tools use) and reports tool calls,
+wall time and the tokens of tool output the model has to read.
+
+Run from EX3-AgentWithTools/samples:
+    python -m helpers.standin.reservation_benchmark --lines 15 --latency-ms 40
+"""
+
+import argparse
+import json
+import time
+from typing import Any, Dict, List
+
+from helpers.openapi_executor import OpenApiExecutor
+from helpers.spec_compiler import load_compiled_spec
+from helpers.standin import create_server, spec_paths
+from helpers.tokens import count_tokens
+
+SINGLE = "reserve_items_inventory_reserve_post"
+BULK = "reserve_items_bulk_inventory_reserve_bulk_post"
+LIST_ALL = "get_all_inventory_inventory_get"
+
+
+def _plan(executor: OpenApiExecutor, lines: int, offset: int) -> List[Dict[str, Any]]:
+    in_stock = [item for item in json.loads(executor.call(LIST_ALL)) if item["stock_quantity"] >= 4]
+    if len(in_stock) < offset + lines:
+        raise ValueError("Not enough stocked items; raise --items")
+    return [{"item_id": item["item_id"], "quantity": 2} for item in in_stock[offset:offset + lines]]
+
+
+def run_benchmark(lines: int = 15, items: int = 1000, latency_ms: float = 40.0) -> Dict[str, Any]:
+    """
+    Reserves a plan of `lines` parts one call per line, then a different plan of the same size in one bulk call.
+
+    :param lines: Parts in the maintenance plan
+    :param items: Size of the stand-in inventory
+    :param latency_ms: Latency added by the stand-in to every request
+    :return: Tool calls, wall time and output tokens of both approaches
+    """
+    server = create_server("inventory", items=items, latency_ms=latency_ms)
+    url = server.start()
+    path, overlay = spec_paths("inventory")
+    spec = load_compiled_spec(path, operations=[SINGLE, BULK, LIST_ALL], verbose=False, overlay=overlay)
+    executor = OpenApiExecutor(spec, base_url=url, verbose=False)
+    try:
+        order = {"requested_by": "benchmark", "work_order": "WO-BENCH"}
+        single_plan = _plan(executor, lines, 0)
+        bulk_plan = _plan(executor, lines, lines)
+
+        start = time.perf_counter()
+        single_outputs = [executor.call(SINGLE, {"body": dict(line, **order)}) for line in single_plan]
+        single_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        bulk_output = executor.call(BULK, {"body": dict(order, items=bulk_plan)})
+        bulk_ms = (time.perf_counter() - start) * 1000
+    finally:
+        executor.close()
+        server.stop()
+
+    return {
+        "lines": lines,
+        "latency_ms": latency_ms,
+        "per_item": {"tool_calls": lines, "wall_ms": round(single_ms, 1),
+                     "output_tokens": sum(count_tokens(output) for output in single_outputs)},
+        "bulk": {"tool_calls": 1, "wall_ms": round(bulk_ms, 1), "output_tokens": count_tokens(bulk_output),
+                 "status": json.loads(bulk_output)["status"]},
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare per-item and bulk reservations on the inventory stand-in")
+    parser.add_argument("--lines", type=int, default=15, help="Parts in the maintenance plan")
+    parser.add_argument("--items", type=int, default=1000, help="Stand-in inventory size")
+    parser.add_argument("--latency-ms", type=float, default=40.0, help="Latency added to every request")
+    args = parser.parse_args()
+
+    result = run_benchmark(args.lines, args.items, args.latency_ms)
+    print(json.dumps(result, indent=2))
+    print(f"📦 {args.lines} parts: {args.lines} tool calls in {result['per_item']['wall_ms']} ms vs "
+          f"1 bulk call in {result['bulk']['wall_ms']} ms ({args.lines - 1} model steps saved)")
@@ -0,0 +1,253 @@
+"""
+Request routing and validation generated from an OpenAPI spec.
+
+SpecRouter compiles every path of the spec into a regular expression and
+binds it to the handler registered under the operation's operationId. Path
+and query parameters are converted to the types declared in the spec and
+JSON bodies are checked against the request schema, so the stand-in answers
+bad requests with the same 422 HTTPValidationError payload as the FastAPI
+services behind the real APIs.
+"""
+
+import json
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Tuple
+
+_PATH_PARAMETER = re.compile(r"\{(\w+)\}")
+
+_JSON_TYPES = {
+    "string": str,
+    "integer": int,
+    "number": (int, float),
+    "boolean": bool,
+    "array": list,
+    "object": dict,
+    "null": type(None),
+}
+
+
+class ApiError(Exception):
+    """
+    Raised by handlers to return an error response ({"detail": ...}).
+
+    :param status: HTTP status code
+    :param detail: Error message or list of validation errors
+    """
+
+    def __init__(self, status: int, detail: Any):
+        super().__init__(detail)
+        self.status = status
+        self.detail = detail
+
+
+class EventStream:
+    """
+    Returned by handlers to answer with a text/event-stream instead of JSON.
+
+    :param events: Iterator of (event id, event name, JSON data) tuples; None sends a keep-alive comment
+    """
+
+    def __init__(self, events: Iterator[Optional[Tuple[Any, str, Any]]]):
+        self.events = events
+
+
+@dataclass
+class Route:
+    method: str
+    template: str
+    operation_id: str
+    pattern: re.Pattern
+    parameters: List[Dict[str, Any]]
+    body_schema: Optional[Dict[str, Any]]
+    handler: Callable[..., Any]
+
+    @property
+    def specificity(self) -> Tuple[int, int]:
+        # Literal segments win over parameters: /inventory/low-stock before /inventory/{item_id}
+        segments = self.template.strip("/").split("/")
+        return (sum(1 for s in segments if s.startswith("{")), -len(segments))
+
+
+def _compile_path(template: str) -> re.Pattern:
+    parts = _PATH_PARAMETER.split(template)
+    regex = "".join(
+        f"(?P<{part}>[^/]+)" if index % 2 else re.escape(part)
+        for index, part in enumerate(parts)
+    )
+    return re.compile(f"^{regex}/?$")
+
+
+def _validation_error(loc: List[Any], msg: str, error_type: str) -> Dict[str, Any]:
+    return {"loc": loc, "msg": msg, "type": error_type}
+
+
+def _convert(raw: str, schema: Mapping[str, Any], loc: List[Any], errors: List[Dict[str, Any]]) -> Any:
+    """Converts a path/query string to the type declared in its schema."""
+    schema_type = schema.get("type", "string")
+    try:
+        if schema_type == "integer":
+            value: Any = int(raw)
+        elif schema_type == "number":
+            value = float(raw)
+        elif schema_type == "boolean":
+            if raw.lower() not in ("true", "false", "1", "0", "yes", "no", "on", "off"):
+                raise ValueError(raw)
+            value = raw.lower() in ("true", "1", "yes", "on")
+        else:
+            value = raw
+    except ValueError:
+        errors.append(_validation_error(loc, f"Input should be a valid {schema_type}", f"{schema_type}_parsing"))
+        return None
+
+    if "enum" in schema and value not in schema["enum"]:
+        expected = ", ".join(repr(option) for option in schema["enum"])
+        errors.append(_validation_error(loc, f"Input should be {expected}", "enum"))
+        return None
+    return value
+
+
+def validate_body(value: Any, schema: Mapping[str, Any], loc: List[Any], errors: List[Dict[str, Any]]) -> None:
+    """
+    Checks a decoded JSON value against a (resolved) JSON schema.
+    Covers what the specs use: type, enum, required, properties, items and anyOf.
+    """
+    if "anyOf" in schema:
+        for option in schema["anyOf"]:
+            option_errors: List[Dict[str, Any]] = []
+            validate_body(value, option, loc, option_errors)
+            if not option_errors:
+                return
+        errors.append(_validation_error(loc, "Input does not match any of the allowed types", "any_of"))
+        return
+
+    schema_type = schema.get("type")
+    if schema_type:
+        expected = _JSON_TYPES[schema_type]
+        is_bool = isinstance(value, bool)
+        if not isinstance(value, expected) or (is_bool and schema_type in ("integer", "number")):
+            errors.append(_validation_error(loc, f"Input should be a valid {schema_type}", f"{schema_type}_type"))
+            return
+
+    if "enum" in schema and value not in schema["enum"]:
+        expected_values = ", ".join(repr(option) for option in schema["enum"])
+        errors.append(_validation_error(loc, f"Input should be {expected_values}", "enum"))
+        return
+
+    if isinstance(value, dict):
+        for name in schema.get("required", []):
+            if name not in value:
+                errors.append(_validation_error(loc + [name], "Field required", "missing"))
+        for name, property_schema in schema.get("properties", {}).items():
+            if name in value:
+                validate_body(value[name], property_schema, loc + [name], errors)
+    elif isinstance(value, list) and "items" in schema:
+        for index, item in enumerate(value):
+            validate_body(item, schema["items"], loc + [index], errors)
+
+
+class SpecRouter:
+    """
+    Routes requests to the handlers of a resolved OpenAPI spec.
+
+    :param spec: OpenAPI spec with every $ref resolved (helpers.tool_cache.load_openapi_spec)
+    :param handlers: Callable per operationId; called with the path/query parameters as keyword
+                     arguments, plus body=... for operations with a request body
+    :raises ValueError: If an operation of the spec has no handler
+    """
+
+    def __init__(self, spec: Mapping[str, Any], handlers: Mapping[str, Callable[..., Any]]):
+        self.spec = spec
+        self.routes: List[Route] = []
+        missing = []
+        for template, operations in spec["paths"].items():
+            for method, operation in operations.items():
+                operation_id = operation["operationId"]
+                if operation_id not in handlers:
+                    missing.append(f"{method.upper()} {template} ({operation_id})")
+                    continue
+                body = operation.get("requestBody", {}).get("content", {}).get("application/json", {})
+                self.routes.append(Route(
+                    method=method.upper(),
+                    template=template,
+                    operation_id=operation_id,
+                    pattern=_compile_path(template),
+                    parameters=operation.get("parameters", []),
+                    body_schema=body.get("schema"),
+                    handler=handlers[operation_id],
+                ))
+        if missing:
+            raise ValueError("No handler for: " + ", ".join(missing))
+        self.routes.sort(key=lambda route: route.specificity)
+
+    def match(self, method: str, path: str) -> Tuple[Optional[Route], Dict[str, str]]:
+        """
+        Finds the route for a request.
+
+        :return: (route, raw path parameters); route is None when nothing matches
+        :raises ApiError: 405 when the path exists but not for this method
+        """
+        path_matches = False
+        for route in self.routes:
+            found = route.pattern.match(path)
+            if not found:
+                continue
+            if route.method == method:
+                return route, found.groupdict()
+            path_matches = True
+        if path_matches:
+            raise ApiError(405, "Method Not Allowed")
+        return None, {}
+
+    def dispatch(self, method: str, path: str, query: Mapping[str, List[str]], body: bytes) -> Tuple[int, Any]:
+        """
+        Validates a request and calls its handler.
+
+        :param method: HTTP method
+        :param path: URL path without the query string
+        :param query: Parsed query string (urllib.parse.parse_qs)
+        :param body: Raw request body
+        :return: (status code, JSON-serializable payload)
+        """
+        try:
+            route, raw_path = self.match(method, path)
+            if route is None:
+                return 404, {"detail": "Not Found"}
+            return 200, route.handler(**self._arguments(route, raw_path, query, body))
+        except ApiError as e:
+            return e.status, {"detail": e.detail}
+        except Exception as e:  # A failing handler answers 500, as FastAPI would, instead of dropping the connection
+            return 500, {"detail": f"Internal Server Error: {type(e).__name__}: {e}"}
+
+    def _arguments(self, route: Route, raw_path: Mapping[str, str], query: Mapping[str, List[str]],
+                   body: bytes) -> Dict[str, Any]:
+        arguments: Dict[str, Any] = {}
+        errors: List[Dict[str, Any]] = []
+        for parameter in route.parameters:
+            name, location, schema = parameter["name"], parameter["in"], parameter.get("schema", {})
+            raw = raw_path.get(name) if location == "path" else (query.get(name) or [None])[0]
+            if raw is None:
+                if parameter.get("required"):
+                    errors.append(_validation_error([location, name], "Field required", "missing"))
+                elif "default" in schema:
+                    arguments[name] = schema["default"]
+                continue
+            value = _convert(raw, schema, [location, name], errors)
+            if value is not None:
+                arguments[name] = value
+
+        if route.body_schema is not None:
+            try:
+                payload = json.loads(body or b"null")
+            except ValueError:
+                errors.append(_validation_error(["body"], "JSON decode error", "json_invalid"))
+            else:
+                if payload is None:
+                    errors.append(_validation_error(["body"], "Field required", "missing"))
+                else:
+                    validate_body(payload, route.body_schema, ["body"], errors)
+                    arguments["body"] = payload
+
+        if errors:
+            raise ApiError(422, errors)
+        return arguments
@@ -0,0 +1,188 @@
+"""
+Interval index over technician availability for the maintenance stand-in.
+
+Finding the earliest slot by scanning every technician's bookings day by day
+costs O(technicians x days) per question. ScheduleIndex keeps, for each group
+of technicians sharing a status and a specialization, one max segment tree
+whose leaves are ordered by (day, hour, technician) and hold the number of
+free consecutive hours starting at that hour. "Earliest start of H free
+hours on or after day D" is then the leftmost leaf >= (D, 08:00) whose value
+is >= H, found in O(log n); a booking updates the nine leaves of one
+technician's day in each of its groups, O(log n) each.
+
+The trees are numpy uint8 arrays: 1,000 technicians over 28 days take about
+1 MB per group.
+"""
+
+import datetime
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+ANY_SPECIALIZATION = "*"
+
+
+def free_runs(bookings: Iterable[Sequence[int]], day_start: int, day_end: int) -> List[int]:
+    """
+    Free consecutive hours starting at each hour of a day.
+
+    :param bookings: [start_hour, end_hour, ...] bookings of the day
+    :param day_start: First working hour
+    :param day_end: End of the working day
+    :return: One value per hour from day_start to day_end - 1 (0 when the hour is booked)
+    """
+    hours = day_end - day_start
+    booked = [False] * hours
+    for booking in bookings:
+        for hour in range(max(booking[0], day_start), min(booking[1], day_end)):
+            booked[hour - day_start] = True
+    runs = [0] * hours
+    run = 0
+    for index in range(hours - 1, -1, -1):
+        run = 0 if booked[index] else run + 1
+        runs[index] = run
+    return runs
+
+
+class _MaxTree:
+    """Max segment tree over uint8 leaves, with a leftmost "first leaf >= lo with value >= h" search."""
+
+    def __init__(self, leaves: np.ndarray):
+        self.size = 1 << max(int(len(leaves) - 1).bit_length(), 0)
+        self.tree = np.zeros(2 * self.size, dtype=np.uint8)
+        self.tree[self.size:self.size + len(leaves)] = leaves
+        level = self.size
+        while level > 1:
+            self.tree[level // 2:level] = np.maximum(self.tree[level:2 * level:2], self.tree[level + 1:2 * level:2])
+            level //= 2
+
+    def set(self, position: int, value: int) -> None:
+        tree = self.tree
+        index = position + self.size
+        tree[index] = value
+        index //= 2
+        while index:
+            best = max(tree[2 * index], tree[2 * index + 1])
+            if tree[index] == best:
+                return
+            tree[index] = best
+            index //= 2
+
+    def first_at_least(self, lo: int, value: int) -> Optional[int]:
+        tree = self.tree
+        index = lo + self.size
+        while tree[index] < value:
+            # Climb while on a right child, then step to the next subtree on the right
+            while index & 1:
+                index //= 2
+            if index == 0:
+                return None
+            index += 1
+        while index < self.size:
+            index = 2 * index if tree[2 * index] >= value else 2 * index + 1
+        return index - self.size
+
+
+class ScheduleIndex:
+    """
+    Earliest-slot index over all technicians.
+
+    :param technicians: Technician records (technician_id, status, specialization)
+    :param bookings: (technician_id, date) -> [start_hour, end_hour, job_id] bookings
+    :param first_date: Day 0 of the index
+    :param days: Number of days indexed
+    :param day_start: First working hour
+    :param day_end: End of the working day
+    :param statuses: Technician statuses that can be booked (others are not indexed)
+    """
+
+    def __init__(self, technicians: Iterable[Mapping[str, object]], bookings: Mapping[Tuple[str, str], List[List[object]]],
+                 first_date: datetime.date, days: int, day_start: int, day_end: int,
+                 statuses: Sequence[str] = ("available", "busy")):
+        self.first_date = first_date
+        self.days = days
+        self.day_start = day_start
+        self.hours = day_end - day_start
+        self.day_end = day_end
+
+        members: Dict[Tuple[str, str], List[str]] = {}
+        for technician in technicians:
+            if technician["status"] not in statuses:
+                continue
+            for specialization in [ANY_SPECIALIZATION, *technician["specialization"]]:
+                members.setdefault((technician["status"], specialization), []).append(technician["technician_id"])
+        self.members = {group: sorted(ids) for group, ids in members.items()}
+        self.rank = {group: {technician_id: rank for rank, technician_id in enumerate(ids)}
+                     for group, ids in self.members.items()}
+        self.groups_of: Dict[str, List[Tuple[str, str]]] = {}
+        for group, ids in self.members.items():
+            for technician_id in ids:
+                self.groups_of.setdefault(technician_id, []).append(group)
+
+        booked_days: Dict[str, Dict[int, List[int]]] = {}
+        for (technician_id, day), day_bookings in bookings.items():
+            offset = self.offset(day)
+            if technician_id in self.groups_of and 0 <= offset < days and day_bookings:
+                booked_days.setdefault(technician_id, {})[offset] = free_runs(day_bookings, day_start, day_end)
+
+        free_day = np.arange(self.hours, 0, -1, dtype=np.uint8)
+        self.trees: Dict[Tuple[str, str], _MaxTree] = {}
+        for group, ids in self.members.items():
+            # Leaves in (day, hour, technician) order, initialised as fully free days
+            leaves = np.broadcast_to(free_day[None, :, None], (days, self.hours, len(ids))).copy()
+            for rank, technician_id in enumerate(ids):
+                for offset, runs in booked_days.get(technician_id, {}).items():
+                    leaves[offset, :, rank] = runs
+            self.trees[group] = _MaxTree(leaves.reshape(-1))
+
+    def offset(self, day: str) -> int:
+        return (datetime.date.fromisoformat(day) - self.first_date).days
+
+    def has_group(self, status: str, specialization: str) -> bool:
+        return (status, specialization) in self.members
+
+    def update(self, technician_id: str, day: str, day_bookings: Iterable[Sequence[int]]) -> None:
+        """Re-indexes one technician's day after its bookings changed."""
+        offset = self.offset(day)
+        if technician_id not in self.groups_of or not 0 <= offset < self.days:
+            return
+        runs = free_runs(day_bookings, self.day_start, self.day_end)
+        for group in self.groups_of[technician_id]:
+            width = len(self.members[group])
+            base = offset * self.hours * width + self.rank[group][technician_id]
+            tree = self.trees[group]
+            for hour, run in enumerate(runs):
+                tree.set(base + hour * width, run)
+
+    def earliest(self, hours: int, statuses: Sequence[str], specialization: str = ANY_SPECIALIZATION,
+                 first_day: int = 0, last_day: Optional[int] = None) -> Optional[Tuple[int, int, str]]:
+        """
+        Earliest slot of `hours` free consecutive hours.
+
+        :param hours: Duration in whole hours
+        :param statuses: Technician statuses to consider
+        :param specialization: Required specialization (ANY_SPECIALIZATION for none)
+        :param first_day: First day offset to consider
+        :param last_day: Day offset to stop before (defaults to the end of the index)
+        :return: (day offset, start hour, technician_id), or None when no technician is free
+        """
+        last_day = self.days if last_day is None else min(last_day, self.days)
+        if first_day >= last_day:
+            return None
+        best = None
+        for status in statuses:
+            group = (status, specialization)
+            if group not in self.trees:
+                continue
+            width = len(self.members[group])
+            position = self.trees[group].first_at_least(first_day * self.hours * width, hours)
+            if position is None:
+                continue
+            slot, rank = divmod(position, width)
+            day, hour = divmod(slot, self.hours)
+            if day >= last_day:
+                continue
+            candidate = (day, self.day_start + hour, self.members[group][rank])
+            if best is None or candidate < best:
+                best = candidate
+        return best
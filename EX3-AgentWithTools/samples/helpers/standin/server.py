@@ -0,0 +1,179 @@
+"""
+HTTP server for the stand-in APIs, with optional latency and fault injection.
+
+Built on the standard library's ThreadingHTTPServer so it runs anywhere the
+samples run. HTTP/1.1 keep-alive is enabled, so clients that pool
+connections are measured the way they would behave against the real API.
+GET responses carry an ETag (hash of the body) and a Last-Modified date
+(last successful write) and conditional requests are answered with 304.
+Handlers returning an EventStream are served as server-sent events; a
+Last-Event-ID header is passed to them as the cursor query parameter.
+"""
+
+import hashlib
+import json
+import random
+import threading
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from helpers.standin.router import EventStream, SpecRouter
+
+
+class StandInServer(ThreadingHTTPServer):
+    """
+    Serves a SpecRouter over HTTP.
+
+    :param router: Router built from the spec and the API's handlers
+    :param host: Interface to bind
+    :param port: Port to bind (0 picks a free port)
+    :param latency_ms: Delay added to every response
+    :param jitter_ms: Extra random delay (uniform between 0 and jitter_ms)
+    :param fault_rate: Fraction of requests answered with an injected 503 (0.0 - 1.0)
+    :param seed: Seed for the jitter and fault draws
+    :param verbose: Log every request to stderr
+    """
+
+    daemon_threads = True
+
+    def __init__(self, router: SpecRouter, host: str = "127.0.0.1", port: int = 8000, latency_ms: float = 0.0,
+                 jitter_ms: float = 0.0, fault_rate: float = 0.0, seed: int = 0, verbose: bool = False):
+        if not 0.0 <= fault_rate <= 1.0:
+            raise ValueError("fault_rate must be between 0 and 1")
+        self.router = router
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.fault_rate = fault_rate
+        self.verbose = verbose
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self.last_modified = time.time()
+        self._thread: Optional[threading.Thread] = None
+        super().__init__((host, port), _RequestHandler)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def draw_fault_and_delay(self) -> Tuple[bool, float]:
+        """Draws whether the next request fails and how long it is delayed (seconds)."""
+        with self._random_lock:
+            fault = self.fault_rate > 0 and self._random.random() < self.fault_rate
+            jitter = self._random.uniform(0, self.jitter_ms) if self.jitter_ms else 0.0
+        return fault, (self.latency_ms + jitter) / 1000
+
+    def start(self) -> str:
+        """
+        Serves in a background thread (for benchmarks and tests in the same process).
+
+        :return: Base URL of the server
+        """
+        self._thread = threading.Thread(target=self.serve_forever, name="standin-server", daemon=True)
+        self._thread.start()
+        return self.url
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+        if self._thread:
+            self._thread.join()
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without TCP_NODELAY keep-alive clients wait ~40 ms for delayed ACKs
+    disable_nagle_algorithm = True
+    server: StandInServer
+
+    def do_GET(self) -> None:
+        self._handle()
+
+    def do_POST(self) -> None:
+        self._handle()
+
+    def do_PUT(self) -> None:
+        self._handle()
+
+    def do_DELETE(self) -> None:
+        self._handle()
+
+    def _handle(self) -> None:
+        url = urlsplit(self.path)
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+        fault, delay = self.server.draw_fault_and_delay()
+        if delay:
+            time.sleep(delay)
+        if fault:
+            self._send(503, {"detail": "Injected fault"})
+            return
+
+        query = parse_qs(url.query)
+        if "Last-Event-ID" in self.headers and "cursor" not in query:
+            query["cursor"] = [self.headers["Last-Event-ID"]]
+        status, payload = self.server.router.dispatch(self.command, url.path, query, body)
+        if self.command != "GET" and status < 400:
+            self.server.last_modified = time.time()
+        if isinstance(payload, EventStream):
+            self._send_stream(payload)
+        else:
+            self._send(status, payload)
+
+    def _not_modified(self, etag: str) -> bool:
+        if "If-None-Match" in self.headers:
+            return etag in (tag.strip() for tag in self.headers["If-None-Match"].split(","))
+        if "If-Modified-Since" in self.headers:
+            try:
+                since = parsedate_to_datetime(self.headers["If-Modified-Since"]).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return int(self.server.last_modified) <= since
+        return False
+
+    def _send(self, status: int, payload: Any) -> None:
+        data = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+        if self.command == "GET" and status == 200:
+            headers["ETag"] = '"' + hashlib.sha1(data).hexdigest() + '"'
+            headers["Last-Modified"] = formatdate(self.server.last_modified, usegmt=True)
+            if self._not_modified(headers["ETag"]):
+                status, data = 304, b""
+
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_stream(self, stream: EventStream) -> None:
+        # No Content-Length: the stream ends when the connection closes
+        self.close_connection = True
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        try:
+            for event in stream.events:
+                if event is None:
+                    chunk = ": keep-alive\n\n"
+                else:
+                    event_id, name, data = event
+                    chunk = f"id: {event_id}\nevent: {name}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+                self.wfile.write(chunk.encode("utf-8"))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Subscriber went away
+        finally:
+            close = getattr(stream.events, "close", None)
+            if close:
+                close()
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
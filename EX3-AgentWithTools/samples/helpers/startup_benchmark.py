@@ -0,0 +1,188 @@
+"""
+Startup-time benchmark for the tool definitions built by each sample.
+
+For every script it measures the tool-building work done before the first
+agent is created (FunctionTool introspection, OpenAPI $ref resolution and
+Pydantic schema generation), once without the cache and once with a warm
+helpers.tool_cache. Nothing is sent to Azure: only the imports, function and
+class definitions of each script are executed.
+
+Run from EX3-AgentWithTools/samples:
+    python -m helpers.startup_benchmark [--repeat 20]
+"""
+
+import argparse
+import ast
+import os
+import statistics
+import sys
+import time
+import types
+from typing import Any, Dict, List, Tuple
+
+import jsonref
+from azure.ai.agents.models import FunctionTool
+
+from helpers import tool_cache
+from helpers.tool_cache import CachedFunctionTool, cached_model_json_schema, load_openapi_spec
+
+SAMPLES_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EX3_DIR = os.path.dirname(SAMPLES_DIR)
+REPO_DIR = os.path.dirname(EX3_DIR)
+
+SCRIPTS = [
+    os.path.join(SAMPLES_DIR, "ex3-s1-FunctionCalling.py"),
+    os.path.join(SAMPLES_DIR, "ex3-s2-AgentWithOpenAPI.py"),
+    os.path.join(SAMPLES_DIR, "ex3-s4-StructuredOutput.py"),
+    os.path.join(EX3_DIR, "challenge", "solutions", "ex3-ch1-solution.py"),
+    os.path.join(EX3_DIR, "challenge", "solutions", "ex3-ch2-solution.py"),
+    os.path.join(EX3_DIR, "challenge", "solutions", "ex3-ch4-solution.py"),
+    os.path.join(REPO_DIR, "EX4-AgentOrchestrationService", "challenge", "solutions", "ex4-ch1-solution.py"),
+]
+
+_DEFINITIONS = (ast.Import, ast.ImportFrom, ast.FunctionDef, ast.ClassDef)
+
+
+def _is_sys_path_change(node: ast.stmt) -> bool:
+    return (isinstance(node, ast.Expr) and isinstance(node.value, ast.Call)
+            and ast.unparse(node.value.func) in ("sys.path.append", "sys.path.insert"))
+
+
+def _definition_nodes(body: List[ast.stmt]) -> List[ast.stmt]:
+    nodes = []
+    for node in body:
+        if isinstance(node, _DEFINITIONS) or _is_sys_path_change(node):
+            nodes.append(node)
+        elif isinstance(node, ast.With):  # Some samples define their models inside "with AIProjectClient(...)"
+            nodes.extend(_definition_nodes(node.body))
+    return nodes
+
+
+def _load_definitions(path: str, tree: ast.Module) -> types.ModuleType:
+    """Executes only the imports, sys.path changes and def/class statements of a script."""
+    module = types.ModuleType(f"_startup_benchmark_{len(sys.modules)}")
+    module.__file__ = path
+    sys.modules[module.__name__] = module
+    code = compile(ast.Module(body=_definition_nodes(tree.body), type_ignores=[]), path, "exec")
+    exec(code, module.__dict__)
+    return module
+
+
+def _set_names(tree: ast.Module, node: ast.expr) -> List[str]:
+    if isinstance(node, ast.Set):
+        return [element.id for element in node.elts if isinstance(element, ast.Name)]
+    if isinstance(node, ast.Name):
+        for assign in ast.walk(tree):
+            if (isinstance(assign, ast.Assign) and isinstance(assign.value, ast.Set)
+                    and any(isinstance(t, ast.Name) and t.id == node.id for t in assign.targets)):
+                return _set_names(tree, assign.value)
+    return []
+
+
+def discover_startup_work(path: str) -> Tuple[List[Any], List[str], List[Any]]:
+    """
+    Finds what a script builds at startup.
+
+    :param path: Path to the sample script
+    :return: (tool functions, OpenAPI spec paths, Pydantic models used as response formats)
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read(), path)
+    module = _load_definitions(path, tree)
+
+    function_names, spec_paths, model_names = [], [], []
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.Call):
+            continue
+        callee = ast.unparse(node.func)
+        if callee in ("FunctionTool", "CachedFunctionTool"):
+            for keyword in node.keywords:
+                if keyword.arg == "functions":
+                    function_names += _set_names(tree, keyword.value)
+        elif callee == "os.path.join":
+            for arg in node.args:
+                if isinstance(arg, ast.Constant) and str(arg.value).endswith(".json"):
+                    spec_paths.append(os.path.normpath(os.path.join(os.path.dirname(path), arg.value)))
+        elif isinstance(node.func, ast.Attribute) and node.func.attr == "model_json_schema":
+            model_names.append(ast.unparse(node.func.value))
+        elif callee == "cached_model_json_schema" and node.args:
+            model_names.append(ast.unparse(node.args[0]))
+
+    functions = [getattr(module, name) for name in dict.fromkeys(function_names)]
+    models = [getattr(module, name) for name in dict.fromkeys(model_names)]
+    return functions, list(dict.fromkeys(spec_paths)), models
+
+
+def _resolve(value: Any) -> Any:
+    # jsonref resolves lazily; walking the structure forces the work the SDK does when it serializes the spec
+    if isinstance(value, dict):
+        return {key: _resolve(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_resolve(item) for item in value]
+    return value
+
+
+def build_uncached(functions: List[Any], spec_paths: List[str], models: List[Any]) -> None:
+    if functions:
+        FunctionTool(functions=set(functions))
+    for path in spec_paths:
+        with open(path, "r") as f:
+            _resolve(jsonref.loads(f.read()))
+    for model in models:
+        model.model_json_schema()
+
+
+def build_cached(functions: List[Any], spec_paths: List[str], models: List[Any]) -> None:
+    tool_cache._file_hashes.clear()  # Behave like a fresh process: hash the source files again
+    if functions:
+        CachedFunctionTool(functions=set(functions))
+    for path in spec_paths:
+        load_openapi_spec(path)
+    for model in models:
+        cached_model_json_schema(model)
+
+
+def _median_ms(fn, args, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def run_benchmark(repeat: int = 20) -> List[Dict[str, Any]]:
+    """
+    Benchmarks every script in SCRIPTS.
+
+    :param repeat: Number of timed repetitions per measurement (the median is reported)
+    :return: One result row per script
+    """
+    results = []
+    for path in SCRIPTS:
+        work = discover_startup_work(path)
+        build_cached(*work)  # Prime the cache
+        cold = _median_ms(build_uncached, work, repeat)
+        warm = _median_ms(build_cached, work, repeat)
+        results.append({
+            "script": os.path.basename(path),
+            "functions": len(work[0]),
+            "specs": len(work[1]),
+            "models": len(work[2]),
+            "uncached_ms": round(cold, 3),
+            "cached_ms": round(warm, 3),
+            "speedup": round(cold / warm, 1) if warm else None,
+        })
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure tool-definition startup time with and without the cache")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed repetitions per measurement")
+    args = parser.parse_args()
+
+    print(f"{'Script':<32}{'Funcs':>6}{'Specs':>6}{'Models':>7}{'Uncached ms':>13}{'Cached ms':>11}{'Speedup':>9}")
+    print("-" * 84)
+    for row in run_benchmark(args.repeat):
+        print(f"{row['script']:<32}{row['functions']:>6}{row['specs']:>6}{row['models']:>7}"
+              f"{row['uncached_ms']:>13.3f}{row['cached_ms']:>11.3f}{str(row['speedup']) + 'x':>9}")
@@ -0,0 +1,268 @@
+"""
+Incremental parsing of streamed structured outputs.
+
+An agent with a JSON schema response format writes its answer as one JSON
+document, and the samples parse it with json.loads once the run is over: a
+response listing ten repositories shows nothing until the tenth is written.
+StructuredStream is fed the message deltas as they arrive and scans only the
+new characters, keeping the scanner state (container stack, current key,
+inside a string or an escape) between chunks. Each element of the list field
+of the response model (repositories for GitHubReposResponse) is validated
+into its item model and returned as soon as its closing brace arrives;
+result() validates the whole document at the end.
+
+The scan jumps between structural characters with a regular expression, so
+feeding a response costs one pass over it however it is split into deltas.
+run() streams an agent run and yields the items; the run's function tools
+are executed by the stream when enable_auto_function_calls() was used.
+events() streams a run and yields its raw events, for callers that parse
+something else than the message deltas (a connected agent's output).
+
+Usage:
+    stream = StructuredStream(GitHubReposResponse, "repositories")
+    for repo in stream.run(project.agents, thread.id, agent.id):
+        print(repo.repo_name)
+    response = stream.result()
+
+Run from EX3-AgentWithTools/samples:
+    python -m helpers.structured_stream --repos 10 --delta-chars 6 --delta-ms 20
+"""
+
+import argparse
+import json
+import re
+import time
+from typing import Any, Dict, Iterator, List, Optional, Type, get_args
+
+from azure.ai.agents.models import MessageDeltaChunk, ThreadRun
+from pydantic import BaseModel, TypeAdapter
+
+# Characters that change the scanner state outside and inside strings
+_STRUCTURE = re.compile(r'[{}\[\]",:]')
+_IN_STRING = re.compile(r'["\\]')
+
+
+class StructuredStream:
+    """
+    Incremental parser of one structured output, yielding the elements of its list field.
+
+    :param response_model: Pydantic model of the whole response
+    :param items: Name of the list field whose elements are yielded
+    """
+
+    def __init__(self, response_model: Type[BaseModel], items: str):
+        if items not in response_model.model_fields:
+            raise ValueError(f"{response_model.__name__} has no field {items!r}")
+        item_type = get_args(response_model.model_fields[items].annotation)
+        if not item_type:
+            raise ValueError(f"{response_model.__name__}.{items} is not a list")
+        self.response_model = response_model
+        self.items = items
+        self._item = TypeAdapter(item_type[0])
+        self.thread_run: Optional[ThreadRun] = None
+        self.reset()
+
+    def reset(self) -> None:
+        """Forgets the text fed so far (a new message starts)."""
+        self.text = ""
+        self.parsed: List[Any] = []
+        self._pos = 0
+        # One entry per open container: [kind, current key, expecting a key]
+        self._stack: List[List[Any]] = []
+        self._in_string = False
+        self._string_start = 0
+        self._item_start: Optional[int] = None
+        self._started = time.perf_counter()
+        self._first_item_ms: Optional[float] = None
+
+    def feed(self, text: str) -> List[Any]:
+        """
+        Adds the next chunk of the response.
+
+        :param text: Characters following those fed so far
+        :return: Items whose object closed in this chunk, validated
+        :raises ValueError: If the text is not a JSON document (or an item does not validate)
+        """
+        self.text += text
+        closed = []
+        buffer, pos, stack = self.text, self._pos, self._stack
+        while True:
+            if self._in_string:
+                match = _IN_STRING.search(buffer, pos)
+                if match is None:
+                    pos = len(buffer)
+                    break
+                if match.group() == "\\":
+                    if match.end() == len(buffer):
+                        # The escaped character is in the next chunk
+                        pos = match.start()
+                        break
+                    pos = match.end() + 1
+                    continue
+                self._in_string = False
+                pos = match.end()
+                if stack and stack[-1][0] == "{" and stack[-1][2]:
+                    stack[-1][1] = json.loads(buffer[self._string_start:pos])
+                continue
+            match = _STRUCTURE.search(buffer, pos)
+            if match is None:
+                pos = len(buffer)
+                break
+            char, pos = match.group(), match.end()
+            if char in ':,]}' and not stack:
+                self._pos = pos
+                raise ValueError(f"Unexpected {char!r} outside of a JSON value at offset {match.start()}")
+            if char == '"':
+                self._in_string, self._string_start = True, match.start()
+            elif char == ":":
+                stack[-1][2] = False
+            elif char == ",":
+                if stack[-1][0] == "{":
+                    stack[-1][2] = True
+            elif char in "{[":
+                if char == "{" and self._at_items(stack):
+                    self._item_start = match.start()
+                stack.append([char, None, char == "{"])
+            else:
+                if stack[-1][0] != ("{" if char == "}" else "["):
+                    self._pos = pos
+                    raise ValueError(f"Unexpected {char!r} closing {stack[-1][0]!r} at offset {match.start()}")
+                stack.pop()
+                if char == "}" and self._item_start is not None and self._at_items(stack):
+                    closed.append(self._item.validate_python(json.loads(buffer[self._item_start:pos])))
+                    self._item_start = None
+        self._pos = pos
+        if closed and self._first_item_ms is None:
+            self._first_item_ms = (time.perf_counter() - self._started) * 1000
+        self.parsed.extend(closed)
+        return closed
+
+    def _at_items(self, stack: List[List[Any]]) -> bool:
+        return (len(stack) == 2 and stack[0][0] == "{" and stack[0][1] == self.items
+                and stack[1][0] == "[")
+
+    def result(self) -> BaseModel:
+        """The whole response, validated (raises if it is incomplete or invalid)."""
+        return self.response_model.model_validate_json(self.text)
+
+    def events(self, agents_client: Any, thread_id: str, agent_id: str, **run_kwargs: Any) -> Iterator[Any]:
+        """
+        Streams an agent run, yielding the data of each event (run updates, run steps, message deltas...).
+
+        The final run is in thread_run afterwards.
+
+        :param agents_client: The agents client (project_client.agents)
+        :param thread_id: Thread to run
+        :param agent_id: Agent to run it with
+        :param run_kwargs: Extra arguments for runs.stream
+        :return: Event data, in order
+        """
+        self.thread_run = None
+        run_id = None
+        with agents_client.runs.stream(thread_id=thread_id, agent_id=agent_id, **run_kwargs) as stream:
+            for _, event_data, _ in stream:
+                if isinstance(event_data, ThreadRun):
+                    run_id = event_data.id
+                yield event_data
+        if run_id is None:
+            raise RuntimeError("The run stream ended before the run was created")
+        self.thread_run = agents_client.runs.get(thread_id=thread_id, run_id=run_id)
+
+    def run(self, agents_client: Any, thread_id: str, agent_id: str, **run_kwargs: Any) -> Iterator[Any]:
+        """
+        Streams an agent run, yielding the items of its structured output as they close.
+
+        The final run is in thread_run afterwards.
+
+        :param agents_client: The agents client (project_client.agents)
+        :param thread_id: Thread to run
+        :param agent_id: Agent with a JSON schema response format
+        :param run_kwargs: Extra arguments for runs.stream
+        :return: Validated items, in order
+        """
+        self.reset()
+        message_id = None
+        for event_data in self.events(agents_client, thread_id, agent_id, **run_kwargs):
+            if isinstance(event_data, MessageDeltaChunk):
+                if event_data.id != message_id:
+                    started = self._started
+                    self.reset()
+                    self._started, message_id = started, event_data.id
+                yield from self.feed(event_data.text)
+
+    def report(self) -> Dict[str, Any]:
+        """Characters parsed, items yielded and when the first one was ready."""
+        return {"chars": len(self.text), "items": len(self.parsed),
+                "first_item_ms": round(self._first_item_ms, 1) if self._first_item_ms is not None else None}
+
+
+class _BenchmarkRepo(BaseModel):
+    repo_name: str
+    description: str
+    stars: int
+    forks: int
+    issues: int
+    url: str
+
+
+class _BenchmarkResponse(BaseModel):
+    repositories: List[_BenchmarkRepo]
+    total_found: int
+    query_used: str
+
+
+def run_benchmark(repos: int = 10, delta_chars: int = 6, delta_ms: float = 20.0) -> Dict[str, Any]:
+    """
+    Replays a structured response as timed deltas and compares when the first repository is usable.
+
+    :param repos: Repositories in the response
+    :param delta_chars: Characters per message delta (about one token and a half)
+    :param delta_ms: Interval between deltas
+    :return: Time to the first and last repository with and without incremental parsing, and parser cost
+    """
+    response = _BenchmarkResponse(repositories=[
+        _BenchmarkRepo(repo_name=f"org/agent-framework-{i}", description=f"Agent framework \"{i}\" with tools\\plugins",
+                       stars=1000 * (repos - i), forks=100 + i, issues=10 + i, url=f"https://github.com/org/agent-{i}")
+        for i in range(repos)], total_found=repos * 10, query_used="AI agent frameworks")
+    text = response.model_dump_json()
+    deltas = [text[i:i + delta_chars] for i in range(0, len(text), delta_chars)]
+
+    stream = StructuredStream(_BenchmarkResponse, "repositories")
+    start = time.perf_counter()
+    first_ms = None
+    for delta in deltas:
+        time.sleep(delta_ms / 1000)
+        if stream.feed(delta) and first_ms is None:
+            first_ms = (time.perf_counter() - start) * 1000
+    streamed_ms = (time.perf_counter() - start) * 1000
+    if stream.result() != response or stream.parsed != response.repositories:
+        raise AssertionError("Incremental parse differs from the response")
+
+    # Parser cost alone: the same deltas without the pacing, against one json.loads of the whole text
+    start = time.perf_counter()
+    for _ in range(20):
+        stream.reset()
+        for delta in deltas:
+            stream.feed(delta)
+    feed_ms = (time.perf_counter() - start) * 1000 / 20
+    start = time.perf_counter()
+    for _ in range(20):
+        _BenchmarkResponse(**json.loads(text))
+    whole_ms = (time.perf_counter() - start) * 1000 / 20
+    return {"repos": repos, "chars": len(text), "deltas": len(deltas),
+            "first_repo_ms": {"incremental": round(first_ms, 1), "after_response": round(streamed_ms, 1)},
+            "parse_ms": {"incremental": round(feed_ms, 2), "whole": round(whole_ms, 2)}}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time to the first repository of a streamed structured output")
+    parser.add_argument("--repos", type=int, default=10, help="Repositories in the response")
+    parser.add_argument("--delta-chars", type=int, default=6, help="Characters per message delta")
+    parser.add_argument("--delta-ms", type=float, default=20.0, help="Interval between deltas")
+    args = parser.parse_args()
+
+    result = run_benchmark(args.repos, args.delta_chars, args.delta_ms)
+    print(json.dumps(result, indent=2))
+    print(f"📦 First of {result['repos']} repositories after {result['first_repo_ms']['incremental']} ms "
+          f"instead of {result['first_repo_ms']['after_response']} ms; parsing the deltas took "
+          f"{result['parse_ms']['incremental']} ms")
@@ -0,0 +1,142 @@
+"""
+Timezone resolution for the time-related function tools.
+
+The alias index is built once at import time and maps a normalized name
+(case and separator insensitive) to an IANA zone key, so every lookup is a
+single dict access. Offsets are computed through ``zoneinfo`` for the instant
+being formatted, which keeps daylight saving time correct all year round.
+
+Accepted names:
+- Common abbreviations (UTC, GMT, EST, PDT, CET, JST, PKT, ...)
+- IANA names (America/New_York, europe/madrid, ASIA-TOKYO, ...)
+- City names taken from the IANA database plus a few extra aliases (New York, Islamabad, ...)
+"""
+
+import datetime
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError, available_timezones
+
+# Abbreviations and friendly names that are not IANA keys themselves.
+# Regional abbreviations resolve to the region's zone, so "EST" in July
+# correctly reports EDT (UTC-4) instead of a fixed UTC-5.
+_EXTRA_ALIASES = {
+    "UTC": "UTC", "GMT": "Etc/GMT", "Z": "UTC", "ZULU": "UTC",
+    # US Eastern Time
+    "EST": "America/New_York", "EDT": "America/New_York", "ET": "America/New_York", "EASTERN": "America/New_York",
+    "WASHINGTON": "America/New_York", "BOSTON": "America/New_York",
+    # US Central Time
+    "CST": "America/Chicago", "CDT": "America/Chicago", "CT": "America/Chicago", "CENTRAL": "America/Chicago",
+    "DALLAS": "America/Chicago", "HOUSTON": "America/Chicago",
+    # US Mountain Time
+    "MST": "America/Denver", "MDT": "America/Denver", "MT": "America/Denver", "MOUNTAIN": "America/Denver",
+    # US Pacific Time
+    "PST": "America/Los_Angeles", "PDT": "America/Los_Angeles", "PT": "America/Los_Angeles",
+    "PACIFIC": "America/Los_Angeles", "SAN FRANCISCO": "America/Los_Angeles", "SEATTLE": "America/Los_Angeles",
+    # European Time
+    "WET": "Europe/Lisbon", "BST": "Europe/London",
+    "CET": "Europe/Paris", "CEST": "Europe/Paris",
+    "EET": "Europe/Athens", "EEST": "Europe/Athens",
+    "BARCELONA": "Europe/Madrid", "FRANKFURT": "Europe/Berlin", "MUNICH": "Europe/Berlin",
+    # Asian Time
+    "PKT": "Asia/Karachi", "ISLAMABAD": "Asia/Karachi", "LAHORE": "Asia/Karachi",
+    "IST": "Asia/Kolkata", "MUMBAI": "Asia/Kolkata", "DELHI": "Asia/Kolkata", "NEW DELHI": "Asia/Kolkata",
+    "BANGALORE": "Asia/Kolkata", "BENGALURU": "Asia/Kolkata",
+    "GST": "Asia/Dubai", "SGT": "Asia/Singapore",
+    "CHINA": "Asia/Shanghai", "BEIJING": "Asia/Shanghai",
+    "JST": "Asia/Tokyo", "KST": "Asia/Seoul",
+    # Australian Time
+    "AEST": "Australia/Sydney", "AEDT": "Australia/Sydney",
+    "ACST": "Australia/Adelaide", "AWST": "Australia/Perth",
+}
+
+_SEPARATORS = str.maketrans("", "", " _-/.")
+
+
+def _normalize(name: str) -> str:
+    """Upper-cases a timezone name and drops separators ("new_york" == "New York" == "NEW-YORK")."""
+    return name.strip().upper().translate(_SEPARATORS)
+
+
+def _build_alias_index() -> Mapping[str, str]:
+    """Builds the read-only normalized-name -> IANA key index used by resolve_timezone."""
+    iana_keys = sorted(available_timezones())
+    index: Dict[str, str] = {}
+
+    # City names are the weakest match, so they are added first and overwritten by anything stronger
+    for key in iana_keys:
+        index.setdefault(_normalize(key.rsplit("/", 1)[-1]), key)
+    for key in iana_keys:
+        index[_normalize(key)] = key
+    for alias, key in _EXTRA_ALIASES.items():
+        index[_normalize(alias)] = key
+
+    return MappingProxyType(index)
+
+
+TIMEZONE_ALIASES = _build_alias_index()
+
+
+def resolve_timezone(name: str) -> Optional[ZoneInfo]:
+    """
+    Resolves a timezone abbreviation, IANA name or city name to a ZoneInfo.
+
+    :param name: Timezone name in any of the accepted forms
+    :return: The matching ZoneInfo, or None when the name is unknown
+    """
+    key = TIMEZONE_ALIASES.get(_normalize(name))
+    if key is None:
+        return None
+    try:
+        return ZoneInfo(key)  # ZoneInfo keeps its own per-key cache
+    except ZoneInfoNotFoundError:
+        return None
+
+
+def _format_offset(offset: datetime.timedelta) -> str:
+    total_minutes = int(offset.total_seconds() // 60)
+    sign = "+" if total_minutes >= 0 else "-"
+    hours, minutes = divmod(abs(total_minutes), 60)
+    return f"UTC{sign}{hours}" if minutes == 0 else f"UTC{sign}{hours}:{minutes:02d}"
+
+
+def describe_time(name: str, utc_now: Optional[datetime.datetime] = None) -> dict:
+    """
+    Describes the current local time in a timezone.
+
+    :param name: Timezone name in any of the accepted forms
+    :param utc_now: Reference instant (defaults to now); pass one value to keep a batch consistent
+    :return: Dictionary with the local time details, or an "error" entry when the name is unknown
+    """
+    tz = resolve_timezone(name)
+    if tz is None:
+        return {"timezone": name, "error": f"Unknown timezone: {name}"}
+
+    if utc_now is None:
+        utc_now = datetime.datetime.now(datetime.timezone.utc)
+    local_time = utc_now.astimezone(tz)
+
+    return {
+        "timezone": name,
+        "iana_name": tz.key,
+        "abbreviation": local_time.tzname(),
+        "timezone_offset": _format_offset(local_time.utcoffset()),
+        "is_dst": bool(local_time.dst()),
+        "current_time": local_time.strftime("%Y-%m-%d %H:%M:%S"),
+        "day_of_week": local_time.strftime("%A"),
+        "formatted_time": local_time.strftime("%I:%M %p"),
+        "date": local_time.strftime("%B %d, %Y"),
+    }
+
+
+def describe_times(names: List[str], utc_now: Optional[datetime.datetime] = None) -> List[dict]:
+    """
+    Describes the current local time in several timezones at the same instant.
+
+    :param names: Timezone names in any of the accepted forms
+    :param utc_now: Reference instant (defaults to now)
+    :return: One dictionary per requested name, in the same order
+    """
+    if utc_now is None:
+        utc_now = datetime.datetime.now(datetime.timezone.utc)
+    return [describe_time(name, utc_now) for name in names]
@@ -0,0 +1,49 @@
+"""
+Token counting used to size tool outputs and tool definitions.
+
+Uses tiktoken (o200k_base, the GPT-4o/4.1 encoding) when it is installed and
+falls back to the usual ~4 characters per token estimate otherwise. The
+encoding is loaded on the first count, not at import: tiktoken may download
+its files the first time, which importing a helper should not trigger.
+"""
+
+import functools
+import json
+from typing import Any, Optional
+
+
+@functools.lru_cache(maxsize=None)
+def _encoding() -> Optional[Any]:
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("o200k_base")
+    except Exception:  # tiktoken missing or its encoding files cannot be downloaded
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """
+    Counts (or estimates) the number of tokens in a text.
+
+    :param text: Text to measure
+    :return: Token count
+    """
+    encoding = _encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return (len(text) + 3) // 4
+
+
+def count_json_tokens(value: Any, compact: bool = True) -> int:
+    """
+    Counts the tokens of a value once serialized to JSON.
+
+    :param value: Any JSON-serializable value
+    :param compact: Serialize without whitespace (True) or pretty-printed with indent=2 (False)
+    :return: Token count
+    """
+    if compact:
+        text = json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+    else:
+        text = json.dumps(value, indent=2)
+    return count_tokens(text)
@@ -0,0 +1,215 @@
+"""
+Content-hash-keyed cache of compiled tool definitions.
+
+Every run of the samples repeats the same startup work:
+- FunctionTool introspects signatures and docstrings of every function,
+- jsonref resolves every $ref of the OpenAPI specs,
+- Pydantic regenerates the JSON schemas used as response formats.
+
+The helpers below store the finished result on disk, keyed by a SHA-256 of
+the inputs (the spec file bytes, or the source file that defines the
+functions/models, plus the library version). Editing a spec, a function or a
+model changes the key, so stale entries are never used; a warm start only
+hashes a file and reads one small JSON document.
+
+Other helpers (spec_compiler, mcp_catalog) keep their entries in the same
+cache through cache_key(), read_cached() and write_cached().
+
+The cache lives in samples/.cache/tool_definitions unless TOOL_DEFINITION_CACHE_DIR is set.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import sys
+import tempfile
+from typing import Any, Dict, List, Optional, Type
+
+import jsonref
+from azure.ai.agents import __version__ as agents_sdk_version
+from azure.ai.agents.models import FunctionTool, FunctionToolDefinition
+from pydantic import VERSION as pydantic_version
+from pydantic import BaseModel
+
+CACHE_DIR = os.getenv(
+    "TOOL_DEFINITION_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "tool_definitions"),
+)
+
+# Setting TOOL_DEFINITION_CACHE=off disables the cache (useful for cold-start benchmarks)
+CACHE_ENABLED = os.getenv("TOOL_DEFINITION_CACHE", "on").lower() not in ("0", "off", "false", "no")
+
+_file_hashes: Dict[str, List[Any]] = {}
+
+
+def file_sha256(path: str, memo: Optional[Dict[str, List[Any]]] = None) -> str:
+    """
+    Hashes a file's content, reading it again only when its size or modification time changed.
+
+    :param path: File to hash
+    :param memo: Absolute path -> [size, mtime_ns, sha256] entries to reuse and update, for callers that
+        persist them (defaults to a per-process memo)
+    :return: Hex SHA-256 of the content
+    """
+    path = os.path.abspath(path)
+    memo = _file_hashes if memo is None else memo
+    stat = os.stat(path)
+    known = memo.get(path)
+    if known and known[:2] == [stat.st_size, stat.st_mtime_ns]:
+        return known[2]
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    memo[path] = [stat.st_size, stat.st_mtime_ns, digest.hexdigest()]
+    return memo[path][2]
+
+
+def cache_key(kind: str, *parts: str) -> str:
+    """
+    Builds the key of a cache entry from its kind and the strings it depends on.
+
+    :param kind: Kind of entry (prefix of the file name)
+    :param parts: Content hashes, versions, names... any change gives a new key
+    :return: The key, usable as a file name
+    """
+    digest = hashlib.sha256("\x00".join((kind,) + parts).encode("utf-8")).hexdigest()
+    return f"{kind}-{digest}"
+
+
+def read_cached(key: str) -> Optional[Any]:
+    """Returns the cached value of a key, or None when it is missing, unreadable or the cache is disabled."""
+    if not CACHE_ENABLED:
+        return None
+    try:
+        with open(os.path.join(CACHE_DIR, key + ".json"), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_cached(key: str, value: Any) -> None:
+    """Stores a JSON-serializable value under a key (atomically; a no-op when the cache is disabled)."""
+    if not CACHE_ENABLED:
+        return
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    # Write to a temporary file first so concurrent runs never read a half-written entry
+    fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(value, f, separators=(",", ":"))
+    os.replace(tmp_path, os.path.join(CACHE_DIR, key + ".json"))
+
+
+def _source_file(obj: Any) -> Optional[str]:
+    module = sys.modules.get(getattr(obj, "__module__", ""))
+    code = getattr(obj, "__code__", None)
+    path = code.co_filename if code is not None else getattr(module, "__file__", None)
+    return path if path and os.path.isfile(path) else None
+
+
+def read_openapi_json(path: str, overlay: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Reads an OpenAPI spec file as is ($refs unresolved), optionally with an overlay spec merged in.
+
+    An overlay only adds: its paths and components are added to the spec's, and a path or component
+    the spec already has is an error. The stand-ins use this for operations the hosted APIs do not serve.
+
+    :param path: Path to the OpenAPI JSON file
+    :param overlay: Optional path to an overlay spec (same layout, only the additions)
+    :return: The spec as plain dicts and lists
+    """
+    with open(path, "r") as f:
+        spec = json.load(f)
+    if overlay is None:
+        return spec
+    with open(overlay, "r") as f:
+        extension = json.load(f)
+
+    for section, additions in [("paths", extension.get("paths", {})),
+                               *((f"components/{name}", entries)
+                                 for name, entries in extension.get("components", {}).items())]:
+        target = spec
+        for part in section.split("/"):
+            target = target.setdefault(part, {})
+        clashes = sorted(set(target) & set(additions))
+        if clashes:
+            raise ValueError(f"{os.path.basename(overlay)} redefines {section}: {', '.join(clashes)}")
+        target.update(additions)
+    return spec
+
+
+def load_openapi_spec(path: str, overlay: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Loads an OpenAPI spec with every $ref resolved, reusing the cached resolution when the file is unchanged.
+    Drop-in replacement for jsonref.loads(open(path).read()).
+
+    :param path: Path to the OpenAPI JSON file
+    :param overlay: Optional overlay spec merged in first (see read_openapi_json)
+    :return: The fully resolved spec as plain dicts and lists
+    """
+    key = cache_key("openapi", file_sha256(path), *([file_sha256(overlay)] if overlay else []))
+    spec = read_cached(key)
+    if spec is None:
+        spec = jsonref.replace_refs(read_openapi_json(path, overlay), proxies=False, lazy_load=False)
+        write_cached(key, spec)
+    return spec
+
+
+def cached_model_json_schema(model: Type[BaseModel]) -> Dict[str, Any]:
+    """
+    Returns model.model_json_schema(), cached per model and per content of the file defining it.
+
+    :param model: Pydantic model class
+    :return: The model's JSON schema
+    """
+    source = _source_file(model)
+    if source is None:
+        return model.model_json_schema()
+
+    key = cache_key("schema", file_sha256(source), model.__qualname__, pydantic_version)
+    schema = read_cached(key)
+    if schema is None:
+        schema = model.model_json_schema()
+        write_cached(key, schema)
+    return schema
+
+
+def _overridable(cls: type, name: str, parameters: List[str]) -> bool:
+    method = getattr(cls, name, None)
+    try:
+        return callable(method) and list(inspect.signature(method).parameters) == parameters
+    except (TypeError, ValueError):
+        return False
+
+
+# FunctionTool builds its definitions in _build_function_definitions, a private method of the
+# beta SDK that may change in any release. The cached version is only installed while that method
+# exists with the expected signature; otherwise CachedFunctionTool behaves as a plain FunctionTool.
+CACHE_FUNCTION_DEFINITIONS = _overridable(FunctionTool, "_build_function_definitions", ["self", "functions"])
+
+
+class CachedFunctionTool(FunctionTool):
+    """
+    FunctionTool whose definitions are loaded from the cache when the functions' source files are unchanged.
+    Execution (execute, enable_auto_function_calls) works exactly as with FunctionTool.
+    """
+
+    if CACHE_FUNCTION_DEFINITIONS:
+        def _build_function_definitions(self, functions: Dict[str, Any]) -> List[FunctionToolDefinition]:
+            sources = []
+            for name in sorted(functions):
+                source = _source_file(functions[name])
+                if source is None:  # Built-ins, lambdas created at runtime, ...: nothing stable to key on
+                    return super()._build_function_definitions(functions)
+                sources.append(f"{name}:{functions[name].__qualname__}:{file_sha256(source)}")
+
+            key = cache_key("functions", agents_sdk_version, *sources)
+            cached = read_cached(key)
+            if cached is not None:
+                return [FunctionToolDefinition(definition) for definition in cached]
+
+            # Built in name order, so the definitions sent to the agent do not follow set iteration order
+            definitions = super()._build_function_definitions({name: functions[name] for name in sorted(functions)})
+            write_cached(key, [definition.as_dict() for definition in definitions])
+            return definitions
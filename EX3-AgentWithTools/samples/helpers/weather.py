@@ -0,0 +1,120 @@
+"""
+Weather data for the weather function tools.
+
+The mock data lives in read-only module-level tables that are built once,
+instead of being re-allocated on every tool call. Tools read it through a
+pluggable provider: LocalWeatherProvider serves the tables below, and a real
+weather service can be swapped in with set_weather_provider() as long as it
+offers the same current()/forecast() methods.
+"""
+
+from types import MappingProxyType
+from typing import List, Mapping, Optional, Protocol, Sequence
+
+WEATHER_DATA: Mapping[str, Mapping[str, str]] = MappingProxyType({
+    "New York": MappingProxyType({"temp": "18°C", "condition": "Cloudy", "humidity": "65%", "wind": "12 km/h NW"}),
+    "London": MappingProxyType({"temp": "12°C", "condition": "Rainy", "humidity": "80%", "wind": "8 km/h SW"}),
+    "Tokyo": MappingProxyType({"temp": "22°C", "condition": "Sunny", "humidity": "55%", "wind": "6 km/h E"}),
+    "Sydney": MappingProxyType({"temp": "25°C", "condition": "Partly Cloudy", "humidity": "60%", "wind": "15 km/h SE"}),
+    "Barcelona": MappingProxyType({"temp": "25°C", "condition": "Sunny", "humidity": "45%", "wind": "10 km/h E"}),
+    "Madrid": MappingProxyType({"temp": "22°C", "condition": "Cloudy", "humidity": "50%", "wind": "7 km/h N"}),
+    "Frankfurt": MappingProxyType({"temp": "16°C", "condition": "Rainy", "humidity": "75%", "wind": "9 km/h W"}),
+    "Paris": MappingProxyType({"temp": "19°C", "condition": "Overcast", "humidity": "70%", "wind": "11 km/h NW"}),
+    "Berlin": MappingProxyType({"temp": "17°C", "condition": "Partly Cloudy", "humidity": "60%", "wind": "8 km/h NE"}),
+})
+
+# Simple 3-day forecast data (tomorrow, day 2, day 3)
+FORECAST_DATA: Mapping[str, Sequence[str]] = MappingProxyType({
+    "New York": ("19°C Sunny", "21°C Partly Cloudy", "16°C Rainy"),
+    "London": ("14°C Overcast", "11°C Rainy", "15°C Cloudy"),
+    "Tokyo": ("24°C Sunny", "23°C Partly Cloudy", "25°C Sunny"),
+    "Sydney": ("27°C Sunny", "24°C Cloudy", "26°C Partly Cloudy"),
+    "Barcelona": ("27°C Sunny", "26°C Sunny", "24°C Partly Cloudy"),
+})
+
+FORECAST_DAYS = ("tomorrow", "day_2", "day_3")
+
+
+class WeatherProvider(Protocol):
+    """Anything that can answer current conditions and forecasts for a location."""
+
+    def current(self, location: str) -> Optional[Mapping[str, str]]: ...
+
+    def forecast(self, location: str) -> Optional[Sequence[str]]: ...
+
+
+class LocalWeatherProvider:
+    """Stand-in provider backed by the module-level mock tables (case-insensitive lookups)."""
+
+    def __init__(self, weather: Mapping[str, Mapping[str, str]] = WEATHER_DATA,
+                 forecasts: Mapping[str, Sequence[str]] = FORECAST_DATA):
+        self._weather = {name.casefold(): data for name, data in weather.items()}
+        self._forecasts = {name.casefold(): data for name, data in forecasts.items()}
+
+    def current(self, location: str) -> Optional[Mapping[str, str]]:
+        return self._weather.get(location.strip().casefold())
+
+    def forecast(self, location: str) -> Optional[Sequence[str]]:
+        return self._forecasts.get(location.strip().casefold())
+
+
+_provider: WeatherProvider = LocalWeatherProvider()
+
+
+def set_weather_provider(provider: WeatherProvider) -> None:
+    """Replaces the provider used by weather_report()/weather_reports()."""
+    global _provider
+    _provider = provider
+
+
+def weather_report(location: str, include_forecast: bool = False) -> dict:
+    """
+    Builds the weather report for a single location.
+
+    :param location: The location to fetch weather for
+    :param include_forecast: Whether to include a 3-day forecast
+    :return: Dictionary with current conditions (and forecast when requested and available)
+    """
+    current = _provider.current(location)
+    result = {
+        "location": location,
+        "current": dict(current) if current else {
+            "temp": "N/A", "condition": "Data not available",
+            "humidity": "N/A", "wind": "N/A"
+        }
+    }
+
+    forecast = _provider.forecast(location) if include_forecast else None
+    if forecast:
+        result["forecast"] = dict(zip(FORECAST_DAYS, forecast))
+
+    return result
+
+
+def weather_reports(locations: List[str], include_forecast: bool = False) -> dict:
+    """
+    Builds one compact payload for several locations.
+
+    Rows are flat (no nested "current" object) and unknown locations are listed once
+    under "not_found" instead of repeating placeholder values for each of them.
+
+    :param locations: The locations to fetch weather for
+    :param include_forecast: Whether to include a 3-day forecast per location
+    :return: Dictionary with a "weather" row per known location and the "not_found" locations
+    """
+    rows = []
+    not_found = []
+    for location in dict.fromkeys(locations):  # Drop duplicates, keep the requested order
+        current = _provider.current(location)
+        if current is None:
+            not_found.append(location)
+            continue
+
+        row = {"location": location, **current}
+        if include_forecast:
+            forecast = _provider.forecast(location)
+            if forecast:
+                row["forecast"] = list(forecast)
+        rows.append(row)
+
+    return {"weather": rows, "not_found": not_found}
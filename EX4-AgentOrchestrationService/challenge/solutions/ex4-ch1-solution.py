@@ -9,7 +9,7 @@
 #   - Simpler tool definitions matching the working sample
 # ---------------------------------------------------------------------
 import os
-import jsonref
+import sys
 from azure.ai.agents import AgentsClient
 from azure.ai.agents.models import (
     ConnectedAgentTool, 
@@ -20,6 +20,9 @@ from azure.ai.agents.models import (
     OpenApiAnonymousAuthDetails,
     ResponseFormatJsonSchema,
     ResponseFormatJsonSchemaType,
+    RunStep,
+    RunStepConnectedAgentToolCall,
+    RunStepToolCallDetails,
     McpTool,
     RequiredMcpToolCall,
     SubmitToolApprovalAction,
@@ -29,6 +32,12 @@ from azure.identity import DefaultAzureCredential
 from dotenv import load_dotenv
 from pydantic import BaseModel
 
+# Make the shared helpers in EX3-AgentWithTools/samples importable
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../../EX3-AgentWithTools/samples"))
+from helpers.spec_compiler import load_compiled_spec
+from helpers.structured_stream import StructuredStream
+from helpers.tool_cache import cached_model_json_schema
+
 # Load environment variables from a .env file
 load_dotenv()
 
@@ -83,8 +92,8 @@ agents_client = AgentsClient(
 # Load the GitHub OpenAPI specification to enable real GitHub repository search
 # ---------------------------------------------------------------------
 openapi_file_path = os.path.join(os.path.dirname(__file__), "../gitHubOpenApidef.json")
-with open(openapi_file_path, "r") as f:
-    github_openapi_spec = jsonref.loads(f.read())
+# Only the parts of the spec the model needs are sent (see helpers/spec_compiler.py)
+github_openapi_spec = load_compiled_spec(openapi_file_path)
 
 print(f"✅ Loaded GitHub OpenAPI spec from: {openapi_file_path}")
 
@@ -155,7 +164,7 @@ When searching for repositories:
      response_format=ResponseFormatJsonSchemaType(
          json_schema=ResponseFormatJsonSchema(
              name="GitHubReposResponse",
-             schema=GitHubReposResponse.model_json_schema()
+             schema=cached_model_json_schema(GitHubReposResponse)
          )
      )
 )
@@ -290,13 +299,27 @@ message = agents_client.messages.create(
 )   
     
 # Run the thread using the master agent
-# create_and_process() is a convenience method that:
-#   - Creates a run with the specified agent
-#   - Automatically processes any tool calls (including ConnectedAgentTool calls)
-#   - Handles the orchestration workflow without manual intervention
-#   - Returns when the entire orchestration is complete
+# The run is streamed rather than created with create_and_process():
+#   - Connected agent calls are still processed by the service without manual intervention
+#   - Each run step arrives as soon as it completes, so the GitHub Explorer's structured
+#     output is parsed (one validated GitHubRepo at a time, see helpers/structured_stream.py)
+#     and shown while the master agent is still consulting the other specialists
 print("\nProcessing agent thread. Please wait.")
-run = agents_client.runs.create_and_process(thread_id=thread.id, agent_id=master_agent.id)
+github_results = StructuredStream(GitHubReposResponse, "repositories")
+for event_data in github_results.events(agents_client, thread_id=thread.id, agent_id=master_agent.id):
+     if (isinstance(event_data, RunStep) and event_data.status == "completed"
+             and isinstance(event_data.step_details, RunStepToolCallDetails)):
+         for tool_call in event_data.step_details.tool_calls:
+             if (isinstance(tool_call, RunStepConnectedAgentToolCall)
+                     and tool_call.connected_agent.name == github_explorer.name):
+                 print(f"🔍 GitHub Explorer found:")
+                 github_results.reset()
+                 try:
+                     for repo in github_results.feed(tool_call.connected_agent.output or ""):
+                         print(f"   📦 {repo.name} ({repo.language}) ⭐ {repo.stargazers_count} {repo.html_url}")
+                 except ValueError as e:
+                     print(f"   ⚠️  Unexpected GitHub Explorer output: {e}")
+run = github_results.thread_run
         
 if run.status == "failed":
      print(f"Run failed: {run.last_error}")
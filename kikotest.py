@@ -1,13 +1,18 @@
 # 0. Import necessary libraries and set up environment variables
 # ---------------------------------------------------------------------
 import os
+import sys
 import jsonref
 from azure.ai.projects import AIProjectClient
 from azure.identity import DefaultAzureCredential
-from azure.ai.agents.models import ListSortOrder, OpenApiTool, OpenApiAnonymousAuthDetails, ResponseFormatJsonSchema, ResponseFormatJsonSchemaType
+from azure.ai.agents.models import OpenApiTool, OpenApiAnonymousAuthDetails, ResponseFormatJsonSchema, ResponseFormatJsonSchemaType
 from dotenv import load_dotenv
 from pydantic import BaseModel
 
+# Make the shared helpers in EX3-AgentWithTools/samples importable
+sys.path.append(os.path.join(os.path.dirname(__file__), "EX3-AgentWithTools/samples"))
+from helpers.structured_stream import StructuredStream
+
 # Load environment variables from a .env file
 load_dotenv()
 
@@ -95,9 +100,13 @@ with AIProjectClient(
         content="Give me repos related to AI Agent Service"
     )
 
-    # 8. Run Creation and Processing
+    # 8. Run Creation and Streaming
     # ---------------------------------------------------------------------
-    run = project.agents.runs.create_and_process(thread_id=thread.id, agent_id=agent.id)
+    # Each repository is validated and printed as soon as its JSON object is complete
+    structured = StructuredStream(GitHubReposResponse, "repositories")
+    for repo in structured.run(project.agents, thread.id, agent.id):
+        print(f"{repo.repo_name} ({repo.stars} stars): {repo.url}")
+    run = structured.thread_run
 
     # 9. Error Handling
     # ---------------------------------------------------------------------
@@ -105,14 +114,6 @@ with AIProjectClient(
         # Check if you got "Rate limit is exceeded.", then you want to get more quota
         print(f"Run failed: {run.last_error}")
 
-    # 10. Retrieving and Displaying Messages
+    # 10. Displaying the Full Response
     # ---------------------------------------------------------------------
-    messages = project.agents.messages.list(
-        thread_id=thread.id, 
-        order=ListSortOrder.ASCENDING
-    )
-
-    for message in messages:
-        if message.run_id == run.id and message.text_messages:
-            print(f"{message.role}: {message.text_messages[-1].text.value}")
-
+    print(f"assistant: {structured.text}")